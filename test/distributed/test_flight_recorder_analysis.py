@@ -0,0 +1,83 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))),
+                             "tools", "flight_recorder"))
+from analysis_flight import (analyze_pg_sequences, build_pg_sequences, extract_hccl_info,  # noqa: E402
+                             find_first_divergence, load_recorder_data)
+
+
+def make_entry(record_id, pg_id, seq_id, name="hccl:all_reduce", sizes=((4, 4),), state="completed"):
+    entry = {"record_id": record_id, "pg_id": pg_id, "profiling_name": name, "state": state,
+             "time_discovered_completed_ns": record_id, "input_sizes": [list(size) for size in sizes],
+             "output_sizes": [list(size) for size in sizes], "frames": [{"name": "all_reduce", "line": 1}]}
+    if seq_id is not None:
+        entry["collective_seq_id"] = seq_id
+    return entry
+
+
+class FlightRecorderAnalysisTest(unittest.TestCase):
+    world_size = 4
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = self.tmp_dir.name + "/"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _dump(self, rank_entries):
+        for rank, entries in enumerate(rank_entries):
+            flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+            with os.fdopen(os.open(self.path + str(rank), flags, 0o640), "wb") as f:
+                pickle.dump({"entries": entries}, f)
+
+    def _make_rank_entries(self, rank):
+        # the pg 0 and pg 1 collectives interleave, so record_id differs from the collective_seq_id of a pg
+        entries = []
+        for seq_id in range(4):
+            sizes = ((4, 8),) if rank == 2 and seq_id == 2 else ((4, 4),)
+            entries.append(make_entry(len(entries), 0, seq_id, sizes=sizes))
+            if rank % 2 == 0:
+                entries.append(make_entry(len(entries), 1, seq_id, name="hccl:broadcast"))
+        # the ring buffer of rank 3 dropped its first entry
+        return entries[1:] if rank == 3 else entries
+
+    def test_find_first_divergence(self):
+        self._dump([self._make_rank_entries(rank) for rank in range(self.world_size)])
+        for workers in (1, 2):
+            recorder_dict = load_recorder_data(self.path, self.world_size, workers)
+            self.assertEqual(self.world_size, len(recorder_dict))
+            pg_sequences = build_pg_sequences(recorder_dict)
+            divergence = find_first_divergence(pg_sequences[0])
+            self.assertEqual(2, divergence["seq_id"])
+            self.assertEqual([], divergence["missing_ranks"])
+            self.assertEqual({("hccl:all_reduce", ((4, 4),), ("0", "1", "3")), ("hccl:all_reduce", ((4, 8),), ("2",))},
+                             {(sig["name"], sig["input_sizes"], tuple(sig["ranks"]))
+                              for sig in divergence["signatures"]})
+            self.assertIsNone(find_first_divergence(pg_sequences[1]))
+
+    def test_missing_collective(self):
+        rank_entries = [[make_entry(seq_id, 0, seq_id) for seq_id in range(3)] for _ in range(self.world_size)]
+        del rank_entries[1][1]
+        self._dump(rank_entries)
+        report = analyze_pg_sequences(load_recorder_data(self.path, self.world_size, 1))
+        self.assertEqual(1, report["0"]["seq_id"])
+        self.assertEqual(["1"], report["0"]["missing_ranks"])
+
+    def test_entries_without_collective_seq_id_skipped(self):
+        rank_entries = [[make_entry(record_id, record_id % 2, None) for record_id in range(4)]
+                        for _ in range(self.world_size)]
+        self._dump(rank_entries)
+        recorder_dict = load_recorder_data(self.path, self.world_size, 1)
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual({}, analyze_pg_sequences(recorder_dict))
+        # the last entry heuristics keep reporting the name of the first frame
+        self.assertEqual("all_reduce", extract_hccl_info(recorder_dict)["0"]["name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
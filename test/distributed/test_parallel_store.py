@@ -1,6 +1,10 @@
 import random
+import threading
 import unittest
+from unittest import mock
+from torch.distributed.elastic.rendezvous.api import RendezvousStoreInfo
 from torch_npu.distributed import ParallelStore
+from torch_npu.distributed.rendezvous import _ParallelTCPRendezvous, _StoreTree, _store_barrier, _store_broadcast
 
 
 class ParallelStoreTest(unittest.TestCase):
@@ -64,6 +68,95 @@ class ParallelStoreTest(unittest.TestCase):
             new_key_count = self._server.num_keys()
             self.assertEqual(old_key_count - 1, new_key_count)
 
+    def test_client_multi_set_and_server_multi_get(self):
+        key_base = 'key/ParallelStoreTest/client_multi_set_and_server_multi_get'
+        keys = [f'{key_base}/{i}' for i in range(0, 100)]
+        values = [f'value/{i}'.encode() for i in range(0, 100)]
+        old_key_count = self._server.num_keys()
+        self._client.multi_set(keys, values)
+        self.assertEqual(old_key_count + len(keys), self._server.num_keys())
+
+        result = self._server.multi_get(keys)
+        self.assertEqual(values, result)
+
+        self._client.multi_set(keys[:10], [b'new'] * 10)
+        result = self._server.multi_get(keys[:20])
+        self.assertEqual([b'new'] * 10 + values[10:20], result)
+
+    def _run_ranks(self, world_size, func):
+        tcp_port = self._begin_port + self._port_offset
+        results = [None] * world_size
+
+        def run(rank):
+            store = ParallelStore(port=tcp_port, agent_run=False, agent_pid=100, is_server=False)
+            results[rank] = func(store, rank)
+
+        threads = [threading.Thread(target=run, args=(rank,)) for rank in range(world_size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_store_tree_covers_all_ranks(self):
+        world_size = 37
+        for local_world_size in (1, 4):
+            trees = [_StoreTree(rank, world_size, 5, local_world_size, 2) for rank in range(world_size)]
+            self.assertIsNone(trees[5].parent)
+            for rank, tree in enumerate(trees):
+                if tree.parent is not None:
+                    self.assertIn(rank, trees[tree.parent].children)
+            self.assertEqual(world_size - 1, sum(len(tree.children) for tree in trees))
+
+    def test_store_barrier(self):
+        world_size = 16
+        tag = 'key/ParallelStoreTest/store_barrier'
+        arrived = []
+
+        def barrier(store, rank):
+            arrived.append(rank)
+            _store_barrier(store, rank, world_size, tag, local_world_size=4, fanout=2)
+            return len(arrived)
+
+        results = self._run_ranks(world_size, barrier)
+        self.assertEqual([world_size] * world_size, results)
+
+    def test_store_broadcast(self):
+        world_size = 16
+        key = 'key/ParallelStoreTest/store_broadcast'
+        value = b'value/ParallelStoreTest/store_broadcast'
+
+        def broadcast(store, rank):
+            return _store_broadcast(store, rank, world_size, key, value if rank == 3 else None, src=3,
+                                    local_world_size=4, fanout=2)
+
+        results = self._run_ranks(world_size, broadcast)
+        self.assertEqual([value] * world_size, results)
+
+    def test_parallel_rendezvous_rounds(self):
+        world_size = 4
+        joined = []
+        master_ports = [29400, 29500]
+
+        def next_rendezvous(store, rank):
+            handler = _ParallelTCPRendezvous('127.0.0.1', 0, rank, world_size, False, 100, 'run', False, 60)
+            handler._store = store
+            result = []
+            for round_id in range(2):
+                joined.append(round_id)
+                info = handler.next_rendezvous()
+                # every agent has joined the round before any of them leaves it
+                store_info = info.bootstrap_store_info
+                result.append((joined.count(round_id), store_info.master_addr, store_info.master_port))
+            return result
+
+        # rank 0 publishes a new master port every round
+        store_infos = [RendezvousStoreInfo('127.0.0.1', master_port) for master_port in master_ports]
+        with mock.patch.object(RendezvousStoreInfo, 'build', side_effect=store_infos):
+            results = self._run_ranks(world_size, next_rendezvous)
+        expected = [(world_size, '127.0.0.1', master_port) for master_port in master_ports]
+        self.assertEqual([expected] * world_size, results)
+
     def test_multi_server_set_get(self):
         key = 'key/ParallelStoreTest/test_multi_server_set_get'
         tcp_port = self._begin_port + self._port_offset
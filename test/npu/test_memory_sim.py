@@ -0,0 +1,85 @@
+from torch_npu.npu._memory_sim import AllocatorConfig, CachingAllocatorSimulator, compare_configs, replay
+from torch_npu.testing.testcase import TestCase, run_tests
+
+MB = 1024 * 1024
+
+
+def make_trace(ops):
+    trace = []
+    for op in ops:
+        if op[0] == "alloc":
+            trace.append({"action": "alloc", "addr": op[1], "size": op[2], "stream": 0})
+        elif op[0] == "free":
+            trace.append({"action": "free_requested", "addr": op[1], "size": 0, "stream": 0})
+            trace.append({"action": "free_completed", "addr": op[1], "size": 0, "stream": 0})
+        elif op[0] == "empty_cache":
+            trace.append({"action": "segment_free", "addr": 0, "size": 0, "stream": 0})
+    return trace
+
+
+class TestMemorySim(TestCase):
+
+    def test_round_size_and_pools(self):
+        simulator = CachingAllocatorSimulator()
+        self.assertEqual(512, simulator.round_size(1))
+        self.assertEqual(1024, simulator.round_size(512))
+        simulator.malloc(100)
+        self.assertEqual(2 * MB, simulator.total_allocated_memory)
+        simulator.malloc(5 * MB)
+        self.assertEqual(22 * MB, simulator.total_allocated_memory)
+        # the 20MB segment is split, a second 5MB block fits in its remainder
+        simulator.malloc(5 * MB)
+        self.assertEqual(22 * MB, simulator.total_allocated_memory)
+        self.assertEqual(2, simulator.num_segment_allocs)
+
+    def test_free_merges_blocks(self):
+        simulator = CachingAllocatorSimulator()
+        first = simulator.malloc(5 * MB)
+        second = simulator.malloc(5 * MB)
+        simulator.free(first)
+        simulator.free(second)
+        self.assertEqual([(0, 20 * MB)], [key[:2] for key in simulator.large_blocks.keys])
+        simulator.empty_cache()
+        self.assertEqual(0, simulator.total_allocated_memory)
+
+    def test_max_split_size(self):
+        ops = [("alloc", 1, 200 * MB - 1024), ("free", 1), ("alloc", 2, 100 * MB - 1024),
+               ("alloc", 3, 100 * MB - 1024)]
+        default, max_split = compare_configs(make_trace(ops), ["", "max_split_size_mb:64"])
+        # the freed 200MB block is split by default, above max split size a request only takes a block
+        # less than 20MB larger
+        self.assertEqual(200 * MB, default.peak_reserved)
+        self.assertEqual(400 * MB, max_split.peak_reserved)
+
+    def test_expandable_segments(self):
+        ops = [("alloc", 1, 30 * MB), ("alloc", 2, 30 * MB), ("free", 1), ("free", 2), ("empty_cache",)]
+        result = replay(make_trace(ops), AllocatorConfig.from_env_string("expandable_segments:True"))
+        # pages of 20MB are mapped on demand and unmapped by empty_cache
+        self.assertEqual([40 * MB, 80 * MB, 80 * MB, 80 * MB, 0], result.reserved.tolist())
+
+    def test_oom_under_device_memory(self):
+        ops = [("alloc", 1, 60 * MB - 1024), ("alloc", 2, 60 * MB - 1024), ("free", 2),
+               ("alloc", 3, 30 * MB - 1024)]
+        result = replay(make_trace(ops), device_memory=100 * MB)
+        self.assertEqual(1, len(result.ooms))
+        self.assertEqual(1, result.ooms[0][0])
+        self.assertEqual(60 * MB - 1024, result.ooms[0][1])
+        # the free of the failed allocation is ignored
+        self.assertEqual(2, result.num_segment_allocs)
+        self.assertEqual(90 * MB, result.peak_reserved)
+
+    def test_config_parse(self):
+        config = AllocatorConfig.from_env_string(
+            "max_split_size_mb:128, garbage_collection_threshold:0.6,expandable_segments:False")
+        self.assertEqual(128 * MB, config.max_split_size)
+        self.assertEqual(0.6, config.garbage_collection_threshold)
+        self.assertFalse(config.expandable_segments)
+        self.assertEqual("max_split_size_mb:128,garbage_collection_threshold:0.6", config.to_env_string())
+        for conf in ["max_split_size_mb:10", "garbage_collection_threshold:1.5", "expandable_segments:yes",
+                     "unknown:1", "max_split_size_mb"]:
+            with self.assertRaises(ValueError):
+                AllocatorConfig.from_env_string(conf)
+
+
+if __name__ == "__main__":
+    run_tests()
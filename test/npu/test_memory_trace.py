@@ -0,0 +1,85 @@
+import os
+import tempfile
+
+from torch_npu.npu._memory_trace import (EVENT_DTYPE, NO_STACK, MemoryTraceReader, dump_snapshot, entries_to_array,
+                                         is_compact_trace)
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+def make_snapshot():
+    # symbolized frames are shared between the stacks, as in the snapshots of the allocator
+    frame_a = {"filename": "train.py", "line": 10, "name": "forward"}
+    frame_b = {"filename": "model.py", "line": 3, "name": "linear"}
+    stack = [frame_b, frame_a]
+    trace = []
+    for index in range(10):
+        trace.append({"action": "alloc", "addr": 4096 * index, "size": 512 * (index + 1), "stream": 0,
+                      "frames": stack})
+        trace.append({"action": "free_requested", "addr": 4096 * index, "size": 512 * (index + 1), "stream": 0,
+                      "frames": [dict(frame_a)]})
+    trace.append({"action": "oom", "device_free": 1024, "size": 1 << 30, "stream": 1, "frames": []})
+    trace.append({"action": "segment_free", "addr": 0, "size": 2 << 20, "stream": 0})
+    segments = [{"device": 1, "address": 0, "total_size": 2 << 20, "allocated_size": 512, "active_size": 512,
+                 "requested_size": 500, "stream": 0, "segment_type": "small", "is_expandable": False,
+                 "frames": stack,
+                 "blocks": [{"address": 0, "size": 512, "requested_size": 500, "state": "active_allocated",
+                             "frames": stack},
+                            {"address": 512, "size": (2 << 20) - 512, "requested_size": 0, "state": "inactive"}]}]
+    return {"segments": segments, "device_traces": [[], trace]}
+
+
+class TestMemoryTrace(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "snapshot.npumem")
+        self.snapshot = make_snapshot()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        dump_snapshot(self.snapshot, self.path, chunk_events=3)
+        self.assertTrue(is_compact_trace(self.path))
+        with MemoryTraceReader(self.path) as reader:
+            self.assertEqual(self.snapshot, reader.to_snapshot())
+            # strings and stacks are interned once
+            self.assertEqual(["model.py", "linear", "train.py", "forward"], reader.strings)
+            self.assertEqual(3, len(reader._stack_frames))
+
+    def test_lazy_device_iteration(self):
+        dump_snapshot(self.snapshot, self.path, chunk_events=4)
+        with MemoryTraceReader(self.path) as reader:
+            self.assertEqual([], list(reader.iter_events(device=0)))
+            events = list(reader.iter_events(device=1))
+            self.assertEqual(self.snapshot["device_traces"][1], [entry for _, entry in events])
+            self.assertEqual({1}, {device for device, _ in events})
+            # entries of the same stack share their frame list
+            self.assertIs(events[0][1]["frames"], events[2][1]["frames"])
+
+    def test_event_arrays(self):
+        dump_snapshot(self.snapshot, self.path, chunk_events=5)
+        with MemoryTraceReader(self.path) as reader:
+            arrays = reader.load_event_arrays()
+            self.assertEqual([0, 1], sorted(arrays))
+            self.assertEqual(0, len(arrays[0]))
+            events = arrays[1]
+            self.assertEqual(EVENT_DTYPE.names, events.dtype.names)
+            self.assertEqual(22, len(events))
+            self.assertEqual(1024, events["addr"][20])
+            self.assertEqual(NO_STACK, events["stack"][21])
+            self.assertEqual(reader.get_frames(int(events["stack"][0])), self.snapshot["device_traces"][1][0]["frames"])
+        expect = entries_to_array(self.snapshot["device_traces"][1])
+        for field in ("action", "addr", "size", "stream"):
+            self.assertEqual(expect[field].tolist(), events[field].tolist())
+
+    def test_not_a_compact_trace(self):
+        with open(self.path, "wb") as f:
+            f.write(b"\x80\x04not a trace")
+        self.assertFalse(is_compact_trace(self.path))
+        with self.assertRaises(ValueError):
+            MemoryTraceReader(self.path)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,66 @@
+import io
+import os
+import tempfile
+
+from torch_npu.npu._memory_trace import MemoryTraceReader, dump_snapshot
+from torch_npu.npu._memory_viz import _write_folded_stacks, memory, segments
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+def make_snapshot():
+    frame_a = {"filename": "/src/train.py", "line": 10, "name": "forward"}
+    frame_b = {"filename": "/src/model.py", "line": 3, "name": "linear"}
+    frame_c = {"filename": "Python/ceval.c", "line": 1, "name": "_PyEval_EvalFrameDefault"}
+    stack = [frame_b, frame_c, frame_a]
+    blocks_0 = [{"address": 0, "size": 512, "requested_size": 500, "state": "active_allocated", "frames": stack},
+                {"address": 512, "size": 1024, "requested_size": 1000, "state": "active_allocated",
+                 "frames": stack},
+                {"address": 1536, "size": 2048, "requested_size": 0, "state": "inactive", "frames": []}]
+    blocks_1 = [{"address": 8192, "size": 512, "requested_size": 512, "state": "active_allocated",
+                 "frames": [dict(frame) for frame in stack]}]
+    return {"segments": [{"device": 0, "address": 0, "total_size": 4096, "stream": 0, "blocks": blocks_0},
+                         {"device": 0, "address": 8192, "total_size": 512, "stream": 0, "blocks": blocks_1}]}
+
+
+def identity(folded):
+    return folded
+
+
+class TestMemoryViz(TestCase):
+
+    def test_memory_aggregates_same_stacks(self):
+        folded = memory(make_snapshot(), identity)
+        # blocks of the same stack are summed over the segments of a stream, filtered frames are dropped
+        expect = ["stream_0;active_allocated;train.py:10:forward;model.py:3:linear 2012",
+                  "stream_0;active_allocated;<gaps> 36",
+                  "stream_0;inactive;<non-python> 0",
+                  "stream_0;inactive;<gaps> 2048"]
+        self.assertEqual(sorted(expect), sorted(folded.splitlines()))
+
+    def test_segments_keep_segment_prefix(self):
+        folded = segments(make_snapshot(), identity)
+        self.assertIn("stream_0;seg_0;active_allocated;train.py:10:forward;model.py:3:linear 1500", folded)
+        self.assertIn("stream_0;seg_8192;active_allocated;train.py:10:forward;model.py:3:linear 512", folded)
+
+    def test_legacy_history(self):
+        snapshot = {"segments": [{"stream": 1, "address": 0, "blocks": [
+            {"size": 1024, "state": "active_allocated",
+             "history": [{"real_size": 300, "frames": [{"filename": "a.py", "line": 1, "name": "f"}]},
+                         {"real_size": 200}]}]}]}
+        folded = memory(snapshot, identity)
+        self.assertEqual(["stream_1;active_allocated;a.py:1:f 300", "stream_1;active_allocated;<no-context> 200",
+                          "stream_1;active_allocated;<gaps> 524"], folded.splitlines())
+
+    def test_compact_trace(self):
+        snapshot = make_snapshot()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "snapshot.npumem")
+            dump_snapshot(snapshot, path)
+            with MemoryTraceReader(path) as reader:
+                f = io.StringIO()
+                _write_folded_stacks(f, reader, by_segment=True)
+        self.assertEqual(segments(snapshot, identity), f.getvalue())
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -101,6 +101,53 @@ class TestTorchOpNode(TestCase):
         self.assertEqual(self.level2_node.corr_id_self, [40])
         self.assertEqual(self.level2_node.corr_id_total, [40])
 
+    def test_tree_columns(self):
+        tree = self.root_node.tree
+        self.assertEqual([10, 20, 40, 60], tree.start.tolist())
+        self.assertEqual([100, 30, 80, 70], tree.end.tolist())
+        self.assertEqual([-1, 0, 0, 2], tree.parent.tolist())
+        self.assertEqual(["ProfilerStep#1", "MatMul", "Div", "Add"], [tree.names[i] for i in tree.name_id.tolist()])
+        self.assertEqual([999] * 4, tree.pid.tolist())
+
+    def test_match_child_by_binary_search(self):
+        root_node = TorchOpNode()
+        spans = [(start, start + 5) for start in range(0, 1000, 10)]
+        for start, end in spans:
+            event = MagicMock(pid=1, tid=1, ts=start, end_ns=end)
+            event.name = "Op"
+            root_node.add_child_node(TorchOpNode(event, root_node))
+        for ts in range(-5, 1010):
+            matched = root_node.match_child_node(ts)
+            expect = next((index + 1 for index, (start, end) in enumerate(spans) if start <= ts < end), None)
+            self.assertEqual(expect, matched.index if matched else None)
+        # a child added after a match is found by the next one
+        event = MagicMock(pid=1, tid=1, ts=2000, end_ns=2010)
+        event.name = "Op"
+        late_node = TorchOpNode(event, root_node)
+        root_node.add_child_node(late_node)
+        self.assertEqual(late_node, root_node.match_child_node(2005))
+
+    def test_tree_columns_are_cached(self):
+        root_node = TorchOpNode()
+        tree = root_node.tree
+        start = tree.start
+        self.assertIs(start, tree.start)
+        self.assertFalse(start.flags.writeable)
+        event = MagicMock(pid=1, tid=1, ts=7, end_ns=9)
+        event.name = "Op"
+        TorchOpNode(event, root_node)
+        self.assertEqual([0, 7], tree.start.tolist())
+
+    def test_node_list(self):
+        nodes = self.root_node.tree.nodes
+        self.assertEqual(4, len(nodes))
+        self.assertEqual(self.root_node, nodes[0])
+        self.assertEqual([self.level1_node2, self.level2_node], list(nodes[2:]))
+        self.assertEqual(self.level1_node2, nodes[-1].parent_node)
+        self.assertEqual(self.level2_node, nodes[1:][-1])
+        self.assertNotEqual(self.level1_node1, self.level1_node2)
+        self.assertEqual({self.level2_node: 1}, {nodes[3]: 1})
+
 
 if __name__ == "__main__":
     run_tests()
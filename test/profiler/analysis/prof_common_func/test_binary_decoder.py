@@ -0,0 +1,57 @@
+import struct
+
+from torch_npu.profiler.analysis.prof_bean._python_tracer_func_bean import PythonTracerFuncBean, PythonTracerFuncEnum
+from torch_npu.profiler.analysis.prof_common_func._binary_decoder import BinaryDecoder
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestBinaryDecoder(TestCase):
+
+    def setUp(self):
+        self.records = [(100, 1, 10, 7, 0), (200, 2, 10, 8, 1), (300, 1, 10, 9, 2)]
+        self.encoded_data = b"".join(struct.pack("<4QB", *record) for record in self.records)
+        # trailing incomplete record must be ignored
+        self.encoded_data += b"\x00" * 5
+
+    def test_decode(self):
+        beans = BinaryDecoder.decode(self.encoded_data, PythonTracerFuncBean, 33)
+        self.assertEqual(3, len(beans))
+        self.assertEqual(200, beans[1].start_ns)
+
+    def test_iter_decode(self):
+        chunks = list(BinaryDecoder.iter_decode(self.encoded_data, PythonTracerFuncBean, 33, chunk_size=2))
+        self.assertEqual([2, 1], [len(chunk) for chunk in chunks])
+        self.assertEqual(300, chunks[1][0].start_ns)
+
+    def test_decode_columnar(self):
+        records = BinaryDecoder.decode_columnar(self.encoded_data, PythonTracerFuncBean, 33,
+                                                PythonTracerFuncBean.CONSTANT_STRUCT, PythonTracerFuncEnum)
+        self.assertEqual(3, len(records))
+        self.assertEqual([100, 200, 300], records.column("start_ns").tolist())
+        self.assertEqual([1, 2, 1], records.column("thread_id").tolist())
+        self.assertEqual([0, 1, 2], records.column("trace_tag").tolist())
+        bean = records[2]
+        self.assertEqual(300, bean.start_ns)
+        self.assertEqual(9, bean.key)
+        selected = records.select(records.column("thread_id") == 1)
+        self.assertEqual([100, 300], [bean.start_ns for bean in selected])
+
+    def test_decode_columnar_empty(self):
+        records = BinaryDecoder.decode_columnar(b"", PythonTracerFuncBean, 33,
+                                                PythonTracerFuncBean.CONSTANT_STRUCT, PythonTracerFuncEnum)
+        self.assertFalse(records)
+        self.assertEqual([], records.column("start_ns").tolist())
+        with self.assertRaises(TypeError):
+            BinaryDecoder.decode_columnar("", PythonTracerFuncBean, 33,
+                                          PythonTracerFuncBean.CONSTANT_STRUCT, PythonTracerFuncEnum)
+
+    def test_struct_format_to_dtype(self):
+        dtype = BinaryDecoder.struct_format_to_dtype("<3q4QB?")
+        self.assertEqual(58, dtype.itemsize)
+        self.assertEqual(9, len(dtype.names))
+        with self.assertRaises(ValueError):
+            BinaryDecoder.struct_format_to_dtype("<2s")
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,136 @@
+import os
+import shutil
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from torch_npu.profiler.analysis.prof_common_func._cann_package_manager import CannPackageManager
+from torch_npu.profiler.analysis.prof_common_func._checkpoint_manager import CheckpointManager
+from torch_npu.profiler.analysis.prof_common_func._output_recorder import OutputRecorder
+from torch_npu.profiler.analysis.prof_common_func._task_manager import TaskInfo, TaskStatus
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestCheckpointManager(TestCase):
+    CONTEXT = {"analysis_type": "tensorboard_trace_handler"}
+    EXPORT_TYPES = {"pre": ["text"], "tree": ["text"], "view": ["text"], "export": ["text"]}
+
+    def setUp(self):
+        self.profiler_path = os.path.realpath("./test_checkpoint_manager")
+        self.output_path = os.path.join(self.profiler_path, "ASCEND_PROFILER_OUTPUT")
+        os.makedirs(os.path.join(self.profiler_path, "FRAMEWORK"))
+        os.makedirs(self.output_path)
+        self.raw_file = os.path.join(self.profiler_path, "FRAMEWORK", "torch.op_range")
+        self._write(self.raw_file, "raw")
+        self.tasks = [SimpleNamespace(name="pre", deps=[]), SimpleNamespace(name="tree", deps=[]),
+                      SimpleNamespace(name="view", deps=["pre", "tree"]), SimpleNamespace(name="export", deps=[])]
+
+    def tearDown(self):
+        shutil.rmtree(self.profiler_path)
+
+    @classmethod
+    def _write(cls, file_path: str, content: str):
+        with open(file_path, "w") as file:
+            file.write(content)
+        OutputRecorder.record(file_path)
+
+    def _run_task(self, task_infos: dict, name: str, func: callable, has_output: bool = False):
+        time.sleep(0.02)
+        task_info = TaskInfo(SimpleNamespace(name=name, deps=[]))
+        task_info.start_time = time.time_ns()
+        OutputRecorder.start()
+        func()
+        task_info.output_files = OutputRecorder.stop()
+        task_info.end_time = time.time_ns()
+        task_info.status = TaskStatus.Succeed
+        task_info.has_output = has_output
+        task_infos[name] = task_info
+
+    def _analyse(self, rerun_tasks: set, enabled: bool = True):
+        checkpoint = CheckpointManager(self.profiler_path, self.output_path, self.CONTEXT, enabled)
+        skipped_tasks = checkpoint.get_skipped_tasks(self.tasks, self.EXPORT_TYPES)
+        task_infos = {}
+        temp_file = os.path.join(self.output_path, "trace_view.json.tmp")
+        if "pre" not in skipped_tasks:
+            self._run_task(task_infos, "pre", lambda: self._write(temp_file, "["))
+        if "tree" not in skipped_tasks:
+            self._run_task(task_infos, "tree", lambda: None, has_output=True)
+        if "view" not in skipped_tasks:
+            def run_view():
+                with open(temp_file, "a") as file:
+                    file.write("]")
+                os.rename(temp_file, os.path.join(self.output_path, "trace_view.json"))
+                OutputRecorder.record(os.path.join(self.output_path, "trace_view.json"))
+                self._write(os.path.join(self.output_path, "operator_details.csv"), "Name")
+            self._run_task(task_infos, "view", run_view)
+        if "export" not in skipped_tasks:
+            self._run_task(task_infos, "export", lambda: self._write(os.path.join(self.profiler_path, "msprof.db"), ""))
+        checkpoint.update(task_infos)
+        checkpoint.save()
+        self.assertEqual(rerun_tasks, {task.name for task in self.tasks} - skipped_tasks)
+        return checkpoint
+
+    def test_skip_unchanged_tasks(self):
+        self.assertFalse(self._analyse({"pre", "tree", "view", "export"}).is_valid)
+        self.assertTrue(self._analyse(set()).is_valid)
+
+    def test_rerun_task_with_missing_output_and_its_deps(self):
+        self._analyse({"pre", "tree", "view", "export"})
+        os.remove(os.path.join(self.output_path, "operator_details.csv"))
+        # tree returns data to view and the file of pre was consumed by view, export is kept
+        self._analyse({"pre", "tree", "view"})
+        self._analyse(set())
+
+    def test_rerun_all_tasks_on_input_change(self):
+        self._analyse({"pre", "tree", "view", "export"})
+        self._write(self.raw_file, "new raw data")
+        self._analyse({"pre", "tree", "view", "export"})
+
+    def test_rerun_task_on_export_type_change(self):
+        self._analyse({"pre", "tree", "view", "export"})
+        self.EXPORT_TYPES = dict(self.EXPORT_TYPES, export=["db", "text"])
+        self._analyse({"export"})
+
+    def test_rerun_all_tasks_on_code_change_or_when_disabled(self):
+        self._analyse({"pre", "tree", "view", "export"})
+        self.assertFalse(self._analyse({"pre", "tree", "view", "export"}, enabled=False).is_valid)
+        self._analyse(set())
+        code_digest = CheckpointManager._get_code_digest()
+        try:
+            CheckpointManager._code_digest = "parser fixed"
+            self._analyse({"pre", "tree", "view", "export"})
+        finally:
+            CheckpointManager._code_digest = code_digest
+
+    def test_rerun_msprof_tasks_on_toolkit_change(self):
+        with mock.patch.object(CannPackageManager, "TOOLKIT_FINGERPRINT", "cann_1"):
+            self._analyse({"pre", "tree", "view", "export"})
+            self._analyse(set())
+        with mock.patch.object(CannPackageManager, "TOOLKIT_FINGERPRINT", "cann_2"):
+            checkpoint = CheckpointManager(self.profiler_path, self.output_path, self.CONTEXT)
+            tasks = self.tasks[:2] + [SimpleNamespace(name="export", deps=[]),
+                                      SimpleNamespace(name="view", deps=["pre", "tree", "export"])]
+            # the tasks using the output of msprof run again, together with what they need
+            self.assertEqual({"pre", "tree", "view", "export"},
+                             {task.name for task in tasks} - checkpoint.get_skipped_tasks(tasks, self.EXPORT_TYPES))
+            self._analyse({"export"})
+
+    def test_outputs_are_the_files_recorded_by_each_task(self):
+        checkpoint = CheckpointManager(self.profiler_path, self.output_path, self.CONTEXT)
+        checkpoint.get_skipped_tasks(self.tasks, self.EXPORT_TYPES)
+        task_infos = {}
+        # a file written concurrently by another writer is not an output of the task
+        self._run_task(task_infos, "pre", lambda: (self._write(os.path.join(self.output_path, "a.csv"), "a"),
+                                                   open(os.path.join(self.output_path, "b.csv"), "w").close()))
+        self._run_task(task_infos, "tree", lambda: None)
+        checkpoint.update(task_infos)
+        checkpoint.save()
+        records = {record["name"]: record for record in checkpoint._records.values()}
+        self.assertEqual([os.path.join(self.output_path, "a.csv")], list(records["pre"]["outputs"]))
+        # a task that neither wrote a file nor returned data is run again
+        checkpoint = CheckpointManager(self.profiler_path, self.output_path, self.CONTEXT)
+        self.assertEqual({"pre"}, checkpoint.get_skipped_tasks(self.tasks[:2], self.EXPORT_TYPES))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,92 @@
+import os
+import shutil
+from unittest import mock
+
+import numpy as np
+
+from torch_npu.profiler.analysis.prof_common_func._columnar_manager import ColumnarManager
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestColumnarManager(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = "./test_columnar_manager"
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.headers = ["Name", "Duration(us)", "Count", "Start Time(us)"]
+        self.data = [
+            ["MatMul", "12.5", 3, "1700000000123456.789\t"],
+            ["Add", "1.25", 1, "1700000000123460.001\t"],
+            ["MatMul", "30.0", 2, "1700000000123470.002\t"],
+            ["Cast", "0.5", 5, "1700000000123480.003\t"],
+            ["Add", "2.0", 4, "1700000000123490.004\t"],
+        ]
+        self.pyarrow = ColumnarManager._pyarrow
+        ColumnarManager._pyarrow = ()
+
+    def tearDown(self):
+        ColumnarManager._pyarrow = self.pyarrow
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_to_array(self):
+        self.assertEqual(np.int64, ColumnarManager.to_array([1, 2, 3]).dtype)
+        self.assertEqual(np.int64, ColumnarManager.to_array(["1", " 2"]).dtype)
+        floats = ColumnarManager.to_array([1, None, 2.5])
+        self.assertEqual(np.float64, floats.dtype)
+        self.assertTrue(np.isnan(floats[1]))
+        self.assertEqual(np.float64, ColumnarManager.to_array(["1.5", "2"]).dtype)
+        # more significant digits than float64 keeps exactly, left as text
+        self.assertEqual("U", ColumnarManager.to_array(["1700000000123456.789"]).dtype.kind)
+        self.assertEqual("U", ColumnarManager.to_array(["N/A", 1]).dtype.kind)
+        self.assertEqual("U", ColumnarManager.to_array([True, False]).dtype.kind)
+
+    def test_write_and_read_all(self):
+        ColumnarManager.create_columnar_file(self.tmp_dir, self.data, "kernel_details", self.headers,
+                                             row_group_size=2)
+        file_path = ColumnarManager.get_columnar_file_path(self.tmp_dir, "kernel_details")
+        self.assertTrue(file_path.endswith(ColumnarManager.NUMPY_SUFFIX))
+        table = ColumnarManager.read_columnar_file(file_path)
+        self.assertEqual(["Name", "Duration(us)", "Count", "Start Time(ns)"], list(table.keys()))
+        self.assertEqual([12.5, 1.25, 30.0, 0.5, 2.0], table.get("Duration(us)").tolist())
+        self.assertEqual([3, 1, 2, 5, 4], table.get("Count").tolist())
+        # timestamps too precise for float64 are kept exactly as int64 nanoseconds
+        self.assertEqual(np.int64, table.get("Start Time(ns)").dtype)
+        self.assertEqual(1700000000123456789, table.get("Start Time(ns)")[0])
+
+    def test_time_range_filter(self):
+        data = [["Add", "999999999999999.5"], ["Cast", "1000000000000000.25"], ["MatMul", "1000000000000001"]]
+        ColumnarManager.create_columnar_file(self.tmp_dir, data, "kernel_details", ["Name", "Start Time(us)"],
+                                             row_group_size=1)
+        file_path = ColumnarManager.get_columnar_file_path(self.tmp_dir, "kernel_details")
+        # compared as text, "999..." would sort after "1000..."
+        table = ColumnarManager.read_columnar_file(file_path, columns=["Name"],
+                                                   filters=[("Start Time(ns)", ">=", 1000000000000000000)])
+        self.assertEqual(["Cast", "MatMul"], table.get("Name").tolist())
+        self.assertEqual("U", ColumnarManager.rows_to_columns([["1.2345"], ["N/A"]], ["Start Time(us)"]).get(
+            "Start Time(us)").dtype.kind)
+
+    def test_projection_and_predicate_pushdown(self):
+        ColumnarManager.create_columnar_file(self.tmp_dir, self.data, "kernel_details", self.headers,
+                                             row_group_size=2)
+        file_path = ColumnarManager.get_columnar_file_path(self.tmp_dir, "kernel_details")
+        with mock.patch("numpy.load", wraps=np.load) as load:
+            table = ColumnarManager.read_columnar_file(file_path, columns=["Name"], filters=[("Count", ">=", 4)])
+        self.assertEqual(["Name"], list(table.keys()))
+        self.assertEqual(["Cast", "Add"], table.get("Name").tolist())
+        # the first row group (counts 3 and 1) is skipped by its statistics
+        self.assertEqual(4, load.call_count)
+        table = ColumnarManager.read_columnar_file(file_path, columns=["Count"],
+                                                   filters=[("Name", "in", ["Add"]), ("Count", "!=", 1)])
+        self.assertEqual([4], table.get("Count").tolist())
+        table = ColumnarManager.read_columnar_file(file_path, columns=["Count"], filters=[("Count", ">", 10)])
+        self.assertEqual(0, len(table.get("Count")))
+        with self.assertRaises(ValueError):
+            ColumnarManager.read_columnar_file(file_path, filters=[("Count", "like", 1)])
+
+    def test_no_file_without_data(self):
+        ColumnarManager.create_columnar_file(self.tmp_dir, [], "empty", self.headers)
+        self.assertEqual("", ColumnarManager.get_columnar_file_path(self.tmp_dir, "empty"))
+
+
+if __name__ == "__main__":
+    run_tests()
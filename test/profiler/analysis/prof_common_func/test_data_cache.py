@@ -0,0 +1,79 @@
+import os
+import shutil
+import stat
+
+from torch_npu.profiler.analysis.prof_common_func._data_cache import DataCache
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestDataCache(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmp_dir = "./tmp_data_cache_dir"
+        os.makedirs(cls.tmp_dir)
+        cls.file_path = os.path.join(cls.tmp_dir, "torch.op_mark")
+        cls.write_file(b"something")
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.tmp_dir)
+
+    @classmethod
+    def write_file(cls, data: bytes):
+        with os.fdopen(os.open(cls.file_path,
+                               os.O_WRONLY | os.O_CREAT | os.O_TRUNC, stat.S_IWUSR | stat.S_IRUSR), 'wb') as fp:
+            fp.write(data)
+
+    def setUp(self):
+        DataCache().invalidate()
+        self.load_count = 0
+
+    def loader(self):
+        self.load_count += 1
+        return [self.load_count]
+
+    def test_get_hit_and_invalidate(self):
+        self.assertEqual([1], DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader))
+        self.assertEqual([1], DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader))
+        self.assertEqual(1, self.load_count)
+        DataCache().get(self.tmp_dir, 3, [self.file_path], self.loader)
+        self.assertEqual(2, self.load_count)
+        DataCache().invalidate(self.tmp_dir, 2)
+        self.assertEqual([3], DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader))
+        self.assertEqual([2], DataCache().get(self.tmp_dir, 3, [self.file_path], self.loader))
+
+    def test_get_when_file_changed(self):
+        DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader)
+        self.write_file(b"something else")
+        self.assertEqual([2], DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader))
+
+    def test_max_size(self):
+        max_size = DataCache().max_size
+        try:
+            DataCache().max_size = os.path.getsize(self.file_path)
+            DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader, size_factor=1)
+            DataCache().get(self.tmp_dir, 3, [self.file_path], self.loader, size_factor=1)
+            DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader, size_factor=1)
+            self.assertEqual(3, self.load_count)
+        finally:
+            DataCache().max_size = max_size
+
+    def test_size_factor(self):
+        max_size = DataCache().max_size
+        try:
+            # the decoded data is estimated 4 times larger than the file, it does not fit in the cache
+            DataCache().max_size = os.path.getsize(self.file_path) * 2
+            DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader, size_factor=4)
+            DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader, size_factor=4)
+            self.assertEqual(2, self.load_count)
+            DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader, size_factor=2)
+            DataCache().get(self.tmp_dir, 2, [self.file_path], self.loader, size_factor=2)
+            self.assertEqual(3, self.load_count)
+        finally:
+            DataCache().max_size = max_size
+
+
+if __name__ == "__main__":
+    run_tests()
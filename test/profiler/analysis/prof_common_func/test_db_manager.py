@@ -0,0 +1,59 @@
+import os
+import shutil
+import sqlite3
+
+from torch_npu.profiler.analysis.prof_common_func._db_manager import BasicDb, DbManager
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestDbManager(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = "./test_db_manager"
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.db = BasicDb()
+        self.db.init(os.path.join(self.tmp_dir, "test.db"))
+        self.assertTrue(self.db.create_connect_db())
+        self.db.create_table_with_headers("KERNEL", [("id", "INTEGER"), ("name", "TEXT"), ("dur", "INTEGER")])
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_bulk_load_pragmas(self):
+        self.assertEqual("memory", self.db.fetch_one_data("PRAGMA journal_mode")[0])
+        self.assertEqual(1, self.db.fetch_one_data("PRAGMA synchronous")[0])
+
+    def test_failed_transaction_rolled_back(self):
+        self.db.insert_data_into_table("KERNEL", [(1, "a", 10)])
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.db.conn:
+                self.db.conn.execute("INSERT INTO KERNEL VALUES (2, 'b', 20)")
+                self.db.conn.execute("INSERT INTO NOT_EXIST VALUES (3)")
+        self.assertEqual(1, self.db.fetch_one_data("SELECT count(*) FROM KERNEL")[0])
+
+    def test_insert_from_generator(self):
+        rows = ((index, f"kernel_{index % 3}", index * 10) for index in range(DbManager.INSERT_SIZE + 5))
+        self.db.insert_data_into_table("KERNEL", rows)
+        self.assertEqual(DbManager.INSERT_SIZE + 5, self.db.fetch_one_data("SELECT count(*) FROM KERNEL")[0])
+        self.db.insert_data_into_table("KERNEL", iter([]))
+        self.assertEqual(DbManager.INSERT_SIZE + 5, self.db.fetch_one_data("SELECT count(*) FROM KERNEL")[0])
+
+    def test_failed_insert_raises(self):
+        with self.assertRaises(RuntimeError):
+            self.db.insert_data_into_table("KERNEL", [(1, "a")])
+
+    def test_deferred_index(self):
+        db_path = self.db.get_db_path()
+        self.db.create_index("KERNEL", "KERNEL_NAME_INDEX", ["name"])
+        sql = "SELECT count(*) FROM sqlite_master WHERE type='index' AND name='KERNEL_NAME_INDEX'"
+        self.assertEqual(0, self.db.fetch_one_data(sql)[0])
+        self.db.insert_data_into_table("KERNEL", [(1, "a", 1), (2, "b", 2)])
+        self.db.close()
+        conn, curs = DbManager.create_connect_db(db_path)
+        self.assertEqual(1, DbManager.fetch_one_data(curs, sql)[0])
+        DbManager.destroy_db_connect(conn, curs)
+
+
+if __name__ == "__main__":
+    run_tests()
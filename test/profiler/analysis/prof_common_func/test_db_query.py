@@ -0,0 +1,65 @@
+import os
+import shutil
+
+from torch_npu.profiler.analysis.prof_common_func._db_manager import BasicDb
+from torch_npu.profiler.analysis.prof_common_func._db_query import ProfilerDbQuery
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestProfilerDbQuery(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = os.path.realpath("./test_db_query")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.db_path = os.path.join(self.tmp_dir, "ascend_pytorch_profiler.db")
+        db = BasicDb()
+        db.init(self.db_path)
+        self.assertTrue(db.create_connect_db())
+        db.create_table_with_headers("TASK", [("startNs", "INTEGER"), ("endNs", "INTEGER"), ("deviceId", "INTEGER"),
+                                              ("connectionId", "INTEGER"), ("globalTaskId", "INTEGER"),
+                                              ("streamId", "INTEGER"), ("taskId", "INTEGER")])
+        db.insert_data_into_table("TASK", [(index * 10, index * 10 + 5, 0, index, index, index % 2, index)
+                                           for index in range(100)])
+        db.create_table_with_headers("STEP_SUMMARY", [("step", "INTEGER"), ("startNs", "INTEGER"),
+                                                      ("endNs", "INTEGER"), ("taskCount", "INTEGER")])
+        db.insert_data_into_table("STEP_SUMMARY", [(1, 0, 500, 50), (2, 500, None, 50)])
+        db.create_table_with_headers("STEP_OP_TYPE_SUMMARY", [("step", "INTEGER"), ("opType", "INTEGER"),
+                                                              ("count", "INTEGER")])
+        db.insert_data_into_table("STEP_OP_TYPE_SUMMARY", [(1, 7, 50), (2, 7, 50)])
+        db.create_table_with_headers("STRING_IDS", [("id", "INTEGER"), ("value", "TEXT")])
+        db.insert_data_into_table("STRING_IDS", [(7, "MatMul")])
+        db.create_index("TASK", "TASK_STREAM_START_INDEX", ["streamId", "startNs"])
+        db.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_get_step_tasks(self):
+        with ProfilerDbQuery(self.db_path) as query:
+            self.assertEqual((0, 500), query.get_step_range(1))
+            self.assertEqual((500, float("inf")), query.get_step_range(2))
+            tasks = query.get_step_tasks(1, stream_id=1, columns=["startNs", "streamId"])
+            self.assertEqual([(index * 10, 1) for index in range(1, 50, 2)], tasks)
+            self.assertEqual(50, len(query.get_step_tasks(2)))
+            with self.assertRaises(ValueError):
+                query.get_step_range(3)
+
+    def test_get_tasks_uses_index(self):
+        with ProfilerDbQuery(self.db_path) as query:
+            self.assertEqual([(100,), (120,)], query.get_tasks(100, 140, stream_id=0, columns=["startNs"]))
+            plan = query._conn.execute("EXPLAIN QUERY PLAN SELECT startNs FROM TASK "
+                                       "WHERE streamId = ? AND startNs >= ? AND startNs < ?", (0, 100, 140)).fetchall()
+            self.assertIn("TASK_STREAM_START_INDEX", str(plan))
+            with self.assertRaises(ValueError):
+                query.get_tasks(0, 10, columns=["unknown"])
+
+    def test_get_step_op_type_summary(self):
+        with ProfilerDbQuery(self.db_path) as query:
+            self.assertEqual([{"step": 2, "opType": 7, "count": 50, "opTypeName": "MatMul"}],
+                             query.get_step_op_type_summary(2))
+            self.assertEqual(2, len(query.get_step_summary()))
+            self.assertEqual([], query.get_communication_ops(0, 100))
+
+
+if __name__ == "__main__":
+    run_tests()
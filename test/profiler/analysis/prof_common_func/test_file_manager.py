@@ -28,6 +28,15 @@ class TestFileManager(TestCase):
             fp.write("something")
         self.assertEqual("something", FileManager.file_read_all(test_file_path))
 
+    def test_file_mmap(self):
+        test_file_path = os.path.join(self.tmp_dir, "test_file.bin")
+        with os.fdopen(os.open(test_file_path,
+                               os.O_WRONLY | os.O_CREAT, stat.S_IWUSR | stat.S_IRUSR), 'wb') as fp:
+            fp.write(b"something")
+        with FileManager.file_mmap(test_file_path) as mapped_file:
+            self.assertEqual(b"some", mapped_file[0:4])
+            self.assertEqual(9, len(mapped_file))
+
     def test_read_csv_file(self):
         dir_path = self.tmp_dir
         test_file1 = os.path.join(self.tmp_dir, "test_file1.csv")
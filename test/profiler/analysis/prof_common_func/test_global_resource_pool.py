@@ -0,0 +1,68 @@
+import multiprocessing
+
+from torch_npu.profiler.analysis.prof_common_func._global_resource_pool import GlobalResourcePool
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestGlobalResourcePool(TestCase):
+
+    def setUp(self):
+        self.resource_pool = GlobalResourcePool()
+        self.resource_pool.init_pool(2, 100)
+
+    def tearDown(self):
+        self.resource_pool.close_pool()
+
+    def test_acquire_and_release(self):
+        self.assertTrue(self.resource_pool.enabled)
+        self.assertEqual(70, self.resource_pool.try_acquire(70))
+        self.assertEqual(-1, self.resource_pool.try_acquire(40))
+        self.assertEqual(30, self.resource_pool.try_acquire(30))
+        # no slot left
+        self.assertEqual(-1, self.resource_pool.try_acquire(0))
+        self.resource_pool.release(70)
+        self.assertEqual(40, self.resource_pool.try_acquire(40))
+
+    def test_estimate_over_budget_is_clamped(self):
+        self.assertEqual(100, self.resource_pool.try_acquire(1000))
+        self.assertEqual(-1, self.resource_pool.try_acquire(1))
+        self.resource_pool.release(100)
+        self.assertEqual(0, self.resource_pool.try_acquire(-5))
+
+    def test_progress_shared_with_forked_process(self):
+        self.resource_pool.add_tasks(3)
+        process = multiprocessing.get_context("fork").Process(target=self._finish_tasks, args=(2,))
+        process.start()
+        process.join()
+        self.assertEqual((2, 3), self.resource_pool.get_progress())
+
+    def test_reclaim_slots_of_dead_holder(self):
+        process = multiprocessing.get_context("fork").Process(target=self._acquire, args=(60,))
+        process.start()
+        process.join()
+        # the forked process exited holding a slot and 60 of the memory, they are reclaimed when short
+        self.assertEqual(100, self.resource_pool.try_acquire(100))
+        self.assertEqual(-1, self.resource_pool.try_acquire(1))
+        self.resource_pool.release(100)
+        self.assertEqual(40, self.resource_pool.try_acquire(40))
+        self.assertEqual(60, self.resource_pool.try_acquire(60))
+
+    def test_close_pool(self):
+        self.resource_pool.close_pool()
+        self.assertFalse(self.resource_pool.enabled)
+
+    def test_get_available_memory(self):
+        self.assertGreaterEqual(GlobalResourcePool().get_available_memory(), 0)
+
+    @classmethod
+    def _acquire(cls, memory: int):
+        GlobalResourcePool().try_acquire(memory)
+
+    @classmethod
+    def _finish_tasks(cls, task_num: int):
+        for _ in range(task_num):
+            GlobalResourcePool().finish_task()
+
+
+if __name__ == "__main__":
+    run_tests()
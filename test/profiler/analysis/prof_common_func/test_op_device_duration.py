@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+
+from torch_npu.profiler.analysis.prof_common_func._constant import Constant
+from torch_npu.profiler.analysis.prof_common_func._op_device_duration import OpDeviceDuration
+from torch_npu.profiler.analysis.prof_common_func._tree_builder import TreeBuilder
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestOpDeviceDuration(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Step(10, 100) -> [MatMul(20, 30), MatMul(50, 80) -> Add(60, 70)]
+        cls.event_list = []
+        for name, ts, end_ns in (("ProfilerStep#1", 10, 100), ("MatMul", 20, 30), ("MatMul", 50, 80),
+                                 ("Add", 60, 70)):
+            event = MagicMock()
+            event.pid = 999
+            event.name = name
+            event.args = {Constant.INPUT_SHAPES: "[2, 2048]", Constant.CALL_STACK: "call stack"}
+            event.ts = ts
+            event.end_ns = end_ns
+            event.dur = end_ns - ts
+            event.is_torch_op = True
+            cls.event_list.append(event)
+
+    @classmethod
+    def _create_kernel(cls, dur: str, is_ai_core: bool):
+        kernel = MagicMock()
+        kernel.dur = dur
+        kernel.is_ai_core = is_ai_core
+        return kernel
+
+    def test_durations(self):
+        nodes = TreeBuilder.build_tree(self.event_list, [])
+        kernel_dict = {
+            25: [self._create_kernel("1.5", True)],
+            40: [self._create_kernel("2", False)],
+            55: [self._create_kernel("4", True), self._create_kernel("8", False)],
+            65: [self._create_kernel("16", True)],
+            90: []
+        }
+        TreeBuilder.update_tree_node_info_in_bulk(kernel_dict.keys(), nodes[1:])
+        device_dur = OpDeviceDuration(nodes[1:], kernel_dict)
+        self.assertEqual([2.0, 1.5, 12.0, 16.0], device_dur.self_dur.tolist())
+        self.assertEqual([31.5, 1.5, 28.0, 16.0], device_dur.total_dur.tolist())
+        self.assertEqual([0.0, 1.5, 4.0, 16.0], device_dur.self_dur_with_ai_core.tolist())
+        self.assertEqual([21.5, 1.5, 20.0, 16.0], device_dur.total_dur_with_ai_core.tolist())
+
+    def test_durations_match_corr_id_total(self):
+        nodes = TreeBuilder.build_tree(self.event_list, [])
+        kernel_dict = {ts: [self._create_kernel(str(ts), ts % 2 == 0)] for ts in range(15, 95, 5)}
+        TreeBuilder.update_tree_node_info_in_bulk(kernel_dict.keys(), nodes[1:])
+        device_dur = OpDeviceDuration(nodes[1:], kernel_dict)
+        for index, node in enumerate(nodes[1:]):
+            expect = sum(float(kernel.dur) for corr_id in node.corr_id_total for kernel in kernel_dict.get(corr_id))
+            self.assertEqual(expect, device_dur.total_dur[index])
+
+    def test_empty_nodes(self):
+        device_dur = OpDeviceDuration([], {})
+        self.assertEqual([], device_dur.total_dur.tolist())
+
+
+if __name__ == "__main__":
+    run_tests()
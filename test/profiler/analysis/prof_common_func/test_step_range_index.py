@@ -0,0 +1,67 @@
+import random
+
+from torch_npu.profiler.analysis.prof_common_func._step_range_index import StepRangeIndex
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestStepRangeIndex(TestCase):
+
+    def setUp(self):
+        # steps are given out of order and with a gap between step 2 and 3
+        self.step_ranges = [("2", 100, 200), ("1", 0, 100), ("3", 250, 400)]
+
+    def test_half_open_ranges(self):
+        index = StepRangeIndex(self.step_ranges)
+        self.assertEqual(["1", "2", "3"], index.step_ids)
+        ts_list = [-1, 0, 99, 100, 199, 200, 249, 250, 399, 400]
+        expect = [None, "1", "1", "2", "2", None, None, "3", "3", None]
+        self.assertEqual(expect, index.get_step_ids(ts_list))
+        self.assertEqual(expect, [index.get_step_id(ts) for ts in ts_list])
+
+    def test_inclusive_end_keeps_the_first_step_on_a_boundary(self):
+        index = StepRangeIndex(self.step_ranges, inclusive_end=True)
+        ts_list = [100, 200, 201, 400, 401]
+        expect = ["1", "2", None, "3", None]
+        self.assertEqual(expect, index.get_step_ids(ts_list))
+        self.assertEqual(expect, [index.get_step_id(ts) for ts in ts_list])
+
+    def test_ns_timestamps_with_infinite_end(self):
+        start_ns = 1700000000000000001
+        index = StepRangeIndex([(None, start_ns, float("inf"))])
+        self.assertEqual([-1, 0, 0], index.get_positions([start_ns - 1, start_ns, start_ns + 10 ** 12]).tolist())
+        self.assertEqual(-1, index.get_position(start_ns - 1))
+        self.assertEqual(0, index.get_position(start_ns))
+
+    def test_empty_index(self):
+        index = StepRangeIndex([])
+        self.assertEqual(0, len(index))
+        self.assertEqual([None, None], index.get_step_ids([1, 2]))
+        self.assertIsNone(index.get_step_id(1))
+
+    def test_sum_by_step(self):
+        index = StepRangeIndex(self.step_ranges)
+        positions = index.get_positions([10, 150, 220, 300, 20])
+        self.assertEqual([15.0, 2.0, 4.0], index.sum_by_step(positions, [5, 2, 3, 4, 10]).tolist())
+
+    def test_same_as_linear_scan(self):
+        step_ranges = []
+        start = 0
+        for step in range(500):
+            end = start + random.randint(1, 1000)
+            step_ranges.append((str(step), start, end))
+            start = end + random.randint(0, 100)
+        ts_list = [random.randint(-10, start + 10) for _ in range(2000)]
+        for inclusive_end in (False, True):
+            expect = []
+            for ts in ts_list:
+                step_id = None
+                for step, step_start, step_end in step_ranges:
+                    if step_start <= ts < step_end or (inclusive_end and ts == step_end):
+                        step_id = step
+                        break
+                expect.append(step_id)
+            self.assertEqual(expect, StepRangeIndex(step_ranges, inclusive_end).get_step_ids(ts_list))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -5,6 +5,8 @@ import time
 import multiprocessing
 
 from torch_npu.profiler.analysis.prof_common_func._constant import Constant
+from torch_npu.profiler.analysis.prof_common_func._global_resource_pool import GlobalResourcePool
+from torch_npu.profiler.analysis.prof_common_func._output_recorder import OutputRecorder
 from torch_npu.profiler.analysis.prof_common_func._task_manager import (
     ConcurrentTasksManager, send_print_req_to_manager, send_result_to_manager,
     TaskMsgType, ConcurrentTask, ConcurrentMode, TaskStatus
@@ -66,6 +68,49 @@ class TaskSerial2(ConcurrentTask):
         return Constant.SUCCESS, "task_serial2_output"
 
 
+class TaskLargeOutput(ConcurrentTask):
+
+    def __init__(self, deps: list, mode: int):
+        self.name = "task_large_output"
+        super().__init__(self.name, deps, mode)
+
+    def run(self, user_input: dict):
+        return Constant.SUCCESS, list(range(Constant.SHM_OUTPUT_THRESHOLD // 4))
+
+
+class TaskCheckLargeInput(ConcurrentTask):
+
+    def __init__(self, deps: list, mode: int):
+        self.name = "task_check_large_input"
+        super().__init__(self.name, deps, mode)
+
+    def run(self, user_input: dict):
+        if user_input.get("task_large_output") != list(range(Constant.SHM_OUTPUT_THRESHOLD // 4)):
+            raise RuntimeError("Failed to get depend data!")
+        return Constant.SUCCESS, None
+
+
+class TaskRecordOutputFile(ConcurrentTask):
+
+    def __init__(self, name: str, mode: int):
+        super().__init__(name, [], mode)
+
+    def run(self, user_input: dict):
+        OutputRecorder.record(f"/tmp/{self.name}.csv")
+        return Constant.SUCCESS, None
+
+
+class TaskRecordOrder(ConcurrentTask):
+    run_order = []
+
+    def __init__(self, name: str, deps: list, mode: int):
+        super().__init__(name, deps, mode)
+
+    def run(self, user_input: dict):
+        TaskRecordOrder.run_order.append(self.name)
+        return Constant.SUCCESS, None
+
+
 class TestTaskManager(TestCase):
 
     def setUp(self):
@@ -140,6 +185,64 @@ class TestTaskManager(TestCase):
         self.assertEqual(TaskStatus.Succeed, task_infos.get("task_serial1").status)
         self.assertEqual(TaskStatus.Succeed, task_infos.get("task_serial2").status)
 
+    def test_large_output_through_shared_memory(self):
+        manager = ConcurrentTasksManager()
+        manager.add_task(TaskLargeOutput([], ConcurrentMode.SUB_PROCESS))
+        manager.add_task(TaskCheckLargeInput(["task_large_output"], ConcurrentMode.PTHREAD))
+        manager.run()
+        task_infos = manager.task_infos
+        self.assertEqual(TaskStatus.Succeed, task_infos.get("task_large_output").status)
+        self.assertEqual(TaskStatus.Succeed, task_infos.get("task_check_large_input").status)
+
+    def test_output_files_of_each_task(self):
+        manager = ConcurrentTasksManager()
+        modes = {"sub_process": ConcurrentMode.SUB_PROCESS, "sub_thread": ConcurrentMode.PTHREAD,
+                 "main_process": ConcurrentMode.MAIN_PROCESS}
+        for name, mode in modes.items():
+            manager.add_task(TaskRecordOutputFile(name, mode))
+        manager.run()
+        for name in modes:
+            self.assertEqual([f"/tmp/{name}.csv"], manager.task_infos.get(name).output_files)
+
+    def test_default_concurrent_num(self):
+        manager = ConcurrentTasksManager()
+        self.assertEqual(ConcurrentTasksManager.get_available_cpu_num(), manager.max_concurrent_num)
+        self.assertEqual(4, ConcurrentTasksManager(max_concurrent_num=4).max_concurrent_num)
+
+    def test_critical_path_first(self):
+        TaskRecordOrder.run_order = []
+        manager = ConcurrentTasksManager()
+        manager.add_task(TaskRecordOrder("leaf", [], ConcurrentMode.MAIN_PROCESS))
+        manager.add_task(TaskRecordOrder("head", [], ConcurrentMode.MAIN_PROCESS))
+        manager.add_task(TaskRecordOrder("middle", ["head"], ConcurrentMode.MAIN_PROCESS))
+        manager.add_task(TaskRecordOrder("tail", ["middle"], ConcurrentMode.MAIN_PROCESS))
+        manager.run()
+        # without priority "leaf" would run first as it was added first
+        self.assertEqual(["head", "leaf", "middle", "tail"], TaskRecordOrder.run_order)
+        self.assertTrue(all(info.status == TaskStatus.Succeed for info in manager.task_infos.values()))
+
+    def test_run_with_global_resource_pool(self):
+        resource_pool = GlobalResourcePool()
+        resource_pool.init_pool(1, 100)
+        try:
+            manager = ConcurrentTasksManager(resource_pool=resource_pool)
+            task_serial1 = TaskSerial1([], ConcurrentMode.SUB_PROCESS)
+            task_serial1.memory_estimate = 60
+            task_success = TaskSuccess([], ConcurrentMode.SUB_PROCESS)
+            task_success.memory_estimate = 1000
+            manager.add_task(task_serial1)
+            manager.add_task(task_success)
+            manager.run()
+            task_infos = manager.task_infos
+            self.assertEqual(TaskStatus.Succeed, task_infos.get("task_serial1").status)
+            self.assertEqual(TaskStatus.Succeed, task_infos.get("task_success").status)
+            self.assertEqual((2, 2), resource_pool.get_progress())
+            # all the resources are given back
+            self.assertEqual(100, resource_pool.try_acquire(1000))
+            self.assertEqual(-1, resource_pool.try_acquire(0))
+        finally:
+            resource_pool.close_pool()
+
     def __send_and_receive_msg(self, func, data):
         epoll = select.epoll()
         pr, pw = os.pipe()
@@ -1,6 +1,8 @@
 import struct
 
 from torch_npu.profiler.analysis.prof_bean._op_mark_bean import OpMarkBean
+from torch_npu.profiler.analysis.prof_bean._torch_op_bean import TorchOpBean
+from torch_npu.profiler.analysis.prof_common_func._constant import Constant
 from torch_npu.profiler.analysis.prof_common_func._tlv_decoder import TLVDecoder
 from torch_npu.testing.testcase import TestCase, run_tests
 
@@ -26,6 +28,39 @@ class TestTLVDecoder(TestCase):
         self.assertEqual(self.data_map.get("tid"), op_mark_bean.tid)
         self.assertEqual(self.data_map.get("pid"), op_mark_bean.pid)
 
+    def test_decode_lazy_fields(self):
+        constant_bytes = struct.pack("<3q4QB?", 10, 20, 3, 555, 444, 444, 0, 0, False)
+        fields = b""
+        for type_id, value in [(2, b"aten::add"), (4, b"[2, 2];[2, 2]"), (8, b"a.py(1);b.py(2)")]:
+            fields += struct.pack("<HI", type_id, len(value)) + value
+        record = constant_bytes + fields
+        encoded_data = struct.pack("<HI", 1, len(record)) + record
+        torch_op_list = TLVDecoder.decode(encoded_data * 2, TorchOpBean, 58)
+        self.assertEqual(2, len(torch_op_list))
+        torch_op = torch_op_list[1]
+        self.assertEqual("aten::add", torch_op.name)
+        self.assertEqual(3, torch_op.sequence_number)
+        self.assertEqual("a.py(1);\r\nb.py(2)", torch_op.call_stack)
+        self.assertEqual("[2, 2];\r\n[2, 2]", torch_op.args.get(Constant.INPUT_SHAPES))
+        self.assertIsNone(torch_op.inputs.get(Constant.INPUT_TENSORS))
+
+    def test_decode_releases_buffer(self):
+        all_bytes = bytearray(self.encoded_data * 2)
+        op_mark_list = TLVDecoder.decode(all_bytes, OpMarkBean, self.data_map.get("struct_size"))
+        # the beans hold copies of their records, no view of the buffer is left to block resizing it
+        all_bytes.clear()
+        self.assertEqual(f"Dequeue@{self.data_map.get('name')}", op_mark_list[1].name)
+
+    def test_iter_decode(self):
+        chunks = list(TLVDecoder.iter_decode(self.encoded_data * 5, OpMarkBean, 40, chunk_size=2))
+        self.assertEqual([2, 2, 1], [len(chunk) for chunk in chunks])
+        self.assertEqual(f"Dequeue@{self.data_map.get('name')}", chunks[2][0].name)
+
+    def test_tlv_list_decode(self):
+        fields = struct.pack("<HI", 1, 4) + b"test" + struct.pack("<HI", 3, 2) + b"ab"
+        self.assertEqual({1: "test", 3: "ab"}, TLVDecoder.tlv_list_decode(fields, is_field=True))
+        self.assertEqual([b"test", b"ab"], TLVDecoder.tlv_list_decode(fields))
+
 
 if __name__ == "__main__":
     run_tests()
@@ -0,0 +1,60 @@
+import gzip
+import json
+import os
+import shutil
+
+from torch_npu.profiler.analysis.prof_common_func._file_manager import FileManager
+from torch_npu.profiler.analysis.prof_common_func._trace_json_writer import TraceJsonWriter
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestTraceJsonWriter(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = "./test_trace_json_writer"
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.events = [{"name": f"op_{i}", "ph": "X", "ts": str(i), "dur": 1} for i in range(7)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_write_in_chunks(self):
+        output_path = os.path.join(self.tmp_dir, "trace_view.json")
+        with TraceJsonWriter(output_path, chunk_size=3) as writer:
+            writer.write(self.events[:4])
+            writer.write(iter(self.events[4:]))
+        with open(output_path, "r") as file:
+            self.assertEqual(self.events, json.load(file))
+
+    def test_append_to_prepared_trace(self):
+        output_path = os.path.join(self.tmp_dir, "trace_view.json.tmp")
+        FileManager.create_prepare_trace_json_by_path(output_path, self.events[:2])
+        with TraceJsonWriter(output_path, append=True, chunk_size=2) as writer:
+            writer.write(self.events[2:])
+        with open(output_path, "r") as file:
+            self.assertEqual(self.events, json.load(file))
+
+    def test_append_nothing_closes_array(self):
+        output_path = os.path.join(self.tmp_dir, "trace_view.json.tmp")
+        FileManager.create_prepare_trace_json_by_path(output_path, self.events[:2])
+        with TraceJsonWriter(output_path, append=True):
+            pass
+        with open(output_path, "r") as file:
+            self.assertEqual(self.events[:2], json.load(file))
+
+    def test_write_gzip(self):
+        output_path = os.path.join(self.tmp_dir, "memory.json.gz")
+        with TraceJsonWriter(output_path, compress=True, chunk_size=2) as writer:
+            writer.write(self.events)
+        with gzip.open(output_path, "rt") as file:
+            self.assertEqual(self.events, json.load(file))
+
+    def test_no_file_without_event(self):
+        output_path = os.path.join(self.tmp_dir, "empty.json")
+        with TraceJsonWriter(output_path) as writer:
+            writer.write([])
+        self.assertFalse(os.path.exists(output_path))
+
+
+if __name__ == "__main__":
+    run_tests()
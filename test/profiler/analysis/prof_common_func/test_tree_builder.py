@@ -65,7 +65,7 @@ class TestTreeBuilder(TestCase):
         for ts in ts_list:
             TreeBuilder.update_tree_node_info(ts, root_node)
         self.assertEqual(nodes[1].corr_id_self, [40])
-        self.assertEqual(nodes[1].corr_id_total, [25, 40, 65])
+        self.assertEqual(sorted(nodes[1].corr_id_total), [25, 40, 65])
         self.assertEqual(nodes[2].corr_id_self, [25])
         self.assertEqual(nodes[4].corr_id_self, [65])
 
@@ -79,6 +79,20 @@ class TestTreeBuilder(TestCase):
         match_op = TreeBuilder.match_self_torch_op(65, root_node)
         self.assertEqual(match_op, nodes[4])
 
+    def test_update_tree_node_info_in_bulk(self):
+        nodes = TreeBuilder.build_tree(self.event_list, [])
+        TreeBuilder.update_tree_node_info_in_bulk([65, 25, 40, 5], nodes[1:])
+        self.assertEqual(nodes[1].corr_id_self, [40])
+        self.assertEqual(sorted(nodes[1].corr_id_total), [25, 40, 65])
+        self.assertEqual(nodes[2].corr_id_self, [25])
+        self.assertEqual(nodes[3].corr_id_total, [65])
+        self.assertEqual(nodes[4].corr_id_self, [65])
+
+    def test_match_self_torch_op_in_bulk(self):
+        nodes = TreeBuilder.build_tree(self.event_list, [])
+        match_dict = TreeBuilder.match_self_torch_op_in_bulk([25, 40, 65, 100], nodes[1:])
+        self.assertEqual({25: nodes[2], 40: nodes[1], 65: nodes[4]}, match_dict)
+
 
 if __name__ == "__main__":
     run_tests()
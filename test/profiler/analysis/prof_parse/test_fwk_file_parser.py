@@ -0,0 +1,108 @@
+import os
+import shutil
+import stat
+import struct
+from unittest.mock import patch
+
+from torch_npu.profiler.analysis.prof_common_func._constant import Constant
+from torch_npu.profiler.analysis.prof_common_func._data_cache import DataCache
+from torch_npu.profiler.analysis.prof_common_func._file_tag import FileTag
+from torch_npu.profiler.analysis.prof_parse._fwk_cann_relation_parser import FwkCANNRelationParser
+from torch_npu.profiler.analysis.prof_parse._fwk_file_parser import FwkFileParser
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestFwkFileParser(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.profiler_path = "./tmp_fwk_file_parser_dir"
+        fwk_path = os.path.join(cls.profiler_path, "FRAMEWORK")
+        os.makedirs(fwk_path)
+        # (time_ns, category, corr_id, tid, name), category 0/1 enqueue start/end, 2/3 dequeue start/end
+        op_marks = [
+            (10, 0, 1, 100, b"Add"), (15, 1, 1, 100, b"Add"), (20, 2, 1, 200, b"Add"),
+            (12, 0, 2, 100, b"Mul"), (18, 1, 2, 100, b"Mul"), (30, 3, 1, 200, b"Add"),
+            (35, 2, 2, 200, b"Mul"), (50, 3, 2, 200, b"Mul"), (60, 3, 3, 200, b"Sub")
+        ]
+        data = b""
+        for time_ns, category, corr_id, tid, name in op_marks:
+            record = struct.pack("<q4Q", time_ns, category, corr_id, tid, 1) + struct.pack("<HI", 1, len(name)) + name
+            data += struct.pack("<HI", 1, len(record)) + record
+        file_path = os.path.join(fwk_path, "torch.op_mark")
+        with os.fdopen(os.open(file_path, os.O_WRONLY | os.O_CREAT, stat.S_IWUSR | stat.S_IRUSR), 'wb') as fp:
+            fp.write(data)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        DataCache().invalidate()
+        shutil.rmtree(cls.profiler_path)
+
+    @classmethod
+    def make_profiler_path(cls, name: str, files: dict) -> str:
+        profiler_path = os.path.join(cls.profiler_path, name)
+        fwk_path = os.path.join(profiler_path, "FRAMEWORK")
+        os.makedirs(fwk_path)
+        for file_name, data in files.items():
+            file_path = os.path.join(fwk_path, file_name)
+            with os.fdopen(os.open(file_path, os.O_WRONLY | os.O_CREAT, stat.S_IWUSR | stat.S_IRUSR), 'wb') as fp:
+                fp.write(data)
+        return profiler_path
+
+    def test_empty_columnar_files(self):
+        profiler_path = self.make_profiler_path("empty", {"torch.gc_record": b"", "torch.python_tracer_func": b""})
+        fwk_file_parser = FwkFileParser(profiler_path)
+        self.assertEqual([], fwk_file_parser.get_gc_record_db_data())
+        self.assertFalse(fwk_file_parser.get_file_data_by_tag(FileTag.PYTHON_TRACER_FUNC, columnar=True))
+        self.assertEqual([], fwk_file_parser.get_python_trace_data(set()))
+
+    def test_get_task_queue_data(self):
+        enqueue_data_list, dequeue_data_list = FwkFileParser(self.profiler_path).get_task_queue_data()
+        self.assertEqual([(10, 5, 1), (12, 6, 2)],
+                         [(enqueue.ts, enqueue.dur, enqueue.corr_id) for enqueue in enqueue_data_list])
+        self.assertEqual([(20, 10, 1), (35, 15, 2)],
+                         [(dequeue.ts, dequeue.dur, dequeue.corr_id) for dequeue in dequeue_data_list])
+        self.assertEqual(2, len(FwkFileParser(self.profiler_path).get_enqueue_data()))
+        self.assertEqual(2, len(FwkFileParser(self.profiler_path).get_dequeue_data()))
+
+    def test_cached_op_mark_unchanged(self):
+        DataCache().invalidate()
+        FwkFileParser(self.profiler_path).preload_shared_data()
+        _, dequeue_data_list = FwkFileParser(self.profiler_path).get_task_queue_data()
+        self.assertEqual([20, 35], [dequeue.ts for dequeue in dequeue_data_list])
+        # the matched marks are copies, the beans of OP_MARK shared with other readers keep no ts and dur
+        op_mark_data = FwkFileParser(self.profiler_path).get_file_data_by_tag(FileTag.OP_MARK)
+        self.assertEqual(9, len(op_mark_data))
+        self.assertTrue(all(op_mark.ts is None and op_mark.dur is None for op_mark in op_mark_data))
+
+    def test_oversized_columnar_file(self):
+        gc_records = [(1, 100, 200), (1, 300, 450)]
+        profiler_path = self.make_profiler_path(
+            "oversized", {"torch.gc_record": b"".join(struct.pack("<3Q", *record) for record in gc_records)})
+        DataCache().invalidate()
+        with patch.object(Constant, "MAX_FILE_SIZE", 0):
+            gc_events = FwkFileParser(profiler_path).get_file_data_by_tag(FileTag.GC_RECORD, columnar=True)
+        self.assertEqual([100, 300], gc_events.column("strat_ns").tolist())
+        self.assertEqual([200, 450], gc_events.column("end_ns").tolist())
+        self.assertEqual(300, gc_events[1].ts)
+
+    def test_iter_file_beans_of_large_file(self):
+        DataCache().invalidate()
+        with patch.object(Constant, "MAX_FILE_SIZE", 0):
+            beans = FwkFileParser(self.profiler_path).iter_file_beans_by_tag(FileTag.OP_MARK)
+            self.assertEqual([10, 15, 20, 12, 18, 30, 35, 50, 60], [op_mark.time_ns for op_mark in beans])
+        self.assertEqual([], list(FwkFileParser(self.profiler_path).iter_file_beans_by_tag(FileTag.TORCH_OP)))
+
+    def test_combine_kernel_dict_by_columns(self):
+        start_ns, end_ns, corr_ids = FwkFileParser(self.profiler_path).get_dequeue_columns()
+        self.assertEqual([20, 35], start_ns.tolist())
+        self.assertEqual([30, 50], end_ns.tolist())
+        acl_to_npu_dict = {25: ["kernel1"], 32: ["kernel2"], 40: ["kernel3"], 45: ["kernel4"]}
+        kernel_dict = FwkCANNRelationParser.combine_kernel_dict_by_columns(
+            acl_to_npu_dict, (start_ns, end_ns, corr_ids))
+        self.assertEqual({1: ["kernel1"], 2: ["kernel3", "kernel4"]}, kernel_dict)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,65 @@
+import csv
+import json
+import os
+import shutil
+
+from torch_npu.profiler.analysis.prof_view._cluster_view_parser import ClusterViewParser
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestClusterViewParser(TestCase):
+
+    def setUp(self):
+        self.input_path = os.path.realpath("./test_cluster_view_parser")
+        self.output_path = os.path.join(self.input_path, "cluster_analysis_output")
+        os.makedirs(self.output_path)
+        self.profiler_path_list = []
+        for rank_id, (computing, size, time) in enumerate([(100.0, 10, 2), (160.0, 30, 4)]):
+            profiler_path = os.path.join(self.input_path, f"rank{rank_id}_ascend_pt")
+            rank_output_path = os.path.join(profiler_path, "ASCEND_PROFILER_OUTPUT")
+            os.makedirs(rank_output_path)
+            self._write_json(os.path.join(profiler_path, f"profiler_info_{rank_id}.json"), {"rank_id": rank_id})
+            link_info = {"Transport Type": "HCCS", "Transit Size(MB)": size, "Transit Time(ms)": time,
+                         "Bandwidth(GB/s)": round(size / time, 4)}
+            matrix = {"step1": {"collective": {"allreduce@1": {"0-1": dict(link_info),
+                                                              f"{rank_id}-{rank_id}": dict(link_info)}}}}
+            self._write_json(os.path.join(rank_output_path, "communication_matrix.json"), matrix)
+            with open(os.path.join(rank_output_path, "step_trace_time.csv"), "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["Step", "Computing", "Communication(Not Overlapped)"])
+                writer.writerow(["1", computing, ""])
+            self.profiler_path_list.append(profiler_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.input_path)
+
+    @classmethod
+    def _write_json(cls, file_path: str, data: dict):
+        with open(file_path, "w") as file:
+            json.dump(data, file)
+
+    def test_generate_view(self):
+        ClusterViewParser(list(reversed(self.profiler_path_list)), self.output_path).generate_view()
+        with open(os.path.join(self.output_path, ClusterViewParser.CLUSTER_COMMUNICATION_MATRIX)) as file:
+            links = json.load(file)["step1"]["collective"]["allreduce@1"]
+        self.assertEqual({"0-1", "0-0", "1-1"}, set(links.keys()))
+        # the link reported by both of its ranks is counted once, with the data of its source rank 0
+        self.assertEqual(10, links["0-1"]["Transit Size(MB)"])
+        self.assertEqual(2, links["0-1"]["Transit Time(ms)"])
+        self.assertEqual(5.0, links["0-1"]["Bandwidth(GB/s)"])
+        self.assertEqual(10, links["0-0"]["Transit Size(MB)"])
+        self.assertEqual(30, links["1-1"]["Transit Size(MB)"])
+
+        with open(os.path.join(self.output_path, ClusterViewParser.CLUSTER_STEP_TRACE)) as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(["0", "1"], [row["Rank"] for row in rows])
+        with open(os.path.join(self.output_path, ClusterViewParser.STEP_TIME_SKEW)) as file:
+            rows = list(csv.DictReader(file))
+        # empty values are not taken into account
+        self.assertEqual(1, len(rows))
+        self.assertEqual({"Step": "1", "Metric": "Computing", "Min(us)": "100.0", "Min Rank": "0", "Max(us)": "160.0",
+                          "Max Rank": "1", "Mean(us)": "130.0", "Skew(us)": "60.0"}, rows[0])
+
+
+if __name__ == "__main__":
+    run_tests()
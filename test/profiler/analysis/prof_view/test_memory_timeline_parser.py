@@ -0,0 +1,64 @@
+from torch_npu.profiler.analysis.prof_parse._event_tree_parser import _DeviceType
+from torch_npu.profiler.analysis.prof_view._memory_timeline_parser import (
+    Action,
+    Category,
+    DeviceKey,
+    MemoryProfileTimeline,
+    Storage,
+    TensorKey,
+    _CATEGORY_TO_INDEX,
+)
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class FakeCategories:
+    def get(self, key, version):
+        return Category.ACTIVATION if version == 0 else Category.GRADIENT
+
+
+class FakeMemoryProfile:
+    def __init__(self, timeline):
+        self.timeline = timeline
+        self._categories = FakeCategories()
+        self.memory_history = []
+
+
+class TestMemoryProfileTimeline(TestCase):
+
+    def setUp(self):
+        npu = _DeviceType.NPU.value
+        tensor = TensorKey(npu, 0, 1, Storage(100, 1))
+        unknown = DeviceKey(npu, 0)
+        other_device = DeviceKey(npu, 1)
+        self.timeline = MemoryProfileTimeline(FakeMemoryProfile((
+            (-1, Action.PREEXISTING, (unknown, 0), 8),
+            (2000, Action.CREATE, (tensor, 0), 100),
+            (2500, Action.CREATE, (other_device, 0), 50),
+            (3000, Action.INCREMENT_VERSION, (tensor, 0), 100),
+            (9000, Action.DESTROY, (tensor, 1), 100),
+        )))
+        self.activation = _CATEGORY_TO_INDEX[Category.ACTIVATION] + 1
+        self.gradient = _CATEGORY_TO_INDEX[Category.GRADIENT] + 1
+        self.unknown = _CATEGORY_TO_INDEX[None] + 1
+
+    def test_construct_timeline(self):
+        timestamps, sizes = self.timeline._construct_timeline("npu:0")
+        self.assertEqual([2, 2, 3, 9], timestamps.tolist())
+        self.assertEqual([8, 8, 8, 8], sizes[:, self.unknown].tolist())
+        self.assertEqual([0, 100, 0, 0], sizes[:, self.activation].tolist())
+        self.assertEqual([0, 0, 100, 0], sizes[:, self.gradient].tolist())
+        self.assertEqual([0, 0, 0, 0], sizes[:, 0].tolist())
+
+    def test_construct_timeline_downsample(self):
+        timestamps, sizes = self.timeline._construct_timeline("npu:0", bucket_us=5)
+        self.assertEqual([3, 9], timestamps.tolist())
+        self.assertEqual([108, 8], sizes.sum(axis=1).tolist())
+
+    def test_construct_timeline_without_events(self):
+        timestamps, sizes = self.timeline._construct_timeline("npu:2")
+        self.assertEqual(0, timestamps.size)
+        self.assertEqual(0, len(sizes))
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,56 @@
+import os
+import shutil
+
+from torch_npu.profiler.analysis.prof_common_func._constant import Constant
+from torch_npu.profiler.analysis.prof_common_func._db_manager import DbManager, TorchDb
+from torch_npu.profiler.analysis.prof_view.prof_db_parse._rollup_db_parser import RollupDbParser
+from torch_npu.testing.testcase import TestCase, run_tests
+
+
+class TestRollupDbParser(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = os.path.realpath("./test_rollup_db_parser")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.db_path = os.path.join(self.tmp_dir, "ascend_pytorch_profiler.db")
+        TorchDb().init(self.db_path)
+        self.assertTrue(TorchDb().create_connect_db())
+        TorchDb().create_table_with_headers("TASK", [("startNs", "INTEGER"), ("endNs", "INTEGER"),
+                                                     ("globalTaskId", "INTEGER"), ("streamId", "INTEGER")])
+        TorchDb().insert_data_into_table("TASK", [(0, 10, 1, 0), (20, 50, 2, 0), (100, 110, 3, 1)])
+        TorchDb().create_table_with_headers("COMPUTE_TASK_INFO", [("globalTaskId", "INTEGER"),
+                                                                  ("opType", "INTEGER")])
+        TorchDb().insert_data_into_table("COMPUTE_TASK_INFO", [(1, 7), (2, 7), (3, 8)])
+        TorchDb().create_table_with_headers("COMMUNICATION_OP", [("startNs", "INTEGER"), ("endNs", "INTEGER")])
+        TorchDb().insert_data_into_table("COMMUNICATION_OP", [(60, 90), (120, 125)])
+        self.deps_data = {Constant.STEP_INFO_DB_PARSER: [
+            {Constant.STEP_ID: "1", Constant.START_TS: 0, Constant.END_TS: 100,
+             Constant.TASK_INFO: {1: {"startNs": 0, "endNs": 10}, 2: {"startNs": 20, "endNs": 50}}},
+            {Constant.STEP_ID: "2", Constant.START_TS: 100, Constant.END_TS: float("inf"),
+             Constant.TASK_INFO: {3: {"startNs": 100, "endNs": 110}}},
+        ]}
+
+    def tearDown(self):
+        TorchDb().close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_run(self):
+        parser = RollupDbParser(Constant.ROLLUP_DB_PARSER, {"profiler_path": self.tmp_dir,
+                                                            "output_path": self.tmp_dir})
+        self.assertEqual(Constant.SUCCESS, parser.run(self.deps_data)[0])
+        TorchDb().close()
+        conn, curs = DbManager.create_connect_db(self.db_path)
+        self.assertEqual([(1, 0, 100, 2, 40, 1, 30), (2, 100, None, 1, 10, 1, 5)],
+                         DbManager.fetch_all_data(curs, "SELECT * FROM STEP_SUMMARY ORDER BY step"))
+        self.assertEqual([(1, 7, 2, 40, 10, 30), (2, 8, 1, 10, 10, 10)],
+                         DbManager.fetch_all_data(curs, "SELECT * FROM STEP_OP_TYPE_SUMMARY ORDER BY step"))
+        indexes = {row[0] for row in DbManager.fetch_all_data(
+            curs, "SELECT name FROM sqlite_master WHERE type='index'")}
+        self.assertTrue({"TASK_START_INDEX", "TASK_STREAM_START_INDEX", "COMMUNICATION_OP_START_INDEX",
+                         "STEP_SUMMARY_STEP_INDEX"}.issubset(indexes))
+        self.assertNotIn("CANN_API_TYPE_START_INDEX", indexes)
+        DbManager.destroy_db_connect(conn, curs)
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,76 @@
+import os
+import json
+import shutil
+from types import SimpleNamespace
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler._dynamic_profiler._dynamic_profiler_config_watcher import ConfigFileWatcher
+from torch_npu.profiler._dynamic_profiler._dynamic_profiler_monitor_shm import DynamicProfilerShareMemory
+
+
+class TestDynamicProfilerConfigBroadcast(TestCase):
+    BUFFER_SIZE = 1024
+
+    def setUp(self):
+        self.cfg_dir = os.path.realpath(f"./dynamic_profiler_config_broadcast_{os.getpid()}")
+        os.makedirs(self.cfg_dir)
+        self.cfg_path = os.path.join(self.cfg_dir, "profiler_config.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.cfg_dir)
+
+    def _create_shm_obj(self):
+        shm_obj = DynamicProfilerShareMemory.__new__(DynamicProfilerShareMemory)
+        shm_obj.shm = SimpleNamespace(buf=bytearray(self.BUFFER_SIZE))
+        shm_obj.is_mmap = False
+        shm_obj._shm_buf_bytes_size = self.BUFFER_SIZE
+        return shm_obj
+
+    def _write_cfg(self, data: dict):
+        with open(self.cfg_path, "w") as file:
+            json.dump(data, file)
+
+    def test_config_record_version(self):
+        shm_obj = self._create_shm_obj()
+        self.assertEqual(0, shm_obj.read_version())
+        shm_obj.write_config(b'{"active": 1}')
+        self.assertEqual((2, b'{"active": 1}'), shm_obj.read_config())
+        shm_obj.write_config(b'{}')
+        self.assertEqual((4, b'{}'), shm_obj.read_config())
+
+    def test_config_record_being_written(self):
+        shm_obj = self._create_shm_obj()
+        shm_obj.write_config(b'{"active": 1}')
+        # an odd version means the monitor process is rewriting the record
+        shm_obj.shm.buf[0] = 3
+        self.assertIsNone(shm_obj.read_config())
+
+    def test_watcher_reports_changes(self):
+        self._write_cfg({"active": 1})
+        watcher = ConfigFileWatcher(self.cfg_path, ConfigFileWatcher.get_file_stat(self.cfg_path))
+        try:
+            self.assertFalse(watcher.wait_change(0.01))
+            self._write_cfg({"active": 2, "warmup": 1})
+            self.assertTrue(watcher.wait_change(0.5))
+            self.assertFalse(watcher.wait_change(0.01))
+            # a file replaced by rename is seen as well
+            new_cfg_path = self.cfg_path + ".new"
+            with open(new_cfg_path, "w") as file:
+                json.dump({"active": 3}, file)
+            os.replace(new_cfg_path, self.cfg_path)
+            self.assertTrue(watcher.wait_change(0.5))
+        finally:
+            watcher.close()
+
+    def test_watcher_missing_file(self):
+        watcher = ConfigFileWatcher(self.cfg_path)
+        try:
+            self.assertFalse(watcher.wait_change(0.01))
+            self._write_cfg({})
+            self.assertTrue(watcher.wait_change(0.5))
+        finally:
+            watcher.close()
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -24,7 +24,7 @@ class TestExperimentalConfig(TestCase):
             Constant.AicResourceConflictRatio,
             Constant.AicL2Cache,
         ])
-        cls.export_type = set([Constant.Db, Constant.Text])
+        cls.export_type = set([Constant.Db, Constant.Text, Constant.Columnar])
 
     @unittest.skip("Skip test_supported_profiler_level now!")
     def test_supported_profiler_level(self):
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+
+from torch_npu.testing.testcase import TestCase, run_tests
+from torch_npu.profiler._dynamic_profiler._dynamic_profiler_straggler import StepTimeRing, StragglerDetector
+
+
+class TestStragglerDetector(TestCase):
+    CONFIG = {"enable": True, "metric": "step_time", "window": 4, "percentile": 90, "threshold": 0.2,
+              "check_interval": 2, "cooldown": 100}
+
+    def setUp(self):
+        self.shm_name = f"TestStepTimeShm{os.getpid()}"
+        self.environ = {key: os.environ.get(key) for key in ("LOCAL_RANK", "LOCAL_WORLD_SIZE")}
+        os.environ["LOCAL_WORLD_SIZE"] = "2"
+
+    def tearDown(self):
+        for key, value in self.environ.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    def test_find_stragglers_by_peers(self):
+        recent = {0: np.array([100.0] * 8), 1: np.array([101.0] * 8), 2: np.array([99.0] * 8),
+                  3: np.array([100.0] * 4 + [150.0] * 4)}
+        self.assertEqual([3], StragglerDetector.find_stragglers(recent, 4, 90, 0.2))
+        self.assertEqual([], StragglerDetector.find_stragglers(recent, 4, 90, 0.6))
+        # ranks with less than window steps are not compared
+        self.assertEqual([], StragglerDetector.find_stragglers({0: np.array([100.0] * 8), 1: np.array([200.0])},
+                                                               4, 90, 0.2))
+
+    def test_find_stragglers_by_history(self):
+        self.assertEqual([0], StragglerDetector.find_stragglers({0: np.array([100.0] * 4 + [130.0] * 4)}, 4, 90, 0.2))
+        self.assertEqual([], StragglerDetector.find_stragglers({0: np.array([100.0] * 4 + [110.0] * 4)}, 4, 90, 0.2))
+
+    def test_ring_wraps(self):
+        ring = StepTimeRing(self.shm_name, 1, 2)
+        try:
+            for step in range(StepTimeRing.RING_SIZE + 3):
+                ring.write((step, step * 10.0, 0, 0, step * 10.0))
+            recent = ring.read_recent("step", 5)
+            self.assertEqual([1], list(recent.keys()))
+            self.assertEqual(list(range(StepTimeRing.RING_SIZE - 2, StepTimeRing.RING_SIZE + 3)), recent[1].tolist())
+        finally:
+            ring.clean_resource()
+
+    def test_detect_slow_local_rank(self):
+        os.environ["LOCAL_RANK"] = "0"
+        fast_rank = StragglerDetector(self.shm_name, dict(self.CONFIG, metric="computing"))
+        os.environ["LOCAL_RANK"] = "1"
+        slow_rank = StragglerDetector(self.shm_name, dict(self.CONFIG, metric="computing"))
+        try:
+            self.assertTrue(fast_rank.enabled and slow_rank.enabled)
+            flagged = []
+            # the first call only starts the step timer
+            fast_rank.record_step(0)
+            slow_rank.record_step(0)
+            for step in range(1, 12):
+                fast_rank.record_step(step, computing_us=100)
+                slow_rank.record_step(step, computing_us=100 if step <= 4 else 150)
+                flagged.append((fast_rank.is_straggler(), slow_rank.is_straggler()))
+            self.assertFalse(any(fast for fast, _ in flagged))
+            # flagged once, then quiet during the cooldown
+            self.assertEqual(1, sum(slow for _, slow in flagged))
+        finally:
+            slow_rank.clean_resource()
+            fast_rank.clean_resource()
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,82 @@
+"""
+Keys per second of a ParallelStore server under N clients on the loopback, single key ops versus batched ops.
+
+single: every client sets then gets its keys one message at a time
+batch:  every client sends its keys in multi_set/multi_get messages of --batch keys
+Each client runs in its own process and uses its own key prefix, the time measured is the slowest client.
+
+usage: python parallel_store_benchmark.py [--clients N] [--keys N] [--batch N] [--port PORT]
+"""
+import argparse
+import multiprocessing
+import os
+import time
+
+from torch_npu.distributed import ParallelStore
+
+READY_KEY = "bench/ready"
+
+
+def run_single(store: ParallelStore, keys: list, values: list):
+    for key, value in zip(keys, values):
+        store.set(key, value)
+    for key in keys:
+        store.get(key)
+
+
+def run_batch(store: ParallelStore, keys: list, values: list, batch: int):
+    for index in range(0, len(keys), batch):
+        store.multi_set(keys[index:index + batch], values[index:index + batch])
+    for index in range(0, len(keys), batch):
+        store.multi_get(keys[index:index + batch])
+
+
+def client_main(args, mode: str, client_id: int, result_queue):
+    store = ParallelStore(port=args.port, agent_run=False, agent_pid=args.agent_pid, is_server=False)
+    keys = [f"bench/{mode}/{client_id}/{index}" for index in range(args.keys)]
+    values = [f"{client_id}/{index}".encode() for index in range(args.keys)]
+    # all the clients start together once every one of them is connected
+    store.add(f"{READY_KEY}/{mode}", 1)
+    store.wait([f"{READY_KEY}/{mode}/go"])
+    start = time.perf_counter()
+    if mode == "single":
+        run_single(store, keys, values)
+    else:
+        run_batch(store, keys, values, args.batch)
+    result_queue.put(time.perf_counter() - start)
+
+
+def run_mode(args, mode: str, server: ParallelStore) -> float:
+    result_queue = multiprocessing.Queue()
+    clients = [multiprocessing.Process(target=client_main, args=(args, mode, client_id, result_queue))
+               for client_id in range(args.clients)]
+    for client in clients:
+        client.start()
+    while int(server.add(f"{READY_KEY}/{mode}", 0)) < args.clients:
+        time.sleep(0.01)
+    server.set(f"{READY_KEY}/{mode}/go", b"1")
+    elapsed = max(result_queue.get() for _ in clients)
+    for client in clients:
+        client.join()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="parallel store loopback benchmark")
+    parser.add_argument("--clients", type=int, default=64, help="number of client processes")
+    parser.add_argument("--keys", type=int, default=1000, help="number of keys set and got by each client")
+    parser.add_argument("--batch", type=int, default=100, help="number of keys of a multi_set/multi_get message")
+    parser.add_argument("--port", type=int, default=29600, help="port of the store server")
+    parser.add_argument("--agent_pid", type=int, default=os.getpid(), help="pid used for the local sockets")
+    args = parser.parse_args()
+    server = ParallelStore(port=args.port, agent_run=True, agent_pid=args.agent_pid, is_server=True,
+                           wait_workers=False)
+    total_ops = args.clients * args.keys * 2
+    for mode in ("single", "batch"):
+        elapsed = run_mode(args, mode, server)
+        print(f"{mode:>6}: {args.clients} clients, {total_ops} key ops in {elapsed:.2f}s, "
+              f"{total_ops / elapsed:,.0f} keys/s")
+
+
+if __name__ == "__main__":
+    main()
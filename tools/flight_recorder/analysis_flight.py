@@ -1,7 +1,9 @@
 import os
+import json
 import pickle
 import logging
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import argparse
 
 from check_path import get_valid_read_path
@@ -30,18 +32,74 @@ class SafeUnpickler(pickle.Unpickler):
         raise pickle.UnpicklingError(f"Forbidden class: {module}.{name}")
 
 
-def load_recorder_data(path, world_size):
-    """加载所有 rank 的 recorder 数据"""
-    recorder_dict = {}
-    for rank in range(world_size):
-        file_path = os.path.join(path, str(rank)) if not path.endswith("/") else path + str(rank)
+def get_rank_file_path(path, rank):
+    return os.path.join(path, str(rank)) if not path.endswith("/") else path + str(rank)
+
+
+def get_frame_name(entry):
+    frames = entry.get("frames", None) or [{}]
+    return frames[0].get("name", None)
+
+
+def get_entry_name(entry):
+    name = entry.get("profiling_name", None)
+    if name:
+        return name
+    return get_frame_name(entry)
+
+
+def to_hashable(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(to_hashable(item) for item in value)
+    return value
+
+
+def compact_entry(entry):
+    """只保留分析需要的字段，调用栈等大字段不回传给主进程"""
+    return {
+        "record_id": entry.get("record_id", None),
+        "pg_id": entry.get("pg_id", None),
+        "collective_seq_id": entry.get("collective_seq_id", None),
+        "state": entry.get("state", None),
+        "time_discovered_completed_ns": entry.get("time_discovered_completed_ns", None),
+        "name": get_entry_name(entry),
+        "frame_name": get_frame_name(entry),
+        "input_sizes": to_hashable(entry.get("input_sizes", None)),
+        "output_sizes": to_hashable(entry.get("output_sizes", None)),
+    }
+
+
+def load_rank_data(file_path):
+    """在子进程中加载一个 rank 的 recorder 数据，只返回精简后的 entries"""
+    try:
         file_path = get_valid_read_path(file_path)
-        try:
-            with open(file_path, "rb") as f:
-                res = SafeUnpickler(f).load()
+        with open(file_path, "rb") as f:
+            res = SafeUnpickler(f).load()
+        return {"entries": [compact_entry(entry) for entry in res.get("entries", [])]}, None
+    except Exception as e:
+        return None, f"Failed to load data from {file_path}: {e}"
+
+
+def load_recorder_data(path, world_size, workers=None):
+    """使用进程池并行加载所有 rank 的 recorder 数据"""
+    recorder_dict = {}
+    file_paths = [get_rank_file_path(path, rank) for rank in range(world_size)]
+    workers = workers or min(os.cpu_count() or 1, world_size)
+    if workers <= 1:
+        results = map(load_rank_data, file_paths)
+        for rank, (res, error) in enumerate(results):
+            if error:
+                logging.error(error)
+            else:
+                recorder_dict[str(rank)] = res
+        return recorder_dict
+    chunksize = max(world_size // (workers * 4), 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rank, (res, error) in enumerate(executor.map(load_rank_data, file_paths, chunksize=chunksize)):
+            if error:
+                logging.error(error)
+            else:
                 recorder_dict[str(rank)] = res
-        except Exception as e:
-            logging.error(f"Failed to load data from {file_path}: {e}")
     return recorder_dict
 
 
@@ -58,11 +116,86 @@ def extract_hccl_info(recorder_dict):
             "record_id": last_entry.get("record_id", None),
             "pg_id": last_entry.get("pg_id", None),
             "time_discovered_completed_ns": last_entry.get("time_discovered_completed_ns", None),
-            "name": last_entry.get("frames", [{}])[0].get("name", None),
+            "name": last_entry.get("frame_name", None),
         }
     return hccl_dict
 
 
+def build_pg_sequences(recorder_dict):
+    """按 pg_id 整理每个 rank 的通信算子序列，返回 {pg_id: {rank: {seq_id: entry}}}"""
+    pg_sequences = defaultdict(dict)
+    skipped_ranks = []
+    for rank, recorder in recorder_dict.items():
+        skipped = False
+        for entry in recorder.get("entries", []):
+            # record_id 是 rank 内所有通信域共用的计数，不能用于对齐，旧版本数据没有 collective_seq_id 时跳过
+            seq_id = entry.get("collective_seq_id", None)
+            if seq_id is None:
+                skipped = True
+                continue
+            pg_sequences[entry.get("pg_id", None)].setdefault(rank, {})[seq_id] = entry
+        if skipped:
+            skipped_ranks.append(rank)
+    if skipped_ranks:
+        logging.warning(
+            f"The recorder data of ranks {sorted(skipped_ranks, key=int)} has entries without collective_seq_id, "
+            "they are skipped when aligning the communication operators."
+        )
+    return pg_sequences
+
+
+def find_first_divergence(rank_sequences):
+    """对齐一个通信域内所有 rank 的算子序列，返回第一个不一致的算子，全部一致时返回 None"""
+    # 环形缓冲区中各 rank 保留的最早算子不同，只比较所有 rank 都还保留的区间
+    start_seq_id = max(min(sequence) for sequence in rank_sequences.values())
+    all_seq_ids = sorted({seq_id for sequence in rank_sequences.values() for seq_id in sequence
+                          if seq_id >= start_seq_id})
+    for seq_id in all_seq_ids:
+        signatures = defaultdict(list)
+        missing_ranks = []
+        for rank, sequence in rank_sequences.items():
+            entry = sequence.get(seq_id, None)
+            if entry is None:
+                missing_ranks.append(rank)
+                continue
+            signatures[(entry["name"], entry["input_sizes"], entry["output_sizes"])].append(rank)
+        if len(signatures) <= 1 and not missing_ranks:
+            continue
+        return {
+            "seq_id": seq_id,
+            "missing_ranks": sorted(missing_ranks, key=int),
+            "signatures": [
+                {"name": name, "input_sizes": input_sizes, "output_sizes": output_sizes,
+                 "ranks": sorted(ranks, key=int)}
+                for (name, input_sizes, output_sizes), ranks in signatures.items()
+            ],
+        }
+    return None
+
+
+def analyze_pg_sequences(recorder_dict):
+    """找出每个通信域中第一个 rank 间不一致的通信算子"""
+    report = {}
+    for pg_id, rank_sequences in build_pg_sequences(recorder_dict).items():
+        divergence = find_first_divergence(rank_sequences)
+        report[str(pg_id)] = divergence
+        if divergence is None:
+            continue
+        if divergence["missing_ranks"]:
+            logging.info(
+                f"The pg_id {pg_id}'s Communication Operator {divergence['seq_id']} "
+                f"was not issued by ranks {divergence['missing_ranks']}."
+            )
+        if len(divergence["signatures"]) > 1:
+            details = "; ".join(f"{sig['name']} {sig['input_sizes']}->{sig['output_sizes']} on ranks {sig['ranks']}"
+                                for sig in divergence["signatures"])
+            logging.info(
+                f"The pg_id {pg_id}'s Communication Operator {divergence['seq_id']} "
+                f"mismatched across ranks: {details}."
+            )
+    return report
+
+
 def analyze_pg_groups(hccl_dict):
     """分析 HCCL 数据，按 pg_id 分组并检查问题"""
     pg_groups = defaultdict(list)
@@ -117,13 +250,15 @@ def main():
     parser = argparse.ArgumentParser(description="Process HCCL debug info.")
     parser.add_argument('--path', type=str, default=default_path, help='Path to the recorder data file')
     parser.add_argument('--world-size', type=int, default=default_world_size, help='World size for the operation')
-    
+    parser.add_argument('--workers', type=int, default=None, help='Number of processes loading the recorder data')
+    parser.add_argument('--output', type=str, default=None, help='Path of the json report of the first divergence')
+
     args = parser.parse_args()
 
     logging.info("Path: %r", args.path)
     logging.info("World Size: %r", args.world_size)
 
-    recorder_dict = load_recorder_data(args.path, args.world_size)
+    recorder_dict = load_recorder_data(args.path, args.world_size, args.workers)
     if not recorder_dict:
         logging.error("No valid recorder data found.")
         return
@@ -134,6 +269,13 @@ def main():
     # 分析 HCCL 数据
     analyze_pg_groups(hccl_dict)
 
+    # 对齐各通信域的全部算子，找出第一个不一致的算子
+    report = analyze_pg_sequences(recorder_dict)
+    if args.output:
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        with os.fdopen(os.open(args.output, flags, 0o640), "w") as f:
+            json.dump(report, f, indent=4)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
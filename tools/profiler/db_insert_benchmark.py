@@ -0,0 +1,79 @@
+"""
+Rows per second of the profiler db export, legacy path versus DbManager bulk load.
+
+legacy: default journaling and synchronous, index created before the load,
+        a materialized list committed every DbManager.INSERT_SIZE rows
+bulk:   BasicDb connection with the bulk load pragmas, rows streamed from a generator in one transaction,
+        index deferred until the db is closed
+The measured time includes building the index. The pragmas the bulk connection ran with are printed
+along with the result.
+
+usage: python db_insert_benchmark.py [--rows N] [--output DIR]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from torch_npu.profiler.analysis.prof_common_func._db_manager import BasicDb, DbManager
+
+TABLE_NAME = "BENCH_KERNEL"
+INDEX_NAME = "BENCH_KERNEL_CONNECTION_INDEX"
+INDEX_COLUMNS = ["connectionId"]
+HEADERS = [("startNs", "INTEGER"), ("endNs", "INTEGER"), ("deviceId", "INTEGER"), ("connectionId", "INTEGER"),
+           ("name", "INTEGER"), ("globalTaskId", "INTEGER")]
+
+
+def generate_rows(row_num: int):
+    for index in range(row_num):
+        # connection ids arrive out of order, as they do for kernels of different streams
+        yield index * 1000, index * 1000 + 500, 0, (index * 7919) % row_num, index % 4096, index
+
+
+def legacy_insert(db_path: str, row_num: int) -> float:
+    conn = sqlite3.connect(db_path)
+    table_headers = ", ".join([f"{col[0]} {col[1]}" for col in HEADERS])
+    conn.execute(f"CREATE TABLE {TABLE_NAME} ({table_headers})")
+    conn.execute(f"CREATE INDEX {INDEX_NAME} ON {TABLE_NAME} ({', '.join(INDEX_COLUMNS)})")
+    conn.commit()
+    start = time.perf_counter()
+    data = list(generate_rows(row_num))
+    sql = f"insert into {TABLE_NAME} values ({'?, ' * (len(HEADERS) - 1)}?)"
+    for index in range(0, len(data), DbManager.INSERT_SIZE):
+        conn.executemany(sql, data[index:index + DbManager.INSERT_SIZE])
+        conn.commit()
+    conn.close()
+    return time.perf_counter() - start
+
+
+def bulk_insert(db_path: str, row_num: int) -> float:
+    db = BasicDb()
+    db.init(db_path)
+    if not db.create_connect_db():
+        raise RuntimeError(f"Failed to connect to db file: {db_path}")
+    db.create_table_with_headers(TABLE_NAME, HEADERS)
+    db.create_index(TABLE_NAME, INDEX_NAME, INDEX_COLUMNS)
+    start = time.perf_counter()
+    db.insert_data_into_table(TABLE_NAME, generate_rows(row_num))
+    pragmas = {name: db.fetch_one_data(f"PRAGMA {name}")[0] for name in ("journal_mode", "synchronous")}
+    db.close()
+    elapsed = time.perf_counter() - start
+    print(f"  bulk pragmas: {', '.join(f'{name}={value}' for name, value in pragmas.items())}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="profiler db insert benchmark")
+    parser.add_argument("--rows", type=int, default=2000000, help="number of rows to insert")
+    parser.add_argument("--output", type=str, default=None, help="directory of the temporary db files")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(dir=args.output) as tmp_dir:
+        for name, func in (("legacy", legacy_insert), ("bulk", bulk_insert)):
+            db_path = os.path.join(tmp_dir, f"{name}.db")
+            elapsed = func(db_path, args.rows)
+            print(f"{name:>6}: {args.rows} rows in {elapsed:.2f}s, {args.rows / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -462,7 +462,9 @@ PyObject* c10d_npu_init(PyObject* _unused, PyObject* noargs)
 A TCP-Parallel-Epoll-based distributed key-value store implementation. The server store holds
 the data, while the client stores can connect to the server store over TCP and
 perform actions such as :meth:`~torch.distributed.store.set` to insert a key-value
-pair, :meth:`~torch.distributed.store.get` to retrieve a key-value pair, etc. There
+pair, :meth:`~torch.distributed.store.get` to retrieve a key-value pair, etc. Many keys
+can be set or retrieved in one request with :meth:`~torch.distributed.store.multi_set` and
+:meth:`~torch.distributed.store.multi_get`. There
 should always be one server store initialized because the client store(s) will wait for
 the server to establish a connection.
 
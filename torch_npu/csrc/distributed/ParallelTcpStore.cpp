@@ -13,7 +13,10 @@
  * See the License for the specific language governing permissions and
  * limitations under the License.
  */
+#include <algorithm>
 #include <chrono>
+#include <functional>
+#include <stdexcept>
 #include "ParallelTcpServer.hpp"
 #include "ParallelTcpStore.hpp"
 #include "ParallelStoreProxy.hpp"
@@ -99,11 +102,13 @@ torch_npu::StoreMessage ParallelStoreServer::ProcessRequest(int fd, const torch_
 
 torch_npu::StoreMessage ParallelStoreServer::ProcessGetRequest(int fd, const torch_npu::StoreMessage &request) noexcept
 {
-    std::unique_lock<torch_npu::SpinLock> lockGuard{ serverLock_ };
-    auto pos = keyStore_.find(request.keys[0]);
-    if (pos != keyStore_.end()) {
+    auto &shard = GetShard(request.keys[0]);
+    std::unique_lock<torch_npu::SpinLock> lockGuard{ shard.lock };
+    auto pos = shard.keyStore.find(request.keys[0]);
+    if (pos != shard.keyStore.end()) {
+        auto value = pos->second;
         lockGuard.unlock();
-        return { torch_npu::MessageType::GET, request.fd, pos->second };
+        return { torch_npu::MessageType::GET, request.fd, std::move(value) };
     }
     lockGuard.unlock();
 
@@ -113,10 +118,11 @@ torch_npu::StoreMessage ParallelStoreServer::ProcessGetRequest(int fd, const tor
 torch_npu::StoreMessage ParallelStoreServer::ProcessSetRequest(int fd, const torch_npu::StoreMessage &request) noexcept
 {
     bool newCreated = false;
-    std::unique_lock<torch_npu::SpinLock> lockGuard{ serverLock_ };
-    auto pos = keyStore_.find(request.keys[0]);
-    if (pos == keyStore_.end()) {
-        keyStore_.emplace(request.keys[0], request.values[0]);
+    auto &shard = GetShard(request.keys[0]);
+    std::unique_lock<torch_npu::SpinLock> lockGuard{ shard.lock };
+    auto pos = shard.keyStore.find(request.keys[0]);
+    if (pos == shard.keyStore.end()) {
+        shard.keyStore.emplace(request.keys[0], request.values[0]);
         newCreated = true;
     } else {
         pos->second = request.values[0];
@@ -137,16 +143,17 @@ torch_npu::StoreMessage ParallelStoreServer::ProcessAddRequest(int fd, const tor
     auto old = 0L;
     bool oldExist = false;
 
-    std::unique_lock<torch_npu::SpinLock> lockGuard{ serverLock_ };
-    auto pos = keyStore_.find(request.keys[0]);
-    if (pos != keyStore_.end()) {
+    auto &shard = GetShard(request.keys[0]);
+    std::unique_lock<torch_npu::SpinLock> lockGuard{ shard.lock };
+    auto pos = shard.keyStore.find(request.keys[0]);
+    if (pos != shard.keyStore.end()) {
         oldExist = true;
         old = std::stoll(std::string(reinterpret_cast<const char *>(pos->second.data()), pos->second.size()));
     }
 
     auto newValue = old + delta;
     auto valueString = std::to_string(newValue);
-    keyStore_[request.keys[0]] = std::vector<uint8_t>(valueString.begin(), valueString.end());
+    shard.keyStore[request.keys[0]] = std::vector<uint8_t>(valueString.begin(), valueString.end());
     lockGuard.unlock();
 
     if (!notifiedWaitWorkers && request.keys[0] == initKey_ && numWorkers_ != c10::nullopt &&
@@ -165,12 +172,12 @@ torch_npu::StoreMessage ParallelStoreServer::ProcessAddRequest(int fd, const tor
 
 torch_npu::StoreMessage ParallelStoreServer::ProcessCheckRequest(int fd, const torch_npu::StoreMessage &request) noexcept
 {
-    std::unique_lock<torch_npu::SpinLock> lockGuard{ serverLock_ };
+    auto shardIndexes = LockShards(request.keys);
     torch_npu::MessageCheckKeyRes res = torch_npu::MessageCheckKeyRes::KEYS_NOT_READY;
     if (CheckAllKeysExistInLock(request.keys)) {
         res = torch_npu::MessageCheckKeyRes::KEYS_READY;
     }
-    lockGuard.unlock();
+    UnlockShards(shardIndexes);
 
     std::vector<uint8_t> body{ static_cast<uint8_t>(res) };
     return { torch_npu::MessageType::CHECK, request.fd, body };
@@ -178,8 +185,9 @@ torch_npu::StoreMessage ParallelStoreServer::ProcessCheckRequest(int fd, const t
 
 torch_npu::StoreMessage ParallelStoreServer::ProcessDeleteRequest(int fd, const torch_npu::StoreMessage &request) noexcept
 {
-    std::unique_lock<torch_npu::SpinLock> lockGuard{ serverLock_ };
-    auto count = keyStore_.erase(request.keys[0]);
+    auto &shard = GetShard(request.keys[0]);
+    std::unique_lock<torch_npu::SpinLock> lockGuard{ shard.lock };
+    auto count = shard.keyStore.erase(request.keys[0]);
     lockGuard.unlock();
 
     return torch_npu::StoreMessage{ torch_npu::MessageType::DELETE_KEY, request.fd, std::vector<uint8_t>{ static_cast<uint8_t>(count > 0) } };
@@ -187,11 +195,12 @@ torch_npu::StoreMessage ParallelStoreServer::ProcessDeleteRequest(int fd, const
 
 torch_npu::StoreMessage ParallelStoreServer::ProcessCompareSetRequest(int fd, const torch_npu::StoreMessage &request) noexcept
 {
-    std::unique_lock<torch_npu::SpinLock> lockGuard{ serverLock_ };
-    auto pos = keyStore_.find(request.keys[0]);
-    if (pos == keyStore_.end()) {
+    auto &shard = GetShard(request.keys[0]);
+    std::unique_lock<torch_npu::SpinLock> lockGuard{ shard.lock };
+    auto pos = shard.keyStore.find(request.keys[0]);
+    if (pos == shard.keyStore.end()) {
         if (request.values[0].empty()) {
-            keyStore_[request.keys[0]] = request.values[1];
+            shard.keyStore[request.keys[0]] = request.values[1];
             lockGuard.unlock();
             server_->WakeupWaitingClients(request.keys[0]);
             return { torch_npu::MessageType::COMPARE_SET, request.fd, request.values[1] };
@@ -207,15 +216,18 @@ torch_npu::StoreMessage ParallelStoreServer::ProcessCompareSetRequest(int fd, co
         return { torch_npu::MessageType::COMPARE_SET, request.fd, request.values[1] };
     }
 
+    auto current = pos->second;
     lockGuard.unlock();
-    return { torch_npu::MessageType::COMPARE_SET, request.fd, pos->second };
+    return { torch_npu::MessageType::COMPARE_SET, request.fd, std::move(current) };
 }
 
 torch_npu::StoreMessage ParallelStoreServer::ProcessGetNumKeyRequest(int fd, const torch_npu::StoreMessage &request) noexcept
 {
-    std::unique_lock<torch_npu::SpinLock> lockGuard{ serverLock_ };
-    auto keyNum = keyStore_.size();
-    lockGuard.unlock();
+    std::size_t keyNum = 0U;
+    for (auto &shard : keyStoreShards_) {
+        std::lock_guard<torch_npu::SpinLock> lockGuard{ shard.lock };
+        keyNum += shard.keyStore.size();
+    }
     return { torch_npu::MessageType::GET_NUM_KEYS, request.fd, torch_npu::StoreMessagePacker::PackPod(keyNum) };
 }
 
@@ -225,26 +237,70 @@ torch_npu::StoreMessage ParallelStoreServer::ProcessWaitKeysRequest(int fd, cons
     std::vector<std::string> waitKeys;
     waitKeys.reserve(request.keys.size());
 
-    std::unique_lock<torch_npu::SpinLock> lockGuard{ serverLock_ };
+    // the waiting socket is registered under the shard locks, a key set afterwards wakes it up
+    auto shardIndexes = LockShards(request.keys);
     if (CheckAllKeysExistInLock(request.keys)) {
-        lockGuard.unlock();
+        UnlockShards(shardIndexes);
 
         std::vector<uint8_t> body{ static_cast<uint8_t>(torch_npu::MessageWaitKeyRes::KEYS_STOP_WAITING) };
         return { torch_npu::MessageType::WAIT, request.fd, body };
     }
 
     for (auto &key : request.keys) {
-        if (keyStore_.find(key) == keyStore_.end()) {
+        if (GetShard(key).keyStore.count(key) == 0) {
             waitKeys.emplace_back(key);
             numKeysToWait++;
         }
     }
     server_->SetKeysWaitingSocket(waitKeys, fd, request.fd, numKeysToWait);
-    lockGuard.unlock();
+    UnlockShards(shardIndexes);
 
     return torch_npu::StoreMessage{ torch_npu::MessageType::INVALID_MSG, request.fd};
 }
 
+torch_npu::StoreMessage ParallelStoreServer::ProcessMultiSetRequest(int fd, const torch_npu::StoreMessage &request) noexcept
+{
+    if (request.keys.size() != request.values.size()) {
+        LOG(ERROR) << "multi set with " << request.keys.size() << " keys and " << request.values.size() << " values";
+        return torch_npu::StoreMessage{ torch_npu::MessageType::MULTI_SET, request.fd};
+    }
+
+    std::vector<std::string> newKeys;
+    auto shardIndexes = LockShards(request.keys);
+    for (auto i = 0UL; i < request.keys.size(); i++) {
+        auto &keyStore = GetShard(request.keys[i]).keyStore;
+        auto pos = keyStore.find(request.keys[i]);
+        if (pos == keyStore.end()) {
+            keyStore.emplace(request.keys[i], request.values[i]);
+            newKeys.emplace_back(request.keys[i]);
+        } else {
+            pos->second = request.values[i];
+        }
+    }
+    UnlockShards(shardIndexes);
+
+    for (auto &key : newKeys) {
+        server_->WakeupWaitingClients(key);
+    }
+
+    return torch_npu::StoreMessage{ torch_npu::MessageType::MULTI_SET, request.fd};
+}
+
+torch_npu::StoreMessage ParallelStoreServer::ProcessMultiGetRequest(int fd, const torch_npu::StoreMessage &request) noexcept
+{
+    std::vector<std::vector<uint8_t>> values;
+    values.reserve(request.keys.size());
+    auto shardIndexes = LockShards(request.keys);
+    for (auto &key : request.keys) {
+        auto &keyStore = GetShard(key).keyStore;
+        auto pos = keyStore.find(key);
+        values.emplace_back(pos != keyStore.end() ? pos->second : std::vector<uint8_t>{});
+    }
+    UnlockShards(shardIndexes);
+
+    return { torch_npu::MessageType::MULTI_GET, request.fd, std::move(values) };
+}
+
 void ParallelStoreServer::InitializeHandlers() noexcept
 {
     requestHandlers_.emplace(torch_npu::MessageType::SET,
@@ -263,6 +319,10 @@ void ParallelStoreServer::InitializeHandlers() noexcept
         [this](int fd, const torch_npu::StoreMessage &req) { return ProcessGetNumKeyRequest(fd, req); });
     requestHandlers_.emplace(torch_npu::MessageType::DELETE_KEY,
         [this](int fd, const torch_npu::StoreMessage &req) { return ProcessDeleteRequest(fd, req); });
+    requestHandlers_.emplace(torch_npu::MessageType::MULTI_SET,
+        [this](int fd, const torch_npu::StoreMessage &req) { return ProcessMultiSetRequest(fd, req); });
+    requestHandlers_.emplace(torch_npu::MessageType::MULTI_GET,
+        [this](int fd, const torch_npu::StoreMessage &req) { return ProcessMultiGetRequest(fd, req); });
 }
 
 void ParallelStoreServer::LocalInitializeHandlers() noexcept
@@ -283,11 +343,43 @@ void ParallelStoreServer::LocalInitializeHandlers() noexcept
         [this](int fd, const torch_npu::StoreMessage &req) { return callback_(fd, req); });
     requestHandlers_.emplace(torch_npu::MessageType::DELETE_KEY,
         [this](int fd, const torch_npu::StoreMessage &req) { return callback_(fd, req); });
+    requestHandlers_.emplace(torch_npu::MessageType::MULTI_SET,
+        [this](int fd, const torch_npu::StoreMessage &req) { return callback_(fd, req); });
+    requestHandlers_.emplace(torch_npu::MessageType::MULTI_GET,
+        [this](int fd, const torch_npu::StoreMessage &req) { return callback_(fd, req); });
 }
 
 bool ParallelStoreServer::CheckAllKeysExistInLock(const std::vector<std::string> &keys) noexcept
 {
-    return std::all_of(keys.begin(), keys.end(), [this](const std::string &key) { return keyStore_.count(key) > 0; });
+    return std::all_of(keys.begin(), keys.end(),
+        [this](const std::string &key) { return GetShard(key).keyStore.count(key) > 0; });
+}
+
+ParallelStoreServer::KeyStoreShard &ParallelStoreServer::GetShard(const std::string &key) noexcept
+{
+    return keyStoreShards_[std::hash<std::string>{}(key) % KEY_STORE_SHARD_NUM];
+}
+
+std::vector<std::size_t> ParallelStoreServer::LockShards(const std::vector<std::string> &keys) noexcept
+{
+    std::vector<std::size_t> shardIndexes;
+    shardIndexes.reserve(keys.size());
+    for (auto &key : keys) {
+        shardIndexes.emplace_back(std::hash<std::string>{}(key) % KEY_STORE_SHARD_NUM);
+    }
+    std::sort(shardIndexes.begin(), shardIndexes.end());
+    shardIndexes.erase(std::unique(shardIndexes.begin(), shardIndexes.end()), shardIndexes.end());
+    for (auto index : shardIndexes) {
+        keyStoreShards_[index].lock.lock();
+    }
+    return shardIndexes;
+}
+
+void ParallelStoreServer::UnlockShards(const std::vector<std::size_t> &shardIndexes) noexcept
+{
+    for (auto it = shardIndexes.rbegin(); it != shardIndexes.rend(); ++it) {
+        keyStoreShards_[*it].lock.unlock();
+    }
 }
 } // torch_npu
 
@@ -419,6 +511,51 @@ std::vector<uint8_t> ParallelTcpStore::get(const std::string &key)
     return getResp.values.empty() ? std::vector<uint8_t>{} : std::move(getResp.values[0]);
 }
 
+std::vector<std::vector<uint8_t>> ParallelTcpStore::multiGet(const std::vector<std::string> &keys)
+{
+    torch_npu::StoreMessage waitReq{ torch_npu::MessageType::WAIT, 0, keys };
+    torch_npu::StoreMessage getReq{ torch_npu::MessageType::MULTI_GET, 0, keys };
+    torch_npu::StoreMessage waitResp;
+    torch_npu::StoreMessage getResp;
+
+    std::lock_guard<std::mutex> lockGuard{ clientMutex_ };
+    DoWait(waitReq, waitResp);
+    int ret = -1;
+    if (proxy_) {
+        ret = proxy_->SyncCall(getReq, getResp);
+    } else {
+        ret = client_->SyncCall(getReq, getResp);
+    }
+    if (ret != 0) {
+        throw std::runtime_error{ std::string("multi get ") + std::to_string(keys.size()) + " keys failed or timeout." };
+    }
+    if (getResp.values.size() != keys.size()) {
+        throw std::runtime_error{ std::string("multi get ") + std::to_string(keys.size()) + " keys returned " +
+            std::to_string(getResp.values.size()) + " values." };
+    }
+    return std::move(getResp.values);
+}
+
+void ParallelTcpStore::multiSet(const std::vector<std::string> &keys, const std::vector<std::vector<uint8_t>> &values)
+{
+    if (keys.size() != values.size()) {
+        throw std::invalid_argument{ std::string("multi set got ") + std::to_string(keys.size()) + " keys and " +
+            std::to_string(values.size()) + " values." };
+    }
+    torch_npu::StoreMessage request{ torch_npu::MessageType::MULTI_SET, 0, keys, values };
+    torch_npu::StoreMessage response;
+    std::lock_guard<std::mutex> lockGuard{ clientMutex_ };
+    int ret = -1;
+    if (proxy_) {
+        ret = proxy_->SyncCall(request, response);
+    } else {
+        ret = client_->SyncCall(request, response);
+    }
+    if (ret != 0) {
+        throw std::runtime_error{ std::string("multi set ") + std::to_string(keys.size()) + " keys failed or timeout." };
+    }
+}
+
 int64_t ParallelTcpStore::add(const std::string &key, int64_t value)
 {
     return IncreaseKey(key, value);
@@ -16,6 +16,7 @@
 #pragma once
 
 #include <pthread.h>
+#include <array>
 #include <cstdint>
 #include <string>
 #include <vector>
@@ -50,18 +51,33 @@ private:
     torch_npu::StoreMessage ProcessCompareSetRequest(int fd, const torch_npu::StoreMessage &request) noexcept;
     torch_npu::StoreMessage ProcessGetNumKeyRequest(int fd, const torch_npu::StoreMessage &request) noexcept;
     torch_npu::StoreMessage ProcessWaitKeysRequest(int fd, const torch_npu::StoreMessage &request) noexcept;
+    torch_npu::StoreMessage ProcessMultiSetRequest(int fd, const torch_npu::StoreMessage &request) noexcept;
+    torch_npu::StoreMessage ProcessMultiGetRequest(int fd, const torch_npu::StoreMessage &request) noexcept;
     void InitializeHandlers() noexcept;
     void LocalInitializeHandlers() noexcept;
     bool CheckAllKeysExistInLock(const std::vector<std::string> &keys) noexcept;
 
+    /* *
+     * @brief one shard of the key space, keys are spread over the shards by hash so requests on different
+     * keys only contend on the same shard lock.
+     */
+    struct KeyStoreShard {
+        torch_npu::SpinLock lock;
+        std::unordered_map<std::string, std::vector<uint8_t>> keyStore;
+    };
+    static constexpr std::size_t KEY_STORE_SHARD_NUM = 64U;
+    KeyStoreShard &GetShard(const std::string &key) noexcept;
+    // requests on several keys lock their shards in index order, so they never dead lock each other
+    std::vector<std::size_t> LockShards(const std::vector<std::string> &keys) noexcept;
+    void UnlockShards(const std::vector<std::size_t> &shardIndexes) noexcept;
+
 private:
     CallBackFn callback_;
     const std::string localSocketPath_;
     using RequestHandler = std::function<torch_npu::StoreMessage(int, const torch_npu::StoreMessage &)>;
     std::unique_ptr<torch_npu::ParallelTcpServer> server_;
     std::unordered_map<torch_npu::MessageType, RequestHandler> requestHandlers_;
-    std::unordered_map<std::string, std::vector<uint8_t>> keyStore_;
-    SpinLock serverLock_;
+    std::array<KeyStoreShard, KEY_STORE_SHARD_NUM> keyStoreShards_;
     std::mutex initWaitMutex_;
     std::condition_variable initWaitCond_;
     std::atomic<bool> workersReady_{ false };
@@ -86,6 +102,8 @@ public:
     bool deleteKey(const std::string &key) override;
     bool check(const std::vector<std::string> &keys) override;
     int64_t getNumKeys() override;
+    std::vector<std::vector<uint8_t>> multiGet(const std::vector<std::string> &keys) override;
+    void multiSet(const std::vector<std::string> &keys, const std::vector<std::vector<uint8_t>> &values) override;
     void wait(const std::vector<std::string> &keys) override;
     void wait(const std::vector<std::string> &keys, const std::chrono::milliseconds &timeout) override;
     const std::chrono::milliseconds &getTimeout() const noexcept override;
@@ -34,7 +34,9 @@ enum class MessageType : uint8_t {
     WATCH_KEY,
     DELETE_KEY,
     INVALID_MSG,
-    SKIP_MSG
+    SKIP_MSG,
+    MULTI_SET,
+    MULTI_GET
 };
 
 enum class MessageCheckKeyRes : uint8_t {
@@ -86,6 +88,10 @@ struct StoreMessage {
     StoreMessage(MessageType type, int fd, std::vector<std::vector<uint8_t>> vs) noexcept : mt{ type }, fd { fd }, values{ std::move(vs) }
     {}
 
+    StoreMessage(MessageType type, int fd, std::vector<std::string> ks, std::vector<std::vector<uint8_t>> vs) noexcept
+        : mt{ type }, fd{ fd }, keys{ std::move(ks) }, values{ std::move(vs) }
+    {}
+
     int fd { 0 };
     MessageType mt;
     std::vector<std::string> keys;
@@ -8,7 +8,7 @@ except ImportError as e:
 import os
 import logging
 from datetime import timedelta
-from typing import Dict, Optional, Union, cast
+from typing import Dict, List, Optional, Union, cast
 from torch.distributed.rendezvous import register_rendezvous_handler as register_rendezvous_handler
 from torch._C._distributed_c10d import _DEFAULT_PG_TIMEOUT
 from torch.distributed import Store, PrefixStore
@@ -21,6 +21,7 @@ from torch_npu.distributed import ParallelStore
 log = logging.getLogger(__name__)
 
 _default_timeout_seconds = 600
+_default_tree_fanout = 8
 
 __all__ = []
 
@@ -67,6 +68,108 @@ def _create_c10d_store(hostname, port, rank, world_size, timeout) -> Store:
         )
 
 
+class _StoreTree:
+    """
+    Tree over the ranks used by the store barrier and broadcast, so that every key is waited on by a single
+    rank and no rank waits on more than ``fanout`` + ``local_world_size`` keys.
+
+    Ranks are renumbered so that ``root`` is 0, then grouped by node in blocks of ``local_world_size``.
+    The first rank of each block is the node leader, the other ranks of the block are its children, and
+    the node leaders form a ``fanout``-ary tree. Depth is therefore logarithmic in the number of nodes.
+    """
+
+    def __init__(self, rank: int, world_size: int, root: int = 0, local_world_size: int = 1,
+                 fanout: int = _default_tree_fanout):
+        if not 0 <= rank < world_size or not 0 <= root < world_size:
+            raise ValueError(f"rank {rank} and root {root} must be in [0, {world_size}).")
+        self.rank = rank
+        self.world_size = world_size
+        self.root = root
+        self.local_world_size = max(local_world_size, 1)
+        self.fanout = max(fanout, 1)
+
+    def _to_rank(self, vrank: int) -> int:
+        return (vrank + self.root) % self.world_size
+
+    @property
+    def parent(self) -> Optional[int]:
+        vrank = (self.rank - self.root) % self.world_size
+        node, local = divmod(vrank, self.local_world_size)
+        if local != 0:
+            return self._to_rank(node * self.local_world_size)
+        if node == 0:
+            return None
+        return self._to_rank((node - 1) // self.fanout * self.local_world_size)
+
+    @property
+    def children(self) -> List[int]:
+        vrank = (self.rank - self.root) % self.world_size
+        node, local = divmod(vrank, self.local_world_size)
+        if local != 0:
+            return []
+        children = list(range(vrank + 1, min(vrank + self.local_world_size, self.world_size)))
+        first_child_node = node * self.fanout + 1
+        for child_node in range(first_child_node, first_child_node + self.fanout):
+            if child_node * self.local_world_size >= self.world_size:
+                break
+            children.append(child_node * self.local_world_size)
+        return [self._to_rank(child) for child in children]
+
+
+def _get_tree_local_world_size() -> int:
+    # with the tiered store the ranks of a node reach the store through their agent, so the tree keeps
+    # them under one node leader and only the leaders fan out across nodes
+    if str(os.environ.get("ENABLE_TIERED_PARALLEL_TCPSTORE", None)).lower() != "true":
+        return 1
+    try:
+        return max(int(os.environ.get("LOCAL_WORLD_SIZE", 1)), 1)
+    except ValueError:
+        return 1
+
+
+def _store_barrier(store: Store, rank: int, world_size: int, tag: str, local_world_size: Optional[int] = None,
+                   fanout: int = _default_tree_fanout) -> None:
+    """
+    Block until all the ``world_size`` ranks have entered the barrier ``tag``.
+    Arrivals are gathered up the tree and the release is sent down it, ``tag`` must not be reused.
+    """
+    if local_world_size is None:
+        local_world_size = _get_tree_local_world_size()
+    tree = _StoreTree(rank, world_size, 0, local_world_size, fanout)
+    children = tree.children
+    if children:
+        arrive_keys = [f"{tag}/arrive/{child}" for child in children]
+        store.wait(arrive_keys)
+        for key in arrive_keys:
+            store.delete_key(key)
+    parent = tree.parent
+    if parent is not None:
+        store.set(f"{tag}/arrive/{rank}", b"1")
+        store.wait([f"{tag}/release/{parent}"])
+    if children:
+        store.set(f"{tag}/release/{rank}", b"1")
+
+
+def _store_broadcast(store: Store, rank: int, world_size: int, key: str, value: Optional[bytes] = None,
+                     src: int = 0, local_world_size: Optional[int] = None,
+                     fanout: int = _default_tree_fanout) -> bytes:
+    """
+    Send ``value`` of rank ``src`` to all the ranks and return it, every rank gets it from its tree parent.
+    """
+    if local_world_size is None:
+        local_world_size = _get_tree_local_world_size()
+    tree = _StoreTree(rank, world_size, src, local_world_size, fanout)
+    parent = tree.parent
+    if parent is None:
+        if value is None:
+            raise ValueError(f"value of broadcast {key} must be given on the source rank {src}.")
+    else:
+        value = store.get(f"{key}/tree/{parent}")
+    if tree.children:
+        store.set(f"{key}/tree/{rank}", value)
+    return value
+
+
 def _parallel_rendezvous_handler(
     url: str, timeout: timedelta = _DEFAULT_PG_TIMEOUT, **kwargs
 ):
@@ -123,6 +226,7 @@ class _ParallelTCPRendezvous(RendezvousHandler):
         self.enable_tiered = enable_tiered
         self.timeout = timedelta(seconds=timeout)
         self._store: Optional[Store] = None
+        self._round = 0
 
     def get_backend(self) -> str:
         return "parallel"
@@ -143,9 +247,25 @@ class _ParallelTCPRendezvous(RendezvousHandler):
                 multi_tenant=True,
             )
         store = PrefixStore(self.run_id, self._store)
-        bootstrap_store_info = RendezvousStoreInfo.build(self.rank, store)
+        bootstrap_store_info = self._build_store_info(store)
+        # the round is complete once every agent has joined, the barrier keys are not reused by the next round
+        _store_barrier(store, self.rank, self.world_size, f"parallel_rendezvous/barrier/{self._round}",
+                       local_world_size=1)
+        self._round += 1
         return RendezvousInfo(store, self.rank, self.world_size, bootstrap_store_info)
 
+    def _build_store_info(self, store: Store) -> RendezvousStoreInfo:
+        # the master endpoint is sent down the store tree instead of every agent waiting on the same key
+        value = None
+        if self.rank == 0:
+            store_info = RendezvousStoreInfo.build(self.rank, store)
+            value = f"{store_info.master_addr}:{store_info.master_port}".encode(encoding="UTF-8")
+        # the keys of a previous round are still in the store, the round keeps a child from reading its endpoint
+        value = _store_broadcast(store, self.rank, self.world_size, f"parallel_rendezvous/store_info/{self._round}",
+                                 value, local_world_size=1)
+        master_addr, master_port = value.decode(encoding="UTF-8").rsplit(":", 1)
+        return RendezvousStoreInfo(master_addr, int(master_port))
+
     def is_closed(self):
         return False
 
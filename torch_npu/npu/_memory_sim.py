@@ -0,0 +1,755 @@
+"""
+Offline replay of the NPUCachingAllocator on the alloc/free history of a memory snapshot.
+
+The trace recorded by ``torch_npu.npu.memory._record_memory_history`` and saved by
+``torch_npu.npu.memory._dump_snapshot`` is replayed on a CPU-only port of the allocator policy: size
+rounding, small and large pools, best-fit block search, block splitting and merging,
+``max_split_size_mb``, ``garbage_collection_threshold`` and ``expandable_segments``. This gives the
+peak reserved memory, the fragmentation and the OOM points of another ``PYTORCH_NPU_ALLOC_CONF``
+without running the job again on the NPU.
+
+The module only depends on the standard library and numpy, so it can be run as a script:
+
+    python _memory_sim.py dump_snapshot.pickle --device-memory-gb 64 \
+        --alloc-conf "" --alloc-conf "max_split_size_mb:256" --alloc-conf "expandable_segments:True"
+
+Snapshots saved in the compact format of ``_memory_trace.py`` are replayed from their event arrays, without
+building the trace entry dicts.
+
+What is not replayed: allocations done before the history was enabled or dropped by ``max_entries``
+(their frees are ignored), the extra aligning split of ``base_addr_aligned_kb``, and cross stream uses,
+the frees being replayed when the recorded allocator completed them.
+"""
+import argparse
+import bisect
+import math
+import os
+import pickle
+
+import numpy as np
+
+try:
+    from ._memory_trace import ACTION_CODES, MemoryTraceReader, entries_to_array, is_compact_trace
+except ImportError:
+    # run as a script
+    from _memory_trace import ACTION_CODES, MemoryTraceReader, entries_to_array, is_compact_trace
+
+__all__ = []
+
+# allocator constants of NPUCachingAllocator.cpp
+kMinBlockSize = 512
+kSmallSize = 1048576
+kSmallBuffer = 2097152
+kLargeBuffer = 20971520
+kMinLargeAlloc = 10485760
+kRoundLarge = 2097152
+kRoundPadding = 32
+# address space given to an expandable segment when the device memory is not known
+kDefaultExpandableVirAddrSize = 1 << 40
+
+_ALLOC = ACTION_CODES["alloc"]
+_FREE_REQUESTED = ACTION_CODES["free_requested"]
+_FREE_COMPLETED = ACTION_CODES["free_completed"]
+_SEGMENT_ALLOC = ACTION_CODES["segment_alloc"]
+_SEGMENT_FREE = ACTION_CODES["segment_free"]
+_SEGMENT_MAP = ACTION_CODES["segment_map"]
+_SEGMENT_UNMAP = ACTION_CODES["segment_unmap"]
+_OOM = ACTION_CODES["oom"]
+
+
+class AllocatorConfig:
+    """The PYTORCH_NPU_ALLOC_CONF options replayed by the simulator."""
+
+    def __init__(self, max_split_size=math.inf, garbage_collection_threshold=0.0, expandable_segments=False):
+        self.max_split_size = max_split_size
+        self.garbage_collection_threshold = garbage_collection_threshold
+        self.expandable_segments = expandable_segments
+
+    def __repr__(self):
+        return self.to_env_string() or "default"
+
+    @classmethod
+    def from_env_string(cls, conf: str):
+        """Parse a PYTORCH_NPU_ALLOC_CONF value with the checks of CachingAllocatorConfig::parseArgs."""
+        config = cls()
+        for option in filter(None, (item.strip() for item in (conf or "").split(","))):
+            key, sep, value = (part.strip() for part in option.partition(":"))
+            if not sep or not value:
+                raise ValueError(f"Error, expecting {key} value")
+            if key == "max_split_size_mb":
+                max_split_size_mb = int(value)
+                if max_split_size_mb <= kLargeBuffer // (1024 * 1024):
+                    raise ValueError(f"CachingAllocator option max_split_size_mb too small, "
+                                     f"must be > {kLargeBuffer // (1024 * 1024)}")
+                config.max_split_size = max_split_size_mb * 1024 * 1024
+            elif key == "garbage_collection_threshold":
+                threshold = float(value)
+                if not 0 < threshold < 1.0:
+                    raise ValueError("garbage_collect_threshold should be set in 0.0~1.0")
+                config.garbage_collection_threshold = threshold
+            elif key == "expandable_segments":
+                if value not in ("True", "False"):
+                    raise ValueError("Expected a single True/False argument for expandable_segments")
+                config.expandable_segments = value == "True"
+            elif key == "base_addr_aligned_kb":
+                # the aligning split only moves the block start, it is not replayed
+                continue
+            else:
+                raise ValueError(f"Unrecognized CachingAllocator option: {key}")
+        return config
+
+    def to_env_string(self) -> str:
+        options = []
+        if self.max_split_size != math.inf:
+            options.append(f"max_split_size_mb:{self.max_split_size // (1024 * 1024)}")
+        if self.garbage_collection_threshold > 0:
+            options.append(f"garbage_collection_threshold:{self.garbage_collection_threshold}")
+        if self.expandable_segments:
+            options.append("expandable_segments:True")
+        return ",".join(options)
+
+
+class _Block:
+    __slots__ = ("addr", "size", "stream", "pool", "allocated", "mapped", "prev", "next", "segment",
+                 "requested_size", "gc_count")
+
+    def __init__(self, addr, size, stream, pool, segment=None):
+        self.addr = addr
+        self.size = size
+        self.stream = stream
+        self.pool = pool
+        self.allocated = False
+        self.mapped = True
+        self.prev = None
+        self.next = None
+        self.segment = segment
+        self.requested_size = 0
+        self.gc_count = 0
+
+    def is_split(self) -> bool:
+        return self.prev is not None or self.next is not None
+
+    def splice(self, before, after):
+        if before is not None:
+            before.next = self
+        self.prev = before
+        if after is not None:
+            after.prev = self
+        self.next = after
+
+
+class _BlockPool:
+    """
+    The cached free blocks of a pool, sorted by (stream, size, addr) as BlockComparatorSize, and its unmapped
+    expandable blocks, sorted by (stream, addr) as BlockComparatorAddress.
+    The gc age of the free blocks is the number of searches of the pool since they were put in it, kept as
+    the search count at insertion so a search does not have to touch every block.
+    """
+
+    def __init__(self, is_small: bool):
+        self.is_small = is_small
+        self.keys = []
+        self.unmapped_keys = []
+        self.blocks = {}
+        self.unmapped = {}
+        self.search_count = 0
+
+    def insert(self, block: _Block):
+        key = (block.stream, block.size, block.addr)
+        bisect.insort(self.keys, key)
+        self.blocks[key] = block
+        block.gc_count = self.search_count - block.gc_count
+
+    def erase(self, block: _Block):
+        key = (block.stream, block.size, block.addr)
+        del self.keys[bisect.bisect_left(self.keys, key)]
+        del self.blocks[key]
+        block.gc_count = self.search_count - block.gc_count
+
+    def age(self, block: _Block) -> int:
+        return self.search_count - block.gc_count
+
+    def insert_unmapped(self, block: _Block):
+        key = (block.stream, block.addr)
+        bisect.insort(self.unmapped_keys, key)
+        self.unmapped[key] = block
+
+    def erase_unmapped(self, block: _Block):
+        key = (block.stream, block.addr)
+        del self.unmapped_keys[bisect.bisect_left(self.unmapped_keys, key)]
+        del self.unmapped[key]
+
+
+class _ExpandableSegment:
+
+    def __init__(self, addr, segment_size, max_handles, stream):
+        self.addr = addr
+        self.segment_size = segment_size
+        self.max_handles = max_handles
+        self.stream = stream
+
+    @property
+    def size(self) -> int:
+        return self.max_handles * self.segment_size
+
+    def map(self, addr, size, can_map) -> tuple:
+        """Map the pages of [addr, addr + size), return the mapped (addr, size), a size of 0 when out of memory."""
+        begin = (addr - self.addr) // self.segment_size
+        end = -(-(addr + size - self.addr) // self.segment_size)
+        if not can_map((end - begin) * self.segment_size):
+            return addr, 0
+        return self.addr + begin * self.segment_size, (end - begin) * self.segment_size
+
+    def unmap(self, addr, size) -> tuple:
+        """Unmap the pages fully inside [addr, addr + size), return the unmapped (addr, size)."""
+        begin = -(-(addr - self.addr) // self.segment_size)
+        end = (addr + size - self.addr) // self.segment_size
+        if begin >= end:
+            return addr, 0
+        return self.addr + begin * self.segment_size, (end - begin) * self.segment_size
+
+
+class CachingAllocatorSimulator:
+    """
+    Port of the block management of NPUCachingAllocator for one device.
+    device_memory is the memory the allocator may reserve, as the memory fraction sets it, None for no
+    limit. As in the allocator, the garbage collection only runs with such a limit.
+    """
+
+    def __init__(self, config: AllocatorConfig = None, device_memory: int = None):
+        self.config = config or AllocatorConfig()
+        self.device_memory = device_memory
+        self.small_blocks = _BlockPool(True)
+        self.large_blocks = _BlockPool(False)
+        self.active_blocks = {}
+        self.expandable_segments = []
+        self.total_allocated_memory = 0
+        self.allocated_bytes = 0
+        self.requested_bytes = 0
+        self.num_segment_allocs = 0
+        self.num_alloc_retries = 0
+        self.num_ooms = 0
+        self._next_addr = kLargeBuffer
+
+    @staticmethod
+    def round_size(size: int) -> int:
+        size = size + kRoundPadding
+        if size < kMinBlockSize:
+            return kMinBlockSize
+        return kMinBlockSize * ((size + kMinBlockSize - 1) // kMinBlockSize)
+
+    @staticmethod
+    def get_allocation_size(size: int) -> int:
+        if size <= kSmallSize:
+            return kSmallBuffer
+        elif size < kMinLargeAlloc:
+            return kLargeBuffer
+        return kRoundLarge * ((size + kRoundLarge - 1) // kRoundLarge)
+
+    @property
+    def set_fraction(self) -> bool:
+        return self.device_memory is not None
+
+    def malloc(self, orig_size: int, stream: int = 0):
+        """Return the address of the new block, None when the allocation runs out of memory."""
+        size = self.round_size(orig_size)
+        pool = self.small_blocks if size <= kSmallSize else self.large_blocks
+        alloc_size = self.get_allocation_size(size)
+        block = self._get_free_block(pool, size, stream)
+        if block is None:
+            if self.set_fraction and self.config.garbage_collection_threshold > 0:
+                self._garbage_collect_cached_blocks()
+            block = self._alloc_block(pool, size, alloc_size, stream)
+            if block is None and self._release_available_cached_blocks(pool, size, stream):
+                block = self._alloc_block(pool, size, alloc_size, stream)
+        if block is None:
+            self.num_alloc_retries += 1
+            self.release_cached_blocks()
+            block = self._alloc_block(pool, size, alloc_size, stream)
+        if block is None:
+            self.num_ooms += 1
+            return None
+        return self._alloc_found_block(block, size, orig_size).addr
+
+    def free(self, addr: int):
+        block = self.active_blocks.pop(addr)
+        block.allocated = False
+        self.allocated_bytes -= block.size
+        self.requested_bytes -= block.requested_size
+        pool = block.pool
+        for merge_candidate in (block.prev, block.next):
+            self._try_merge_blocks(block, merge_candidate, pool)
+        pool.insert(block)
+
+    def empty_cache(self):
+        self.release_cached_blocks()
+
+    def release_cached_blocks(self):
+        self._release_blocks(self.large_blocks)
+        self._release_blocks(self.small_blocks)
+
+    def _new_address(self, size: int) -> int:
+        addr = self._next_addr
+        self._next_addr += -(-size // kLargeBuffer) * kLargeBuffer
+        return addr
+
+    def _get_free_block(self, pool: _BlockPool, size: int, stream: int):
+        if self.set_fraction and self.config.garbage_collection_threshold > 0:
+            pool.search_count += 1
+        index = bisect.bisect_left(pool.keys, (stream, size, 0))
+        if index == len(pool.keys) or pool.keys[index][0] != stream:
+            return None
+        block = pool.blocks[pool.keys[index]]
+        if block.segment is not None:
+            if self.config.expandable_segments:
+                # an expandable block is as large as the unmapped space after it
+                def expandable_size(candidate):
+                    return candidate.size + (candidate.next.size if candidate.next is not None and
+                                             not candidate.next.mapped else 0)
+                while block.segment is not None and index + 1 < len(pool.keys) and \
+                        pool.keys[index + 1][0] == stream and \
+                        expandable_size(pool.blocks[pool.keys[index + 1]]) < expandable_size(block):
+                    index += 1
+                    block = pool.blocks[pool.keys[index]]
+            else:
+                index += 1
+                while index < len(pool.keys) and pool.keys[index][0] == stream and \
+                        pool.blocks[pool.keys[index]].segment is not None:
+                    index += 1
+                if index == len(pool.keys) or pool.keys[index][0] != stream:
+                    return None
+                block = pool.blocks[pool.keys[index]]
+        # do not return an oversized block for a large request, and round an oversized one only within a limit
+        if size < self.config.max_split_size <= block.size:
+            return None
+        if size >= self.config.max_split_size and block.size >= size + kLargeBuffer:
+            return None
+        pool.erase(block)
+        block.gc_count = 0
+        return block
+
+    def _should_split(self, block: _Block, size: int) -> bool:
+        remaining = block.size - size
+        if block.pool.is_small or self.config.expandable_segments:
+            return remaining >= kMinBlockSize
+        return size < self.config.max_split_size and remaining > kSmallSize
+
+    def _alloc_found_block(self, block: _Block, size: int, orig_size: int) -> _Block:
+        if self._should_split(block, size):
+            remaining = block
+            block = _Block(remaining.addr, size, remaining.stream, remaining.pool, remaining.segment)
+            block.splice(remaining.prev, remaining)
+            remaining.addr += size
+            remaining.size -= size
+            remaining.pool.insert(remaining)
+        block.allocated = True
+        block.requested_size = orig_size
+        self.active_blocks[block.addr] = block
+        self.allocated_bytes += block.size
+        self.requested_bytes += orig_size
+        return block
+
+    def _can_reserve(self, size: int) -> bool:
+        return self.device_memory is None or self.total_allocated_memory + size <= self.device_memory
+
+    def _alloc_block(self, pool: _BlockPool, size: int, alloc_size: int, stream: int):
+        if self.set_fraction and not self._can_reserve(alloc_size):
+            return None
+        if self.config.expandable_segments:
+            return self._try_allocate_expandable_block(pool, size, stream)
+        self.total_allocated_memory += alloc_size
+        self.num_segment_allocs += 1
+        return _Block(self._new_address(alloc_size), alloc_size, stream, pool)
+
+    def _release_block(self, block: _Block):
+        self.total_allocated_memory -= block.size
+        block.pool.erase(block)
+
+    def _release_available_cached_blocks(self, pool: _BlockPool, size: int, stream: int) -> bool:
+        """Free the oversize blocks of the stream, only enough to satisfy the allocation."""
+        if self.config.max_split_size == math.inf:
+            return False
+        key_size = max(size, self.config.max_split_size)
+        index = bisect.bisect_left(pool.keys, (stream, key_size, 0))
+        if index < len(pool.keys) and pool.keys[index][0] == stream:
+            block = pool.blocks[pool.keys[index]]
+            if block.segment is None:
+                self._release_block(block)
+            return True
+        # no single block is large enough, free the oversize blocks from the largest one
+        total_released = 0
+        index -= 1
+        while index >= 0 and total_released < key_size:
+            block = pool.blocks[pool.keys[index]]
+            if block.stream != stream or block.size < self.config.max_split_size:
+                break
+            if block.segment is None:
+                total_released += block.size
+                self._release_block(block)
+            index -= 1
+        return total_released >= key_size
+
+    def _garbage_collect_cached_blocks(self):
+        gc_threshold = int(self.config.garbage_collection_threshold * self.device_memory)
+        if self.total_allocated_memory <= gc_threshold:
+            return
+        target_size = self.total_allocated_memory - gc_threshold
+        pool = self.large_blocks
+        freeable = [pool.blocks[key] for key in pool.keys]
+        freeable = [block for block in freeable if not block.is_split() and block.segment is None]
+        if not freeable:
+            return
+        total_age = float(sum(pool.age(block) for block in freeable))
+        gc_reclaimed = 0
+        block_freed = True
+        while gc_reclaimed < target_size and block_freed and freeable:
+            # free the blocks older than the average age first
+            age_threshold = total_age / len(freeable)
+            block_freed = False
+            remained = []
+            for block in freeable:
+                age = pool.age(block)
+                if age >= age_threshold:
+                    block_freed = True
+                    gc_reclaimed += block.size
+                    total_age -= age
+                    self._release_block(block)
+                else:
+                    remained.append(block)
+            freeable = remained
+
+    def _release_blocks(self, pool: _BlockPool):
+        to_unmap = []
+        for key in list(pool.keys):
+            block = pool.blocks[key]
+            if block.segment is not None:
+                to_unmap.append(block)
+            elif not block.is_split():
+                self._release_block(block)
+        for block in to_unmap:
+            self._unmap_block(block)
+            if not block.mapped and not block.is_split():
+                pool.erase_unmapped(block)
+                self.expandable_segments.remove(block.segment)
+
+    def _try_merge_blocks(self, dst: _Block, src: _Block, pool: _BlockPool) -> int:
+        if src is None or src.allocated or dst.mapped != src.mapped:
+            return 0
+        if src.mapped:
+            pool.erase(src)
+        else:
+            pool.erase_unmapped(src)
+        if dst.prev is src:
+            dst.addr = src.addr
+            dst.prev = src.prev
+            if dst.prev is not None:
+                dst.prev.next = dst
+        else:
+            dst.next = src.next
+            if dst.next is not None:
+                dst.next.prev = dst
+        dst.size += src.size
+        return src.size
+
+    def _find_expandable_block(self, pool: _BlockPool, size: int, stream: int) -> _Block:
+        def allocatable(block):
+            return block is not None and not block.allocated
+
+        def has_available_address_space(block):
+            available = 0
+            while available < size and allocatable(block):
+                available += block.size
+                block = block.next
+            return available >= size
+
+        index = bisect.bisect_left(pool.unmapped_keys, (stream, 0))
+        while index < len(pool.unmapped_keys) and pool.unmapped_keys[index][0] == stream:
+            candidate = pool.unmapped[pool.unmapped_keys[index]]
+            # a free block right before the lowest unmapped one is used as well
+            if allocatable(candidate.prev):
+                candidate = candidate.prev
+            if has_available_address_space(candidate):
+                return candidate
+            index += 1
+        segment_size = kSmallBuffer if pool.is_small else kLargeBuffer
+        vir_addr_size = self.device_memory + self.device_memory // 8 if self.device_memory is not None \
+            else kDefaultExpandableVirAddrSize
+        max_handles = -(-vir_addr_size // segment_size)
+        segment = _ExpandableSegment(self._new_address(max_handles * segment_size), segment_size, max_handles,
+                                     stream)
+        self.expandable_segments.append(segment)
+        candidate = _Block(segment.addr, segment.size, stream, pool, segment)
+        candidate.mapped = False
+        pool.insert_unmapped(candidate)
+        return candidate
+
+    def _map_block(self, to_map: _Block, size: int) -> bool:
+        mapped_addr, mapped_size = to_map.segment.map(to_map.addr, size, self._can_reserve)
+        if mapped_size == 0:
+            return False
+        pool = to_map.pool
+        pool.erase_unmapped(to_map)
+        to_map.mapped = True
+        if mapped_size < to_map.size:
+            remaining = _Block(to_map.addr + mapped_size, to_map.size - mapped_size, to_map.stream, pool,
+                               to_map.segment)
+            remaining.mapped = False
+            remaining.splice(to_map, to_map.next)
+            pool.insert_unmapped(remaining)
+            to_map.size = mapped_size
+        self._try_merge_blocks(to_map, to_map.prev, pool)
+        self._try_merge_blocks(to_map, to_map.next, pool)
+        pool.insert(to_map)
+        self.total_allocated_memory += mapped_size
+        self.num_segment_allocs += 1
+        return True
+
+    def _try_allocate_expandable_block(self, pool: _BlockPool, size: int, stream: int):
+        candidate = self._find_expandable_block(pool, size, stream)
+        if not candidate.mapped and not self._map_block(candidate, min(candidate.size, size)):
+            return None
+        while candidate.size < size:
+            # the candidate is free and followed by unmapped space, mapping it merges them
+            new_candidate = candidate.next
+            if not self._map_block(new_candidate, min(size - candidate.size, new_candidate.size)):
+                return None
+            candidate = new_candidate
+        pool.erase(candidate)
+        return candidate
+
+    def _unmap_block(self, block: _Block):
+        unmapped_addr, unmapped_size = block.segment.unmap(block.addr, block.size)
+        if unmapped_size == 0:
+            return
+        pool = block.pool
+        pool.erase(block)
+        before_size = unmapped_addr - block.addr
+        if before_size > 0:
+            before_free = _Block(block.addr, before_size, block.stream, pool, block.segment)
+            before_free.splice(block.prev, block)
+            pool.insert(before_free)
+        after_size = block.size - (before_size + unmapped_size)
+        if after_size > 0:
+            after_free = _Block(unmapped_addr + unmapped_size, after_size, block.stream, pool, block.segment)
+            after_free.splice(block, block.next)
+            pool.insert(after_free)
+        block.addr = unmapped_addr
+        block.size = unmapped_size
+        block.mapped = False
+        self._try_merge_blocks(block, block.prev, pool)
+        self._try_merge_blocks(block, block.next, pool)
+        pool.insert_unmapped(block)
+        self.total_allocated_memory -= unmapped_size
+
+
+class SimulationResult:
+    """
+    Memory of one replay after each replayed event, in numpy arrays: reserved (memory held by the allocator),
+    allocated (rounded block sizes in use) and requested. event_indexes gives the index of the replayed events
+    in the device trace.
+    ooms lists (trace index, requested size, allocated, reserved) of the allocations that failed.
+    """
+
+    def __init__(self, config: AllocatorConfig, event_indexes, reserved, allocated, requested, ooms,
+                 num_segment_allocs, num_alloc_retries):
+        self.config = config
+        self.event_indexes = event_indexes
+        self.reserved = reserved
+        self.allocated = allocated
+        self.requested = requested
+        self.ooms = ooms
+        self.num_segment_allocs = num_segment_allocs
+        self.num_alloc_retries = num_alloc_retries
+
+    @property
+    def peak_reserved(self) -> int:
+        return int(self.reserved.max()) if self.reserved.size else 0
+
+    @property
+    def peak_allocated(self) -> int:
+        return int(self.allocated.max()) if self.allocated.size else 0
+
+    @property
+    def fragmentation(self) -> float:
+        """Share of the reserved memory not allocated to a block, at the peak reserved."""
+        if not self.reserved.size or not self.peak_reserved:
+            return 0.0
+        index = int(self.reserved.argmax())
+        return 1 - self.allocated[index] / self.reserved[index]
+
+    @property
+    def max_cached(self) -> int:
+        """Largest reserved memory not allocated to a block over the trace."""
+        return int((self.reserved - self.allocated).max()) if self.reserved.size else 0
+
+    def summary(self) -> dict:
+        return {
+            "config": repr(self.config),
+            "peak_reserved": self.peak_reserved,
+            "peak_allocated": self.peak_allocated,
+            "fragmentation": round(float(self.fragmentation), 4),
+            "max_cached": self.max_cached,
+            "segment_allocs": self.num_segment_allocs,
+            "alloc_retries": self.num_alloc_retries,
+            "ooms": len(self.ooms),
+            "first_oom_event": self.ooms[0][0] if self.ooms else None,
+        }
+
+
+class _Trace:
+    """The events of a device trace replayed by the simulator, in parallel lists."""
+
+    # replayed actions
+    ALLOC = 0
+    FREE = 1
+    EMPTY_CACHE = 2
+
+    def __init__(self, device_trace):
+        """device_trace is a device of snapshot["device_traces"] or its EVENT_DTYPE array of _memory_trace."""
+        events = device_trace if isinstance(device_trace, np.ndarray) else entries_to_array(device_trace)
+        actions = events["action"].astype(np.int64)
+        sizes = events["size"].astype(np.int64)
+        # frees are replayed when completed, traces of allocators that never delay them only have requests
+        free_action = _FREE_COMPLETED if np.any(actions == _FREE_COMPLETED) else _FREE_REQUESTED
+        segment_release = np.isin(actions, (_SEGMENT_FREE, _SEGMENT_UNMAP))
+        # segments released in an allocation are followed by its new segment or its oom,
+        # the others were released by empty_cache
+        next_actions = np.append(actions[1:], -1)
+        empty_cache = segment_release & ~np.isin(next_actions, (_SEGMENT_FREE, _SEGMENT_UNMAP, _SEGMENT_ALLOC,
+                                                                _SEGMENT_MAP, _OOM))
+        kinds = np.full(len(events), -1, dtype=np.int64)
+        kinds[actions == _ALLOC] = self.ALLOC
+        kinds[actions == free_action] = self.FREE
+        kinds[empty_cache] = self.EMPTY_CACHE
+        indexes = np.flatnonzero(kinds >= 0)
+        self.kinds = kinds[indexes].tolist()
+        self.indexes = indexes.tolist()
+        self.addrs = events["addr"][indexes].tolist()
+        self.sizes = sizes[indexes].tolist()
+        self.streams = events["stream"][indexes].tolist()
+        self.recorded_reserved_delta = np.where(np.isin(actions, (_SEGMENT_ALLOC, _SEGMENT_MAP)), sizes,
+                                                np.where(segment_release, -sizes, 0))
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def recorded_peak_reserved(self) -> int:
+        """Peak of the memory reserved in the recorded trace, relative to its start."""
+        if not self.recorded_reserved_delta.size:
+            return 0
+        return int(max(np.cumsum(self.recorded_reserved_delta).max(), 0))
+
+
+def replay(device_trace: list, config: AllocatorConfig = None, device_memory: int = None,
+           replay_empty_cache: bool = True) -> SimulationResult:
+    """Replay the alloc/free events of device_trace, a device of snapshot["device_traces"], on the allocator."""
+    trace = device_trace if isinstance(device_trace, _Trace) else _Trace(device_trace)
+    simulator = CachingAllocatorSimulator(config, device_memory)
+    reserved = np.zeros(len(trace), dtype=np.int64)
+    allocated = np.zeros(len(trace), dtype=np.int64)
+    requested = np.zeros(len(trace), dtype=np.int64)
+    ooms = []
+    # recorded address -> simulated address of the live blocks
+    live_blocks = {}
+    for index, (kind, addr, size, stream) in enumerate(zip(trace.kinds, trace.addrs, trace.sizes, trace.streams)):
+        if kind == _Trace.ALLOC:
+            sim_addr = simulator.malloc(size, stream)
+            if sim_addr is None:
+                ooms.append((trace.indexes[index], size, simulator.allocated_bytes,
+                             simulator.total_allocated_memory))
+            else:
+                live_blocks[addr] = sim_addr
+        elif kind == _Trace.FREE:
+            # blocks allocated before the history started or whose allocation failed are not freed
+            sim_addr = live_blocks.pop(addr, None)
+            if sim_addr is not None:
+                simulator.free(sim_addr)
+        elif replay_empty_cache:
+            simulator.empty_cache()
+        reserved[index] = simulator.total_allocated_memory
+        allocated[index] = simulator.allocated_bytes
+        requested[index] = simulator.requested_bytes
+    return SimulationResult(simulator.config, np.array(trace.indexes, dtype=np.int64), reserved, allocated, requested,
+                            ooms, simulator.num_segment_allocs, simulator.num_alloc_retries)
+
+
+def compare_configs(device_trace: list, configs: list, device_memory: int = None,
+                    replay_empty_cache: bool = True) -> list:
+    """Replay device_trace once per config, configs being AllocatorConfig or PYTORCH_NPU_ALLOC_CONF strings."""
+    trace = _Trace(device_trace)
+    return [replay(trace, config if isinstance(config, AllocatorConfig) else AllocatorConfig.from_env_string(config),
+                   device_memory, replay_empty_cache) for config in configs]
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    # snapshots only hold builtin containers and scalars
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Forbidden class in memory snapshot: {module}.{name}")
+
+
+def load_snapshot(path: str) -> dict:
+    if is_compact_trace(path):
+        with MemoryTraceReader(path) as reader:
+            return reader.to_snapshot()
+    with open(path, "rb") as f:
+        return _SnapshotUnpickler(f).load()
+
+
+def _load_device_events(path: str) -> dict:
+    """Return {device: EVENT_DTYPE array} of the traced devices of the snapshot at path."""
+    if is_compact_trace(path):
+        with MemoryTraceReader(path) as reader:
+            return reader.load_event_arrays()
+    device_traces = load_snapshot(path).get("device_traces", [])
+    return {device: entries_to_array(device_trace) for device, device_trace in enumerate(device_traces)}
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.2f}GiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the memory history of a snapshot on the NPU caching "
+                                                 "allocator with other PYTORCH_NPU_ALLOC_CONF settings.")
+    parser.add_argument("snapshot", help="file saved by torch_npu.npu.memory._dump_snapshot, pickled or compact")
+    parser.add_argument("--device", type=int, default=None, help="device to replay, the first traced one by default")
+    parser.add_argument("--alloc-conf", action="append", default=None,
+                        help="PYTORCH_NPU_ALLOC_CONF to replay, repeat it to compare several, default: \"\"")
+    parser.add_argument("--device-memory-gb", type=float, default=None,
+                        help="memory the allocator may reserve, the OOM and garbage collection limit")
+    parser.add_argument("--ignore-empty-cache", action="store_true",
+                        help="do not replay the empty_cache calls found in the trace")
+    args = parser.parse_args()
+
+    device_events = _load_device_events(os.path.realpath(args.snapshot))
+    device = args.device
+    if device is None:
+        device = next((index for index, events in sorted(device_events.items()) if events.size), 0)
+    if device not in device_events or not device_events[device].size:
+        raise ValueError(f"No memory history of device {device} in {args.snapshot}, "
+                         f"enable it with torch_npu.npu.memory._record_memory_history.")
+    device_memory = int(args.device_memory_gb * 1024 ** 3) if args.device_memory_gb is not None else None
+    trace = _Trace(device_events[device])
+    print(f"device {device}: {len(trace)} replayed events, recorded peak reserved "
+          f"{_format_size(trace.recorded_peak_reserved)}")
+    headers = ["config", "peak_reserved", "peak_allocated", "fragmentation", "max_cached", "segment_allocs",
+               "alloc_retries", "ooms", "first_oom_event"]
+    rows = []
+    for config in args.alloc_conf or [""]:
+        summary = replay(trace, AllocatorConfig.from_env_string(config), device_memory,
+                         not args.ignore_empty_cache).summary()
+        for key in ("peak_reserved", "peak_allocated", "max_cached"):
+            summary[key] = _format_size(summary[key])
+        rows.append([str(summary[header]) for header in headers])
+    widths = [max(len(header), *(len(row[column]) for row in rows)) for column, header in enumerate(headers)]
+    for row in [headers] + rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+
+
+if __name__ == "__main__":
+    main()
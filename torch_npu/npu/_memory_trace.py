@@ -0,0 +1,376 @@
+"""
+Compact binary format of the memory snapshots, written and read in chunks.
+
+A pickled ``_snapshot()`` holds a Python dict per trace event and a list of frame dicts per stack, so a
+snapshot with the history of a full training step takes gigabytes and minutes to save and load. The
+compact format keeps:
+
+* a string table of the file names and function names of the frames,
+* a table of the unique frame stacks, each frame being (file name id, function name id, line),
+* the trace events as fixed-width records (action, stack id, addr, size, stream),
+* the segments and blocks of the snapshot as fixed-width records as well.
+
+The file is a header followed by chunks (4 bytes tag, 8 bytes payload length, payload), the strings and
+stacks being written in a chunk before the first chunk using them. The writer streams the chunks as the
+events are encoded and the reader iterates them lazily, as snapshot dicts or as numpy arrays:
+
+    with MemoryTraceReader("snapshot.npumem") as reader:
+        for entry in reader.iter_events(device=0):
+            ...
+        events = reader.load_event_arrays()[0]
+
+The module only depends on the standard library and numpy.
+"""
+import os
+import stat
+import struct
+
+import numpy as np
+
+__all__ = []
+
+MAGIC = b"NPUMEMTR"
+VERSION = 1
+
+ACTIONS = ("alloc", "free_requested", "free_completed", "segment_alloc", "segment_free", "segment_map",
+           "segment_unmap", "oom", "snapshot")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+OOM_CODE = ACTION_CODES["oom"]
+BLOCK_STATES = ("active_allocated", "active_pending_free", "inactive")
+BLOCK_STATE_CODES = {state: code for code, state in enumerate(BLOCK_STATES)}
+SEGMENT_TYPES = ("small", "large")
+SEGMENT_TYPE_CODES = {segment_type: code for code, segment_type in enumerate(SEGMENT_TYPES)}
+
+# stack id of the entries without frames
+NO_STACK = -1
+DEFAULT_CHUNK_EVENTS = 65536
+
+EVENT_DTYPE = np.dtype({
+    "names": ["action", "stack", "addr", "size", "stream"],
+    "formats": ["u1", "<i4", "<u8", "<u8", "<i8"],
+    "offsets": [0, 4, 8, 16, 24],
+    "itemsize": 32,
+})
+FRAME_DTYPE = np.dtype([("filename", "<u4"), ("name", "<u4"), ("line", "<i4")])
+SEGMENT_DTYPE = np.dtype({
+    "names": ["device", "segment_type", "is_expandable", "stack", "address", "total_size", "allocated_size",
+              "active_size", "requested_size", "stream", "block_count"],
+    "formats": ["<i4", "u1", "u1", "<i4", "<u8", "<u8", "<u8", "<u8", "<u8", "<i8", "<u4"],
+    "offsets": [0, 4, 5, 8, 16, 24, 32, 40, 48, 56, 64],
+    "itemsize": 72,
+})
+BLOCK_DTYPE = np.dtype({
+    "names": ["state", "stack", "address", "size", "requested_size"],
+    "formats": ["u1", "<i4", "<u8", "<u8", "<u8"],
+    "offsets": [0, 4, 8, 16, 24],
+    "itemsize": 32,
+})
+
+_TAG_STRINGS = b"STRS"
+_TAG_STACKS = b"STKS"
+_TAG_EVENTS = b"EVTS"
+_TAG_SEGMENTS = b"SEGS"
+_TAG_END = b"END_"
+_HEADER = struct.Struct("<8sI")
+_CHUNK_HEADER = struct.Struct("<4sQ")
+_COUNT = struct.Struct("<I")
+_EVENTS_HEADER = struct.Struct("<iI")
+
+
+def is_compact_trace(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class MemoryTraceWriter:
+    """
+    Encode snapshots to the compact format, each chunk is written to the file once encoded.
+    The strings and frames are interned with their first use, frame dicts shared between the stacks of
+    a snapshot, as the symbolized ones are, are only encoded once.
+    """
+
+    def __init__(self, f, chunk_events: int = DEFAULT_CHUNK_EVENTS):
+        self._file = f
+        self._chunk_events = chunk_events
+        self._strings = {}
+        self._stacks = {}
+        self._frame_keys = {}
+        self._frames = []
+        self._list_stack_ids = {}
+        self._new_strings = []
+        self._new_stacks = []
+        self._file.write(_HEADER.pack(MAGIC, VERSION))
+
+    def write_snapshot(self, snapshot: dict):
+        self.write_segments(snapshot.get("segments", []))
+        for device, device_trace in enumerate(snapshot.get("device_traces", [])):
+            self.write_events(device, device_trace)
+
+    def write_segments(self, segments: list):
+        segment_records = np.zeros(len(segments), dtype=SEGMENT_DTYPE)
+        block_rows = []
+        for index, segment in enumerate(segments):
+            blocks = segment.get("blocks", [])
+            segment_type = SEGMENT_TYPE_CODES[segment.get("segment_type", "large")]
+            segment_records[index] = (segment.get("device", 0), segment_type, segment.get("is_expandable", False),
+                                      self._intern_frames(segment), segment["address"], segment["total_size"],
+                                      segment.get("allocated_size", 0), segment.get("active_size", 0),
+                                      segment.get("requested_size", 0), segment["stream"], len(blocks))
+            block_rows.extend((BLOCK_STATE_CODES[block["state"]], self._intern_frames(block), block["address"],
+                               block["size"], block.get("requested_size", 0)) for block in blocks)
+        block_records = np.array(block_rows, dtype=BLOCK_DTYPE)
+        self._flush_tables()
+        self._write_chunk(_TAG_SEGMENTS, _COUNT.pack(len(segments)) + segment_records.tobytes() +
+                          block_records.tobytes())
+
+    def write_events(self, device: int, entries: list):
+        """Append the trace entries of device, an iterable of snapshot trace entry dicts."""
+        chunk = []
+        written = False
+        for entry in entries:
+            action = ACTION_CODES[entry["action"]]
+            addr = entry.get("device_free", 0) if action == OOM_CODE else entry.get("addr", 0)
+            chunk.append((action, self._intern_frames(entry), addr, entry.get("size", 0), entry.get("stream", 0)))
+            if len(chunk) == self._chunk_events:
+                self._write_events_chunk(device, chunk)
+                chunk = []
+                written = True
+        # an empty trace is written as well, so the devices keep their index
+        if chunk or not written:
+            self._write_events_chunk(device, chunk)
+
+    def close(self):
+        self._flush_tables()
+        self._write_chunk(_TAG_END, b"")
+
+    def _write_events_chunk(self, device: int, rows: list):
+        records = np.array(rows, dtype=EVENT_DTYPE)
+        self._flush_tables()
+        self._write_chunk(_TAG_EVENTS, _EVENTS_HEADER.pack(device, len(rows)) + records.tobytes())
+
+    def _write_chunk(self, tag: bytes, payload: bytes):
+        self._file.write(_CHUNK_HEADER.pack(tag, len(payload)))
+        self._file.write(payload)
+
+    def _flush_tables(self):
+        if self._new_strings:
+            encoded = [string.encode("utf-8") for string in self._new_strings]
+            lengths = np.array([len(value) for value in encoded], dtype="<u4")
+            self._write_chunk(_TAG_STRINGS, _COUNT.pack(len(encoded)) + lengths.tobytes() + b"".join(encoded))
+            self._new_strings = []
+        if self._new_stacks:
+            counts = np.array([len(stack) for stack in self._new_stacks], dtype="<u4")
+            frames = np.array([frame for stack in self._new_stacks for frame in stack], dtype=FRAME_DTYPE)
+            self._write_chunk(_TAG_STACKS, _COUNT.pack(len(self._new_stacks)) + counts.tobytes() + frames.tobytes())
+            self._new_stacks = []
+
+    def _intern_string(self, string: str) -> int:
+        string_id = self._strings.get(string)
+        if string_id is None:
+            string_id = self._strings[string] = len(self._strings)
+            self._new_strings.append(string)
+        return string_id
+
+    def _intern_frames(self, entry: dict) -> int:
+        frames = entry.get("frames")
+        if frames is None:
+            return NO_STACK
+        # the symbolized frame lists are shared by the entries of the same traceback, and the frame dicts by
+        # the tracebacks, both are looked up by id first and kept alive so their ids are not reused
+        cached = self._list_stack_ids.get(id(frames))
+        if cached is not None:
+            return cached[1]
+        frame_keys = self._frame_keys
+        try:
+            stack = tuple([frame_keys[id(frame)] for frame in frames])
+        except KeyError:
+            stack = tuple([self._get_frame_key(frame) for frame in frames])
+        stack_id = self._stacks.get(stack)
+        if stack_id is None:
+            stack_id = self._stacks[stack] = len(self._stacks)
+            self._new_stacks.append(stack)
+        self._list_stack_ids[id(frames)] = (frames, stack_id)
+        return stack_id
+
+    def _get_frame_key(self, frame: dict) -> tuple:
+        key = self._frame_keys.get(id(frame))
+        if key is None:
+            key = self._frame_keys[id(frame)] = (self._intern_string(frame["filename"]),
+                                                 self._intern_string(frame["name"]), frame["line"])
+            self._frames.append(frame)
+        return key
+
+
+def entries_to_array(entries: list) -> np.ndarray:
+    """Return the trace entries as an EVENT_DTYPE array, without their frames."""
+    rows = []
+    for entry in entries:
+        action = ACTION_CODES[entry["action"]]
+        addr = entry.get("device_free", 0) if action == OOM_CODE else entry.get("addr", 0)
+        rows.append((action, NO_STACK, addr, entry.get("size", 0), entry.get("stream", 0)))
+    return np.array(rows, dtype=EVENT_DTYPE)
+
+
+def dump_snapshot(snapshot: dict, filename: str, chunk_events: int = DEFAULT_CHUNK_EVENTS):
+    with os.fdopen(os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, stat.S_IWUSR | stat.S_IRUSR),
+                   "wb") as f:
+        writer = MemoryTraceWriter(f, chunk_events)
+        writer.write_snapshot(snapshot)
+        writer.close()
+
+
+class MemoryTraceReader:
+    """
+    Lazy reader of a compact memory trace. Every iteration reads the file again from the start, skipping
+    the chunks it does not need, the string and stack tables being loaded once.
+    The frame lists returned for a stack id are shared by all the entries using it and must not be modified.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        magic, version = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a compact memory trace.")
+        if version > VERSION:
+            self._file.close()
+            raise ValueError(f"Unsupported compact memory trace version {version} of {path}.")
+        self.strings = []
+        self._stack_frames = []
+        self._stack_cache = {}
+        # end offset of the last table chunk loaded
+        self._tables_end = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def get_frames(self, stack_id: int):
+        """Return the frame dicts of stack_id, None for NO_STACK."""
+        if stack_id == NO_STACK:
+            return None
+        frames = self._stack_cache.get(stack_id)
+        if frames is None:
+            frames = self._stack_cache[stack_id] = [
+                {"filename": self.strings[filename], "line": int(line), "name": self.strings[name]}
+                for filename, name, line in self._stack_frames[stack_id].tolist()]
+        return frames
+
+    def iter_event_arrays(self, device: int = None):
+        """Yield (device, EVENT_DTYPE array) of every events chunk, of device only if given."""
+        for tag, payload_size in self._iter_chunks():
+            if tag != _TAG_EVENTS:
+                self._skip(payload_size)
+                continue
+            chunk_device, count = _EVENTS_HEADER.unpack(self._file.read(_EVENTS_HEADER.size))
+            if device is not None and chunk_device != device:
+                self._skip(payload_size - _EVENTS_HEADER.size)
+                continue
+            yield chunk_device, np.frombuffer(self._file.read(count * EVENT_DTYPE.itemsize), dtype=EVENT_DTYPE)
+
+    def load_event_arrays(self) -> dict:
+        """Return {device: EVENT_DTYPE array of all its events}."""
+        chunks = {}
+        for device, events in self.iter_event_arrays():
+            chunks.setdefault(device, []).append(events)
+        return {device: np.concatenate(device_chunks) for device, device_chunks in chunks.items()}
+
+    def iter_events(self, device: int = None):
+        """Yield (device, trace entry) of every event as in snapshot["device_traces"], of device only if given."""
+        for chunk_device, events in self.iter_event_arrays(device):
+            for entry in self._iter_entries(events):
+                yield chunk_device, entry
+
+    def iter_segments(self):
+        """Yield the segment dicts, with their blocks, as in snapshot["segments"]."""
+        for tag, payload_size in self._iter_chunks():
+            if tag != _TAG_SEGMENTS:
+                self._skip(payload_size)
+                continue
+            count = _COUNT.unpack(self._file.read(_COUNT.size))[0]
+            segments = np.frombuffer(self._file.read(count * SEGMENT_DTYPE.itemsize), dtype=SEGMENT_DTYPE)
+            block_count = int(segments["block_count"].sum())
+            blocks = np.frombuffer(self._file.read(block_count * BLOCK_DTYPE.itemsize), dtype=BLOCK_DTYPE).tolist()
+            block_index = 0
+            for segment in segments.tolist():
+                device, segment_type, is_expandable, stack_id, address, total_size, allocated_size, active_size, \
+                    requested_size, stream, segment_block_count = segment
+                segment_dict = {"device": device, "address": address, "total_size": total_size,
+                                "allocated_size": allocated_size, "active_size": active_size,
+                                "requested_size": requested_size, "stream": stream,
+                                "segment_type": SEGMENT_TYPES[segment_type], "is_expandable": bool(is_expandable)}
+                self._set_frames(segment_dict, stack_id)
+                segment_dict["blocks"] = []
+                for state, block_stack_id, block_address, size, block_requested_size in \
+                        blocks[block_index:block_index + segment_block_count]:
+                    block_dict = {"address": block_address, "size": size, "requested_size": block_requested_size,
+                                  "state": BLOCK_STATES[state]}
+                    self._set_frames(block_dict, block_stack_id)
+                    segment_dict["blocks"].append(block_dict)
+                block_index += segment_block_count
+                yield segment_dict
+
+    def to_snapshot(self) -> dict:
+        """Load the whole trace as the snapshot dict of torch_npu.npu.memory._snapshot()."""
+        device_traces = []
+        for device, events in self.iter_event_arrays():
+            while len(device_traces) <= device:
+                device_traces.append([])
+            device_traces[device].extend(self._iter_entries(events))
+        return {"segments": list(self.iter_segments()), "device_traces": device_traces}
+
+    def _iter_entries(self, events: np.ndarray):
+        for action, stack_id, addr, size, stream in zip(events["action"].tolist(), events["stack"].tolist(),
+                                                        events["addr"].tolist(), events["size"].tolist(),
+                                                        events["stream"].tolist()):
+            entry = {"action": ACTIONS[action], "device_free" if action == OOM_CODE else "addr": addr, "size": size,
+                     "stream": stream}
+            self._set_frames(entry, stack_id)
+            yield entry
+
+    def _set_frames(self, entry: dict, stack_id: int):
+        frames = self.get_frames(stack_id)
+        if frames is not None:
+            entry["frames"] = frames
+
+    def _skip(self, size: int):
+        self._file.seek(size, os.SEEK_CUR)
+
+    def _iter_chunks(self):
+        """Yield (tag, payload size) of the chunks other than the tables, the file being at the payload start."""
+        self._file.seek(_HEADER.size)
+        while True:
+            header = self._file.read(_CHUNK_HEADER.size)
+            if len(header) < _CHUNK_HEADER.size:
+                return
+            tag, payload_size = _CHUNK_HEADER.unpack(header)
+            if tag == _TAG_END:
+                return
+            if tag in (_TAG_STRINGS, _TAG_STACKS):
+                if self._file.tell() + payload_size > self._tables_end:
+                    self._load_table(tag, payload_size)
+                    self._tables_end = self._file.tell()
+                else:
+                    self._skip(payload_size)
+                continue
+            yield tag, payload_size
+
+    def _load_table(self, tag: bytes, payload_size: int):
+        payload = self._file.read(payload_size)
+        count = _COUNT.unpack_from(payload)[0]
+        sizes = np.frombuffer(payload, dtype="<u4", count=count, offset=_COUNT.size)
+        offsets = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+        data_offset = _COUNT.size + count * 4
+        if tag == _TAG_STRINGS:
+            data = payload[data_offset:]
+            self.strings.extend(data[start:end].decode("utf-8")
+                                for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist()))
+        else:
+            frames = np.frombuffer(payload, dtype=FRAME_DTYPE, count=int(offsets[-1]), offset=data_offset)
+            self._stack_frames.extend(frames[start:end]
+                                      for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist()))
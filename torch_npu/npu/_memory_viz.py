@@ -13,6 +13,7 @@ from torch.cuda._memory_viz import format_flamegraph
 import torch_npu
 
 from torch_npu.utils._error_code import ErrCode, pta_error
+from ._memory_trace import MemoryTraceReader
 
 PYTORCH_NPU_INSTALL_PATH = os.path.dirname(os.path.realpath(torch_npu.__file__))
 
@@ -86,41 +87,100 @@ def _block_extra(b):
     return b['frames'], b['requested_size']
 
 
-def _write_blocks(f, prefix, blocks):
-    def frames_fragment(frames):
+class _FrameStackCache:
+    """
+    Folded stack fragments of the frame lists. The frame lists and frame dicts of a snapshot are shared
+    between the blocks allocated from the same traceback, as are those of a MemoryTraceReader for a stack id,
+    so they are formatted once, looked up by id and kept alive so their ids are not reused.
+    """
+
+    def __init__(self):
+        self._fragments = {}
+        self._frame_fmts = {}
+
+    def fragment(self, frames):
         if not frames:
             return "<non-python>"
-        return ';'.join(_frames_fmt(frames, reverse=True))
+        cached = self._fragments.get(id(frames))
+        if cached is not None:
+            return cached[1]
+        fmts = [self._frame_fmt(frame) for frame in reversed(frames)]
+        fragment = ';'.join(fmt for fmt in fmts if fmt is not None)
+        self._fragments[id(frames)] = (frames, fragment)
+        return fragment
+
+    def _frame_fmt(self, frame):
+        cached = self._frame_fmts.get(id(frame))
+        if cached is None:
+            fmt = _frame_fmt(frame) if _frame_filter(frame['name'], frame['filename']) else None
+            cached = self._frame_fmts[id(frame)] = (frame, fmt)
+        return cached[1]
+
+
+def _aggregate_blocks(sizes, prefix, blocks, stack_cache):
+    """Add the sizes of blocks to sizes, a dict of (prefix, state, folded stack) -> size."""
+    def add(state, fragment, size):
+        key = (prefix, state, fragment)
+        sizes[key] = sizes.get(key, 0) + size
     for b in blocks:
+        state = b["state"]
         if 'history' not in b:
             frames, accounted_for_size = _block_extra(b)
-            f.write(f'{prefix};{b["state"]};{frames_fragment(frames)} {accounted_for_size}\n')
+            add(state, stack_cache.fragment(frames), accounted_for_size)
         else:
             accounted_for_size = 0
             for h in b['history']:
                 sz = h['real_size']
                 accounted_for_size += sz
                 if 'frames' in h:
-                    frames = h['frames']
-                    f.write(f'{prefix};{b["state"]};{frames_fragment(frames)} {sz}\n')
+                    add(state, stack_cache.fragment(h['frames']), sz)
                 else:
-                    f.write(f'{prefix};{b["state"]};<no-context> {sz}\n')
+                    add(state, '<no-context>', sz)
         gaps = b['size'] - accounted_for_size
         if gaps:
-            f.write(f'{prefix};{b["state"]};<gaps> {gaps}\n')
+            add(state, '<gaps>', gaps)
+
+
+def _write_sizes(f, sizes):
+    f.writelines(f'{prefix};{state};{fragment} {size}\n' for (prefix, state, fragment), size in sizes.items())
+
+
+def _write_blocks(f, prefix, blocks, stack_cache=None):
+    sizes = {}
+    _aggregate_blocks(sizes, prefix, blocks, stack_cache or _FrameStackCache())
+    _write_sizes(f, sizes)
+
+
+def _iter_segments(snapshot):
+    # a compact trace is read lazily, segment by segment
+    if isinstance(snapshot, MemoryTraceReader):
+        return snapshot.iter_segments()
+    return snapshot['segments']
+
+
+def _write_folded_stacks(f, snapshot, by_segment=False):
+    """
+    Write the folded stacks of the blocks of snapshot to f, one line per (stream, state, stack) with the
+    sum of its sizes, per segment as well if by_segment. The lines of a segment are written once the segment
+    is aggregated, so a snapshot read from a MemoryTraceReader is streamed segment by segment.
+    """
+    stack_cache = _FrameStackCache()
+    sizes = {}
+    for seg in _iter_segments(snapshot):
+        if by_segment:
+            _write_blocks(f, f'stream_{seg["stream"]};seg_{seg["address"]}', seg['blocks'], stack_cache)
+        else:
+            _aggregate_blocks(sizes, f'stream_{seg["stream"]}', seg['blocks'], stack_cache)
+    _write_sizes(f, sizes)
 
 
 def segments(snapshot, format_flamegraph_func=format_flamegraph):
     f = io.StringIO()
-    for seg in snapshot['segments']:
-        prefix = f'stream_{seg["stream"]};seg_{seg["address"]}'
-        _write_blocks(f, prefix, seg['blocks'])
+    _write_folded_stacks(f, snapshot, by_segment=True)
     return format_flamegraph_func(f.getvalue())
 
 
 def memory(snapshot, format_flamegraph_func=format_flamegraph):
     f = io.StringIO()
-    for seg in snapshot['segments']:
-        prefix = f'stream_{seg["stream"]}'
-        _write_blocks(f, prefix, seg['blocks'])
+    _write_folded_stacks(f, snapshot)
     return format_flamegraph_func(f.getvalue())
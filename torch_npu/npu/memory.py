@@ -13,7 +13,8 @@ import torch_npu
 from torch_npu.utils._error_code import ErrCode, pta_error
 from . import is_initialized, _get_device_index, _lazy_init
 from .utils import _dummy_type
-from ._memory_viz import memory as _memory, segments as _segments
+from ._memory_viz import memory as _memory, segments as _segments, _write_folded_stacks
+from ._memory_trace import dump_snapshot as _dump_compact_snapshot
 
 __all__ = [
     "caching_allocator_alloc",
@@ -640,7 +641,8 @@ def _record_memory_history(enabled="all", *args, **kwargs):
     this will also enable recording of a history of all alloc/free events.
 
     Use :func:`torch.npu.memory._snapshot()` to retrieve this information,
-    and the tools in `_memory_viz.py` to visualize snapshots.
+    and the tools in `_memory_viz.py` to visualize snapshots, `_memory_sim.py`
+    replays the recorded history with other `PYTORCH_NPU_ALLOC_CONF` settings.
 
     The Python trace collection is fast (2us per trace), so you may consider
     enabling this on production jobs if you anticipate ever having to debug
@@ -763,7 +765,7 @@ def _snapshot(device=None):
     return torch_npu._C._npu_memorySnapshot()
 
 
-def _dump_snapshot(filename="dump_snapshot.pickle"):
+def _dump_snapshot(filename="dump_snapshot.pickle", compact=False):
     """
     Save a pickled version of the `torch.memory._snapshot()` dictionary to a file.
 
@@ -771,10 +773,17 @@ def _dump_snapshot(filename="dump_snapshot.pickle"):
 
     Args:
         filename (str, optional): Name of the file to create. Defaults to "dump_snapshot.pickle".
+        compact (bool, optional): Stream the snapshot in the compact binary format of `_memory_trace.py`
+            instead, much smaller and faster to save and load for long histories. It is read by
+            `_memory_trace.MemoryTraceReader`, `_memory_viz.py` and `_memory_sim.py`, not by the web viewer.
+            Defaults to False.
     """
     s = _snapshot()
-    with os.fdopen(os.open(filename, os.O_WRONLY | os.O_CREAT, stat.S_IWUSR), "wb") as f:
-        pickle.dump(s, f)
+    if compact:
+        _dump_compact_snapshot(s, filename)
+    else:
+        with os.fdopen(os.open(filename, os.O_WRONLY | os.O_CREAT, stat.S_IWUSR), "wb") as f:
+            pickle.dump(s, f)
 
     prof_path = os.path.dirname(os.path.abspath(filename))
     activities = {torch_npu.profiler.ProfilerActivity.CPU, torch_npu.profiler.ProfilerActivity.NPU}
@@ -799,3 +808,14 @@ def _save_memory_usage(filename="output.svg", snapshot=None):
         snapshot = _snapshot()
     with os.fdopen(os.open(filename, os.O_WRONLY | os.O_CREAT, stat.S_IWUSR), "w") as f:
         f.write(_memory(snapshot))
+
+
+def _save_folded_stacks(filename="output.folded", snapshot=None, by_segment=False):
+    """
+    Save the folded stacks of the memory usage, input of flamegraph.pl, without building the whole text
+    in memory. snapshot may be a snapshot dict or a `_memory_trace.MemoryTraceReader`.
+    """
+    if snapshot is None:
+        snapshot = _snapshot()
+    with os.fdopen(os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, stat.S_IWUSR), "w") as f:
+        _write_folded_stacks(f, snapshot, by_segment)
@@ -10,6 +10,16 @@ class ConfigContext:
     DEFAULT_WARMUP = 0
     DEADLINE_PROF_DIR = "./"
     BOOL_MAP = {'true': True, 'false': False}
+    STRAGGLER_METRICS = ("step_time", "computing", "communication", "free")
+    DEFAULT_STRAGGLER_CONFIG = {
+        "enable": False,
+        "metric": "step_time",
+        "window": 20,
+        "percentile": 90,
+        "threshold": 0.2,
+        "check_interval": 10,
+        "cooldown": 200
+    }
 
     def __init__(self, json_data: dict):
         self.activity_set = set()
@@ -32,6 +42,7 @@ class ConfigContext:
         self._is_dyno = DynamicProfilerUtils.is_dyno_model()
         self._is_dyno_monitor = False
         self._rank_id = DynamicProfilerUtils.get_rank_id()
+        self._straggler_config = dict(self.DEFAULT_STRAGGLER_CONFIG)
         self.parse(json_data)
 
     def parse(self, json_data: dict):
@@ -54,6 +65,7 @@ class ConfigContext:
         self._parse_start_step(json_data)
         self._parse_exp_cfg(json_data)
         self._parse_ranks(json_data)
+        self._parse_straggler_detect(json_data)
 
     def _parse_start_step(self, json_data: dict):
         if not self._is_dyno:
@@ -167,6 +179,42 @@ class ConfigContext:
             if isinstance(rank, int) and rank >= 0:
                 self._rank_set.add(rank)
 
+    def _parse_straggler_detect(self, json_data: dict):
+        straggler_config = json_data.get("straggler_detect")
+        if self._is_dyno or straggler_config is None:
+            return
+        if not isinstance(straggler_config, dict):
+            DynamicProfilerUtils.out_log("Set straggler_detect failed, straggler_detect must be dict!",
+                                         DynamicProfilerUtils.LoggerLevelEnum.WARNING)
+            return
+        enable = straggler_config.get("enable", False)
+        self._straggler_config["enable"] = enable if isinstance(enable, bool) else False
+        metric = straggler_config.get("metric", self.DEFAULT_STRAGGLER_CONFIG["metric"])
+        if metric in self.STRAGGLER_METRICS:
+            self._straggler_config["metric"] = metric
+        else:
+            DynamicProfilerUtils.out_log("Invalid straggler_detect metric {}, reset it to {}.".format(
+                metric, self.DEFAULT_STRAGGLER_CONFIG["metric"]), DynamicProfilerUtils.LoggerLevelEnum.WARNING)
+        for key in ("window", "check_interval", "cooldown"):
+            value = straggler_config.get(key, self.DEFAULT_STRAGGLER_CONFIG[key])
+            if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+                self._straggler_config[key] = value
+            else:
+                DynamicProfilerUtils.out_log("Invalid straggler_detect {}, reset it to {}.".format(
+                    key, self.DEFAULT_STRAGGLER_CONFIG[key]), DynamicProfilerUtils.LoggerLevelEnum.WARNING)
+        percentile = straggler_config.get("percentile", self.DEFAULT_STRAGGLER_CONFIG["percentile"])
+        if isinstance(percentile, (int, float)) and not isinstance(percentile, bool) and 0 <= percentile <= 100:
+            self._straggler_config["percentile"] = percentile
+        else:
+            DynamicProfilerUtils.out_log("Invalid straggler_detect percentile, reset it to {}.".format(
+                self.DEFAULT_STRAGGLER_CONFIG["percentile"]), DynamicProfilerUtils.LoggerLevelEnum.WARNING)
+        threshold = straggler_config.get("threshold", self.DEFAULT_STRAGGLER_CONFIG["threshold"])
+        if isinstance(threshold, (int, float)) and not isinstance(threshold, bool) and threshold >= 0:
+            self._straggler_config["threshold"] = threshold
+        else:
+            DynamicProfilerUtils.out_log("Invalid straggler_detect threshold, reset it to {}.".format(
+                self.DEFAULT_STRAGGLER_CONFIG["threshold"]), DynamicProfilerUtils.LoggerLevelEnum.WARNING)
+
     def _parse_activity(self, json_data: dict):
         if not self._is_dyno:
             activities = json_data.get('activities')
@@ -326,6 +374,12 @@ class ConfigContext:
     def is_dyno_monitor(self) -> bool:
         return self._is_dyno_monitor
 
+    def is_straggler_detect(self) -> bool:
+        return self._straggler_config["enable"]
+
+    def straggler_config(self) -> dict:
+        return dict(self._straggler_config)
+
     @staticmethod
     def profiler_cfg_json_to_bytes(json_dict: dict) -> bytes:
         cfg_json_str = json.dumps(json_dict)
@@ -0,0 +1,83 @@
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+
+from ._dynamic_profiler_utils import DynamicProfilerUtils
+
+
+class ConfigFileWatcher:
+    """
+    Wait for the changes of the config file of the monitor process.
+    The directory of the file is watched with inotify, so a file replaced by rename is seen as well, the
+    watcher falls back to polling the file stat when inotify is not available.
+    A change is reported when the (mtime_ns, size, inode) of the file differs from the last one seen.
+    """
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, cfg_path: str, file_stat: tuple = None):
+        self._cfg_path = cfg_path
+        self._file_stat = file_stat
+        self._inotify_fd = -1
+        self._init_inotify()
+
+    @property
+    def use_inotify(self) -> bool:
+        return self._inotify_fd >= 0
+
+    @staticmethod
+    def get_file_stat(file_path: str) -> tuple:
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size, file_stat.st_ino
+
+    def _init_inotify(self):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            inotify_fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if inotify_fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            watch_dir = os.path.dirname(os.path.abspath(self._cfg_path))
+            if libc.inotify_add_watch(inotify_fd, watch_dir.encode(), self.WATCH_MASK) < 0:
+                errno = ctypes.get_errno()
+                os.close(inotify_fd)
+                raise OSError(errno, "inotify_add_watch failed")
+            self._inotify_fd = inotify_fd
+        except (OSError, AttributeError, TypeError) as ex:
+            DynamicProfilerUtils.out_log("Config file watcher falls back to polling, {} has occur".format(str(ex)),
+                                         DynamicProfilerUtils.LoggerLevelEnum.INFO, is_monitor_process=True)
+
+    def wait_change(self, timeout: float) -> bool:
+        """Wait up to timeout seconds, return whether the config file has changed since the last change seen."""
+        if self.use_inotify:
+            readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+            if readable:
+                self._drain_events()
+        else:
+            time.sleep(timeout)
+        file_stat = self.get_file_stat(self._cfg_path)
+        if file_stat is None or file_stat == self._file_stat:
+            return False
+        self._file_stat = file_stat
+        return True
+
+    def _drain_events(self):
+        try:
+            while os.read(self._inotify_fd, self.READ_SIZE):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        if self.use_inotify:
+            os.close(self._inotify_fd)
+            self._inotify_fd = -1
@@ -3,11 +3,11 @@ import mmap
 import stat
 import time
 import json
-import struct
 import multiprocessing
 from ._dynamic_profiler_config_context import ConfigContext
 from ._dynamic_profiler_utils import DynamicProfilerUtils
 from ._dynamic_profiler_monitor_shm import DynamicProfilerShareMemory
+from ._dynamic_profiler_config_watcher import ConfigFileWatcher
 from ._dynamic_monitor_proxy import PyDynamicMonitorProxySingleton
 
 
@@ -30,7 +30,8 @@ class DynamicProfilerMonitor:
             self._path,
             self._config_path,
             self._rank_id)
-        self._cur_time = int(time.time())
+        # only the configs published after the monitor creation are applied
+        self._cur_version = self._shm_obj.read_version()
         self._create_process()
 
     def shm_to_prof_conf_context(self):
@@ -39,18 +40,20 @@ class DynamicProfilerMonitor:
                 self._rank_id), DynamicProfilerUtils.LoggerLevelEnum.ERROR)
             return None
         try:
-            time_bytes_data = self._shm_obj.read_bytes(read_time=True)
-            shm_cfg_change_time = struct.unpack("<I", time_bytes_data)[0]
+            if self._shm_obj.read_version() == self._cur_version:
+                return None
+            cfg_record = self._shm_obj.read_config()
         except Exception as ex:
             DynamicProfilerUtils.out_log("Share memory read error: {}".format(
                 str(ex)), DynamicProfilerUtils.LoggerLevelEnum.WARNING)
             return None
 
-        if shm_cfg_change_time <= self._cur_time:
+        if cfg_record is None:
+            # the monitor process is rewriting the config
             return None
-        self._cur_time = shm_cfg_change_time
+        self._cur_version, cfg_bytes = cfg_record
         try:
-            json_data = ConfigContext.bytes_to_profiler_cfg_json(self._shm_obj.read_bytes())
+            json_data = ConfigContext.bytes_to_profiler_cfg_json(cfg_bytes)
         except Exception as ex:
             DynamicProfilerUtils.out_log("Share memory bytes to json error: {}".format(
                 str(ex)), DynamicProfilerUtils.LoggerLevelEnum.ERROR)
@@ -64,6 +67,10 @@ class DynamicProfilerMonitor:
             return None
         return self.prof_cfg_context
 
+    @property
+    def shm_name(self) -> str:
+        return os.path.basename(self._shm_obj.shm_path)
+
     def clean_resource(self):
         if self._process is not None:
             self._shared_loop_flag.value = False
@@ -84,7 +91,7 @@ class DynamicProfilerMonitor:
             "shm": shm,
             "cfg_path": self._shm_obj.config_path,
             "max_size": self._buffer_size,
-            "file_stat_time": self._shm_obj.cur_mtime,
+            "file_stat": self._shm_obj.cur_file_stat,
             "mmap_path": mmap_path,
             "is_mmap": self._shm_obj.is_mmap,
             "rank_id": self._rank_id,
@@ -122,7 +129,7 @@ def worker_func(params_dict):
     shm = params_dict.get("shm")
     cfg_path = params_dict.get("cfg_path")
     max_size = params_dict.get("max_size")
-    file_stat_time = params_dict.get("file_stat_time")
+    file_stat = params_dict.get("file_stat")
     mmap_path = params_dict.get("mmap_path")
     is_mmap = params_dict.get("is_mmap")
     dynamic_profiler_utils = params_dict.get("dynamic_profiler_utils")
@@ -137,41 +144,39 @@ def worker_func(params_dict):
             dynamic_profiler_utils.out_log("Dynamic profiler process start failed, {} occurred!".format(str(ex)),
                                            dynamic_profiler_utils.LoggerLevelEnum.ERROR, is_monitor_process=True)
             return
-    last_file_t = file_stat_time
+    # one monitor process per node watches the config file and publishes it to all the ranks of the node
+    watcher = ConfigFileWatcher(cfg_path, file_stat)
     while loop_flag.value:
-        if os.path.exists(cfg_path):
-            file_t = int(os.path.getmtime(cfg_path))
-            if not last_file_t or last_file_t != file_t:
-                last_file_t = file_t
-                try:
-                    with open(cfg_path, 'r') as f:
-                        data = json.load(f)
-                    # convert json to bytes
-                    data['is_valid'] = True
-                    DynamicProfilerUtils.out_log("Dynamic profiler process load json success",
-                                                 DynamicProfilerUtils.LoggerLevelEnum.INFO, is_monitor_process=True)
-                except Exception as ex:
-                    data = {'is_valid': False}
-                    dynamic_profiler_utils.out_log("Dynamic profiler process load json failed, {} has occur!".format(
-                        str(ex)), dynamic_profiler_utils.LoggerLevelEnum.ERROR, is_monitor_process=True)
-                time_bytes = struct.pack("<I", last_file_t)
-                prof_cfg_bytes = time_bytes + ConfigContext.profiler_cfg_json_to_bytes(data)
-                if len(prof_cfg_bytes) > max_size:
-                    dynamic_profiler_utils.out_log("Load json failed,  because cfg bytes size over {} bytes".format(
-                        max_size), DynamicProfilerUtils.LoggerLevelEnum.WARNING, is_monitor_process=True)
-                    continue
-                try:
-                    if is_mmap and mmap is not None:
-                        DynamicProfilerShareMemory.write_bytes_py37(mmap_obj, prof_cfg_bytes, max_size)
-                    elif shm is not None:
-                        shm.write_bytes_over_py38(prof_cfg_bytes)
-                except Exception as ex:
-                    dynamic_profiler_utils.out_log("Dynamic profiler cfg bytes write failed, {} has occur!".format(
-                        str(ex)), dynamic_profiler_utils.LoggerLevelEnum.ERROR, is_monitor_process=True)
-        else:
-            dynamic_profiler_utils.out_log("Dynamic profiler cfg json not exists",
-                                           dynamic_profiler_utils.LoggerLevelEnum.ERROR, is_monitor_process=True)
-        time.sleep(poll_interval.value)
+        if not watcher.wait_change(poll_interval.value):
+            if not os.path.exists(cfg_path):
+                dynamic_profiler_utils.out_log("Dynamic profiler cfg json not exists",
+                                               dynamic_profiler_utils.LoggerLevelEnum.ERROR, is_monitor_process=True)
+            continue
+        try:
+            with open(cfg_path, 'r') as f:
+                data = json.load(f)
+            # convert json to bytes
+            data['is_valid'] = True
+            DynamicProfilerUtils.out_log("Dynamic profiler process load json success",
+                                         DynamicProfilerUtils.LoggerLevelEnum.INFO, is_monitor_process=True)
+        except Exception as ex:
+            data = {'is_valid': False}
+            dynamic_profiler_utils.out_log("Dynamic profiler process load json failed, {} has occur!".format(
+                str(ex)), dynamic_profiler_utils.LoggerLevelEnum.ERROR, is_monitor_process=True)
+        prof_cfg_bytes = ConfigContext.profiler_cfg_json_to_bytes(data)
+        if DynamicProfilerShareMemory.HEADER_SIZE + len(prof_cfg_bytes) > max_size:
+            dynamic_profiler_utils.out_log("Load json failed,  because cfg bytes size over {} bytes".format(
+                max_size), DynamicProfilerUtils.LoggerLevelEnum.WARNING, is_monitor_process=True)
+            continue
+        try:
+            if is_mmap and mmap is not None:
+                DynamicProfilerShareMemory.write_config_record(mmap_obj, prof_cfg_bytes)
+            elif shm is not None:
+                shm.write_config(prof_cfg_bytes)
+        except Exception as ex:
+            dynamic_profiler_utils.out_log("Dynamic profiler cfg bytes write failed, {} has occur!".format(
+                str(ex)), dynamic_profiler_utils.LoggerLevelEnum.ERROR, is_monitor_process=True)
+    watcher.close()
     dynamic_profiler_utils.out_log("Dynamic profiler process done", dynamic_profiler_utils.LoggerLevelEnum.INFO,
                                    is_monitor_process=True)
 
@@ -203,15 +208,14 @@ def worker_dyno_func(params_dict):
                                          dynamic_profiler_utils.LoggerLevelEnum.INFO)
         else:
             continue
-        time_bytes = struct.pack("<I", int(time.time()))
-        prof_cfg_bytes = time_bytes + ConfigContext.profiler_cfg_json_to_bytes(data)
-        if len(prof_cfg_bytes) > max_size:
+        prof_cfg_bytes = ConfigContext.profiler_cfg_json_to_bytes(data)
+        if DynamicProfilerShareMemory.HEADER_SIZE + len(prof_cfg_bytes) > max_size:
             dynamic_profiler_utils.out_log("Load json failed, because cfg bytes size over {} bytes".format(
                 max_size), dynamic_profiler_utils.LoggerLevelEnum.INFO)
             continue
         try:
             if shm is not None:
-                shm.write_bytes_over_py38(prof_cfg_bytes)
+                shm.write_config(prof_cfg_bytes)
         except Exception as ex:
             dynamic_profiler_utils.out_log("Dynamic profiler cfg bytes write failed, {} has occur!".format(str(ex)),
                                            dynamic_profiler_utils.LoggerLevelEnum.ERROR)
@@ -1,5 +1,4 @@
 import os
-import pickle
 import random
 import sys
 import stat
@@ -12,9 +11,20 @@ from ...utils._path_manager import PathManager
 from ...utils._error_code import ErrCode, prof_error
 from ..analysis.prof_common_func._file_manager import FileManager
 from ._dynamic_profiler_utils import DynamicProfilerUtils
+from ._dynamic_profiler_config_watcher import ConfigFileWatcher
 
 
 class DynamicProfilerShareMemory:
+    """
+    Node-level shared memory holding the profiler config record published by the monitor process.
+    The record is a fixed header (version, payload size) followed by the json payload of the config.
+    The version is even when the record is stable and odd while the monitor process rewrites it, so a rank
+    only compares the version at each step and reads the payload again when it has changed.
+    """
+    HEADER_FORMAT = "<QI"
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    VERSION_FORMAT = "<Q"
+    SIZE_OFFSET = struct.calcsize(VERSION_FORMAT)
     JSON_DATA = {
         "activities": ["CPU", "NPU"],
         "prof_dir": "./",
@@ -39,6 +49,15 @@ class DynamicProfilerShareMemory:
             "record_op_args": False,
             "export_type": ["text"],
             "msprof_tx": False
+        },
+        "straggler_detect": {
+            "enable": False,
+            "metric": "step_time",
+            "window": 20,
+            "percentile": 90,
+            "threshold": 0.2,
+            "check_interval": 10,
+            "cooldown": 200
         }
     }
 
@@ -56,10 +75,8 @@ class DynamicProfilerShareMemory:
         self._is_dyno = self._is_dyno = DynamicProfilerUtils.is_dyno_model()
         self.is_create_process = False
         self.shm = None
-        self.cur_mtime = 0
+        self.cur_file_stat = None
         self.is_mmap = False
-        self._time_data_bytes = struct.pack("<I", self.cur_mtime)
-        self._time_bytes_size = len(self._time_data_bytes)
         self._clean_shm_for_killed()
         self._create_shm()
         if self.is_create_process and not self._is_dyno:
@@ -101,8 +118,7 @@ class DynamicProfilerShareMemory:
                 self.JSON_DATA,
                 indent=4)
 
-        file_stat = os.stat(self.config_path)
-        self.cur_mtime = int(file_stat.st_mtime)
+        self.cur_file_stat = ConfigFileWatcher.get_file_stat(self.config_path)
 
     def _create_shm(self):
         if sys.version_info >= (3, 8):
@@ -115,9 +131,9 @@ class DynamicProfilerShareMemory:
             self._create_shm_py37()
 
     def _get_default_cfg_bytes(self):
-        bytes_data = pickle.dumps(self.JSON_DATA)
-        bytes_data = self._time_data_bytes + bytes_data
-        bytes_data = bytes_data.ljust(self._shm_buf_bytes_size)
+        # version 0 with an empty payload, the first config is published by the monitor process
+        bytes_data = struct.pack(self.HEADER_FORMAT, 0, 0)
+        bytes_data = bytes_data.ljust(self._shm_buf_bytes_size, b"\0")
         return bytes_data
 
     def _create_shm_over_py38(self):
@@ -250,34 +266,37 @@ class DynamicProfilerShareMemory:
         if try_times <= 0:
             raise RuntimeError("Failed to create shared memory." + prof_error(ErrCode.VALUE))
 
-    def read_bytes(self, read_time=False):
-        """Read bytes from shared memory"""
-        if sys.version_info >= (3, 8):
-            if read_time:
-                res = self.shm.buf[:self._time_bytes_size]
-                return res
-            else:
-                res = self.shm.buf[self._time_bytes_size:self._shm_buf_bytes_size]
-        else:
-            self.shm.seek(0)
-            if read_time:
-                res = self.shm[:self._time_bytes_size]
-                return res
-            else:
-                res = self.shm[self._time_bytes_size:self._shm_buf_bytes_size]
-        res = bytes(res)
-        bytes_data = res.lstrip()
+    def _get_buffer(self):
+        return self.shm.buf if sys.version_info >= (3, 8) else self.shm
 
-        return bytes_data
+    def read_version(self) -> int:
+        """Read the version of the config record from shared memory"""
+        return struct.unpack_from(self.VERSION_FORMAT, self._get_buffer(), 0)[0]
+
+    def read_config(self):
+        """
+        Read (version, payload bytes) of the config record from shared memory,
+        None if the record is being rewritten, it is read again at next step.
+        """
+        buffer = self._get_buffer()
+        version, size = struct.unpack_from(self.HEADER_FORMAT, buffer, 0)
+        if version % 2 == 1 or self.HEADER_SIZE + size > self._shm_buf_bytes_size:
+            return None
+        bytes_data = bytes(buffer[self.HEADER_SIZE:self.HEADER_SIZE + size])
+        if self.read_version() != version:
+            return None
+        return version, bytes_data
 
-    def write_bytes_over_py38(self, bytes_data: bytes):
-        """Write bytes to shared memory"""
-        bytes_data = bytes_data.ljust(self._shm_buf_bytes_size)
-        self.shm.buf[:self._shm_buf_bytes_size] = bytes_data
+    def write_config(self, bytes_data: bytes):
+        """Write the config payload bytes to shared memory"""
+        self.write_config_record(self._get_buffer(), bytes_data)
 
-    @staticmethod
-    def write_bytes_py37(shm: mmap.mmap, bytes_data: bytes, buffer_size: int):
-        """Write bytes to shared memory"""
-        bytes_data = bytes_data.ljust(buffer_size)
-        shm.seek(0)
-        shm[:buffer_size] = bytes_data
+    @classmethod
+    def write_config_record(cls, buffer, bytes_data: bytes):
+        """Publish bytes_data as a new version of the config record of buffer, the monitor process is the only writer"""
+        version = struct.unpack_from(cls.VERSION_FORMAT, buffer, 0)[0]
+        version += 2 - version % 2
+        struct.pack_into(cls.VERSION_FORMAT, buffer, 0, version - 1)
+        struct.pack_into("<I", buffer, cls.SIZE_OFFSET, len(bytes_data))
+        buffer[cls.HEADER_SIZE:cls.HEADER_SIZE + len(bytes_data)] = bytes_data
+        struct.pack_into(cls.VERSION_FORMAT, buffer, 0, version)
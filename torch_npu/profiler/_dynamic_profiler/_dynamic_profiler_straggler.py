@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+from ._dynamic_profiler_utils import DynamicProfilerUtils
+
+
+class StepTimeRing:
+    """
+    Node-local shared memory ring of the recent steps of every local rank.
+    Each local rank owns one slot of RING_SIZE records (step, step_time, computing, communication, free),
+    times in us as in TraceStepTimeParser, and a counter of the records it has written.
+    A rank only writes its own slot and reads the others without locking, a record being overwritten
+    while it is read only shifts the statistics by one sample.
+    """
+    RING_SIZE = 256
+    RECORD_FIELDS = ("step", "step_time", "computing", "communication", "free")
+    DEFAULT_MAX_LOCAL_RANKS = 16
+
+    def __init__(self, shm_name: str, local_rank: int, max_local_ranks: int):
+        self._shm_name = shm_name
+        self._local_rank = local_rank
+        self._max_local_ranks = max_local_ranks
+        self._is_creator = False
+        self.shm = None
+        self._counters = None
+        self._records = None
+        self._create_shm()
+
+    @property
+    def local_rank(self) -> int:
+        return self._local_rank
+
+    @classmethod
+    def get_buffer_size(cls, max_local_ranks: int) -> int:
+        return max_local_ranks * 8 + max_local_ranks * cls.RING_SIZE * len(cls.RECORD_FIELDS) * 8
+
+    def _create_shm(self):
+        from unittest.mock import patch
+        from multiprocessing import shared_memory
+        size = self.get_buffer_size(self._max_local_ranks)
+        try:
+            # the first rank of the node creates the ring zeroed, the others attach to it
+            self.shm = shared_memory.SharedMemory(name=self._shm_name, create=True, size=size)
+            self._is_creator = True
+        except FileExistsError:
+            with patch("multiprocessing.resource_tracker.register", lambda *args, **kwargs: None):
+                self.shm = shared_memory.SharedMemory(name=self._shm_name)
+        self._counters = np.ndarray((self._max_local_ranks,), dtype=np.int64, buffer=self.shm.buf)
+        self._records = np.ndarray((self._max_local_ranks, self.RING_SIZE, len(self.RECORD_FIELDS)),
+                                   dtype=np.float64, buffer=self.shm.buf, offset=self._max_local_ranks * 8)
+
+    def write(self, record: tuple):
+        count = int(self._counters[self._local_rank])
+        self._records[self._local_rank, count % self.RING_SIZE] = record
+        self._counters[self._local_rank] = count + 1
+
+    def read_recent(self, field: str, num: int) -> dict:
+        """Return {local_rank: values of field of its last num records, oldest first} of the ranks with records."""
+        field_index = self.RECORD_FIELDS.index(field)
+        num = min(num, self.RING_SIZE)
+        recent = {}
+        for local_rank in range(self._max_local_ranks):
+            count = int(self._counters[local_rank])
+            if count <= 0:
+                continue
+            positions = np.arange(max(count - num, 0), count) % self.RING_SIZE
+            recent[local_rank] = self._records[local_rank, positions, field_index].copy()
+        return recent
+
+    def clean_resource(self):
+        if self.shm is None:
+            return
+        # the numpy views must be released before the buffer is closed
+        self._counters = None
+        self._records = None
+        try:
+            self.shm.close()
+            if self._is_creator:
+                self.shm.unlink()
+        except Exception as ex:
+            DynamicProfilerUtils.out_log("Rank {} clean step time shm failed, {} has occur".format(
+                self._local_rank, str(ex)), DynamicProfilerUtils.LoggerLevelEnum.ERROR)
+        self.shm = None
+
+
+class StragglerDetector:
+    """
+    Always-on step time recorder of the dynamic profiler that flags this rank as a straggler.
+    Every check_interval steps, the median of the metric over the last window steps of each local rank is
+    compared to the given percentile of the medians of its peers, this rank is a straggler when it exceeds
+    that reference by more than threshold (relative). A rank without peers on its node is compared to its
+    own earlier steps instead, so a drift over time is still caught.
+    Once flagged the rank is not checked again for cooldown steps, giving the triggered capture time to run.
+    """
+
+    def __init__(self, shm_name: str, straggler_config: dict):
+        self._config = straggler_config
+        self._metric = straggler_config["metric"]
+        self._window = min(straggler_config["window"], StepTimeRing.RING_SIZE // 2)
+        self._ring = None
+        self._last_step_time_ns = None
+        self._step_count = 0
+        self._quiet_until = 0
+        max_local_ranks = self.get_max_local_ranks()
+        local_rank = self.get_local_rank(max_local_ranks)
+        if sys.version_info < (3, 8):
+            DynamicProfilerUtils.out_log("Straggler detect needs python 3.8+, it will not be enabled.",
+                                         DynamicProfilerUtils.LoggerLevelEnum.WARNING)
+            return
+        try:
+            self._ring = StepTimeRing(shm_name, local_rank, max_local_ranks)
+        except Exception as ex:
+            DynamicProfilerUtils.out_log("Create step time shm failed, straggler detect will not be enabled, "
+                                         "{} has occur".format(str(ex)), DynamicProfilerUtils.LoggerLevelEnum.ERROR)
+
+    @property
+    def enabled(self) -> bool:
+        return self._ring is not None
+
+    @staticmethod
+    def get_max_local_ranks() -> int:
+        try:
+            return max(int(os.environ.get("LOCAL_WORLD_SIZE", StepTimeRing.DEFAULT_MAX_LOCAL_RANKS)), 1)
+        except ValueError:
+            return StepTimeRing.DEFAULT_MAX_LOCAL_RANKS
+
+    @staticmethod
+    def get_local_rank(max_local_ranks: int) -> int:
+        try:
+            local_rank = int(os.environ.get("LOCAL_RANK"))
+        except (TypeError, ValueError):
+            local_rank = max(DynamicProfilerUtils.get_rank_id(), 0)
+        return local_rank % max_local_ranks
+
+    @staticmethod
+    def find_stragglers(recent: dict, window: int, percentile: float, threshold: float) -> list:
+        """Return the ranks of recent ({rank: metric values, oldest first}) that straggle behind their peers."""
+        medians = {rank: float(np.median(values[-window:]))
+                   for rank, values in recent.items() if len(values) >= window}
+        stragglers = []
+        for rank, median in medians.items():
+            peer_medians = [peer_median for peer, peer_median in medians.items() if peer != rank]
+            if peer_medians:
+                reference = np.percentile(peer_medians, percentile)
+            else:
+                history = recent[rank][:-window]
+                if len(history) < window:
+                    continue
+                reference = np.percentile(history, percentile)
+            if median > reference * (1 + threshold):
+                stragglers.append(rank)
+        return stragglers
+
+    def record_step(self, step: int, computing_us: float = 0, communication_us: float = 0):
+        """Record the wall time since the previous call as the time of step."""
+        now = time.perf_counter_ns()
+        last_step_time_ns, self._last_step_time_ns = self._last_step_time_ns, now
+        if not self.enabled or last_step_time_ns is None:
+            return
+        step_time_us = (now - last_step_time_ns) / 1000
+        free_us = max(step_time_us - computing_us - communication_us, 0)
+        self._ring.write((step, step_time_us, computing_us, communication_us, free_us))
+        self._step_count += 1
+
+    def is_straggler(self) -> bool:
+        if not self.enabled or self._step_count < self._quiet_until:
+            return False
+        if self._step_count < self._window or self._step_count % self._config["check_interval"] != 0:
+            return False
+        recent = self._ring.read_recent(self._metric, StepTimeRing.RING_SIZE)
+        if self._ring.local_rank not in self.find_stragglers(recent, self._window, self._config["percentile"],
+                                                             self._config["threshold"]):
+            return False
+        self._quiet_until = self._step_count + self._config["cooldown"]
+        return True
+
+    def update_config(self, straggler_config: dict):
+        self._config = straggler_config
+        self._metric = straggler_config["metric"]
+        self._window = min(straggler_config["window"], StepTimeRing.RING_SIZE // 2)
+
+    def clean_resource(self):
+        if self._ring is not None:
+            self._ring.clean_resource()
+            self._ring = None
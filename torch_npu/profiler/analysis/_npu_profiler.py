@@ -1,8 +1,13 @@
 import multiprocessing
+import os
+import threading
 
-from .prof_common_func._constant import Constant, print_error_msg
+from .prof_common_func._constant import Constant, print_error_msg, print_info_msg, print_warn_msg
+from .prof_common_func._global_resource_pool import GlobalResourcePool
 from .prof_common_func._path_manager import ProfilerPathManager
 from .prof_common_func._multi_process_pool import MultiProcessPool
+from .prof_common_func._task_manager import ConcurrentTasksManager
+from .prof_view._cluster_view_parser import ClusterViewParser
 from ._profiling_parser import ProfilingParser
 from ...utils._path_manager import PathManager
 
@@ -29,6 +34,9 @@ class NpuProfiler:
 
         # 多profiling数据的解析
         multiprocessing.set_start_method("fork", force=True)
+        if kwargs.get("cluster_mode", False) and len(profiler_path_list) > 1:
+            cls._analyse_cluster(input_path, profiler_path_list, analysis_type, output_path, kwargs)
+            return
         process_number = min(kwargs.get("max_process_number", Constant.DEFAULT_PROCESS_NUMBER),
                              len(profiler_path_list))
         MultiProcessPool().init_pool(process_number)
@@ -40,6 +48,56 @@ class NpuProfiler:
         if not kwargs.get("async_mode", False):
             MultiProcessPool().close_pool()
 
+    @classmethod
+    def _analyse_cluster(cls, input_path: str, profiler_path_list: list, analysis_type: str, output_path: str,
+                         kwargs: dict):
+        """
+        Parse all the ranks with one global budget: the parsers of every rank take their cpu slot and memory
+        estimate from GlobalResourcePool, then the cross-rank views are generated from the rank outputs.
+        """
+        if kwargs.get("async_mode", False):
+            print_warn_msg("The async_mode is not supported by the cluster analysis, it will be parsed synchronously.")
+        cpu_num = ConcurrentTasksManager.get_available_cpu_num()
+        memory_budget = int(GlobalResourcePool().get_available_memory() * Constant.CLUSTER_MEMORY_RATIO)
+        GlobalResourcePool().init_pool(cpu_num, memory_budget)
+        MultiProcessPool().init_pool(min(kwargs.get("max_process_number", Constant.DEFAULT_PROCESS_NUMBER),
+                                         len(profiler_path_list), cpu_num))
+        task_futures = []
+        for profiler_path in profiler_path_list:
+            PathManager.check_directory_path_writeable(profiler_path)
+            profiling_parser = ProfilingParser(profiler_path, analysis_type, output_path, kwargs)
+            task_futures.append(MultiProcessPool().submit_task(profiling_parser.analyse_profiling_data))
+        stop_event = threading.Event()
+        progress_thread = threading.Thread(target=cls._report_progress, args=(stop_event,), daemon=True)
+        progress_thread.start()
+        for task_future in task_futures:
+            try:
+                task_future.result()
+            except Exception as e:
+                print_error_msg(f"Failed to parse the profiling data of one rank, error: {str(e)}")
+        stop_event.set()
+        progress_thread.join()
+        MultiProcessPool().close_pool()
+        GlobalResourcePool().close_pool()
+        if analysis_type != Constant.TENSORBOARD_TRACE_HANDLER:
+            return
+        cluster_output_path = os.path.join(input_path, Constant.CLUSTER_ANALYSIS_OUTPUT)
+        PathManager.make_dir_safety(cluster_output_path)
+        ClusterViewParser(profiler_path_list, cluster_output_path).generate_view()
+        print_info_msg(f"The cluster analysis results are saved in {cluster_output_path}.")
+
+    @classmethod
+    def _report_progress(cls, stop_event: threading.Event):
+        last_progress = None
+        while True:
+            stopped = stop_event.wait(Constant.SLEEP_TIME * 10)
+            progress = GlobalResourcePool().get_progress()
+            if progress != last_progress and progress[1] > 0:
+                print_info_msg(f"Cluster analysis progress: {progress[0]}/{progress[1]} parser tasks finished.")
+                last_progress = progress
+            if stopped:
+                return
+
     @classmethod
     def _check_input_path(cls, path: str):
         PathManager.check_input_directory_path(path)
@@ -4,6 +4,8 @@ import re
 from json import JSONDecodeError
 from configparser import ConfigParser
 
+import numpy as np
+
 from .prof_common_func._file_manager import FileManager
 from .prof_common_func._path_manager import ProfilerPathManager
 from .prof_common_func._singleton import Singleton
@@ -172,6 +174,10 @@ class ProfilerConfig:
     def get_prune_config(self):
         return self.LEVEL_TRACE_PRUNE_CONFIG.get(self._profiler_level)
 
+    def is_text_based_export(self) -> bool:
+        # the columnar tables are built from the same CANN text export as the csv views
+        return Constant.Text in self._export_type or Constant.Columnar in self._export_type
+
     def is_all_kernel_headers(self):
         if self._ai_core_metrics != Constant.AicMetricsNone:
             return True
@@ -181,6 +187,17 @@ class ProfilerConfig:
     def get_local_time(self, monotonic_time: int):
         return int(monotonic_time + self._localtime_diff)
 
+    def get_local_time_array(self, syscnt_array: np.ndarray) -> np.ndarray:
+        """Vectorized get_local_time(get_timestamp_from_syscnt(syscnt)) for a whole column of records."""
+        syscnt_array = np.asarray(syscnt_array).astype(np.int64)
+        if self._syscnt_enable:
+            if abs(self._freq) < 1e-15:
+                msg = "The frequency value is too small to be close to zero, please check."
+                raise RuntimeError(msg)
+            ratio = 1000 / self._freq
+            syscnt_array = ((syscnt_array - self._start_cnt) * ratio).astype(np.int64) + self._time_offset
+        return syscnt_array + int(self._localtime_diff)
+
     def get_level(self):
         return self._profiler_level
 
@@ -206,7 +223,7 @@ class ProfilerConfig:
             print_warn_msg(
                 "Invalid parameter export_type from profiler_info.json: %s, reset it to text." % export_type)
             return [Constant.Text]
-        if not all(tmp_type in [Constant.Text, Constant.Db] for tmp_type in export_type):
+        if not all(tmp_type in [Constant.Text, Constant.Db, Constant.Columnar] for tmp_type in export_type):
             print_warn_msg("Invalid parameter export_type from profiler_info.json, reset it to text.")
             return [Constant.Text]
         return export_type
@@ -4,11 +4,16 @@ from datetime import datetime
 
 from .prof_common_func._constant import Constant, print_info_msg, print_error_msg, print_warn_msg
 from .prof_common_func._cann_package_manager import CannPackageManager
+from .prof_common_func._checkpoint_manager import CheckpointManager
+from .prof_common_func._data_cache import DataCache
+from .prof_common_func._global_resource_pool import GlobalResourcePool
 from .prof_common_func._path_manager import ProfilerPathManager
 from .prof_common_func._task_manager import ConcurrentTasksManager
 from .prof_common_func._log import ProfilerLogger
 from .prof_config._parser_config import ParserConfig
+from .prof_config._parser_deps_config import ParserDepsConfig
 from .prof_parse._cann_file_parser import CANNFileParser
+from .prof_parse._fwk_file_parser import FwkFileParser
 from ._profiler_config import ProfilerConfig
 from ...utils._path_manager import PathManager
 
@@ -22,10 +27,9 @@ class ProfilingParser:
         self._output_path = output_path
         self._kwargs = kwargs
         self._start_time = datetime.utcnow()
+        self._checkpoint = None
         if analysis_type == Constant.TENSORBOARD_TRACE_HANDLER:
             self._output_path = os.path.join(profiler_path, Constant.OUTPUT_DIR)
-            PathManager.remove_path_safety(self._output_path)
-            PathManager.make_dir_safety(self._output_path)
         ProfilerLogger.init(self._profiler_path, "ProfilingParser")
         self.logger = ProfilerLogger.get_instance()
 
@@ -58,6 +62,13 @@ class ProfilingParser:
                     PathManager.remove_file_safety(file_path)
 
     def update_export_type(self):
+        if Constant.Columnar in ProfilerConfig().export_type and \
+                self._analysis_type != Constant.TENSORBOARD_TRACE_HANDLER:
+            print_warn_msg("The setting of type in experimental_config as columnar will be ignored while set "
+                           "export_chrome_trace, export_stacks or export_memory_timeline")
+            export_type = [export_type for export_type in ProfilerConfig().export_type
+                           if export_type != Constant.Columnar]
+            ProfilerConfig().export_type = export_type or [Constant.Text]
         if Constant.Db not in ProfilerConfig().export_type:
             return
         if self._analysis_type == Constant.EXPORT_CHROME_TRACE or self._analysis_type == Constant.EXPORT_STACK:
@@ -70,6 +81,16 @@ class ProfilingParser:
             raise RuntimeError("Current CANN package version does not support export db. "
                                "If you want to export db, you can install supported CANN package version.")
 
+    def get_data_size(self) -> int:
+        data_size = 0
+        for dir_path, _, file_names in os.walk(self._profiler_path):
+            for file_name in file_names:
+                try:
+                    data_size += os.path.getsize(os.path.join(dir_path, file_name))
+                except OSError:
+                    continue
+        return data_size
+
     def delete_previous_cann_db_files(self):
         cann_path = ProfilerPathManager.get_cann_path(self._profiler_path)
         if not cann_path:
@@ -84,14 +105,27 @@ class ProfilingParser:
         print_info_msg(f"Start parsing profiling data: {self._profiler_path}")
         ProfilerConfig().load_info(self._profiler_path)
         self.update_export_type()
-        self.delete_previous_cann_db_files()
+        kwargs = {key: value for key, value in self._kwargs.items() if key != "use_checkpoint"}
+        self._checkpoint = CheckpointManager(self._profiler_path, self._output_path,
+                                             {"analysis_type": self._analysis_type, "kwargs": kwargs,
+                                              "output_path": self._output_path},
+                                             self._kwargs.get("use_checkpoint", True))
+        if self._analysis_type == Constant.TENSORBOARD_TRACE_HANDLER:
+            # the views of the parsers skipped by the checkpoint are kept
+            if not self._checkpoint.is_valid:
+                PathManager.remove_path_safety(self._output_path)
+            PathManager.make_dir_safety(self._output_path)
+        DataCache().invalidate(self._profiler_path)
         try:
             self.run_parser()
         except Exception as err:
             print_error_msg(f"Failed to parsing profiling data. {err}")
             self.logger.error("Failed to parsing profiling data, error: %s", str(err), exc_info=True)
+        finally:
+            DataCache().invalidate(self._profiler_path)
         if self._analysis_type == Constant.TENSORBOARD_TRACE_HANDLER:
             self.simplify_data(self._profiler_path, ProfilerConfig().data_simplification)
+        self._checkpoint.save()
         end_time = datetime.utcnow()
         print_info_msg(f"All profiling data parsed in a total time of {end_time - self._start_time}")
 
@@ -101,24 +135,44 @@ class ProfilingParser:
             param_dict.update(self._kwargs)
 
         parser_config = ParserConfig.ONLY_FWK_CONFIG
-        if ProfilerPathManager.get_cann_path(self._profiler_path):
-            CANNFileParser(self._profiler_path).del_summary_and_timeline_data()
-            CANNFileParser(self._profiler_path).del_output_path_data()
+        cann_path = ProfilerPathManager.get_cann_path(self._profiler_path)
+        if cann_path:
             if ProfilerConfig().get_level() == "Level_none":
                 parser_config = ParserConfig.LEVEL_NONE_CONFIG
             else:
                 parser_config = ParserConfig.COMMON_CONFIG
 
         parser_list = []
-        unique_parser_set = set()
-        for export_type in set(ProfilerConfig().export_type):
+        task_export_types = {}
+        for export_type in sorted(set(ProfilerConfig().export_type)):
             for parser in parser_config.get(export_type).get(self._analysis_type):
-                if parser in unique_parser_set:
-                    continue
-                unique_parser_set.add(parser)
-                parser_list.append(parser)
+                task_name = ParserConfig.PARSER_NAME_MAP.get(parser)
+                if task_name not in task_export_types:
+                    parser_list.append(parser)
+                task_export_types.setdefault(task_name, []).append(export_type)
+
+        task_list = [parser(ParserConfig.PARSER_NAME_MAP.get(parser), param_dict) for parser in parser_list]
+        skipped_tasks = self._checkpoint.get_skipped_tasks(task_list, task_export_types)
+        if skipped_tasks:
+            print_info_msg(f"Reuse the outputs of {len(skipped_tasks)} unchanged parsers of the last analysis.")
+        if cann_path and Constant.CANN_EXPORT_PARSER not in skipped_tasks:
+            self.delete_previous_cann_db_files()
+            CANNFileParser(self._profiler_path).del_summary_and_timeline_data()
+            CANNFileParser(self._profiler_path).del_output_path_data()
 
-        manager = ConcurrentTasksManager(progress_bar="cursor")
-        for parser in parser_list:
-            manager.add_task(parser(ParserConfig.PARSER_NAME_MAP.get(parser), param_dict))
+        # the tasks of all the ranks of a cluster analysis share the global resource pool of the driver
+        resource_pool = GlobalResourcePool() if GlobalResourcePool().enabled else None
+        data_size = self.get_data_size() if resource_pool else 0
+        manager = ConcurrentTasksManager(progress_bar=None if resource_pool else "cursor", resource_pool=resource_pool)
+        for task in task_list:
+            if task.name in skipped_tasks:
+                continue
+            task.deps = [dep for dep in task.deps if dep not in skipped_tasks]
+            task.memory_estimate = data_size * ParserDepsConfig.MEMORY_FACTOR.get(
+                task.name, ParserDepsConfig.DEFAULT_MEMORY_FACTOR)
+            manager.add_task(task)
+        if ProfilerPathManager.get_fwk_path(self._profiler_path) and len(skipped_tasks) < len(task_list):
+            # the parser tasks run in forked sub processes, load the data they share before the fork
+            FwkFileParser(self._profiler_path).preload_shared_data()
         manager.run()
+        self._checkpoint.update(manager.task_infos)
@@ -1,4 +1,5 @@
 import struct
+import sys
 from enum import Enum
 
 from .._profiler_config import ProfilerConfig
@@ -32,11 +33,11 @@ class TorchOpBean:
         Constant.FLOPS: 10
     }
     CONSTANT_STRUCT = "<3q4QB?"
+    __slots__ = ("_origin_data", "_pid", "_tid", "_name", "_start_ns", "_end_ns", "_scope", "_call_stack",
+                 "_args", "_inputs")
 
     def __init__(self, data: dict):
         self._origin_data = data
-        self._constant_data = struct.unpack(self.CONSTANT_STRUCT, data.get(Constant.CONSTANT_BYTES))
-        self._kernel_list = []
         self._pid = None
         self._tid = None
         self._name = None
@@ -44,6 +45,8 @@ class TorchOpBean:
         self._end_ns = None
         self._call_stack = None
         self._args = None
+        self._inputs = None
+        self._scope = None
         self.init()
 
     @property
@@ -72,18 +75,36 @@ class TorchOpBean:
 
     @property
     def call_stack(self):
+        if self._call_stack is None:
+            self._call_stack = self._origin_data.get(
+                self.TLV_TYPE_DICT.get(Constant.CALL_STACK), "").replace(";", ";\r\n")
         return self._call_stack
-    
+
     @property
     def inputs(self):
+        if self._inputs is None:
+            self._inputs = {
+                Constant.INPUT_TENSORS: self._origin_data.get(self.TLV_TYPE_DICT.get(Constant.INPUT_TENSORS)),
+                Constant.INPUT_TENSORLISTS: self._origin_data.get(self.TLV_TYPE_DICT.get(Constant.INPUT_TENSORLISTS)),
+                Constant.INPUT_SCALARS: self._origin_data.get(self.TLV_TYPE_DICT.get(Constant.INPUT_SCALARS))}
         return self._inputs
-    
+
     @property
     def scope(self):
         return self._scope
 
+    @property
+    def sequence_number(self) -> int:
+        return int(self._get_constant_data()[TorchOpEnum.SEQUENCE_NUMBER.value])
+
+    @property
+    def forward_thread_id(self) -> int:
+        return int(self._get_constant_data()[TorchOpEnum.FORWARD_THREAD_ID.value])
+
     @property
     def args(self):
+        if self._args is None:
+            self._args = self.get_args()
         return self._args
 
     @property
@@ -91,26 +112,24 @@ class TorchOpBean:
         return True
 
     def init(self):
-        self._pid = int(self._constant_data[TorchOpEnum.PROCESS_ID.value])
-        self._tid = int(self._constant_data[TorchOpEnum.START_THREAD_ID.value])
-        self._name = str(self._origin_data.get(self.TLV_TYPE_DICT.get(Constant.OP_NAME), ""))
+        # the rarely used constant fields are unpacked again on access instead of being kept per op
+        constant_data = self._get_constant_data()
+        self._pid = int(constant_data[TorchOpEnum.PROCESS_ID.value])
+        self._tid = int(constant_data[TorchOpEnum.START_THREAD_ID.value])
+        self._name = sys.intern(str(self._origin_data.get(self.TLV_TYPE_DICT.get(Constant.OP_NAME), "")))
         self._start_ns = ProfilerConfig().get_local_time(
-            ProfilerConfig().get_timestamp_from_syscnt(self._constant_data[TorchOpEnum.START_NS.value]))
+            ProfilerConfig().get_timestamp_from_syscnt(constant_data[TorchOpEnum.START_NS.value]))
         self._end_ns = ProfilerConfig().get_local_time(
-            ProfilerConfig().get_timestamp_from_syscnt(self._constant_data[TorchOpEnum.END_NS.value]))
-        self._scope = int(self._constant_data[TorchOpEnum.SCOPE.value])
-        self._call_stack = self._origin_data.get(self.TLV_TYPE_DICT.get(Constant.CALL_STACK), "").replace(";", ";\r\n")
-        self._args = self.get_args()
-        self._inputs = {
-            Constant.INPUT_TENSORS: self._origin_data.get(self.TLV_TYPE_DICT.get(Constant.INPUT_TENSORS)),
-            Constant.INPUT_TENSORLISTS: self._origin_data.get(self.TLV_TYPE_DICT.get(Constant.INPUT_TENSORLISTS)),
-            Constant.INPUT_SCALARS: self._origin_data.get(self.TLV_TYPE_DICT.get(Constant.INPUT_SCALARS))}
+            ProfilerConfig().get_timestamp_from_syscnt(constant_data[TorchOpEnum.END_NS.value]))
+        self._scope = int(constant_data[TorchOpEnum.SCOPE.value])
+
+    def _get_constant_data(self) -> tuple:
+        return struct.unpack(self.CONSTANT_STRUCT, self._origin_data.get(Constant.CONSTANT_BYTES))
 
     def get_args(self) -> dict:
         args = {
-            Constant.SEQUENCE_NUMBER: int(self._constant_data[TorchOpEnum.SEQUENCE_NUMBER.value]),
-            Constant.FORWARD_THREAD_ID: int(
-                self._constant_data[TorchOpEnum.FORWARD_THREAD_ID.value])}
+            Constant.SEQUENCE_NUMBER: self.sequence_number,
+            Constant.FORWARD_THREAD_ID: self.forward_thread_id}
         for type_name, type_id in self.TLV_TYPE_DICT.items():
             if type_name in [Constant.OP_NAME, Constant.INPUT_TENSORS,
                              Constant.INPUT_TENSORLISTS, Constant.INPUT_SCALARS]:
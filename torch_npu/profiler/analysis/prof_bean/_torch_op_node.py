@@ -1,100 +1,330 @@
-from math import ceil
+import bisect
+import sys
+from array import array
+from collections.abc import Sequence
+
+import numpy as np
 
 from ..prof_common_func._constant import Constant
 
 __all__ = []
 
 
+class TorchOpTree:
+    """
+    Columnar storage of a torch op tree, one slot per node in insertion (preorder) order.
+    Start, end, parent, children links, child duration sum, pid, tid and name id of the nodes are kept
+    in flat arrays, names are interned in one table and the correlation ids are only stored for the
+    nodes that have any. The events are kept for the lazily decoded fields (args, call stack).
+    Nodes are exposed as TorchOpNode views of (tree, index), so a tree is shared by the forked
+    workers of ConcurrentTasksManager without pickling the nodes.
+    The numpy columns are converted once per tree size and read-only, the children of a node are matched
+    by a binary search over their sorted starts, built on the first match and dropped when a child is added.
+    """
+
+    def __init__(self):
+        self._events = []
+        self._start = array("q")
+        self._end = array("q")
+        self._parent = array("q")
+        self._first_child = array("q")
+        self._last_child = array("q")
+        self._next_sibling = array("q")
+        self._child_dur = array("q")
+        self._pid = array("Q")
+        self._tid = array("Q")
+        self._name_id = array("l")
+        self._name_table = {}
+        self._names = []
+        self._corr_id_self = {}
+        self._corr_id_total = {}
+        self._columns = {}
+        self._child_starts = {}
+
+    def __len__(self):
+        return len(self._events)
+
+    @property
+    def nodes(self) -> "TorchOpNodeList":
+        return TorchOpNodeList(self, range(len(self._events)))
+
+    @property
+    def names(self) -> list:
+        return self._names
+
+    @property
+    def start(self) -> np.ndarray:
+        return self._get_column("_start", np.int64)
+
+    @property
+    def end(self) -> np.ndarray:
+        return self._get_column("_end", np.int64)
+
+    @property
+    def parent(self) -> np.ndarray:
+        return self._get_column("_parent", np.int64)
+
+    @property
+    def name_id(self) -> np.ndarray:
+        return self._get_column("_name_id", np.int64)
+
+    @property
+    def pid(self) -> np.ndarray:
+        return self._get_column("_pid", np.uint64)
+
+    @property
+    def tid(self) -> np.ndarray:
+        return self._get_column("_tid", np.uint64)
+
+    def add_node(self, event: any, parent_index: int = -1) -> int:
+        """Append a node for event (None for a virtual root) and return its index, it is not linked to the parent."""
+        index = len(self._events)
+        self._events.append(event)
+        self._parent.append(parent_index)
+        self._first_child.append(-1)
+        self._last_child.append(-1)
+        self._next_sibling.append(-1)
+        self._child_dur.append(0)
+        if event is None:
+            self._start.append(0)
+            self._end.append(0)
+            self._pid.append(0)
+            self._tid.append(0)
+            self._name_id.append(-1)
+            return index
+        self._start.append(event.ts)
+        self._end.append(event.end_ns)
+        self._pid.append(int(event.pid))
+        self._tid.append(int(event.tid))
+        self._name_id.append(self._intern_name(event.name))
+        return index
+
+    def add_child(self, parent_index: int, child_index: int):
+        self._child_starts.pop(parent_index, None)
+        if self._first_child[parent_index] < 0:
+            self._first_child[parent_index] = child_index
+        else:
+            self._next_sibling[self._last_child[parent_index]] = child_index
+        self._last_child[parent_index] = child_index
+        self._child_dur[parent_index] += self.get_dur(child_index)
+
+    def iter_children(self, index: int):
+        child_index = self._first_child[index]
+        while child_index >= 0:
+            yield child_index
+            child_index = self._next_sibling[child_index]
+
+    def match_child(self, index: int, ts_time: int) -> int:
+        """Return the index of the child of index whose [start, end) holds ts_time, -1 if none does."""
+        child_starts = self._child_starts.get(index)
+        if child_starts is None:
+            children = list(self.iter_children(index))
+            child_starts = self._child_starts[index] = ([self._start[child] for child in children], children)
+        starts, children = child_starts
+        position = bisect.bisect_right(starts, ts_time) - 1
+        if position < 0 or self._end[children[position]] <= ts_time:
+            return -1
+        return children[position]
+
+    def get_event(self, index: int) -> any:
+        return self._events[index]
+
+    def get_name(self, index: int) -> any:
+        name_id = self._name_id[index]
+        return self._names[name_id] if name_id >= 0 else None
+
+    def get_start(self, index: int) -> int:
+        return self._start[index]
+
+    def get_end(self, index: int) -> int:
+        return self._end[index]
+
+    def get_dur(self, index: int) -> int:
+        return self._end[index] - self._start[index]
+
+    def get_child_dur(self, index: int) -> int:
+        return self._child_dur[index]
+
+    def get_pid(self, index: int) -> int:
+        return self._pid[index]
+
+    def get_parent(self, index: int) -> int:
+        return self._parent[index]
+
+    def get_corr_id_self(self, index: int) -> list:
+        return self._corr_id_self.get(index, [])
+
+    def get_corr_id_total(self, index: int) -> list:
+        return self._corr_id_total.get(index, [])
+
+    def add_corr_id_self(self, index: int, corr_id: int):
+        self._corr_id_self.setdefault(index, []).append(corr_id)
+
+    def add_corr_id_total(self, index: int, corr_id: int):
+        self._corr_id_total.setdefault(index, []).append(corr_id)
+
+    def _get_column(self, name: str, dtype) -> np.ndarray:
+        # the columns are only appended to, a cached conversion is valid while the tree keeps its size
+        cached = self._columns.get(name)
+        if cached is None or len(cached) != len(self._events):
+            cached = np.array(getattr(self, name), dtype=dtype)
+            cached.setflags(write=False)
+            self._columns[name] = cached
+        return cached
+
+    def _intern_name(self, name: str) -> int:
+        name_id = self._name_table.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._name_table[name] = name_id
+            self._names.append(sys.intern(name) if isinstance(name, str) else name)
+        return name_id
+
+
+class TorchOpNodeList(Sequence):
+    """Read-only list of the TorchOpNode views of a TorchOpTree, the views are created on access."""
+
+    def __init__(self, tree: TorchOpTree, indexes: range):
+        self._tree = tree
+        self._indexes = indexes
+
+    def __len__(self):
+        return len(self._indexes)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return TorchOpNodeList(self._tree, self._indexes[item])
+        return TorchOpNode.create_view(self._tree, self._indexes[item])
+
+    def __iter__(self):
+        for index in self._indexes:
+            yield TorchOpNode.create_view(self._tree, index)
+
+    @property
+    def tree(self) -> TorchOpTree:
+        return self._tree
+
+
 class TorchOpNode:
+    """
+    View of one node of a TorchOpTree.
+    TorchOpNode() creates a new tree with a virtual root, TorchOpNode(event, parent_node) adds a node to
+    the tree of parent_node, add_child_node links it as the last child.
+    """
+    __slots__ = ("_tree", "_index")
+
     def __init__(self, event=None, parent_node=None):
-        self._event = event
-        self._parent_node = parent_node
-        self._child_list = []
-        self._corr_id_total = []
-        self._corr_id_self = []
+        if parent_node is None:
+            self._tree = TorchOpTree()
+            self._index = self._tree.add_node(event)
+        else:
+            self._tree = parent_node.tree
+            self._index = self._tree.add_node(event, parent_node.index)
+
+    def __eq__(self, other):
+        return isinstance(other, TorchOpNode) and self._tree is other.tree and self._index == other.index
+
+    def __hash__(self):
+        return hash((id(self._tree), self._index))
+
+    @classmethod
+    def create_view(cls, tree: TorchOpTree, index: int) -> "TorchOpNode":
+        node = cls.__new__(cls)
+        node._tree = tree
+        node._index = index
+        return node
+
+    @property
+    def tree(self) -> TorchOpTree:
+        return self._tree
+
+    @property
+    def index(self) -> int:
+        return self._index
 
     @property
     def event(self):
-        return self._event
+        return self._tree.get_event(self._index)
 
     @property
     def pid(self):
-        return self._event.pid
+        return self._tree.get_pid(self._index)
 
     @property
     def name(self):
-        return self._event.name
+        return self._tree.get_name(self._index)
 
     @property
     def input_shape(self):
-        return self._event.args.get(Constant.INPUT_SHAPES, "")
+        return self.event.args.get(Constant.INPUT_SHAPES, "")
 
     @property
     def call_stack(self):
-        return self._event.call_stack
+        return self.event.call_stack
 
     @property
     def start_time(self) -> int:
-        return self._event.ts
+        return self._tree.get_start(self._index)
 
     @property
     def end_time(self) -> int:
-        return self._event.end_ns
+        return self._tree.get_end(self._index)
 
     @property
     def host_self_dur(self):
         # Time unit is ns
-        return self._event.dur - sum([node.event.dur for node in self._child_list])
+        return self._tree.get_dur(self._index) - self._tree.get_child_dur(self._index)
 
     @property
     def host_total_dur(self):
         # Time unit is ns
-        return self._event.dur
+        return self._tree.get_dur(self._index)
 
     @property
     def child_node_list(self) -> list:
-        return self._child_list
+        return [TorchOpNode.create_view(self._tree, index) for index in self._tree.iter_children(self._index)]
 
     @property
     def parent_node(self) -> any:
-        return self._parent_node
+        parent_index = self._tree.get_parent(self._index)
+        return TorchOpNode.create_view(self._tree, parent_index) if parent_index >= 0 else None
 
     @property
-    def corr_id_total(self) -> any:
-        return self._corr_id_total
+    def corr_id_total(self) -> list:
+        """
+        Corr ids of this node and all its descendants, collected from their corr_id_self on access,
+        plus the ones added by update_corr_id_total. The root node only has the added ones.
+        """
+        corr_id_total = list(self._tree.get_corr_id_total(self._index))
+        if self._tree.get_parent(self._index) < 0:
+            return corr_id_total
+        index_stack = [self._index]
+        while index_stack:
+            index = index_stack.pop()
+            corr_id_total.extend(self._tree.get_corr_id_self(index))
+            index_stack.extend(reversed(list(self._tree.iter_children(index))))
+        return corr_id_total
 
     @property
     def corr_id_self(self) -> any:
-        return self._corr_id_self
+        return self._tree.get_corr_id_self(self._index)
 
     def is_profiler_step(self) -> bool:
-        return self._event.name.find("ProfilerStep#") != -1
+        return self.name.find("ProfilerStep#") != -1
 
     def add_child_node(self, child_node):
-        self._child_list.append(child_node)
+        self._tree.add_child(self._index, child_node.index)
 
     def match_child_node(self, ts_time: int) -> any:
-        if not self._child_list:
-            return None
-        right = len(self._child_list) - 1
-        left = 0
-        while right > left:
-            mid = left + ceil((right - left) / 2)
-            if ts_time >= self._child_list[mid].start_time:
-                left = mid
-            else:
-                right = mid - 1
-        return self._child_list[left] if self._child_list[left].end_time > ts_time else None
+        matched_index = self._tree.match_child(self._index, ts_time)
+        return TorchOpNode.create_view(self._tree, matched_index) if matched_index >= 0 else None
 
     def update_corr_id_total(self, corr_id: int):
-        self._corr_id_total.append(corr_id)
+        self._tree.add_corr_id_total(self._index, corr_id)
 
     def update_corr_id_self(self, corr_id: int):
-        self._corr_id_self.append(corr_id)
+        self._tree.add_corr_id_self(self._index, corr_id)
 
     def update_corr_id(self, corr_id: int):
+        # the ancestors see it through corr_id_total, nothing is copied up the tree
         self.update_corr_id_self(corr_id)
-        node = self
-        while node.parent_node:
-            node.update_corr_id_total(corr_id)
-            node = node.parent_node
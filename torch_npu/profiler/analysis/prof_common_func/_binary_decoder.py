@@ -1,4 +1,60 @@
+import re
+from enum import Enum
+
+import numpy as np
+
+from ._constant import Constant
+
+__all__ = []
+
+
+class ColumnarRecords:
+    """
+    Fixed-size records decoded into a NumPy structured array.
+    Columns can be read directly, beans are only created when a record is accessed.
+    """
+
+    def __init__(self, records: np.ndarray, class_bean: any):
+        self._records = records
+        self._class_bean = class_bean
+
+    def __len__(self):
+        return len(self._records)
+
+    def __bool__(self):
+        return len(self._records) > 0
+
+    def __getitem__(self, index: int):
+        return self.bean(index)
+
+    def __iter__(self):
+        for index in range(len(self._records)):
+            yield self.bean(index)
+
+    @property
+    def records(self) -> np.ndarray:
+        return self._records
+
+    @property
+    def column_names(self) -> tuple:
+        return self._records.dtype.names or ()
+
+    def column(self, name: str) -> np.ndarray:
+        return self._records[name]
+
+    def bean(self, index: int):
+        return self._class_bean(self._records[index].tobytes())
+
+    def select(self, mask: np.ndarray):
+        return ColumnarRecords(self._records[mask], self._class_bean)
+
+
 class BinaryDecoder:
+    _STRUCT_CHAR_TO_DTYPE = {
+        "b": "i1", "B": "u1", "?": "?", "h": "i2", "H": "u2", "i": "i4", "I": "u4",
+        "l": "i4", "L": "u4", "q": "i8", "Q": "u8", "e": "f2", "f": "f4", "d": "f8"
+    }
+    _BYTE_ORDER_MAP = {"<": "<", ">": ">", "!": ">", "=": "=", "@": "="}
 
     @classmethod
     def decode(cls, all_bytes: bytes, class_bean: any, struct_size: int) -> list:
@@ -10,3 +66,47 @@ class BinaryDecoder:
             result_data.append(class_bean(all_bytes[start_index: end_index]))
             start_index = end_index
         return result_data
+
+    @classmethod
+    def iter_decode(cls, all_bytes: any, class_bean: any, struct_size: int,
+                    chunk_size: int = Constant.DECODE_CHUNK_SIZE):
+        """Yield beans in lists of at most chunk_size records, each bean owns a copy of its record."""
+        all_bytes_len = len(all_bytes)
+        chunk_bytes = struct_size * chunk_size
+        for chunk_start in range(0, all_bytes_len - all_bytes_len % struct_size, chunk_bytes):
+            chunk_end = min(chunk_start + chunk_bytes, all_bytes_len)
+            yield cls.decode(all_bytes[chunk_start: chunk_end], class_bean, struct_size)
+
+    @classmethod
+    def decode_columnar(cls, all_bytes: bytes, class_bean: any, struct_size: int,
+                        struct_format: str, field_enum: Enum = None) -> ColumnarRecords:
+        if isinstance(all_bytes, str):
+            raise TypeError("The data to decode must be a bytes-like object, not str.")
+        dtype = cls.struct_format_to_dtype(struct_format, field_enum)
+        if dtype.itemsize != struct_size:
+            raise ValueError(f"Struct format {struct_format} does not match the record size {struct_size}.")
+        record_num = len(all_bytes) // struct_size
+        records = np.frombuffer(all_bytes, dtype=dtype, count=record_num)
+        return ColumnarRecords(records, class_bean)
+
+    @classmethod
+    def struct_format_to_dtype(cls, struct_format: str, field_enum: Enum = None) -> np.dtype:
+        """
+        Convert a packed struct format such as "<4QB" to the equivalent structured dtype.
+        Field names are taken from field_enum in value order, or default to f0, f1, ...
+        """
+        byte_order = "<"
+        if struct_format and struct_format[0] in cls._BYTE_ORDER_MAP:
+            byte_order = cls._BYTE_ORDER_MAP.get(struct_format[0])
+            struct_format = struct_format[1:]
+        field_types = []
+        for count, char in re.findall(r"(\d*)([a-zA-Z?])", struct_format):
+            if char not in cls._STRUCT_CHAR_TO_DTYPE:
+                raise ValueError(f"Unsupported struct format character: {char}")
+            field_types.extend([byte_order + cls._STRUCT_CHAR_TO_DTYPE.get(char)] * int(count or 1))
+        if field_enum is not None:
+            field_names = [member.name.lower() for member in sorted(field_enum, key=lambda member: member.value)]
+        else:
+            field_names = []
+        field_names.extend(f"f{index}" for index in range(len(field_names), len(field_types)))
+        return np.dtype(list(zip(field_names[:len(field_types)], field_types)))
@@ -1,3 +1,5 @@
+import hashlib
+import os
 import shutil
 import subprocess
 
@@ -20,9 +22,33 @@ def check_cann_package_support_export_db() -> bool:
 
 class CannPackageManager:
     SUPPORT_EXPORT_DB = None
+    TOOLKIT_FINGERPRINT = None
+    VERSION_FILE = "version.cfg"
 
     @classmethod
     def is_support_export_db(cls) -> bool:
         if cls.SUPPORT_EXPORT_DB is None:
             cls.SUPPORT_EXPORT_DB = check_cann_package_support_export_db()
         return cls.SUPPORT_EXPORT_DB
+
+    @classmethod
+    def get_toolkit_fingerprint(cls) -> str:
+        """
+        Fingerprint of the CANN toolkit used to export the profiling data: the real path, size and mtime of
+        msprof, and the version file of the toolkit when ASCEND_TOOLKIT_HOME or ASCEND_HOME_PATH is set.
+        """
+        if cls.TOOLKIT_FINGERPRINT is None:
+            sha256 = hashlib.sha256()
+            msprof_path = shutil.which("msprof")
+            file_paths = [os.path.realpath(msprof_path)] if msprof_path else []
+            for env_name in ("ASCEND_TOOLKIT_HOME", "ASCEND_HOME_PATH"):
+                if os.environ.get(env_name):
+                    file_paths.append(os.path.realpath(os.path.join(os.environ.get(env_name), cls.VERSION_FILE)))
+            for file_path in file_paths:
+                try:
+                    stat_info = os.stat(file_path)
+                except OSError:
+                    continue
+                sha256.update(f"{file_path}:{stat_info.st_size}:{stat_info.st_mtime_ns}\n".encode())
+            cls.TOOLKIT_FINGERPRINT = sha256.hexdigest()
+        return cls.TOOLKIT_FINGERPRINT
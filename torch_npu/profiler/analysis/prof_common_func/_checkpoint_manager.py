@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import time
+
+import torch_npu
+from ._cann_package_manager import CannPackageManager
+from ._constant import Constant
+from ._file_manager import FileManager
+from ._log import ProfilerLogger
+from ._task_manager import TaskStatus
+
+__all__ = []
+
+
+class CheckpointManager:
+    """
+    Per-parser checkpoints of an offline analysis, saved as profiler_analysis_checkpoint.json in the profiler path.
+    The input fingerprint hashes the path, size and mtime of every file of the profiler path that was not
+    written by an analysis (the logs and the checkpoint itself excluded). A parser is keyed by its
+    name, the analysis type, the export types it serves, the analysis parameters, the torch_npu version and
+    a digest of the analysis code, all the checkpoints are dropped once the input fingerprint changes.
+    The parsers running msprof and the ones depending on them are also keyed by the CANN toolkit fingerprint,
+    so they run again after the toolkit is upgraded.
+    After a run, each succeeded parser records the files written by it, as reported by OutputRecorder,
+    as its outputs.
+
+    A parser is skipped by the next analysis when its key is unchanged and its recorded outputs are intact.
+    It is run again when it neither wrote a file nor returned data, or when a parser that has to run depends
+    on it and it either returns data to its dependents or has no output file left (its product may have been
+    consumed, e.g. the temporary trace file). With enabled False the previous checkpoints are ignored and
+    every parser runs, the checkpoints of this run are still saved.
+    """
+    VERSION = 2
+    MSPROF_TASKS = {Constant.CANN_EXPORT_PARSER, Constant.CANN_TIMELINE_PARSER, Constant.CANN_ANALYZE_PARSER}
+    _code_digest = None
+
+    def __init__(self, profiler_path: str, output_path: str, context: dict, enabled: bool = True):
+        self._profiler_path = os.path.realpath(profiler_path)
+        self._output_path = os.path.realpath(output_path) if output_path else ""
+        self._checkpoint_path = os.path.join(self._profiler_path, Constant.ANALYSIS_CHECKPOINT)
+        self._context = context
+        self._run_start = time.time_ns()
+        self._generated = set()
+        self._records = {}
+        self._task_keys = {}
+        self._load()
+        if not enabled or self._checkpoint_input_hash != self._get_input_hash():
+            self._records = {}
+        self._is_valid = bool(self._records)
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether a previous analysis of the same input data was checkpointed."""
+        return self._is_valid
+
+    def get_skipped_tasks(self, tasks: list, task_export_types: dict) -> set:
+        """
+        tasks must be in dependency order (a task after all its deps), task_export_types maps a task name
+        to the export types it is configured for.
+        """
+        rerun_tasks = set()
+        msprof_tasks = set()
+        for task in tasks:
+            if task.name in self.MSPROF_TASKS or any(dep in msprof_tasks for dep in task.deps):
+                msprof_tasks.add(task.name)
+            key = self._get_task_key(task.name, task_export_types.get(task.name, []), task.name in msprof_tasks)
+            self._task_keys[task.name] = key
+            record = self._records.get(key)
+            if not record or not (record.get("wrote_files") or record.get("has_output")) or \
+                    not self._is_outputs_intact(record.get("outputs", {})):
+                rerun_tasks.add(task.name)
+        task_names = {task.name for task in tasks}
+        for task in reversed(tasks):
+            if task.name not in rerun_tasks:
+                continue
+            for dep in task.deps:
+                if dep not in task_names or dep in rerun_tasks:
+                    continue
+                record = self._records.get(self._task_keys.get(dep), {})
+                if record.get("has_output") or not record.get("outputs"):
+                    rerun_tasks.add(dep)
+        return task_names - rerun_tasks
+
+    def update(self, task_infos: dict) -> None:
+        """Record the tasks succeeded in this run from the task infos of ConcurrentTasksManager."""
+        for name, task_info in task_infos.items():
+            key = self._task_keys.get(name)
+            if key is None:
+                continue
+            if task_info.status != TaskStatus.Succeed:
+                self._records.pop(key, None)
+                continue
+            outputs = {path: self._get_file_stat(path) for path in task_info.output_files}
+            self._generated.update(outputs.keys())
+            self._records[key] = {"name": name, "has_output": task_info.has_output,
+                                  "wrote_files": bool(task_info.output_files),
+                                  "outputs": {path: stat for path, stat in outputs.items() if stat}}
+
+    def save(self) -> None:
+        touched_files = self._get_touched_files()
+        self._generated = {path for path in self._generated | set(touched_files.keys()) if os.path.isfile(path)}
+        # outputs removed after the run (e.g. by simplify_data) count as consumed, the ones rewritten by
+        # a later task keep their final state
+        for key in self._task_keys.values():
+            record = self._records.get(key)
+            if not record:
+                continue
+            outputs = {path: self._get_file_stat(path) for path in record.get("outputs", {})}
+            record["outputs"] = {path: stat for path, stat in outputs.items() if stat}
+        checkpoint = {
+            "version": self.VERSION,
+            "input_hash": self._get_input_hash(),
+            "generated": sorted(self._generated),
+            "tasks": self._records
+        }
+        try:
+            FileManager.create_json_file_by_path(self._checkpoint_path, checkpoint)
+        except RuntimeError:
+            ProfilerLogger.get_instance().warning("Failed to save the analysis checkpoint.")
+
+    def _load(self) -> None:
+        self._checkpoint_input_hash = ""
+        if not os.path.isfile(self._checkpoint_path):
+            return
+        try:
+            checkpoint = json.loads(FileManager.file_read_all(self._checkpoint_path))
+        except (RuntimeError, ValueError):
+            return
+        if not isinstance(checkpoint, dict) or checkpoint.get("version") != self.VERSION:
+            return
+        self._checkpoint_input_hash = checkpoint.get("input_hash", "")
+        self._generated = set(checkpoint.get("generated", []))
+        self._records = checkpoint.get("tasks", {})
+
+    def _get_task_key(self, name: str, export_types: list, uses_msprof: bool = False) -> str:
+        key_data = {
+            "version": self.VERSION, "name": name, "export_types": sorted(export_types), "context": self._context,
+            "torch_npu_version": getattr(torch_npu, "__version__", ""), "code_digest": self._get_code_digest()
+        }
+        if uses_msprof:
+            key_data["cann_toolkit"] = CannPackageManager.get_toolkit_fingerprint()
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+    @classmethod
+    def _get_code_digest(cls) -> str:
+        """Digest of the sources of the analysis package, so a parser fix invalidates the checkpoints."""
+        if cls._code_digest is None:
+            sha256 = hashlib.sha256()
+            analysis_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+            for dir_path, dir_names, file_names in os.walk(analysis_path):
+                dir_names.sort()
+                for file_name in sorted(file_names):
+                    if not file_name.endswith(".py"):
+                        continue
+                    file_path = os.path.join(dir_path, file_name)
+                    sha256.update(os.path.relpath(file_path, analysis_path).encode())
+                    try:
+                        with open(file_path, "rb") as file:
+                            sha256.update(file.read())
+                    except OSError:
+                        continue
+            cls._code_digest = sha256.hexdigest()
+        return cls._code_digest
+
+    def _iter_files(self):
+        roots = [self._profiler_path]
+        if self._output_path and os.path.commonpath([self._profiler_path, self._output_path]) != self._profiler_path:
+            roots.append(self._output_path)
+        for root in roots:
+            if os.path.isfile(root):
+                yield root
+                continue
+            for dir_path, dir_names, file_names in os.walk(root):
+                if dir_path == self._profiler_path and ProfilerLogger.DEFAULT_LOG_DIR in dir_names:
+                    dir_names.remove(ProfilerLogger.DEFAULT_LOG_DIR)
+                for file_name in file_names:
+                    file_path = os.path.join(dir_path, file_name)
+                    if file_path != self._checkpoint_path:
+                        yield file_path
+
+    @classmethod
+    def _get_file_stat(cls, file_path: str) -> list:
+        try:
+            stat_info = os.stat(file_path)
+        except OSError:
+            return []
+        return [stat_info.st_size, stat_info.st_mtime_ns]
+
+    def _get_input_hash(self) -> str:
+        sha256 = hashlib.sha256()
+        for file_path in sorted(self._iter_files()):
+            if file_path in self._generated or not file_path.startswith(self._profiler_path + os.sep):
+                continue
+            stat = self._get_file_stat(file_path)
+            sha256.update(f"{os.path.relpath(file_path, self._profiler_path)}:{stat}\n".encode())
+        return sha256.hexdigest()
+
+    def _get_touched_files(self) -> dict:
+        touched_files = {}
+        for file_path in self._iter_files():
+            stat = self._get_file_stat(file_path)
+            if stat and stat[1] >= self._run_start:
+                touched_files[file_path] = stat
+        return touched_files
+
+    def _is_outputs_intact(self, outputs: dict) -> bool:
+        return all(self._get_file_stat(path) == stat for path, stat in outputs.items())
@@ -0,0 +1,310 @@
+import importlib
+import json
+import operator
+import os
+import re
+
+import numpy as np
+
+from torch_npu.utils._error_code import ErrCode, prof_error
+from ....utils._path_manager import PathManager
+from ._constant import Constant
+from ._output_recorder import OutputRecorder
+
+__all__ = []
+
+
+class ColumnarManager:
+    """
+    Writes and reads the tabular views of the columnar export type.
+    A table is saved as <table_name>.parquet when pyarrow is installed, otherwise as a <table_name>.npcol
+    directory holding one .npy file per column and row group plus a meta.json with the schema and the
+    min/max of every column in every row group.
+    Both formats support column projection and predicate pushdown on read, a filter is a list of
+    (column, op, value) tuples combined with AND, op is one of ==, =, !=, <, <=, >, >=, in, not in.
+    Microsecond timestamps too precise for float64, e.g. "Start Time(us)", are stored as int64 nanoseconds in
+    a column renamed to "Start Time(ns)", so that range filters compare them as numbers.
+    """
+    PARQUET_SUFFIX = ".parquet"
+    NUMPY_SUFFIX = ".npcol"
+    META_FILE = "meta.json"
+    FORMAT_VERSION = 1
+    NUMBER_PATTERN = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+    # decimal strings with at most this many significant digits survive a float64 round trip
+    MAX_FLOAT_DIGITS = 15
+    TIME_US_SUFFIX = "(us)"
+    TIME_NS_SUFFIX = "(ns)"
+    TIME_US_PATTERN = re.compile(r"^([+-]?)(\d+)(?:\.(\d{0,3}))?$")
+    FILTER_OPS = {
+        "==": operator.eq, "=": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+        ">": operator.gt, ">=": operator.ge
+    }
+    _pyarrow = None
+
+    @classmethod
+    def get_pyarrow(cls) -> any:
+        """Return (pyarrow, pyarrow.parquet), or None if pyarrow is not installed."""
+        if cls._pyarrow is None:
+            try:
+                cls._pyarrow = (importlib.import_module("pyarrow"), importlib.import_module("pyarrow.parquet"))
+            except ModuleNotFoundError:
+                cls._pyarrow = ()
+        return cls._pyarrow or None
+
+    @classmethod
+    def create_columnar_file(cls, output_path: str, data: list, table_name: str, headers: list,
+                             row_group_size: int = Constant.COLUMNAR_ROW_GROUP_SIZE) -> None:
+        if not data:
+            return
+        columns = cls.rows_to_columns(data, headers)
+        if cls.get_pyarrow():
+            cls._write_parquet(os.path.join(output_path, table_name + cls.PARQUET_SUFFIX), columns, row_group_size)
+        else:
+            cls._write_numpy(os.path.join(output_path, table_name + cls.NUMPY_SUFFIX), columns, row_group_size)
+
+    @classmethod
+    def get_columnar_file_path(cls, output_path: str, table_name: str) -> str:
+        for suffix in (cls.PARQUET_SUFFIX, cls.NUMPY_SUFFIX):
+            file_path = os.path.join(output_path, table_name + suffix)
+            if os.path.exists(file_path):
+                return file_path
+        return ""
+
+    @classmethod
+    def read_columnar_file(cls, file_path: str, columns: list = None, filters: list = None) -> dict:
+        """
+        Read the columns of a table into {name: numpy array}, all columns by default.
+        Row groups whose statistics can't satisfy the filters are skipped without being loaded.
+        """
+        cls._check_filters(filters)
+        if file_path.endswith(cls.PARQUET_SUFFIX):
+            return cls._read_parquet(file_path, columns, filters)
+        return cls._read_numpy(file_path, columns, filters)
+
+    @classmethod
+    def rows_to_columns(cls, data: list, headers: list) -> dict:
+        columns = {}
+        for index, header in enumerate(headers):
+            array = cls.to_array([row[index] if index < len(row) else None for row in data])
+            if array.dtype.kind == "U" and header.endswith(cls.TIME_US_SUFFIX):
+                time_ns = cls._parse_time_us_strings(array.tolist())
+                if time_ns is not None:
+                    header = header[:-len(cls.TIME_US_SUFFIX)] + cls.TIME_NS_SUFFIX
+                    array = time_ns
+            columns[header] = array
+        return columns
+
+    @classmethod
+    def to_array(cls, values: list) -> np.ndarray:
+        """Convert one column to int64, float64 (None as nan) or str, whichever keeps every value exact."""
+        has_none = False
+        is_int = True
+        for value in values:
+            if value is None:
+                has_none = True
+            elif isinstance(value, bool) or not isinstance(value, (int, float)):
+                break
+            elif not isinstance(value, int):
+                is_int = False
+        else:
+            if is_int and not has_none:
+                try:
+                    return np.array(values, dtype=np.int64)
+                except OverflowError:
+                    pass
+            return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        str_values = ["" if value is None else str(value) for value in values]
+        return cls._parse_number_strings(str_values)
+
+    @classmethod
+    def _parse_number_strings(cls, values: list) -> np.ndarray:
+        stripped = [value.strip() for value in values]
+        if not all(cls.NUMBER_PATTERN.match(value) for value in stripped):
+            return np.array(values, dtype=np.str_)
+        try:
+            return np.array([int(value) for value in stripped], dtype=np.int64)
+        except (ValueError, OverflowError):
+            pass
+        for value in stripped:
+            mantissa = re.split(r"[eE]", value)[0].lstrip("+-").replace(".", "").strip("0")
+            if len(mantissa) > cls.MAX_FLOAT_DIGITS:
+                return np.array(values, dtype=np.str_)
+        return np.array([float(value) for value in stripped], dtype=np.float64)
+
+    @classmethod
+    def _parse_time_us_strings(cls, values: list) -> any:
+        """Convert decimal microsecond strings with at most 3 fractional digits to int64 nanoseconds, or None."""
+        time_ns = []
+        for value in values:
+            match = cls.TIME_US_PATTERN.match(value.strip())
+            if not match:
+                return None
+            sign, integer, fraction = match.groups()
+            nanoseconds = int(integer) * 1000 + int((fraction or "").ljust(3, "0"))
+            time_ns.append(-nanoseconds if sign == "-" else nanoseconds)
+        try:
+            return np.array(time_ns, dtype=np.int64)
+        except OverflowError:
+            return None
+
+    @classmethod
+    def _check_filters(cls, filters: list) -> None:
+        for column, op, _ in filters or []:
+            if op not in cls.FILTER_OPS and op not in ("in", "not in"):
+                raise ValueError(f"Unsupported filter operator {op} on column {column}." +
+                                 prof_error(ErrCode.VALUE))
+
+    @classmethod
+    def _write_parquet(cls, file_path: str, columns: dict, row_group_size: int) -> None:
+        pyarrow, parquet = cls.get_pyarrow()
+        PathManager.make_dir_safety(os.path.dirname(file_path))
+        PathManager.create_file_safety(file_path)
+        OutputRecorder.record(file_path)
+        PathManager.check_directory_path_writeable(file_path)
+        arrays = [pyarrow.array(array.tolist() if array.dtype.kind == "U" else array) for array in columns.values()]
+        try:
+            parquet.write_table(pyarrow.Table.from_arrays(arrays, names=list(columns.keys())), file_path,
+                                row_group_size=row_group_size)
+        except Exception as err:
+            raise RuntimeError(f"Can't create file: {file_path}" + prof_error(ErrCode.SYSCALL)) from err
+
+    @classmethod
+    def _read_parquet(cls, file_path: str, columns: list, filters: list) -> dict:
+        pyarrow_modules = cls.get_pyarrow()
+        if not pyarrow_modules:
+            raise RuntimeError(f"Reading {file_path} requires pyarrow." + prof_error(ErrCode.NOT_FOUND))
+        PathManager.check_input_file_path(file_path)
+        table = pyarrow_modules[1].read_table(file_path, columns=columns, filters=filters or None)
+        result = {}
+        for name in table.column_names:
+            column = table.column(name)
+            if pyarrow_modules[0].types.is_string(column.type):
+                result[name] = np.array(column.to_pylist(), dtype=np.str_)
+            else:
+                result[name] = column.to_numpy()
+        return result
+
+    @classmethod
+    def _write_numpy(cls, dir_path: str, columns: dict, row_group_size: int) -> None:
+        if os.path.exists(dir_path):
+            PathManager.remove_path_safety(dir_path)
+        PathManager.make_dir_safety(dir_path)
+        PathManager.check_directory_path_writeable(dir_path)
+        num_rows = len(next(iter(columns.values())))
+        row_groups = []
+        for group_index, start in enumerate(range(0, num_rows, row_group_size)):
+            stats = []
+            for column_index, array in enumerate(columns.values()):
+                part = array[start: start + row_group_size]
+                cls._save_array(os.path.join(dir_path, f"{group_index}_{column_index}.npy"), part)
+                stats.append(cls._get_stats(part))
+            row_groups.append({"num_rows": min(row_group_size, num_rows - start), "stats": stats})
+        meta = {
+            "version": cls.FORMAT_VERSION,
+            "num_rows": num_rows,
+            "columns": [{"name": name, "dtype": array.dtype.str} for name, array in columns.items()],
+            "row_groups": row_groups
+        }
+        meta_path = os.path.join(dir_path, cls.META_FILE)
+        PathManager.create_file_safety(meta_path)
+        OutputRecorder.record(meta_path)
+        try:
+            with open(meta_path, "w") as file:
+                json.dump(meta, file, ensure_ascii=False)
+        except Exception as err:
+            raise RuntimeError(f"Can't create file: {meta_path}" + prof_error(ErrCode.SYSCALL)) from err
+
+    @classmethod
+    def _save_array(cls, file_path: str, array: np.ndarray) -> None:
+        PathManager.create_file_safety(file_path)
+        OutputRecorder.record(file_path)
+        try:
+            with open(file_path, "wb") as file:
+                np.save(file, array, allow_pickle=False)
+        except Exception as err:
+            raise RuntimeError(f"Can't create file: {file_path}" + prof_error(ErrCode.SYSCALL)) from err
+
+    @classmethod
+    def _get_stats(cls, array: np.ndarray) -> list:
+        if array.dtype.kind == "f":
+            valid = array[~np.isnan(array)]
+            if not valid.size:
+                return []
+            return [float(valid.min()), float(valid.max())]
+        if not array.size:
+            return []
+        if array.dtype.kind == "U":
+            values = array.tolist()
+            return [min(values), max(values)]
+        return [array.min().item(), array.max().item()]
+
+    @classmethod
+    def _read_numpy(cls, dir_path: str, columns: list, filters: list) -> dict:
+        meta_path = os.path.join(dir_path, cls.META_FILE)
+        PathManager.check_input_file_path(meta_path)
+        with open(meta_path, "r") as file:
+            meta = json.load(file)
+        column_index = {column.get("name"): index for index, column in enumerate(meta.get("columns", []))}
+        columns = list(column_index.keys()) if columns is None else columns
+        filters = filters or []
+        for name in list(columns) + [item[0] for item in filters]:
+            if name not in column_index:
+                raise ValueError(f"No column named {name} in {dir_path}." + prof_error(ErrCode.VALUE))
+        parts = {name: [] for name in columns}
+        for group_index, row_group in enumerate(meta.get("row_groups", [])):
+            stats = row_group.get("stats", [])
+            if not all(cls._may_match(stats[column_index.get(name)], op, value) for name, op, value in filters):
+                continue
+            loaded = {}
+
+            def load(name):
+                if name not in loaded:
+                    file_path = os.path.join(dir_path, f"{group_index}_{column_index.get(name)}.npy")
+                    loaded[name] = np.load(file_path, mmap_mode="r", allow_pickle=False)
+                return loaded[name]
+
+            mask = np.ones(row_group.get("num_rows", 0), dtype=bool)
+            for name, op, value in filters:
+                mask &= cls._evaluate(load(name), op, value)
+            if not mask.any():
+                continue
+            for name in columns:
+                parts[name].append(np.asarray(load(name)[mask]))
+        result = {}
+        for name in columns:
+            dtype = np.dtype(meta.get("columns")[column_index.get(name)].get("dtype"))
+            result[name] = np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)
+        return result
+
+    @classmethod
+    def _may_match(cls, stats: list, op: str, value: any) -> bool:
+        """Whether a row group with column statistics [min, max] may hold rows matching the predicate."""
+        if not stats:
+            return op in ("!=", "not in")
+        min_value, max_value = stats
+        try:
+            if op in ("==", "="):
+                return min_value <= value <= max_value
+            if op == "!=":
+                return not min_value == max_value == value
+            if op == "<":
+                return min_value < value
+            if op == "<=":
+                return min_value <= value
+            if op == ">":
+                return max_value > value
+            if op == ">=":
+                return max_value >= value
+            if op == "in":
+                return any(min_value <= item <= max_value for item in value)
+        except TypeError:
+            return True
+        return True
+
+    @classmethod
+    def _evaluate(cls, array: np.ndarray, op: str, value: any) -> np.ndarray:
+        if op == "in":
+            return np.isin(array, list(value))
+        if op == "not in":
+            return ~np.isin(array, list(value))
+        return np.asarray(cls.FILTER_OPS.get(op)(array, value), dtype=bool)
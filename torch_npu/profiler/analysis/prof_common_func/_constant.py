@@ -20,6 +20,8 @@ class Constant(object):
     ASCEND_WORK_PATH = "ASCEND_WORK_PATH"
     PROFILING_WORK_PATH = "profiling_data"
     PROFILER_META_DATA = "profiler_metadata.json"
+    ANALYSIS_CHECKPOINT = "profiler_analysis_checkpoint.json"
+    CLUSTER_ANALYSIS_OUTPUT = "cluster_analysis_output"
 
     # file authority
     FILE_AUTHORITY = 0o640
@@ -31,6 +33,21 @@ class Constant(object):
     MAX_FILE_NAME_LENGTH = 255
     PROF_WARN_SIZE = 1024 * 1024 * 1024
 
+    # number of records decoded per chunk when streaming framework files
+    DECODE_CHUNK_SIZE = 100000
+    # estimated memory of the decoded data kept in DataCache
+    DATA_CACHE_MAX_SIZE = 1024 * 1024 * 1024 * 2
+    # decoded beans take several times the size of their source file
+    DATA_CACHE_SIZE_FACTOR = 8
+    # number of trace events serialized at a time by TraceJsonWriter
+    TRACE_WRITE_CHUNK_SIZE = 10000
+    # number of rows per row group of the tables written for the columnar export type
+    COLUMNAR_ROW_GROUP_SIZE = 100000
+    # task outputs at least this large are passed to ConcurrentTasksManager through shared memory
+    SHM_OUTPUT_THRESHOLD = 1024 * 1024
+    # share of the available memory given to the parsers of a cluster analysis
+    CLUSTER_MEMORY_RATIO = 0.8
+
     # tlv constant struct
     CONSTANT_BYTES = "constant_bytes"
     NS_TO_US = 1000
@@ -122,6 +139,7 @@ class Constant(object):
     AicMetricsNone = "ACL_AICORE_NONE"
     Db = "db"
     Text = "text"
+    Columnar = "columnar"
 
     # profiler end info
     END_INFO = "end_info"
@@ -196,6 +214,7 @@ class Constant(object):
     COMMUNICATION_DB_PARSER = "communication_db"
     TRACE_STEP_TIME_DB_PARSER = "trace_step_time_db"
     GC_RECORD_DB_PARSER = "gc_record_db"
+    ROLLUP_DB_PARSER = "rollup_db"
 
     TRACE_VIEW_TEMP = "trace_view_temp.json"
 
@@ -312,6 +331,10 @@ class DbConstant():
     # step time
     TABLE_STEP_TIME = "STEP_TIME"
 
+    # per step rollup table name
+    TABLE_STEP_SUMMARY = "STEP_SUMMARY"
+    TABLE_STEP_OP_TYPE_SUMMARY = "STEP_OP_TYPE_SUMMARY"
+
     # analyzer table name
     TABLE_ANALYZER_BANDWIDTH = "CommAnalyzerBandwidth"
     TABLE_ANALYZER_MATRIX = "CommAnalyzerMatrix"
@@ -461,5 +484,22 @@ class TableColumnsManager():
             ("startNs", Constant.SQL_INTEGER_TYPE),
             ("endNs", Constant.SQL_INTEGER_TYPE),
             ("globalTid", Constant.SQL_INTEGER_TYPE)
+        ],
+        DbConstant.TABLE_STEP_SUMMARY : [
+            ("step", Constant.SQL_INTEGER_TYPE),
+            ("startNs", Constant.SQL_INTEGER_TYPE),
+            ("endNs", Constant.SQL_INTEGER_TYPE),
+            ("taskCount", Constant.SQL_INTEGER_TYPE),
+            ("taskDurationNs", Constant.SQL_INTEGER_TYPE),
+            ("communicationOpCount", Constant.SQL_INTEGER_TYPE),
+            ("communicationDurationNs", Constant.SQL_INTEGER_TYPE)
+        ],
+        DbConstant.TABLE_STEP_OP_TYPE_SUMMARY : [
+            ("step", Constant.SQL_INTEGER_TYPE),
+            ("opType", Constant.SQL_INTEGER_TYPE),
+            ("count", Constant.SQL_INTEGER_TYPE),
+            ("totalDurationNs", Constant.SQL_INTEGER_TYPE),
+            ("minDurationNs", Constant.SQL_INTEGER_TYPE),
+            ("maxDurationNs", Constant.SQL_INTEGER_TYPE)
         ]
     }
@@ -0,0 +1,95 @@
+import os
+import threading
+from collections import OrderedDict
+
+from ._constant import Constant
+from ._singleton import Singleton
+
+__all__ = []
+
+
+@Singleton
+class DataCache:
+    """
+    Process-wide cache of decoded profiling data, keyed by profiler path and data type (FileTag/CANNDataEnum).
+    An entry is only reused while the mtime and size of every source file are unchanged.
+    The cost of an entry is the size of its source files multiplied by size_factor, an estimate of the memory
+    taken by the decoded objects, the least recently used entries are evicted once the total cost exceeds max_size.
+    The cache lives in the memory of the current process. The parser tasks run in forked sub processes only see
+    the entries loaded by the main process before the fork, the entries they load themselves are lost when
+    they exit, see FwkFileParser.preload_shared_data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._total_size = 0
+        self._max_size = Constant.DATA_CACHE_MAX_SIZE
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size: int):
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    @classmethod
+    def _get_fingerprint(cls, file_paths: any) -> tuple:
+        fingerprint = []
+        for file_path in sorted(file_paths):
+            try:
+                stat_info = os.stat(file_path)
+            except OSError:
+                return ()
+            fingerprint.append((file_path, stat_info.st_mtime_ns, stat_info.st_size))
+        return tuple(fingerprint)
+
+    def get(self, profiler_path: str, data_type: any, file_paths: any, loader: callable,
+            size_factor: int = Constant.DATA_CACHE_SIZE_FACTOR) -> any:
+        """
+        Return the cached data of data_type, calling loader() to decode file_paths on a miss.
+        size_factor is the ratio of the memory of the decoded data to the size of file_paths.
+        Callers must not modify the returned object or the objects it holds in place.
+        """
+        key = (os.path.realpath(profiler_path), data_type)
+        fingerprint = self._get_fingerprint(file_paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return entry[2]
+        data = loader()
+        if not fingerprint:
+            return data
+        size = sum(item[2] for item in fingerprint) * size_factor
+        with self._lock:
+            self._remove(key)
+            if size <= self._max_size:
+                self._entries[key] = (fingerprint, size, data)
+                self._total_size += size
+                self._evict()
+        return data
+
+    def invalidate(self, profiler_path: str = None, data_type: any = None):
+        """Drop the entries matching profiler_path and data_type, everything is dropped by default."""
+        real_path = os.path.realpath(profiler_path) if profiler_path else None
+        with self._lock:
+            for key in list(self._entries.keys()):
+                if real_path is not None and key[0] != real_path:
+                    continue
+                if data_type is not None and key[1] != data_type:
+                    continue
+                self._remove(key)
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._total_size -= entry[1]
+
+    def _evict(self):
+        while self._entries and self._total_size > self._max_size:
+            _, entry = self._entries.popitem(last=False)
+            self._total_size -= entry[1]
@@ -1,8 +1,10 @@
 import os
 import sqlite3
+from itertools import chain
 
 from ._constant import Constant, print_warn_msg, print_error_msg
 from ._file_manager import FileManager
+from ._output_recorder import OutputRecorder
 from ._singleton import Singleton
 
 __all__ = []
@@ -28,6 +30,14 @@ class DbManager:
     INSERT_SIZE = 10000
     FETCH_SIZE = 10000
     MAX_ROW_COUNT = 100000000
+    # the db files also hold the tables merged from the CANN db, the rollback journal is kept in memory so a failed
+    # transaction is still rolled back, and only the fsync per transaction is saved
+    BULK_LOAD_PRAGMAS = [
+        "PRAGMA journal_mode=MEMORY",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-65536",
+        "PRAGMA temp_store=MEMORY"
+    ]
 
     @classmethod
     def create_connect_db(cls, db_path: str) -> tuple:
@@ -45,10 +55,26 @@ class DbManager:
         try:
             curs = conn.cursor()
             os.chmod(db_path, Constant.FILE_AUTHORITY)
+            OutputRecorder.record(db_path)
             return conn, curs
         except sqlite3.Error as err:
             return EmptyClass("empty conn"), EmptyClass("empty curs")
 
+    @classmethod
+    def set_bulk_load_pragmas(cls, conn: sqlite3.Connection) -> bool:
+        """
+        tune connection for bulk insert
+        """
+        try:
+            curs = conn.cursor()
+            for pragma in cls.BULK_LOAD_PRAGMAS:
+                curs.execute(pragma)
+            curs.close()
+            return True
+        except sqlite3.Error as err:
+            print_error_msg("SQLite Error: %s" % " ".join(err.args))
+            return False
+
     @classmethod
     def destroy_db_connect(cls, conn: sqlite3.Connection, cur: sqlite3.Cursor):
         """
@@ -117,19 +143,30 @@ class DbManager:
             raise RuntimeError("Failed to create table in profiler db file")
 
     @classmethod
-    def insert_data_into_table(cls, conn: sqlite3.Connection, table_name: str, data: list) -> None:
+    def insert_data_into_table(cls, conn: sqlite3.Connection, table_name: str, data: any) -> None:
         """
-        insert data into certain table
+        insert data into certain table, data can be any iterable of rows and is consumed lazily,
+        all rows are inserted in one transaction
         """
-        index = 0
         if not data:
             return
+        rows = iter(data)
+        first_row = next(rows, None)
+        if first_row is None:
+            return
         sql = "insert into {table_name} values ({value_form})".format(
-            table_name=table_name, value_form="?, " * (len(data[0]) - 1) + "?")
-        while index < len(data):
-            if not cls.executemany_sql(conn, sql, data[index:index + cls.INSERT_SIZE]):
-                raise RuntimeError("Failed to insert data into profiler db file")
-            index += cls.INSERT_SIZE
+            table_name=table_name, value_form="?, " * (len(first_row) - 1) + "?")
+        if not cls.executemany_sql(conn, sql, chain((first_row,), rows)):
+            raise RuntimeError("Failed to insert data into profiler db file")
+
+    @classmethod
+    def create_index(cls, conn: sqlite3.Connection, table_name: str, index_name: str, columns: list) -> None:
+        """
+        create index on certain table
+        """
+        sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(columns)})"
+        if not cls.execute_sql(conn, sql):
+            raise RuntimeError("Failed to create index in profiler db file")
 
     @classmethod
     def fetch_all_data(cls, cur: sqlite3.Cursor, sql: str) -> list:
@@ -175,6 +212,7 @@ class BasicDb:
         self.db_path = None
         self.conn = None
         self.curs = None
+        self.deferred_indexes = {}
 
     def init(self, db_path: str) -> None:
         if self.db_path is None:
@@ -184,14 +222,37 @@ class BasicDb:
         if self.conn and self.curs:
             return True
         self.conn, self.curs = DbManager.create_connect_db(self.db_path)
+        if self.conn and self.curs:
+            DbManager.set_bulk_load_pragmas(self.conn)
         return True if (self.conn and self.curs) else False
 
     def get_db_path(self) -> str:
         return self.db_path
 
     def close(self) -> None:
-        self.db_path = None
-        DbManager.destroy_db_connect(self.conn, self.curs)
+        try:
+            self.create_deferred_indexes()
+        finally:
+            self.db_path = None
+            DbManager.destroy_db_connect(self.conn, self.curs)
+            self.conn = None
+            self.curs = None
+
+    def create_index(self, table_name: str, index_name: str, columns: list, deferred: bool = True) -> None:
+        """
+        the index is built on close, after all rows are inserted, unless it is needed by a query now
+        """
+        if deferred:
+            self.deferred_indexes[index_name] = (table_name, columns)
+        else:
+            DbManager.create_index(self.conn, table_name, index_name, columns)
+
+    def create_deferred_indexes(self) -> None:
+        if self.conn and self.curs:
+            for index_name, (table_name, columns) in self.deferred_indexes.items():
+                if DbManager.judge_table_exist(self.curs, table_name):
+                    DbManager.create_index(self.conn, table_name, index_name, columns)
+        self.deferred_indexes.clear()
 
     def judge_table_exist(self, table_name: str) -> bool:
         return DbManager.judge_table_exist(self.curs, table_name)
@@ -199,9 +260,12 @@ class BasicDb:
     def create_table_with_headers(self, table_name: str, headers: list) -> None:
         DbManager.create_table_with_headers(self.conn, self.curs, table_name, headers)
 
-    def insert_data_into_table(self, table_name: str, data: list) -> None:
+    def insert_data_into_table(self, table_name: str, data: any) -> None:
         DbManager.insert_data_into_table(self.conn, table_name, data)
 
+    def execute_sql(self, sql: str) -> bool:
+        return DbManager.execute_sql(self.conn, sql)
+
     def fetch_all_data(self, sql: str) -> list:
         return DbManager.fetch_all_data(self.curs, sql)
 
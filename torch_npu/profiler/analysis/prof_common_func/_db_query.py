@@ -0,0 +1,120 @@
+import os
+import sqlite3
+
+from ._constant import DbConstant
+from ._file_manager import FileManager
+
+__all__ = []
+
+
+class ProfilerDbQuery:
+    """
+    Read only queries on an exported ascend_pytorch_profiler db by step or time window.
+    The windows are half open [start_ns, end_ns) on the start time of the rows, they are answered with the
+    time range indexes and the step rollups built at export, a db exported before them is still queried
+    but falls back to table scans.
+
+    usage:
+        with ProfilerDbQuery(db_path) as query:
+            kernels = query.get_step_tasks(1200, stream_id=7)
+    """
+    TASK_COLUMNS = ["startNs", "endNs", "deviceId", "connectionId", "globalTaskId", "streamId", "taskId"]
+    COMMUNICATION_OP_COLUMNS = ["opName", "startNs", "endNs", "connectionId", "groupName"]
+
+    def __init__(self, db_path: str):
+        if not os.path.isfile(db_path):
+            raise FileNotFoundError(f"Profiler db file not found: {db_path}")
+        FileManager.check_db_file_vaild(db_path)
+        self._conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        self._table_columns = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get_table_columns(self, table_name: str) -> list:
+        if table_name not in self._table_columns:
+            rows = self._conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+            self._table_columns[table_name] = [row[1] for row in rows]
+        return self._table_columns[table_name]
+
+    def get_step_range(self, step: int) -> tuple:
+        """Return the (start_ns, end_ns) of step on the device, or of its host range for an older db."""
+        for table_name in (DbConstant.TABLE_STEP_SUMMARY, DbConstant.TABLE_STEP_TIME):
+            if not self.get_table_columns(table_name):
+                continue
+            step_column = "step" if table_name == DbConstant.TABLE_STEP_SUMMARY else "id"
+            row = self._conn.execute(f"SELECT startNs, endNs FROM {table_name} WHERE {step_column} = ?",
+                                     (step,)).fetchone()
+            if row is not None:
+                return row[0], row[1] if row[1] is not None else float("inf")
+        raise ValueError(f"Step {step} not found in the profiler db.")
+
+    def get_tasks(self, start_ns: int, end_ns: int, stream_id: int = None, columns: list = None) -> list:
+        """Return the device tasks started in [start_ns, end_ns), on stream_id if given, by start time."""
+        return self._query_time_window(DbConstant.TABLE_TASK, columns or self.TASK_COLUMNS, start_ns, end_ns,
+                                       {"streamId": stream_id} if stream_id is not None else {})
+
+    def get_step_tasks(self, step: int, stream_id: int = None, columns: list = None) -> list:
+        start_ns, end_ns = self.get_step_range(step)
+        return self.get_tasks(start_ns, end_ns, stream_id, columns)
+
+    def get_communication_ops(self, start_ns: int, end_ns: int, columns: list = None) -> list:
+        return self._query_time_window(DbConstant.TABLE_COMMUNICATION_OP, columns or self.COMMUNICATION_OP_COLUMNS,
+                                       start_ns, end_ns, {})
+
+    def get_step_communication_ops(self, step: int, columns: list = None) -> list:
+        start_ns, end_ns = self.get_step_range(step)
+        return self.get_communication_ops(start_ns, end_ns, columns)
+
+    def get_step_summary(self, step: int = None) -> list:
+        """Return the STEP_SUMMARY rows as dicts, of all the steps when step is None."""
+        return self._query_rollup(DbConstant.TABLE_STEP_SUMMARY, step)
+
+    def get_step_op_type_summary(self, step: int = None) -> list:
+        """Return the STEP_OP_TYPE_SUMMARY rows as dicts with the op type name, of all the steps when step is
+        None."""
+        rows = self._query_rollup(DbConstant.TABLE_STEP_OP_TYPE_SUMMARY, step)
+        if rows and self.get_table_columns(DbConstant.TABLE_STRING_IDS):
+            op_type_ids = tuple({row["opType"] for row in rows})
+            sql = f"SELECT id, value FROM {DbConstant.TABLE_STRING_IDS} " \
+                  f"WHERE id IN ({', '.join('?' * len(op_type_ids))})"
+            names = dict(self._conn.execute(sql, op_type_ids).fetchall())
+            for row in rows:
+                row["opTypeName"] = names.get(row["opType"], "")
+        return rows
+
+    def _query_time_window(self, table_name: str, columns: list, start_ns: int, end_ns: int,
+                           filters: dict) -> list:
+        table_columns = self.get_table_columns(table_name)
+        if not table_columns:
+            return []
+        invalid_columns = [column for column in list(columns) + list(filters) if column not in table_columns]
+        if invalid_columns:
+            raise ValueError(f"Columns {invalid_columns} not found in table {table_name}.")
+        # equality filters first and the time range last, so the (filter, startNs) indexes are used for seeks
+        conditions = [f"{column} = ?" for column in filters] + ["startNs >= ?"]
+        params = list(filters.values()) + [start_ns]
+        if end_ns != float("inf"):
+            conditions.append("startNs < ?")
+            params.append(end_ns)
+        sql = f"SELECT {', '.join(columns)} FROM {table_name} WHERE {' AND '.join(conditions)} ORDER BY startNs"
+        return self._conn.execute(sql, params).fetchall()
+
+    def _query_rollup(self, table_name: str, step: int) -> list:
+        table_columns = self.get_table_columns(table_name)
+        if not table_columns:
+            return []
+        sql = f"SELECT {', '.join(table_columns)} FROM {table_name}"
+        params = []
+        if step is not None:
+            sql += " WHERE step = ?"
+            params.append(step)
+        return [dict(zip(table_columns, row)) for row in self._conn.execute(sql, params).fetchall()]
@@ -1,12 +1,15 @@
 import csv
 import json
+import mmap
 import os.path
-import gzip
 
+from contextlib import contextmanager
 from typing import Dict, Optional
 from torch_npu.utils._error_code import ErrCode, prof_error
 from ....utils._path_manager import PathManager
 from ._constant import Constant, print_warn_msg
+from ._output_recorder import OutputRecorder
+from ._trace_json_writer import TraceJsonWriter
 
 __all__ = []
 
@@ -30,6 +33,24 @@ class FileManager:
         except Exception as err:
             raise RuntimeError(f"Can't read file: {file_path}" + prof_error(ErrCode.UNAVAIL)) from err
 
+    @classmethod
+    @contextmanager
+    def file_mmap(cls, file_path: str):
+        """Map a binary file read-only, there is no size limit since pages are loaded on demand."""
+        PathManager.check_directory_path_readable(file_path)
+        if not os.path.isfile(file_path) or os.path.getsize(file_path) <= 0:
+            yield b''
+            return
+        with open(file_path, "rb") as file:
+            try:
+                mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except Exception as err:
+                raise RuntimeError(f"Can't read file: {file_path}" + prof_error(ErrCode.UNAVAIL)) from err
+            try:
+                yield mapped_file
+            finally:
+                mapped_file.close()
+
     @classmethod
     def read_csv_file(cls, file_path: str, class_bean: any) -> list:
         PathManager.check_directory_path_readable(file_path)
@@ -78,6 +99,7 @@ class FileManager:
         file_path = os.path.join(output_path, file_name)
         PathManager.make_dir_safety(output_path)
         PathManager.create_file_safety(file_path)
+        OutputRecorder.record(file_path)
         PathManager.check_directory_path_writeable(file_path)
         try:
             with open(file_path, "w", newline="") as file:
@@ -102,6 +124,7 @@ class FileManager:
         dir_name = os.path.dirname(output_path)
         PathManager.make_dir_safety(dir_name)
         PathManager.create_file_safety(output_path)
+        OutputRecorder.record(output_path)
         PathManager.check_directory_path_writeable(output_path)
         try:
             with open(output_path, "w") as file:
@@ -114,15 +137,8 @@ class FileManager:
     def create_json_gz_file_by_path(cls, output_path: str, data: list) -> None:
         if not data:
             return
-        dir_name = os.path.dirname(output_path)
-        PathManager.make_dir_safety(dir_name)
-        PathManager.create_file_safety(output_path)
-        PathManager.check_directory_path_writeable(output_path)
-        try:
-            with gzip.open(output_path, "wt") as file:
-                json.dump(data, file)
-        except Exception as err:
-            raise RuntimeError(f"Can't create file: {output_path}" + prof_error(ErrCode.SYSCALL)) from err
+        with TraceJsonWriter(output_path, compress=True) as writer:
+            writer.write(data)
 
     @classmethod
     def create_text_file_by_path(cls, output_path: str, data: str) -> None:
@@ -131,6 +147,7 @@ class FileManager:
         dir_name = os.path.dirname(output_path)
         PathManager.make_dir_safety(dir_name)
         PathManager.create_file_safety(output_path)
+        OutputRecorder.record(output_path)
         PathManager.check_directory_path_writeable(output_path)
         try:
             with open(output_path, "w") as file:
@@ -145,6 +162,7 @@ class FileManager:
         dir_name = os.path.dirname(output_path)
         PathManager.make_dir_safety(dir_name)
         PathManager.create_file_safety(output_path)
+        OutputRecorder.record(output_path)
         PathManager.check_directory_path_writeable(output_path)
         try:
             with os.fdopen(os.open(output_path, os.O_WRONLY, PathManager.DATA_FILE_AUTHORITY), 'wb') as file:
@@ -164,6 +182,7 @@ class FileManager:
             raise RuntimeError(f"Can't create file: {output_path}" + prof_error(ErrCode.SYSCALL)) from err
         if output_path != new_name:
             os.rename(output_path, new_name)
+        OutputRecorder.record(new_name)
 
     @classmethod
     def create_prepare_trace_json_by_path(cls, output_path: str, data: list) -> None:
@@ -172,6 +191,7 @@ class FileManager:
         dir_name = os.path.dirname(output_path)
         PathManager.make_dir_safety(dir_name)
         PathManager.create_file_safety(output_path)
+        OutputRecorder.record(output_path)
         PathManager.check_directory_path_writeable(output_path)
         try:
             with open(output_path, "w") as file:
@@ -0,0 +1,126 @@
+import multiprocessing
+import os
+
+from ._singleton import Singleton
+
+__all__ = []
+
+
+@Singleton
+class GlobalResourcePool:
+    """
+    CPU slots and memory budget shared by the ConcurrentTasksManager of every rank of a cluster analysis,
+    together with the task progress counters.
+    It must be initialized by the driver before the rank processes are forked, they inherit the shared state.
+    A task needs one slot and its memory estimate, an estimate above the whole budget is clamped to it,
+    so such a task runs once everything else has been released.
+    Every taken slot records the pid of its holder, the slots of a holder which died without releasing them
+    are reclaimed by the next try_acquire that cannot be satisfied.
+    """
+
+    def __init__(self):
+        self._lock = None
+        self._free_slots = None
+        self._free_memory = None
+        self._holders = None
+        self._memory_budget = 0
+        self._total_tasks = None
+        self._done_tasks = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._lock is not None
+
+    @staticmethod
+    def get_available_memory() -> int:
+        try:
+            with open("/proc/meminfo", "r") as file:
+                for line in file:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        try:
+            return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (ValueError, OSError, AttributeError):
+            return 0
+
+    @staticmethod
+    def is_process_alive(pid: int) -> bool:
+        try:
+            with open(f"/proc/{pid}/stat", "r") as file:
+                # a killed process not reaped yet by its parent is a zombie
+                return file.read().rsplit(")", 1)[-1].split()[0] != "Z"
+        except (OSError, IndexError):
+            pass
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True
+        return True
+
+    def init_pool(self, slot_num: int, memory_budget: int):
+        self._lock = multiprocessing.Lock()
+        self._memory_budget = max(memory_budget, 1)
+        self._free_slots = multiprocessing.Value("q", max(slot_num, 1), lock=False)
+        self._free_memory = multiprocessing.Value("q", self._memory_budget, lock=False)
+        # (pid, memory) of every taken slot, pid 0 for a free one
+        self._holders = multiprocessing.Array("q", max(slot_num, 1) * 2, lock=False)
+        self._total_tasks = multiprocessing.Value("q", 0, lock=False)
+        self._done_tasks = multiprocessing.Value("q", 0, lock=False)
+
+    def close_pool(self):
+        self._lock = None
+
+    def try_acquire(self, memory: int) -> int:
+        """Take a slot and memory for a task without blocking, return the memory taken or -1 on failure."""
+        memory = min(max(int(memory), 0), self._memory_budget)
+        with self._lock:
+            if self._free_slots.value <= 0 or self._free_memory.value < memory:
+                self._reclaim_dead_holders()
+                if self._free_slots.value <= 0 or self._free_memory.value < memory:
+                    return -1
+            for index in range(0, len(self._holders), 2):
+                if self._holders[index] == 0:
+                    self._holders[index] = os.getpid()
+                    self._holders[index + 1] = memory
+                    break
+            self._free_slots.value -= 1
+            self._free_memory.value -= memory
+        return memory
+
+    def release(self, memory: int):
+        pid = os.getpid()
+        with self._lock:
+            for index in range(0, len(self._holders), 2):
+                if self._holders[index] == pid and self._holders[index + 1] == memory:
+                    self._holders[index] = 0
+                    self._holders[index + 1] = 0
+                    break
+            self._free_slots.value += 1
+            self._free_memory.value += memory
+
+    def _reclaim_dead_holders(self):
+        for index in range(0, len(self._holders), 2):
+            pid = self._holders[index]
+            if pid == 0 or self.is_process_alive(pid):
+                continue
+            self._free_slots.value += 1
+            self._free_memory.value += self._holders[index + 1]
+            self._holders[index] = 0
+            self._holders[index + 1] = 0
+
+    def add_tasks(self, task_num: int):
+        with self._lock:
+            self._total_tasks.value += task_num
+
+    def finish_task(self):
+        with self._lock:
+            self._done_tasks.value += 1
+
+    def get_progress(self) -> tuple:
+        """Return (finished task number, total task number)."""
+        with self._lock:
+            return self._done_tasks.value, self._total_tasks.value
@@ -22,5 +22,5 @@ class MultiProcessPool:
 
     def submit_task(self, func, *args, **kwargs):
         if not self._pool:
-            return
-        self._pool.submit(func, *args, **kwargs)
+            return None
+        return self._pool.submit(func, *args, **kwargs)
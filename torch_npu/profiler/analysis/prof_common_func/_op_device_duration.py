@@ -0,0 +1,63 @@
+import numpy as np
+
+from ._op_interval_index import OpIntervalIndex
+
+__all__ = []
+
+
+class OpDeviceDuration:
+    """
+    Device self/total durations of the torch op nodes built by TreeBuilder.build_tree (without the virtual root).
+    The kernels of every node are summed once from its corr_id_self, the totals are then rolled up
+    from the deepest level to the top level ops with one vectorized scatter-add per level,
+    instead of re-summing the kernels of the whole subtree for every node.
+    """
+
+    def __init__(self, torch_op_nodes: list, kernel_dict: dict):
+        op_index = OpIntervalIndex(torch_op_nodes)
+        node_num = len(torch_op_nodes)
+        self._self_dur = np.zeros(node_num, dtype=np.float64)
+        self._self_dur_with_ai_core = np.zeros(node_num, dtype=np.float64)
+        for index, node in enumerate(torch_op_nodes):
+            dur, ai_core_dur = 0.0, 0.0
+            for corr_id in node.corr_id_self:
+                for kernel in kernel_dict.get(corr_id, []):
+                    kernel_dur = float(kernel.dur)
+                    dur += kernel_dur
+                    if kernel.is_ai_core:
+                        ai_core_dur += kernel_dur
+            self._self_dur[index] = dur
+            self._self_dur_with_ai_core[index] = ai_core_dur
+        self._total_dur = self._self_dur.copy()
+        self._total_dur_with_ai_core = self._self_dur_with_ai_core.copy()
+        self._roll_up(op_index.parent, op_index.depth)
+
+    @property
+    def self_dur(self) -> np.ndarray:
+        return self._self_dur
+
+    @property
+    def total_dur(self) -> np.ndarray:
+        return self._total_dur
+
+    @property
+    def self_dur_with_ai_core(self) -> np.ndarray:
+        return self._self_dur_with_ai_core
+
+    @property
+    def total_dur_with_ai_core(self) -> np.ndarray:
+        return self._total_dur_with_ai_core
+
+    def _roll_up(self, parent: np.ndarray, depth: np.ndarray):
+        if not depth.size:
+            return
+        # nodes of the same level never contain each other, so a whole level is added to its parents at once
+        order = np.argsort(-depth, kind="stable")
+        sorted_depth = depth[order]
+        level_bounds = np.flatnonzero(np.diff(sorted_depth)) + 1
+        for level in np.split(order, level_bounds):
+            level = level[parent[level] >= 0]
+            if not level.size:
+                continue
+            np.add.at(self._total_dur, parent[level], self._total_dur[level])
+            np.add.at(self._total_dur_with_ai_core, parent[level], self._total_dur_with_ai_core[level])
@@ -0,0 +1,80 @@
+import numpy as np
+
+__all__ = []
+
+
+class OpIntervalIndex:
+    """
+    Flattened index over the torch op nodes built by TreeBuilder.build_tree (without the virtual root),
+    answering which torch op node is the innermost one containing a timestamp.
+    The nodes are kept in build order (preorder, sorted by start time) as start/end/depth/parent arrays,
+    and a sorted batch of timestamps is resolved by a single merge-style sweep over them.
+    """
+
+    def __init__(self, torch_op_nodes: list):
+        self._nodes = torch_op_nodes
+        node_num = len(self._nodes)
+        node_index = {node: index for index, node in enumerate(self._nodes)}
+        self._start = np.empty(node_num, dtype=np.int64)
+        self._end = np.empty(node_num, dtype=np.int64)
+        self._parent = np.full(node_num, -1, dtype=np.int64)
+        self._depth = np.ones(node_num, dtype=np.int64)
+        for index, node in enumerate(self._nodes):
+            self._start[index] = node.start_time
+            self._end[index] = node.end_time
+            parent_index = node_index.get(node.parent_node, -1)
+            if parent_index >= 0:
+                self._parent[index] = parent_index
+                self._depth[index] = self._depth[parent_index] + 1
+
+    @property
+    def nodes(self) -> list:
+        return self._nodes
+
+    @property
+    def parent(self) -> np.ndarray:
+        return self._parent
+
+    @property
+    def depth(self) -> np.ndarray:
+        return self._depth
+
+    def match_innermost(self, ts_array: any) -> np.ndarray:
+        """
+        Return, for every timestamp of the ascending ts_array, the index into nodes of the innermost
+        op containing it, or -1 if no op contains it.
+        """
+        ts_list = np.asarray(ts_array, dtype=np.int64).tolist()
+        result = np.full(len(ts_list), -1, dtype=np.int64)
+        start_list = self._start.tolist()
+        end_list = self._end.tolist()
+        depth_list = self._depth.tolist()
+        node_num = len(start_list)
+        # path: nodes from the top level down to the last started node
+        # path_min_end[i]: min end time of path[0..i], a descent stops at the first node that ended
+        path, path_min_end = [], []
+        alive_num = 0
+        next_node = 0
+        for ts_index, ts in enumerate(ts_list):
+            while next_node < node_num and start_list[next_node] <= ts:
+                depth = depth_list[next_node]
+                del path[depth - 1:]
+                del path_min_end[depth - 1:]
+                alive_num = min(alive_num, depth - 1)
+                min_end = min(path_min_end[-1], end_list[next_node]) if path_min_end else end_list[next_node]
+                path.append(next_node)
+                path_min_end.append(min_end)
+                if alive_num == depth - 1:
+                    alive_num = depth
+                next_node += 1
+            while alive_num > 0 and path_min_end[alive_num - 1] <= ts:
+                alive_num -= 1
+            if alive_num > 0:
+                result[ts_index] = path[alive_num - 1]
+        return result
+
+    def iter_ancestors(self, index: int):
+        """Yield index and its ancestors up to the top level op."""
+        while index >= 0:
+            yield index
+            index = int(self._parent[index])
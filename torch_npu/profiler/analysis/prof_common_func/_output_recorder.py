@@ -0,0 +1,44 @@
+import os
+import threading
+
+__all__ = []
+
+
+class OutputRecorder:
+    """
+    Files written by the parser task running in the current thread. The writers of the analysis record the
+    files they create, ConcurrentTasksManager starts the recording before a task runs and returns its files
+    with the task result, so the outputs of the parsers running concurrently are kept apart.
+    """
+    _local = threading.local()
+
+    @classmethod
+    def start(cls) -> None:
+        cls._local.outputs = set()
+
+    @classmethod
+    def stop(cls) -> list:
+        outputs = getattr(cls._local, "outputs", None)
+        cls._local.outputs = None
+        return sorted(outputs) if outputs else []
+
+    @classmethod
+    def record(cls, file_path: str) -> None:
+        outputs = getattr(cls._local, "outputs", None)
+        if outputs is not None:
+            outputs.add(os.path.realpath(file_path))
+
+    @classmethod
+    def record_dir(cls, dir_path: str, since_ns: int, exclude_dirs: tuple = ()) -> None:
+        """Record the files of dir_path modified since since_ns, for the outputs of an external tool."""
+        if getattr(cls._local, "outputs", None) is None or not os.path.isdir(dir_path):
+            return
+        for root, dir_names, file_names in os.walk(dir_path):
+            dir_names[:] = [dir_name for dir_name in dir_names if dir_name not in exclude_dirs]
+            for file_name in file_names:
+                file_path = os.path.join(root, file_name)
+                try:
+                    if os.stat(file_path).st_mtime_ns >= since_ns:
+                        cls.record(file_path)
+                except OSError:
+                    continue
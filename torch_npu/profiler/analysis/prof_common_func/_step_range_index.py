@@ -0,0 +1,84 @@
+import bisect
+
+import numpy as np
+
+__all__ = []
+
+
+class StepRangeIndex:
+    """
+    Assign timestamps to the steps whose [start, end) range holds them, [start, end] when inclusive_end.
+    The steps are sorted by start and assumed not to overlap, as the step ranges of a profiling run, so a
+    timestamp is matched by a binary search on the step ends. A timestamp on the end of a step and the start
+    of the next one goes to the first of them with inclusive_end, as the linear scans did.
+    Positions returned by the index are those of the steps sorted by start, -1 for a timestamp out of any step.
+
+    usage:
+        index = StepRangeIndex([(step_id, start_ts, end_ts), ...])
+        positions = index.get_positions(ts_list)
+        step_ids = index.get_step_ids(ts_list)
+    """
+    NO_STEP = -1
+    _INT64_INFO = np.iinfo(np.int64)
+
+    def __init__(self, step_ranges: list, inclusive_end: bool = False):
+        step_ranges = sorted(step_ranges, key=lambda step_range: step_range[1])
+        self._step_ids = [step_range[0] for step_range in step_ranges]
+        self._inclusive_end = inclusive_end
+        self._starts = self._to_array([step_range[1] for step_range in step_ranges])
+        self._ends = self._to_array([step_range[2] for step_range in step_ranges])
+        self._start_list = self._starts.tolist()
+        self._end_list = self._ends.tolist()
+
+    def __len__(self):
+        return len(self._step_ids)
+
+    @property
+    def step_ids(self) -> list:
+        """Step ids in the order of the positions."""
+        return self._step_ids
+
+    @classmethod
+    def _to_array(cls, values: list) -> np.ndarray:
+        # ns timestamps are kept in int64, float64 would round them to hundreds of ns
+        finite_values = [value for value in values if abs(value) != float("inf")]
+        if all(isinstance(value, (int, np.integer)) for value in finite_values):
+            return np.array([cls._INT64_INFO.max if value == float("inf") else
+                             cls._INT64_INFO.min if value == -float("inf") else value for value in values],
+                            dtype=np.int64)
+        return np.array(values, dtype=np.float64)
+
+    def get_position(self, ts) -> int:
+        """Return the position of the step holding ts, -1 when no step holds it."""
+        if self._inclusive_end:
+            position = bisect.bisect_left(self._end_list, ts)
+        else:
+            position = bisect.bisect_right(self._end_list, ts)
+        if position < len(self._step_ids) and self._start_list[position] <= ts:
+            return position
+        return self.NO_STEP
+
+    def get_step_id(self, ts):
+        position = self.get_position(ts)
+        return self._step_ids[position] if position != self.NO_STEP else None
+
+    def get_positions(self, ts_list) -> np.ndarray:
+        """Return the positions of the steps holding each timestamp of ts_list, -1 for those out of any step."""
+        ts_array = np.asarray(ts_list)
+        if not len(self._step_ids) or not ts_array.size:
+            return np.full(ts_array.shape, self.NO_STEP, dtype=np.int64)
+        positions = np.searchsorted(self._ends, ts_array, side="left" if self._inclusive_end else "right")
+        clipped = np.minimum(positions, len(self._step_ids) - 1)
+        matched = (positions < len(self._step_ids)) & (self._starts[clipped] <= ts_array)
+        return np.where(matched, positions, self.NO_STEP).astype(np.int64)
+
+    def get_step_ids(self, ts_list) -> list:
+        """Return the step id of each timestamp of ts_list, None for those out of any step."""
+        return [self._step_ids[position] if position != self.NO_STEP else None
+                for position in self.get_positions(ts_list).tolist()]
+
+    def sum_by_step(self, positions: np.ndarray, values) -> np.ndarray:
+        """Return the sums of values by step position, the values out of any step are dropped."""
+        values = np.asarray(values, dtype=np.float64)
+        matched = positions != self.NO_STEP
+        return np.bincount(positions[matched], weights=values[matched], minlength=len(self._step_ids))
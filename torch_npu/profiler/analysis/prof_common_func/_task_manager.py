@@ -9,9 +9,12 @@ import pickle
 import signal
 from enum import Enum
 from abc import ABC, abstractmethod
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
 
 from torch_npu.utils._error_code import ErrCode, prof_error
 from ._constant import print_error_msg, Constant
+from ._output_recorder import OutputRecorder
 
 __all__ = []
 
@@ -29,6 +32,8 @@ class ConcurrentTask(ABC):
         self.name = name
         self.deps = deps
         self.mode = mode
+        # 子进程任务的内存预估(字节)，仅在使用全局资源池调度时生效
+        self.memory_estimate = 0
 
     @property
     def is_non_blocking(self):
@@ -50,19 +55,58 @@ class TaskMsgType(Enum):
     RET_CODE = 1
     OUTPUT = 2
     PRINT = 3
-
-
-def send_result_to_manager(fd, ret_code, output):
+    SHM_OUTPUT = 4  # V为8字节output长度 + 共享内存名
+    OUTPUT_FILES = 5  # V为任务写出的文件路径列表(pickle)
+
+
+def create_output_shm(data: bytes) -> SharedMemory:
+    """Copy data into a new shared memory segment, which is owned (and unlinked) by the receiver."""
+    try:
+        shm = SharedMemory(create=True, size=len(data), track=False)
+    except TypeError:
+        # python < 3.13 has no track param, stop the tracker from unlinking the segment when the sender exits
+        shm = SharedMemory(create=True, size=len(data))
+        resource_tracker.unregister(shm._name, "shared_memory")
+    shm.buf[:len(data)] = data
+    shm.close()
+    return shm
+
+
+def load_output_shm(value: bytes):
+    size = int.from_bytes(value[:8], "big")
+    shm = SharedMemory(name=str(value[8:], encoding="utf-8"))
+    try:
+        with shm.buf[:size] as buffer:
+            return pickle.loads(buffer)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def send_result_to_manager(fd, ret_code, output, output_files=None):
     if fd < 0:
         raise OSError("[Errno 9] Bad file descriptor" + prof_error(ErrCode.UNAVAIL))
 
     msg = b''
+    if output_files:
+        files_serialized = pickle.dumps(output_files, protocol=pickle.HIGHEST_PROTOCOL)
+        msg += TaskMsgType.OUTPUT_FILES.value.to_bytes(4, "big")
+        msg += len(files_serialized).to_bytes(4, "big")
+        msg += files_serialized
     # 先发output， 再发ret_code， 接受端会在收到ret_code时认为任务执行完成
     if output:
-        output_serialized = pickle.dumps(output)
-        msg += TaskMsgType.OUTPUT.value.to_bytes(4, "big")
-        msg += len(output_serialized).to_bytes(4, "big")
-        msg += output_serialized
+        output_serialized = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(output_serialized) >= Constant.SHM_OUTPUT_THRESHOLD:
+            # 大数据经共享内存传递，避免在pipe中按64K分片收发和拼接
+            shm = create_output_shm(output_serialized)
+            value = len(output_serialized).to_bytes(8, "big") + bytes(shm.name, encoding="utf-8")
+            msg += TaskMsgType.SHM_OUTPUT.value.to_bytes(4, "big")
+            msg += len(value).to_bytes(4, "big")
+            msg += value
+        else:
+            msg += TaskMsgType.OUTPUT.value.to_bytes(4, "big")
+            msg += len(output_serialized).to_bytes(4, "big")
+            msg += output_serialized
 
     msg += TaskMsgType.RET_CODE.value.to_bytes(4, "big")
     msg += (4).to_bytes(4, "big")
@@ -109,6 +153,16 @@ class TaskInfo:
         self.handler = None
         self.pipe = (-1, -1)
         self.recv_buffer = None
+        self.priority = 0
+        # 任务的起止时间(ns)及是否有输出，供断点续分析判断任务产物
+        self.start_time = 0
+        self.end_time = 0
+        self.has_output = False
+        # 任务写出的文件，由OutputRecorder记录
+        self.output_files = []
+        # 从全局资源池申请到的内存，-1表示未持有资源
+        self.acquired_memory = -1
+        self.progress_reported = False
 
 
 class ConcurrentTasksManager:
@@ -116,13 +170,23 @@ class ConcurrentTasksManager:
        Create tasks of class ConcurrentTask, add them into manager, then call manager.run().
     """
 
-    def __init__(self, *, max_concurrent_num=16, progress_bar=None):
+    def __init__(self, *, max_concurrent_num=None, progress_bar=None, resource_pool=None):
         self.task_infos = {}  # format: {task_name: task_info, ...}
         self.listening_infos = {}  # format: {recv_fd: task_info, ...}
         self.ready_tasks = []
         self.epoll = None
-        self.max_concurrent_num = max_concurrent_num
+        # 并发上限只约束独占Cpu核的子进程任务，默认取当前进程可用的核数
+        self.max_concurrent_num = max_concurrent_num if max_concurrent_num else self.get_available_cpu_num()
         self.progress_bar = progress_bar
+        # 集群解析时各rank的管理器共享的GlobalResourcePool，子进程任务需先申请到Cpu槽位和内存才能启动
+        self.resource_pool = resource_pool
+
+    @staticmethod
+    def get_available_cpu_num():
+        try:
+            return max(len(os.sched_getaffinity(0)), 1)
+        except (AttributeError, OSError):
+            return os.cpu_count() or 1
 
     def add_task(self, task):
         if not isinstance(task, ConcurrentTask):
@@ -136,6 +200,8 @@ class ConcurrentTasksManager:
         self.task_infos[task.name] = task_info
         if not task.deps:
             self.ready_tasks.append(task_info)
+        if self.resource_pool:
+            self.resource_pool.add_tasks(1)
 
     def run(self):
         try:
@@ -143,6 +209,7 @@ class ConcurrentTasksManager:
             if self.progress_bar:
                 self.__start_print_progress_bar()
 
+            self.__init_priority()
             self.__schedule()
             while True:
                 need_exit = self.__listen()
@@ -159,6 +226,8 @@ class ConcurrentTasksManager:
             if task_info.status != TaskStatus.Succeed:
                 print_error_msg(f"Task [{task_info.task.__class__.__name__}] run failed.")
                 self.__stop_task(task_info)
+            self.__release_resource(task_info)
+            self.__report_progress(task_info)
 
         if self.progress_bar:
             self.__stop_print_progress_bar()
@@ -173,17 +242,59 @@ class ConcurrentTasksManager:
             self.epoll.close()
             self.epoll = None
 
+    def __init_priority(self):
+        """ priority of a task is the length of the longest dependency chain starting from it (critical path) """
+        for task_info in self.task_infos.values():
+            stack = [(task_info, False)]
+            while stack:
+                cur_info, post_done = stack.pop()
+                if cur_info.priority:
+                    continue
+                post_infos = [self.task_infos.get(name) for name in cur_info.post_tasks]
+                if post_done:
+                    cur_info.priority = 1 + max((info.priority for info in post_infos), default=0)
+                    continue
+                stack.append((cur_info, True))
+                stack.extend((info, False) for info in post_infos if not info.priority)
+
     def __schedule(self):
-        """ schedule tasks those are ready """
-        free_channel = self.max_concurrent_num - len(self.listening_infos)
-        num_to_run = min(free_channel, len(self.ready_tasks))
-        tasks_wait_schedule = self.ready_tasks[num_to_run:]
-        for task_info in self.ready_tasks[:num_to_run]:
-            self.__run_one_task(task_info)
+        """ schedule tasks those are ready, tasks on the critical path first """
+        # 稳定排序，优先级相同时保持添加顺序
+        self.ready_tasks.sort(key=lambda info: info.priority, reverse=True)
+        free_channel = self.max_concurrent_num - sum(
+            1 for task_info in self.listening_infos.values()
+            if (task_info.task.mode & ConcurrentMode.SUB_PROCESS) != 0)
+        tasks_wait_schedule = []
+        # 主进程任务同步执行完后会把后续任务追加到ready_tasks，在本轮遍历中一并调度
+        for task_info in self.ready_tasks:
+            if (task_info.task.mode & ConcurrentMode.SUB_PROCESS) == 0:
+                self.__run_one_task(task_info)
+            elif free_channel > 0 and self.__acquire_resource(task_info):
+                free_channel -= 1
+                self.__run_one_task(task_info)
+            else:
+                tasks_wait_schedule.append(task_info)
         self.ready_tasks = tasks_wait_schedule
 
+    def __acquire_resource(self, task_info):
+        if not self.resource_pool:
+            return True
+        task_info.acquired_memory = self.resource_pool.try_acquire(task_info.task.memory_estimate)
+        return task_info.acquired_memory >= 0
+
+    def __release_resource(self, task_info):
+        if self.resource_pool and task_info.acquired_memory >= 0:
+            self.resource_pool.release(task_info.acquired_memory)
+        task_info.acquired_memory = -1
+
+    def __report_progress(self, task_info):
+        if self.resource_pool and not task_info.progress_reported:
+            task_info.progress_reported = True
+            self.resource_pool.finish_task()
+
     def __run_one_task(self, task_info):
         task_info.status = TaskStatus.Running
+        task_info.start_time = time.time_ns()
         if (task_info.task.mode & ConcurrentMode.SUB_PROCESS) != 0:
             self.__run_in_subprocess(task_info)
         elif (task_info.task.mode & ConcurrentMode.PTHREAD) != 0:
@@ -210,10 +321,12 @@ class ConcurrentTasksManager:
             # 父进程内有其他python线程，此处子进程对stdout操作可能导致死锁，因此打印信息统一发送给父进程处理
             sys.stdout.write = stdout_wrapper
             sys.stdout.flush = func_nop
+            OutputRecorder.start()
             ret_code, output = task.run(deps_input)
+            output_files = OutputRecorder.stop()
             if ret_code != 0:
                 output = None
-            send_result_to_manager(info.pipe[1], ret_code, output)
+            send_result_to_manager(info.pipe[1], ret_code, output, output_files)
 
         self.__add_listening(task_info)
         p = multiprocessing.Process(target=process_task_func, args=(task_info, user_input))
@@ -231,7 +344,9 @@ class ConcurrentTasksManager:
 
         def thread_task_func(info, deps_input):
             task = info.task
+            OutputRecorder.start()
             ret_code, output = task.run(deps_input)
+            info.output_files = OutputRecorder.stop()
             # 子线程模式与主线程共用地址空间，考虑到output可能很大，此处不用pipe传数据，直接赋值
             # 由于调度关系天然限制了读写时序，此处无需线程锁
             if ret_code == 0:
@@ -253,15 +368,19 @@ class ConcurrentTasksManager:
             dep_task = self.task_infos.get(dep)
             if dep_task:
                 user_input[dep] = self.task_infos.get(dep).output
+        OutputRecorder.start()
         ret_code, output = task_info.task.run(user_input)
+        task_info.output_files = OutputRecorder.stop()
         self.__on_task_done(task_info, ret_code, output)
 
     def __on_task_done(self, task_info, ret_code, output):
         """ be called when task.run is finish(listening thread receives ret_code) """
+        task_info.end_time = time.time_ns()
         if ret_code == 0:
             task_info.status = TaskStatus.Succeed
             if output is not None:
                 task_info.output = output
+            task_info.has_output = task_info.output is not None
             for task_name in task_info.post_tasks:
                 post_task = self.task_infos.get(task_name)
                 post_task.pre_tasks.remove(task_info.task.name)
@@ -276,12 +395,16 @@ class ConcurrentTasksManager:
                     pre_task.output = None
         else:
             task_info.status = TaskStatus.Failed
+        self.__report_progress(task_info)
 
     def __on_task_exit(self, task_info):
         """ be called when subprocess/pthread exits """
         # if a task exits without calling __on_task_done, infer that an error occurred
         if task_info.status != TaskStatus.Succeed:
             task_info.status = TaskStatus.Failed
+        # 非阻塞任务在返回结果后仍可能继续落盘，以退出时间为准
+        task_info.end_time = time.time_ns()
+        self.__release_resource(task_info)
         self.__remove_listening(task_info)
 
     def __add_listening(self, task_info):
@@ -313,11 +436,17 @@ class ConcurrentTasksManager:
                 need_exit = False
                 break
         if need_exit:
+            if self.ready_tasks:
+                # 就绪任务在等待其他rank释放全局资源
+                time.sleep(Constant.SLEEP_TIME)
+                return False
             time.sleep(Constant.SLEEP_TIME * 5)
             if all((task_info.task.is_non_blocking for task_info in self.listening_infos.values())):
                 return True
 
-        events = self.epoll.poll()
+        # 有任务等待全局资源时需定期醒来重新调度
+        timeout = Constant.SLEEP_TIME if self.resource_pool and self.ready_tasks else None
+        events = self.epoll.poll(timeout)
         for fd, event in events:
             if event & select.EPOLLIN:
                 self.__on_recv_msg(fd)
@@ -360,6 +489,10 @@ class ConcurrentTasksManager:
             elif value_type == TaskMsgType.OUTPUT.value:
                 output = pickle.loads(value)
                 task_info.output = output
+            elif value_type == TaskMsgType.SHM_OUTPUT.value:
+                task_info.output = load_output_shm(value)
+            elif value_type == TaskMsgType.OUTPUT_FILES.value:
+                task_info.output_files = pickle.loads(value)
             elif value_type == TaskMsgType.PRINT.value:
                 text = str(value, encoding="utf-8")
                 print(text, end='')
@@ -1,4 +1,5 @@
 import struct
+from collections.abc import Mapping
 from warnings import warn
 
 from ._constant import Constant
@@ -6,51 +7,156 @@ from ._constant import Constant
 __all__ = []
 
 
+class TLVFields(Mapping):
+    """
+    Read-only view of the TLV fields of one record.
+    Field values are kept as offsets into the bytes of the record and only utf-8 decoded on first access.
+    """
+
+    __slots__ = ("_buffer", "_offsets", "_constant_bytes", "_decoded")
+
+    def __init__(self, buffer: bytes, offsets: dict, constant_bytes: bytes):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._constant_bytes = constant_bytes
+        self._decoded = {}
+
+    def __getitem__(self, type_id):
+        if type_id == Constant.CONSTANT_BYTES:
+            return self._constant_bytes
+        if type_id in self._decoded:
+            return self._decoded[type_id]
+        start, end = self._offsets[type_id]
+        value = TLVDecoder.decode_field(self._buffer[start: end])
+        self._decoded[type_id] = value
+        return value
+
+    def __contains__(self, type_id):
+        return type_id == Constant.CONSTANT_BYTES or type_id in self._offsets
+
+    def __iter__(self):
+        yield from self._offsets
+        yield Constant.CONSTANT_BYTES
+
+    def __len__(self):
+        return len(self._offsets) + 1
+
+    def __reduce__(self):
+        # hand a decoded dict to the other process instead of the raw record
+        return dict, (dict(self.items()),)
+
+
 class TLVDecoder:
     T_LEN = 2
     L_LEN = 4
+    TL_STRUCT = struct.Struct("<HI")
 
     @classmethod
     def decode(cls, all_bytes: bytes, class_bean: any, constant_struct_size: int) -> list:
-        result_data = []
-        records = cls.tlv_list_decode(all_bytes)
-        for record in records:
-            if constant_struct_size > len(record):
-                warn("The collected data has been lost")
-                continue
-            constant_bytes = record[0: constant_struct_size]
-            tlv_fields = cls.tlv_list_decode(record[constant_struct_size:], is_field=True)
-            tlv_fields[Constant.CONSTANT_BYTES] = constant_bytes
-            result_data.append(class_bean(tlv_fields))
-        return result_data
+        """Each bean owns a copy of its record, so all_bytes is not kept alive by the beans."""
+        buffer = memoryview(all_bytes)
+        try:
+            return [cls._create_record_bean(buffer, record_start, record_end, class_bean, constant_struct_size)
+                    for record_start, record_end in cls._iter_record_offsets(buffer, constant_struct_size)]
+        finally:
+            buffer.release()
 
     @classmethod
-    def tlv_list_decode(cls, tlv_bytes: bytes, is_field: bool = False) -> dict:
-        result_data = {} if is_field else []
+    def iter_decode(cls, all_bytes: any, class_bean: any, constant_struct_size: int,
+                    chunk_size: int = Constant.DECODE_CHUNK_SIZE):
+        """
+        Yield beans in lists of at most chunk_size records.
+        Each bean owns a copy of its record, so all_bytes (e.g. a mmap) may be released after iterating.
+        """
+        buffer = memoryview(all_bytes)
+        chunk = []
+        try:
+            for record_start, record_end in cls._iter_record_offsets(buffer, constant_struct_size):
+                chunk.append(cls._create_record_bean(buffer, record_start, record_end, class_bean,
+                                                     constant_struct_size))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            buffer.release()
+
+    @classmethod
+    def _iter_record_offsets(cls, buffer: memoryview, constant_struct_size: int):
+        all_bytes_len = len(buffer)
+        head_len = cls.TL_STRUCT.size
+        unpack_from = cls.TL_STRUCT.unpack_from
         index = 0
-        all_bytes_len = len(tlv_bytes)
         while index < all_bytes_len:
-            if index + cls.T_LEN > all_bytes_len:
+            if index + head_len > all_bytes_len:
                 warn("The collected data has been lost")
                 break
-            type_id = struct.unpack("<H", tlv_bytes[index: index + cls.T_LEN])[0]
-            index += cls.T_LEN
-            if index + cls.L_LEN > all_bytes_len:
+            _, record_len = unpack_from(buffer, index)
+            record_start = index + head_len
+            record_end = record_start + record_len
+            if record_end > all_bytes_len:
                 warn("The collected data has been lost")
                 break
-            value_len = struct.unpack("<I", tlv_bytes[index: index + cls.L_LEN])[0]
-            index += cls.L_LEN
+            index = record_end
+            if constant_struct_size > record_len:
+                warn("The collected data has been lost")
+                continue
+            yield record_start, record_end
+
+    @classmethod
+    def _create_record_bean(cls, buffer: memoryview, record_start: int, record_end: int,
+                            class_bean: any, constant_struct_size: int):
+        record = bytes(buffer[record_start: record_end])
+        offsets = cls._build_field_offsets(record, constant_struct_size, len(record))
+        return class_bean(TLVFields(record, offsets, record[:constant_struct_size]))
+
+    @classmethod
+    def tlv_list_decode(cls, tlv_bytes: bytes, is_field: bool = False) -> any:
+        buffer = memoryview(tlv_bytes)
+        if is_field:
+            offsets = cls._build_field_offsets(buffer, 0, len(buffer))
+            return {type_id: cls.decode_field(buffer[start: end]) for type_id, (start, end) in offsets.items()}
+        result_data = []
+        index = 0
+        all_bytes_len = len(buffer)
+        head_len = cls.TL_STRUCT.size
+        while index < all_bytes_len:
+            if index + head_len > all_bytes_len:
+                warn("The collected data has been lost")
+                break
+            _, value_len = cls.TL_STRUCT.unpack_from(buffer, index)
+            index += head_len
             if index + value_len > all_bytes_len:
                 warn("The collected data has been lost")
                 break
-            value = tlv_bytes[index: index + value_len]
+            result_data.append(bytes(buffer[index: index + value_len]))
             index += value_len
-            if is_field:
-                try:
-                    result_data[type_id] = bytes.decode(value)
-                except UnicodeDecodeError:
-                    warn(f"The collected data can't decode by bytes.decode: {value}")
-                    result_data[type_id] = 'N/A'
-            else:
-                result_data.append(value)
         return result_data
+
+    @classmethod
+    def decode_field(cls, value: bytes) -> str:
+        try:
+            return str(value, encoding="utf-8")
+        except UnicodeDecodeError:
+            warn(f"The collected data can't decode by bytes.decode: {bytes(value)}")
+            return 'N/A'
+
+    @classmethod
+    def _build_field_offsets(cls, buffer: any, start: int, end: int) -> dict:
+        offsets = {}
+        head_len = cls.TL_STRUCT.size
+        unpack_from = cls.TL_STRUCT.unpack_from
+        index = start
+        while index < end:
+            if index + head_len > end:
+                warn("The collected data has been lost")
+                break
+            type_id, value_len = unpack_from(buffer, index)
+            index += head_len
+            if index + value_len > end:
+                warn("The collected data has been lost")
+                break
+            offsets[type_id] = (index, index + value_len)
+            index += value_len
+        return offsets
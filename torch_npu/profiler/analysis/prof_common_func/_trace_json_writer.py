@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+
+from torch_npu.utils._error_code import ErrCode, prof_error
+from ....utils._path_manager import PathManager
+from ._constant import Constant
+from ._output_recorder import OutputRecorder
+
+__all__ = []
+
+
+class TraceJsonWriter:
+    """
+    Incremental writer of a Chrome trace json array.
+    Events are buffered and dumped every chunk_size events, so the complete event list and its
+    serialized string never have to be held in memory at once.
+    With append=True, the events are appended to an unclosed array such as the one left by
+    FileManager.create_prepare_trace_json_by_path.
+    """
+
+    def __init__(self, output_path: str, compress: bool = False, append: bool = False,
+                 chunk_size: int = Constant.TRACE_WRITE_CHUNK_SIZE):
+        self._output_path = output_path
+        self._compress = compress
+        self._append = append
+        self._chunk_size = chunk_size
+        self._file = None
+        self._buffer = []
+        self._has_event = append
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        elif self._file:
+            self._file.close()
+            self._file = None
+
+    def write(self, events: any) -> None:
+        for event in events:
+            self._buffer.append(event)
+            if len(self._buffer) >= self._chunk_size:
+                self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self._open()
+        data = json.dumps(self._buffer, ensure_ascii=False)
+        self._buffer = []
+        try:
+            self._file.write(f",{data[1:-1]}" if self._has_event else data[:-1])
+        except Exception as err:
+            raise RuntimeError(f"Can't create file: {self._output_path}" + prof_error(ErrCode.SYSCALL)) from err
+        self._has_event = True
+
+    def close(self) -> None:
+        self.flush()
+        if self._has_event:
+            self._open()
+            try:
+                self._file.write("]")
+            except Exception as err:
+                raise RuntimeError(f"Can't create file: {self._output_path}" + prof_error(ErrCode.SYSCALL)) from err
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        if self._file:
+            return
+        if self._append:
+            PathManager.check_directory_path_writeable(self._output_path)
+        else:
+            PathManager.make_dir_safety(os.path.dirname(self._output_path))
+            PathManager.create_file_safety(self._output_path)
+            PathManager.check_directory_path_writeable(self._output_path)
+        OutputRecorder.record(self._output_path)
+        mode = "at" if self._append else "wt"
+        try:
+            if self._compress:
+                self._file = gzip.open(self._output_path, mode, encoding="utf-8")
+            else:
+                self._file = open(self._output_path, mode, encoding="utf-8")
+        except Exception as err:
+            raise RuntimeError(f"Can't create file: {self._output_path}" + prof_error(ErrCode.SYSCALL)) from err
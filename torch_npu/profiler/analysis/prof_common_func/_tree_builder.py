@@ -1,36 +1,40 @@
+from itertools import chain
 from queue import Queue
 
+import numpy as np
+
+from ._op_interval_index import OpIntervalIndex
 from ..prof_bean._op_mark_bean import OpMarkBean
-from ..prof_bean._torch_op_node import TorchOpNode
+from ..prof_bean._torch_op_node import TorchOpNode, TorchOpTree
 
 __all__ = []
 
 
 class TreeBuilder:
     @classmethod
-    def build_tree(cls, event_list: list, enqueue_list: list) -> TorchOpNode:
-        all_node_list = [None] * (len(event_list) + 1)
-        event_list.extend(enqueue_list)
+    def build_tree(cls, event_list: any, enqueue_list: list) -> list:
+        """
+        event_list may be any iterable of torch op beans, such as the chunks of a streamed file.
+        Return the nodes of a TorchOpTree in preorder, the first one is the virtual root.
+        """
+        event_list = list(chain(event_list, enqueue_list))
         event_list.sort(key=lambda x: x.ts)
-        root_node = TorchOpNode()
-        last_node = root_node
-        index = 0
-        all_node_list[index] = root_node
+        tree = TorchOpTree()
+        root_index = tree.add_node(None)
+        last_index = root_index
         for event in event_list:
-            while last_node:
-                if last_node != root_node and event.ts > last_node.end_time:
-                    last_node = last_node.parent_node
+            while last_index >= 0:
+                if last_index != root_index and event.ts > tree.get_end(last_index):
+                    last_index = tree.get_parent(last_index)
                     continue
                 if event.is_torch_op:
-                    tree_node = TorchOpNode(event, last_node)
-                    last_node.add_child_node(tree_node)
-                    last_node = tree_node
-                    index += 1
-                    all_node_list[index] = tree_node
+                    node_index = tree.add_node(event, last_index)
+                    tree.add_child(last_index, node_index)
+                    last_index = node_index
                 else:
-                    last_node.update_corr_id(event.corr_id)
+                    tree.add_corr_id_self(last_index, event.corr_id)
                 break
-        return all_node_list
+        return tree.nodes
 
     @classmethod
     def update_tree_node_info(cls, acl_ts: int, root_node: TorchOpNode):
@@ -43,13 +47,35 @@ class TreeBuilder:
         node_queue.put(matched_child_node)
         while not node_queue.empty():
             tree_node = node_queue.get()
-            tree_node.update_corr_id_total(corr_id)
             matched_child_node = tree_node.match_child_node(ts)
             if matched_child_node:
                 node_queue.put(matched_child_node)
             else:
                 tree_node.update_corr_id_self(corr_id)
 
+    @classmethod
+    def update_tree_node_info_in_bulk(cls, acl_ts_list: any, torch_op_nodes: list):
+        """
+        Add every acl ts to corr_id_self of its innermost torch op node like update_tree_node_info,
+        with one sweep over an OpIntervalIndex of torch_op_nodes (build_tree output without the root).
+        """
+        op_index = OpIntervalIndex(torch_op_nodes)
+        ts_array = np.sort(np.fromiter(acl_ts_list, dtype=np.int64))
+        nodes = op_index.nodes
+        for ts, node_index in zip(ts_array.tolist(), op_index.match_innermost(ts_array).tolist()):
+            if node_index >= 0:
+                nodes[node_index].update_corr_id_self(ts)
+
+    @classmethod
+    def match_self_torch_op_in_bulk(cls, acl_ts_list: any, torch_op_nodes: list) -> dict:
+        """Match the innermost torch op node of every acl ts, return {acl_ts: matched torch op node}."""
+        op_index = OpIntervalIndex(torch_op_nodes)
+        ts_array = np.sort(np.fromiter(acl_ts_list, dtype=np.int64))
+        nodes = op_index.nodes
+        return {ts: nodes[node_index]
+                for ts, node_index in zip(ts_array.tolist(), op_index.match_innermost(ts_array).tolist())
+                if node_index >= 0}
+
     @classmethod
     def match_self_torch_op(cls, ts: int, root_node: TorchOpNode) -> any:
         matched_child_node = root_node.match_child_node(ts)
@@ -59,6 +59,18 @@ class ParserConfig:
                 MemoryPrepareParser,
                 DbParser
             ]
+        },
+        Constant.Columnar: {
+            Constant.TENSORBOARD_TRACE_HANDLER: [
+                TreeBuildParser,
+                CANNExportParser,
+                CANNTimelineParser,
+                RelationParser,
+                MemoryPrepareParser,
+                CANNAnalyzeParser,
+                OperatorViewParser,
+                MemoryViewParser
+            ]
         }
     }
 
@@ -94,6 +106,20 @@ class ParserConfig:
                 MemoryPrepareParser,
                 DbParser
             ]
+        },
+        Constant.Columnar: {
+            Constant.TENSORBOARD_TRACE_HANDLER: [
+                TreeBuildParser,
+                CANNExportParser,
+                CANNTimelineParser,
+                RelationParser,
+                MemoryPrepareParser,
+                CANNAnalyzeParser,
+                OperatorViewParser,
+                KernelViewParser,
+                MemoryViewParser,
+                CommunicationParser
+            ]
         }
     }
 
@@ -106,6 +132,9 @@ class ParserConfig:
         },
         Constant.Db: {
             Constant.TENSORBOARD_TRACE_HANDLER: [CANNExportParser, DbParser]
+        },
+        Constant.Columnar: {
+            Constant.TENSORBOARD_TRACE_HANDLER: [OperatorViewParser, MemoryViewParser]
         }
     }
 
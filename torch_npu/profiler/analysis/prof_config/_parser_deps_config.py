@@ -68,3 +68,15 @@ class ParserDepsConfig:
         Constant.DB_PARSER: {Constant.MODE: ConcurrentMode.PTHREAD, Constant.DEPS: [Constant.CANN_EXPORT_PARSER]},
         Constant.MEMORY_TIMELINE_PARSER: {}
     }
+
+    # peak memory of a sub process parser as a multiple of the size of the profiling data of its rank,
+    # used as its memory estimate by the global scheduler of a cluster analysis
+    MEMORY_FACTOR = {
+        Constant.CANN_EXPORT_PARSER: 1,
+        Constant.TRACE_PRE_PARSER: 2,
+        Constant.TRACE_VIEW_PARSER: 4,
+        Constant.MEMORY_VIEW_PARSER: 3,
+        Constant.COMMUNICATION_PARSER: 1,
+        Constant.INTEGRATE_PARSER: 1
+    }
+    DEFAULT_MEMORY_FACTOR = 2
@@ -10,6 +10,7 @@ from ....utils._path_manager import PathManager
 from ..prof_bean._event_bean import EventBean
 from ..prof_common_func._constant import Constant, print_warn_msg
 from ..prof_common_func._constant import convert_us2ns
+from ..prof_common_func._data_cache import DataCache
 from ..prof_common_func._path_manager import ProfilerPathManager
 from ..prof_common_func._file_manager import FileManager
 from ..prof_common_func._log import ProfilerLogger
@@ -143,14 +144,19 @@ class CANNFileParser:
         return acl_to_npu_dict
 
     def get_timeline_all_data(self) -> list:
-        timeline_data = []
         msprof_file_list = self._file_dict.get(CANNDataEnum.MSPROF_TIMELINE, set())
+        timeline_data = DataCache().get(self._profiler_path, CANNDataEnum.MSPROF_TIMELINE, msprof_file_list,
+                                        lambda: self._load_timeline_data(msprof_file_list))
+        if not timeline_data:
+            self.logger.error("Get timeline all data failed, the timeline data is empty.")
+        # the events are shared through DataCache, return a new list so callers can extend it
+        return list(timeline_data)
+
+    def _load_timeline_data(self, msprof_file_list: set) -> list:
+        timeline_data = []
         for msprof_file in msprof_file_list:
             data = self._json_load(FileManager.file_read_all(msprof_file, "rt"))
             timeline_data.extend(data)
-
-        if not timeline_data:
-            self.logger.error("Get timeline all data failed, the timeline data is empty.")
         return timeline_data
 
     def get_analyze_communication_data(self, file_type: Enum) -> dict:
@@ -191,8 +191,8 @@ class _ExtraFields_TorchOp:
         self.name = bean.name
         self.end_time_ns = bean.end_ns
         self.scope = bean.scope
-        self.forward_tid = bean.args.get(Constant.FORWARD_THREAD_ID, -1)
-        self.sequence_num = bean.args.get(Constant.SEQUENCE_NUMBER, -1)
+        self.forward_tid = bean.forward_thread_id
+        self.sequence_num = bean.sequence_number
         
         types_string = bean.args.get(Constant.INPUT_DTYPES, None)
         tensors_string = bean.inputs.get(Constant.INPUT_TENSORS, None)
@@ -552,12 +552,8 @@ class EventTree:
         self.events.extend(op_events)
     
     def fetch_allocation_events(self, fwk_file_parser: FwkFileParser) -> None:
-        mem_bean_list: List[MemoryUseBean] = fwk_file_parser.get_file_data_by_tag(FileTag.MEMORY)
-        if not mem_bean_list:
-            return
-        
-        mem_events = [_ProfilerEvent(mem_bean) for mem_bean in mem_bean_list
-                        if mem_bean.data_type != _AllocEventType.BLOCK_FREE.value]
+        mem_events = [_ProfilerEvent(mem_bean) for mem_bean in fwk_file_parser.iter_file_beans_by_tag(FileTag.MEMORY)
+                      if mem_bean.data_type != _AllocEventType.BLOCK_FREE.value]
         
         self.events.extend(mem_events)
     
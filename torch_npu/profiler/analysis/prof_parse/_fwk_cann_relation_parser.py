@@ -1,3 +1,5 @@
+import numpy as np
+
 from ._fwk_file_parser import FwkFileParser
 from ..prof_bean._torch_op_node import TorchOpNode
 from ..prof_common_func._constant import Constant, print_error_msg
@@ -17,18 +19,28 @@ class FwkCANNRelationParser:
     def combine_kernel_dict(cls, acl_to_npu_dict: dict, dequeue_data_list: list):
         if not dequeue_data_list:
             return acl_to_npu_dict
+        start_ns = np.array([dequeue_data.ts for dequeue_data in dequeue_data_list], dtype=np.int64)
+        end_ns = start_ns + np.array([dequeue_data.dur for dequeue_data in dequeue_data_list], dtype=np.int64)
+        corr_ids = np.array([dequeue_data.corr_id for dequeue_data in dequeue_data_list], dtype=np.int64)
+        return cls.combine_kernel_dict_by_columns(acl_to_npu_dict, (start_ns, end_ns, corr_ids))
+
+    @classmethod
+    def combine_kernel_dict_by_columns(cls, acl_to_npu_dict: dict, dequeue_columns: tuple):
+        """
+        Join acl start times against the dequeue spans given as (start_ns, end_ns, corr_id) arrays ordered by
+        end time: each acl belongs to the first dequeue span that ends at or after it, if that span contains it.
+        """
+        start_ns, end_ns, corr_ids = dequeue_columns
+        if not len(corr_ids):
+            return acl_to_npu_dict
         kernel_dict = {}
-        index = 0
-        acl_start_time_list = sorted(list(acl_to_npu_dict.keys()))
-        for acl_start_time in acl_start_time_list:
-            while index < len(dequeue_data_list):
-                if dequeue_data_list[index].ts > acl_start_time:
-                    break
-                if acl_start_time <= dequeue_data_list[index].ts + dequeue_data_list[index].dur:
-                    kernel_dict.setdefault(dequeue_data_list[index].corr_id, []).extend(
-                        acl_to_npu_dict.get(acl_start_time, []))
-                    break
-                index += 1
+        acl_start_times = np.array(sorted(acl_to_npu_dict.keys()), dtype=np.int64)
+        indexes = np.searchsorted(end_ns, acl_start_times, side="left")
+        in_range = indexes < len(end_ns)
+        matched = np.zeros(len(acl_start_times), dtype=bool)
+        matched[in_range] = start_ns[indexes[in_range]] <= acl_start_times[in_range]
+        for acl_start_time, corr_id in zip(acl_start_times[matched].tolist(), corr_ids[indexes[matched]].tolist()):
+            kernel_dict.setdefault(corr_id, []).extend(acl_to_npu_dict.get(acl_start_time, []))
         return kernel_dict
 
     @classmethod
@@ -50,8 +62,8 @@ class FwkCANNRelationParser:
         if not acl_to_npu_dict:
             print_error_msg("Failed to get acl to npu flow events.")
             return acl_to_npu_dict
-        dequeue_data_list = FwkFileParser(self._profiler_path).get_dequeue_data()
-        return self.combine_kernel_dict(acl_to_npu_dict, dequeue_data_list)
+        dequeue_columns = FwkFileParser(self._profiler_path).get_dequeue_columns()
+        return self.combine_kernel_dict_by_columns(acl_to_npu_dict, dequeue_columns)
 
     def get_step_range(self, root_node: TorchOpNode, kernel_dict: dict):
         if not kernel_dict:
@@ -71,10 +83,10 @@ class FwkCANNRelationParser:
         step_range = []
         for step_node in step_node_list:
             step_id = step_node.event.name.split("#")[-1]
-            if not step_node.corr_id_total:
+            corr_id_list = sorted(step_node.corr_id_total)
+            if not corr_id_list:
                 self.logger.error("There is no flow events in %s range.", step_node.event.name)
                 return []
-            corr_id_list = sorted(step_node.corr_id_total)
             min_index, max_index = 0, len(corr_id_list) - 1
             min_kernel_list, max_kernel_list = [], []
             while min_index < len(corr_id_list):
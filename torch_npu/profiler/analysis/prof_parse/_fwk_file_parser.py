@@ -1,10 +1,15 @@
+import copy
 import os
 import re
-from collections import defaultdict
+from itertools import chain
 
+import numpy as np
+
+from .._profiler_config import ProfilerConfig
 from ..prof_bean._torch_op_bean import TorchOpBean
-from ..prof_common_func._binary_decoder import BinaryDecoder
+from ..prof_common_func._binary_decoder import BinaryDecoder, ColumnarRecords
 from ..prof_common_func._constant import Constant, contact_2num
+from ..prof_common_func._data_cache import DataCache
 from ..prof_common_func._file_manager import FileManager
 from ..prof_common_func._file_tag import FileTag
 from ..prof_common_func._path_manager import ProfilerPathManager
@@ -27,151 +32,198 @@ class FwkFileParser:
         ProfilerLogger.init(self._profiler_path, "FwkFileParser")
         self.logger = ProfilerLogger.get_instance()
 
-    def get_file_data_by_tag(self, file_tag: int) -> list:
+    def get_file_data_by_tag(self, file_tag: int, columnar: bool = False) -> list:
+        """
+        Decode the framework file of file_tag into bean objects.
+        With columnar=True, fixed-size records are returned as ColumnarRecords and beans are created on access.
+        The decoded data is shared through DataCache, so a file is decoded once by the process of the analysis,
+        and once by every forked parser task that reads it unless preload_shared_data loaded it before the fork.
+        """
         file_path = self._file_list.get(file_tag)
         if not file_path:
             return []
+        bean_config = FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag, {})
+        if columnar and not bean_config.get("is_tlv") and bean_config.get("struct_format"):
+            return DataCache().get(self._profiler_path, (file_tag, "columnar"), [file_path],
+                                   lambda: self._decode_columnar_file(file_path, bean_config), size_factor=1)
+        data = DataCache().get(self._profiler_path, file_tag, [file_path],
+                               lambda: self._decode_file(file_tag, file_path, bean_config))
+        # return a new list, callers are free to sort or extend it
+        return list(data)
+
+    def _decode_file(self, file_tag: int, file_path: str, bean_config: dict) -> list:
+        if os.path.getsize(file_path) > Constant.MAX_FILE_SIZE:
+            # the file is mapped instead of read, but all of its beans are still held by the returned list
+            self.logger.warning("The file %s is too large to read at once, decode it in chunks.", file_path)
+            return list(chain.from_iterable(self.iter_file_data_by_tag(file_tag)))
         all_bytes = FileManager.file_read_all(file_path, "rb")
-        file_bean = FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag, {}).get("bean")
-        is_tlv = FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag, {}).get("is_tlv")
-        struct_size = FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag, {}).get("struct_size")
-        if is_tlv:
-            return TLVDecoder.decode(all_bytes, file_bean, struct_size)
+        if bean_config.get("is_tlv"):
+            return TLVDecoder.decode(all_bytes, bean_config.get("bean"), bean_config.get("struct_size"))
+        return BinaryDecoder.decode(all_bytes, bean_config.get("bean"), bean_config.get("struct_size"))
+
+    def _decode_columnar_file(self, file_path: str, bean_config: dict) -> ColumnarRecords:
+        decode_args = (bean_config.get("bean"), bean_config.get("struct_size"), bean_config.get("struct_format"),
+                       bean_config.get("field_enum"))
+        if os.path.getsize(file_path) > Constant.MAX_FILE_SIZE:
+            # the records are copied out of the mapping, which is closed once no view of it is left
+            self.logger.warning("The file %s is too large to read at once, decode it through a mapping.", file_path)
+            with FileManager.file_mmap(file_path) as mapped_file:
+                mapped_records = BinaryDecoder.decode_columnar(mapped_file, *decode_args)
+                records = ColumnarRecords(mapped_records.records.copy(), bean_config.get("bean"))
+                del mapped_records
+            return records
+        # file_read_all returns '' for an empty file, decode it as no records
+        all_bytes = FileManager.file_read_all(file_path, "rb") or b""
+        return BinaryDecoder.decode_columnar(all_bytes, *decode_args)
+
+    def iter_file_data_by_tag(self, file_tag: int, chunk_size: int = Constant.DECODE_CHUNK_SIZE):
+        """
+        Map the framework file of file_tag and yield its beans in lists of at most chunk_size records,
+        so the whole file never has to be held in memory at once.
+        """
+        file_path = self._file_list.get(file_tag)
+        if not file_path:
+            return
+        bean_config = FwkFileParserConfig.FILE_BEAN_MAP.get(file_tag, {})
+        decoder = TLVDecoder if bean_config.get("is_tlv") else BinaryDecoder
+        with FileManager.file_mmap(file_path) as mapped_file:
+            yield from decoder.iter_decode(mapped_file, bean_config.get("bean"),
+                                           bean_config.get("struct_size"), chunk_size)
+
+    def iter_file_beans_by_tag(self, file_tag: int):
+        """
+        Yield the beans of file_tag one by one. Files above MAX_FILE_SIZE are decoded chunk by chunk,
+        so consumers which don't keep the beans run in bounded memory, smaller files are read through DataCache.
+        """
+        file_path = self._file_list.get(file_tag)
+        if not file_path:
+            return
+        if os.path.getsize(file_path) > Constant.MAX_FILE_SIZE:
+            yield from chain.from_iterable(self.iter_file_data_by_tag(file_tag))
         else:
-            return BinaryDecoder.decode(all_bytes, file_bean, struct_size)
+            yield from self.get_file_data_by_tag(file_tag)
 
     def get_enqueue_data(self) -> list:
-        enqueue_data_list = []
-        op_mark_data = self.get_file_data_by_tag(FileTag.OP_MARK)
-        if not op_mark_data:
+        enqueue_data_list, _ = self._get_matched_task_queue_data()
+        if not enqueue_data_list and not self.has_task_queue_data():
             self.logger.error("Get enqueue data failed, the op mark data is empty.")
-            return enqueue_data_list
-        op_mark_data.sort(key=lambda x: x.time_ns)
-        tid_op_dict = defaultdict(lambda: defaultdict(list))
-        for op_mark in op_mark_data:
-            if not op_mark.is_enqueue:
-                continue
-            if op_mark.is_enqueue_start:
-                tid_op_dict[op_mark.tid][op_mark.origin_name].append(op_mark)
-                continue
-            start_op_list = tid_op_dict.get(op_mark.tid, {}).get(op_mark.origin_name, [])
-            if not start_op_list:
-                self.logger.warning("Enquque data match failed, the tid: %d, origin_name: %s is not exist.", 
-                                op_mark.tid, op_mark.origin_name)
-                continue
-            start_op = start_op_list.pop()
-            op_mark.ts = start_op.time_ns
-            op_mark.dur = op_mark.time_ns - start_op.time_ns
-            enqueue_data_list.append(op_mark)
-            start_op_list.clear()
-        return enqueue_data_list
+        return list(enqueue_data_list)
 
     def get_dequeue_data(self) -> list:
-        dequeue_data_list = []
-        op_mark_data = self.get_file_data_by_tag(FileTag.OP_MARK)
-        if not op_mark_data:
+        _, dequeue_data_list = self._get_matched_task_queue_data()
+        if not dequeue_data_list and not self.has_task_queue_data():
             self.logger.error("Get dequeue data failed, the op mark data is empty.")
-            return dequeue_data_list
-        op_mark_data.sort(key=lambda x: x.time_ns)
-        tid_op_dict = defaultdict(lambda: defaultdict(list))
-        for op_mark in op_mark_data:
-            if not op_mark.is_dequeue:
-                continue
-            if op_mark.is_dequeue_start:
-                tid_op_dict[op_mark.tid][op_mark.origin_name].append(op_mark)
-                continue
-            start_op_list = tid_op_dict.get(op_mark.tid, {}).get(op_mark.origin_name, [])
-            if not start_op_list:
-                self.logger.warning("Dequque data match failed, the tid: %d, origin_name: %s is not exist.", 
-                                op_mark.tid, op_mark.origin_name)
-                continue
-            start_op = start_op_list.pop()
-            op_mark.ts = start_op.time_ns
-            op_mark.dur = op_mark.time_ns - start_op.time_ns
-            dequeue_data_list.append(op_mark)
-            start_op_list.clear()
-        return dequeue_data_list
+        return list(dequeue_data_list)
 
     def get_task_queue_data(self) -> any:
+        enqueue_data_list, dequeue_data_list = self._get_matched_task_queue_data()
+        return list(enqueue_data_list), list(dequeue_data_list)
+
+    def get_dequeue_columns(self) -> tuple:
+        """
+        Return the matched dequeue spans as (start_ns, end_ns, corr_id) NumPy arrays ordered by end time,
+        which FwkCANNRelationParser.combine_kernel_dict_by_columns joins against directly.
+        """
+        if not self._file_list.get(FileTag.OP_MARK):
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        return DataCache().get(self._profiler_path, (FileTag.OP_MARK, "dequeue_columns"),
+                               [self._file_list.get(FileTag.OP_MARK)], self._build_dequeue_columns, size_factor=1)
+
+    def preload_shared_data(self):
+        """
+        Load the OP_MARK data read by several parser tasks into DataCache of the current process.
+        Called before the parser tasks are forked, so they share the loaded data instead of decoding it each.
+        """
+        if not self._file_list.get(FileTag.OP_MARK):
+            return
+        self._get_matched_task_queue_data()
+        self.get_dequeue_columns()
+
+    def _build_dequeue_columns(self) -> tuple:
+        _, dequeue_data_list = self._get_matched_task_queue_data()
+        start_ns = np.array([dequeue_data.ts for dequeue_data in dequeue_data_list], dtype=np.int64)
+        end_ns = np.array([dequeue_data.ts + dequeue_data.dur for dequeue_data in dequeue_data_list], dtype=np.int64)
+        corr_ids = np.array([dequeue_data.corr_id for dequeue_data in dequeue_data_list], dtype=np.int64)
+        return start_ns, end_ns, corr_ids
+
+    def _get_matched_task_queue_data(self) -> tuple:
+        if not self._file_list.get(FileTag.OP_MARK):
+            return [], []
+        return DataCache().get(self._profiler_path, (FileTag.OP_MARK, "task_queue"),
+                               [self._file_list.get(FileTag.OP_MARK)], self._match_task_queue_data)
+
+    def _match_task_queue_data(self) -> tuple:
+        """
+        Match enqueue and dequeue start/end marks of OP_MARK in a single pass over the time sorted data.
+        Return copies of the matched end marks with ts and dur set, ordered by end time,
+        the beans of OP_MARK in DataCache are left unchanged.
+        """
         enqueue_data_list, dequeue_data_list = [], []
         op_mark_data = self.get_file_data_by_tag(FileTag.OP_MARK)
         if not op_mark_data:
-            return [], []
+            return enqueue_data_list, dequeue_data_list
         op_mark_data.sort(key=lambda x: x.time_ns)
-        enqueue_tid_op_dict = defaultdict(lambda: defaultdict(list))
-        dequeue_tid_op_dict = defaultdict(lambda: defaultdict(list))
+        start_op_dict = {}
         for op_mark in op_mark_data:
-            if op_mark.is_enqueue_start:
-                enqueue_tid_op_dict[op_mark.tid][op_mark.origin_name].append(op_mark)
+            is_enqueue = op_mark.is_enqueue
+            key = (is_enqueue, op_mark.tid, op_mark.origin_name)
+            if op_mark.is_enqueue_start or op_mark.is_dequeue_start:
+                start_op_dict.setdefault(key, []).append(op_mark)
                 continue
-            if op_mark.is_dequeue_start:
-                dequeue_tid_op_dict[op_mark.tid][op_mark.origin_name].append(op_mark)
+            start_op_list = start_op_dict.get(key)
+            if not start_op_list:
+                self.logger.warning("%s data match failed, the tid: %d, origin_name: %s is not exist.",
+                                    "Enqueue" if is_enqueue else "Dequeue", op_mark.tid, op_mark.origin_name)
                 continue
-            if op_mark.is_enqueue_end:
-                start_op_list = enqueue_tid_op_dict.get(op_mark.tid, {}).get(op_mark.origin_name, [])
-                if not start_op_list:
-                    self.logger.warning("Enquque data match failed, the tid: %d, origin_name: %s is not exist.", 
-                                    op_mark.tid, op_mark.origin_name)
-                    continue
-                start_op = start_op_list.pop()
-                op_mark.ts = start_op.time_ns
-                op_mark.dur = op_mark.time_ns - start_op.time_ns
+            start_op = start_op_list.pop()
+            op_mark = copy.copy(op_mark)
+            op_mark.ts = start_op.time_ns
+            op_mark.dur = op_mark.time_ns - start_op.time_ns
+            if is_enqueue:
                 enqueue_data_list.append(op_mark)
-                start_op_list.clear()
-                continue
-            if op_mark.is_dequeue_end:
-                start_op_list = dequeue_tid_op_dict.get(op_mark.tid, {}).get(op_mark.origin_name, [])
-                if not start_op_list:
-                    self.logger.warning("Dequque data match failed, the tid: %d, origin_name: %s is not exist.", 
-                                    op_mark.tid, op_mark.origin_name)
-                    continue
-                start_op = start_op_list.pop()
-                op_mark.ts = start_op.time_ns
-                op_mark.dur = op_mark.time_ns - start_op.time_ns
+            else:
                 dequeue_data_list.append(op_mark)
-                start_op_list.clear()
+            start_op_list.clear()
         return enqueue_data_list, dequeue_data_list
 
     def get_torch_op_tree_node(self, only_fwk: bool = False) -> list:
-        torch_op_list = self.get_file_data_by_tag(FileTag.TORCH_OP)
-        if not torch_op_list:
+        if not self._file_list.get(FileTag.TORCH_OP):
             self.logger.error("Get torch op tree node failed, the torch op data is empty.")
             return []
+        torch_op_iter = chain.from_iterable(self.iter_file_data_by_tag(FileTag.TORCH_OP))
         enqueue_data_list = []
         if not only_fwk:
             enqueue_data_list = self.get_enqueue_data()
-        result_data = TreeBuilder.build_tree(torch_op_list, enqueue_data_list)
+        result_data = TreeBuilder.build_tree(torch_op_iter, enqueue_data_list)
+        if len(result_data) <= 1:
+            self.logger.error("Get torch op tree node failed, the torch op data is empty.")
+            return []
         return result_data
 
     def get_fwk_trace_data(self):
-        torch_op_data = self.get_file_data_by_tag(FileTag.TORCH_OP)
-        if not torch_op_data:
+        fwk_x_event_list = []
+        tid_dict = {}
+        fwd_dict = {}
+        pid = None
+        for torch_op_chunk in self.iter_file_data_by_tag(FileTag.TORCH_OP):
+            if pid is None:
+                pid = torch_op_chunk[0].pid
+            for torch_op in torch_op_chunk:
+                self.filter_fwd_bwd_event(fwd_dict, torch_op)
+                tid_dict[torch_op.tid] = False
+                fwk_x_event_list.append(TraceEventManager.create_x_event(torch_op, "cpu_op"))
+        if pid is None:
             self.logger.error("Get fwk trace data failed, the torch op data is empty.")
             return []
         enqueue_data_list, dequeue_data_list = self.get_task_queue_data()
-        pid = torch_op_data[0].pid
-        tid_dict = {}
-        fwk_x_event_list = [None] * (
-                len(torch_op_data) + len(enqueue_data_list) * 2 + len(dequeue_data_list) * 2)
-        index = 0
-        fwd_dict = {}
-        for torch_op in torch_op_data:
-            self.filter_fwd_bwd_event(fwd_dict, torch_op)
-            tid_dict[torch_op.tid] = False
-            fwk_x_event_list[index] = TraceEventManager.create_x_event(torch_op, "cpu_op")
-            index += 1
         for enqueue_data in enqueue_data_list:
             tid_dict[enqueue_data.tid] = False
-            fwk_x_event_list[index] = TraceEventManager.create_x_event(enqueue_data, "enqueue")
-            index += 1
-            fwk_x_event_list[index] = TraceEventManager.create_task_queue_flow(Constant.FLOW_START_PH, enqueue_data)
-            index += 1
+            fwk_x_event_list.append(TraceEventManager.create_x_event(enqueue_data, "enqueue"))
+            fwk_x_event_list.append(TraceEventManager.create_task_queue_flow(Constant.FLOW_START_PH, enqueue_data))
         for dequeue_data in dequeue_data_list:
             tid_dict[dequeue_data.tid] = True
-            fwk_x_event_list[index] = TraceEventManager.create_x_event(dequeue_data, "dequeue")
-            index += 1
-            fwk_x_event_list[index] = TraceEventManager.create_task_queue_flow(Constant.FLOW_END_PH, dequeue_data)
-            index += 1
+            fwk_x_event_list.append(TraceEventManager.create_x_event(dequeue_data, "dequeue"))
+            fwk_x_event_list.append(TraceEventManager.create_task_queue_flow(Constant.FLOW_END_PH, dequeue_data))
         other_event_list = TraceEventManager.create_m_event(pid, tid_dict)
         other_event_list.extend(TraceEventManager.create_fwd_flow(fwd_dict))
         fwk_x_event_list.extend(other_event_list)
@@ -185,17 +237,17 @@ class FwkFileParser:
 
     def get_python_trace_data(self, torch_tids: set) -> list:
         trace_hash_data = self.get_file_data_by_tag(FileTag.PYTHON_TRACER_HASH)
-        func_call_data = self.get_file_data_by_tag(FileTag.PYTHON_TRACER_FUNC)
+        func_call_data = self.get_file_data_by_tag(FileTag.PYTHON_TRACER_FUNC, columnar=True)
         python_trace_parser = PythonTraceParser(torch_tids, trace_hash_data, func_call_data)
         return python_trace_parser.get_python_trace_data()
 
     @classmethod
     def filter_fwd_bwd_event(cls, fwd_dict: dict, torch_op: TorchOpBean):
-        seq_num = torch_op.args.get("Sequence number", -1)
+        seq_num = torch_op.sequence_number
         if seq_num < 0:
             return
         fwd_event = fwd_dict.get(seq_num, {})
-        mode = "start" if torch_op.args.get("Fwd thread id") == 0 else "end"
+        mode = "start" if torch_op.forward_thread_id == 0 else "end"
         if fwd_event.get(mode, {}).get("ts", -float('inf')) < torch_op.ts:
             node = {mode: {'pid': torch_op.pid, 'tid': torch_op.tid, 'ts': torch_op.ts}}
             fwd_dict.setdefault(seq_num, {}).update(node)
@@ -213,11 +265,11 @@ class FwkFileParser:
                     self._file_list.setdefault(file_tag, file_path)
 
     def filter_fwd_bwd_api(self, fwd_bwd_dict: dict, torch_op: TorchOpBean, torch_op_idx: int):
-        seq_num = torch_op.args.get("Sequence number", -1)
+        seq_num = torch_op.sequence_number
         if seq_num < 0:
             return
         fwd_event = fwd_bwd_dict.get(seq_num, {})
-        mode = "start" if torch_op.args.get("Fwd thread id") == 0 else "end"
+        mode = "start" if torch_op.forward_thread_id == 0 else "end"
         if fwd_event.get(mode, {}).get("ts", -float('inf')) < torch_op.ts:
             node = {mode: {'idx': torch_op_idx}}
             fwd_bwd_dict.setdefault(seq_num, {}).update(node)
@@ -234,19 +286,18 @@ class FwkFileParser:
                 start_connection_id += 1
 
     def get_fwk_api(self) -> dict:
-        torch_op_data = self.get_file_data_by_tag(FileTag.TORCH_OP)
-        if not torch_op_data:
-            return {}
-        pid = torch_op_data[0].pid
+        pid = None
         torch_op_apis = []
         fwd_bwd_dict = {}
         torch_op_idx = 0
         mstx_mark_apis = []
         torch_tids = set()
 
-        for torch_op in torch_op_data:
+        for torch_op in self.iter_file_beans_by_tag(FileTag.TORCH_OP):
+            if pid is None:
+                pid = torch_op.pid
             api = [torch_op.ts, torch_op.end_ns, contact_2num(pid, torch_op.tid), [], torch_op.name,
-                   torch_op.args.get(Constant.SEQUENCE_NUMBER, -1), torch_op.args.get(Constant.FORWARD_THREAD_ID),
+                   torch_op.sequence_number, torch_op.forward_thread_id,
                    torch_op.args.get(Constant.INPUT_DTYPES), torch_op.args.get(Constant.INPUT_SHAPES), torch_op.call_stack]
             if torch_op.name == "mstx_mark_op":
                 mstx_mark_apis.append(api)
@@ -255,6 +306,8 @@ class FwkFileParser:
                 self.filter_fwd_bwd_api(fwd_bwd_dict, torch_op, torch_op_idx)
                 torch_op_idx += 1
             torch_tids.add(torch_op.tid)
+        if pid is None:
+            return {}
 
         connection_ids = []
         task_enqueues = []
@@ -274,29 +327,27 @@ class FwkFileParser:
         self.update_fwd_bwd_connection_id(fwd_bwd_dict, torch_op_apis, start_connection_id)
 
         trace_hash_data = self.get_file_data_by_tag(FileTag.PYTHON_TRACER_HASH)
-        func_call_data = self.get_file_data_by_tag(FileTag.PYTHON_TRACER_FUNC)
+        func_call_data = self.get_file_data_by_tag(FileTag.PYTHON_TRACER_FUNC, columnar=True)
         python_trace_parser = PythonTraceParser(torch_tids, trace_hash_data, func_call_data)
         python_trace_apis = python_trace_parser.get_python_trace_api_data()
         return {"torch_op": torch_op_apis, "task_enqueues": task_enqueues, "task_dequeues": task_dequeues,
                 "python_trace": python_trace_apis, "mstx_op": mstx_mark_apis}
 
     def get_first_fwk_op(self):
-        torch_op_data = self.get_file_data_by_tag(FileTag.TORCH_OP)
-        if not torch_op_data:
-            return None
-        return min(torch_op_data, key=lambda op: op.ts)
+        return min(self.iter_file_beans_by_tag(FileTag.TORCH_OP), key=lambda op: op.ts, default=None)
 
     def get_torch_op_tids(self):
-        torch_op_data = self.get_file_data_by_tag(FileTag.TORCH_OP)
-        if not torch_op_data:
-            return set()
-        return {op.tid for op in torch_op_data}
+        return {op.tid for op in self.iter_file_beans_by_tag(FileTag.TORCH_OP)}
 
     def get_gc_record_db_data(self):
-        gc_events = self.get_file_data_by_tag(FileTag.GC_RECORD)
+        gc_events = self.get_file_data_by_tag(FileTag.GC_RECORD, columnar=True)
         if not gc_events:
             return []
-        return [[event.ts, event.ts + event.dur, contact_2num(event.pid, event.tid)] for event in gc_events]
+        start_ns = ProfilerConfig().get_local_time_array(gc_events.column("strat_ns"))
+        end_ns = ProfilerConfig().get_local_time_array(gc_events.column("end_ns"))
+        pids = gc_events.column("pid").tolist()
+        return [[start, end, contact_2num(pid, pid)]
+                for start, end, pid in zip(start_ns.tolist(), end_ns.tolist(), pids)]
 
     def get_gc_record_trace_data(self):
         gc_events = self.get_file_data_by_tag(FileTag.GC_RECORD)
@@ -306,7 +357,9 @@ class FwkFileParser:
         device_id = ProfilerPathManager.get_device_id(cann_path)
         event_list = [None] * len(gc_events)
         for idx, event in enumerate(gc_events):
-            event.pid = TraceEventManager.get_pid_format(event.pid, TraceEventManager.GC_SORT_INDEX, device_id)
+            # the beans are shared through DataCache, format the pid of the trace event instead of the bean
             event_list[idx] = TraceEventManager.create_x_event(event, "GC")
-        event_list.extend(TraceEventManager.create_gc_m_event(gc_events[0].pid, gc_events[0].tid))
+            event_list[idx]["pid"] = TraceEventManager.get_pid_format(
+                event.pid, TraceEventManager.GC_SORT_INDEX, device_id)
+        event_list.extend(TraceEventManager.create_gc_m_event(event_list[0]["pid"], gc_events[0].tid))
         return event_list
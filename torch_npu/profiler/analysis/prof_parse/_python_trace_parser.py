@@ -1,5 +1,9 @@
 from collections import defaultdict
 from enum import Enum
+
+import numpy as np
+
+from ..prof_common_func._binary_decoder import ColumnarRecords
 from ..prof_common_func._constant import contact_2num
 from ..prof_common_func._trace_event_manager import TraceEventManager
 
@@ -154,12 +158,24 @@ class PythonTraceParser:
         return self._gen_python_trace_event_data()
 
     def _group_tarce_data_by_tid(self):
+        if isinstance(self._python_call_data, ColumnarRecords):
+            return self._group_columnar_data_by_tid()
         trace_data_by_tid = defaultdict(lambda: [])
         for call_bean in self._python_call_data:
             if call_bean.tid in self._torch_tids:
                 trace_data_by_tid[call_bean.tid].append(call_bean)
         return trace_data_by_tid
 
+    def _group_columnar_data_by_tid(self):
+        trace_data_by_tid = defaultdict(lambda: [])
+        if not self._torch_tids:
+            return trace_data_by_tid
+        tids = self._python_call_data.column("thread_id")
+        records = self._python_call_data.select(np.isin(tids, np.array(list(self._torch_tids), dtype=tids.dtype)))
+        for call_bean in records:
+            trace_data_by_tid[call_bean.tid].append(call_bean)
+        return trace_data_by_tid
+
     def _gen_python_trace_event_data(self):
         self._gen_hash_map()
         trace_event_by_tid = self._group_tarce_data_by_tid()
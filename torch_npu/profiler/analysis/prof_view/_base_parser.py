@@ -13,12 +13,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 from abc import ABC
 
+from ..prof_common_func._columnar_manager import ColumnarManager
 from ..prof_common_func._constant import Constant
+from ..prof_common_func._file_manager import FileManager
 from ..prof_common_func._path_manager import ProfilerPathManager
 from ..prof_common_func._task_manager import ConcurrentMode, ConcurrentTask
 from ..prof_config._parser_deps_config import ParserDepsConfig
+from .._profiler_config import ProfilerConfig
 
 __all__ = []
 
@@ -41,3 +45,10 @@ class BaseParser(ConcurrentTask, ABC):
         mode = config.get(Constant.MODE, ConcurrentMode.SUB_PROCESS)
         deps_parser = config.get(Constant.DEPS, [])
         return deps_parser, mode
+
+    def create_table_file(self, data: list, file_name: str, headers: list) -> None:
+        """Write a tabular view as csv for the text export type and as a columnar table for the columnar one."""
+        if Constant.Text in ProfilerConfig().export_type:
+            FileManager.create_csv_file(self._output_path, data, file_name, headers)
+        if Constant.Columnar in ProfilerConfig().export_type:
+            ColumnarManager.create_columnar_file(self._output_path, data, os.path.splitext(file_name)[0], headers)
@@ -0,0 +1,113 @@
+import os
+
+from ..prof_common_func._constant import Constant
+from ..prof_common_func._file_manager import FileManager
+from ..prof_common_func._log import ProfilerLogger
+from ..prof_common_func._path_manager import ProfilerPathManager
+from ._communication_parser import CommunicationParser
+from ._trace_step_time_parser import TraceStepTimeParser
+
+__all__ = []
+
+
+class ClusterViewParser:
+    """
+    Cross-rank views of a cluster analysis, generated from the per-rank views once every rank is parsed:
+    cluster_communication_matrix.json merges the communication_matrix.json of all the ranks,
+    cluster_step_trace_time.csv lists the step_trace_time.csv rows of every rank, and step_time_skew.csv
+    gives the spread of every step time metric over the ranks with the fastest and the slowest one.
+    """
+    CLUSTER_COMMUNICATION_MATRIX = "cluster_communication_matrix.json"
+    CLUSTER_STEP_TRACE = "cluster_step_trace_time.csv"
+    STEP_TIME_SKEW = "step_time_skew.csv"
+    STEP_TIME_SKEW_HEADERS = ["Step", "Metric", "Min(us)", "Min Rank", "Max(us)", "Max Rank", "Mean(us)",
+                              "Skew(us)"]
+
+    def __init__(self, profiler_path_list: list, output_path: str):
+        self._profiler_path_list = profiler_path_list
+        self._output_path = output_path
+        ProfilerLogger.init(self._output_path, "ClusterViewParser")
+        self.logger = ProfilerLogger.get_instance()
+
+    @classmethod
+    def get_rank_id(cls, profiler_path: str) -> int:
+        info_file_path = ProfilerPathManager.get_info_file_path(profiler_path)
+        if not info_file_path:
+            return -1
+        rank_id = FileManager.read_json_file(info_file_path).get(Constant.RANK_ID, -1)
+        return int(rank_id) if str(rank_id).lstrip("-").isdigit() else -1
+
+    def generate_view(self) -> None:
+        rank_paths = []
+        for index, profiler_path in enumerate(sorted(self._profiler_path_list)):
+            rank_id = self.get_rank_id(profiler_path)
+            rank_paths.append((rank_id if rank_id >= 0 else index, os.path.join(profiler_path, Constant.OUTPUT_DIR)))
+        rank_paths.sort(key=lambda item: item[0])
+        try:
+            self.generate_communication_matrix(rank_paths)
+        except Exception as e:
+            self.logger.error("Failed to generate %s, error: %s", self.CLUSTER_COMMUNICATION_MATRIX, str(e),
+                              exc_info=True)
+        try:
+            self.generate_step_time_skew(rank_paths)
+        except Exception as e:
+            self.logger.error("Failed to generate %s, error: %s", self.STEP_TIME_SKEW, str(e), exc_info=True)
+
+    def generate_communication_matrix(self, rank_paths: list) -> None:
+        """Merge the links of all the ranks by step, communication type and op. A link is reported by both of
+        its endpoint ranks, it is counted once with the data of its source rank, or else of the first rank
+        reporting it."""
+        cluster_matrix = {}
+        source_links = set()
+        for rank_id, output_path in rank_paths:
+            matrix_data = FileManager.read_json_file(
+                os.path.join(output_path, CommunicationParser.COMMUNICATION_MATRIX))
+            for step, comm_type_dict in matrix_data.items():
+                for comm_type, comm_ops in comm_type_dict.items():
+                    for op_name, link_dict in comm_ops.items():
+                        merged_links = cluster_matrix.setdefault(step, {}).setdefault(comm_type, {}).setdefault(
+                            op_name, {})
+                        for link, link_info in link_dict.items():
+                            link_key = (step, comm_type, op_name, link)
+                            if link_key in source_links:
+                                continue
+                            if self._get_source_rank(link) == rank_id:
+                                source_links.add(link_key)
+                                merged_links[link] = dict(link_info)
+                            elif link not in merged_links:
+                                merged_links[link] = dict(link_info)
+        if cluster_matrix:
+            FileManager.create_json_file(self._output_path, cluster_matrix, self.CLUSTER_COMMUNICATION_MATRIX)
+
+    def generate_step_time_skew(self, rank_paths: list) -> None:
+        metrics = TraceStepTimeParser.title[1:]
+        step_rows = []
+        step_values = {}
+        for rank_id, output_path in rank_paths:
+            rows = FileManager.read_csv_file(os.path.join(output_path, TraceStepTimeParser.STEP_TRACE), dict)
+            for row in rows:
+                step = row.get("Step", "")
+                step_rows.append([rank_id, step] + [row.get(metric, "") for metric in metrics])
+                for metric in metrics:
+                    try:
+                        value = float(row.get(metric))
+                    except (TypeError, ValueError):
+                        continue
+                    step_values.setdefault((step, metric), []).append((value, rank_id))
+        if not step_rows:
+            return
+        FileManager.create_csv_file(self._output_path, step_rows, self.CLUSTER_STEP_TRACE,
+                                    ["Rank"] + TraceStepTimeParser.title)
+        skew_rows = []
+        for (step, metric), values in step_values.items():
+            min_value, min_rank = min(values)
+            max_value, max_rank = max(values)
+            mean_value = sum(value for value, _ in values) / len(values)
+            skew_rows.append([step, metric, min_value, min_rank, max_value, max_rank, round(mean_value, 3),
+                              round(max_value - min_value, 3)])
+        FileManager.create_csv_file(self._output_path, skew_rows, self.STEP_TIME_SKEW, self.STEP_TIME_SKEW_HEADERS)
+
+    @classmethod
+    def _get_source_rank(cls, link: str) -> int:
+        source_rank = link.split("-", 1)[0]
+        return int(source_rank) if source_rank.isdigit() else -1
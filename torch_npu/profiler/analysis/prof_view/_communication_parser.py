@@ -3,13 +3,16 @@ from collections import defaultdict
 
 from ._base_parser import BaseParser
 from ..prof_bean._torch_op_node import TorchOpNode
+from ..prof_common_func._columnar_manager import ColumnarManager
 from ..prof_common_func._constant import Constant, print_warn_msg
 from ..prof_common_func._file_manager import FileManager
 from ..prof_parse._cann_file_parser import CANNFileParser
 from ..prof_parse._cann_file_parser import CANNDataEnum
 from ..prof_common_func._constant import convert_us2ns
 from ..prof_common_func._log import ProfilerLogger
+from ..prof_common_func._step_range_index import StepRangeIndex
 from ..prof_parse._fwk_cann_relation_parser import FwkCANNRelationParser
+from .._profiler_config import ProfilerConfig
 
 __all__ = []
 
@@ -37,6 +40,10 @@ class CommunicationParser(BaseParser):
     BANDWIDTH_GB_S = "Bandwidth(GB/s)"
     COMMUNICATION = "communication.json"
     COMMUNICATION_MATRIX = "communication_matrix.json"
+    COMMUNICATION_TABLE = "communication"
+    COMMUNICATION_BANDWIDTH_TABLE = "communication_bandwidth"
+    COMMUNICATION_MATRIX_TABLE = "communication_matrix"
+    OP_NAME = "Op Name"
     P2P = "p2p"
     COLLECTIVE = "collective"
     TRANSPORT_TYPE = "Transport Type"
@@ -85,7 +92,10 @@ class CommunicationParser(BaseParser):
         for step_info in self.step_list:
             step = "step" + step_info.get("step_id") if step_info.get("step_id") else "step"
             output_communication[step] = self.get_communication_ops_dict(step_info.get("comm_ops"))
-        FileManager.create_json_file(output_path, output_communication, self.COMMUNICATION)
+        if Constant.Text in ProfilerConfig().export_type:
+            FileManager.create_json_file(output_path, output_communication, self.COMMUNICATION)
+        if Constant.Columnar in ProfilerConfig().export_type:
+            self.generate_communication_table(output_path, output_communication)
 
     def generate_matrix(self, output_path: str):
         matrix_data = CANNFileParser(self._profiler_path).get_analyze_communication_data(CANNDataEnum.MATRIX)
@@ -95,18 +105,61 @@ class CommunicationParser(BaseParser):
         output_matrix_data = {}
         for step, comm_matrix_data in matrix_data_by_step.items():
             output_matrix_data[step] = self.get_matrix_ops_dict(comm_matrix_data)
-        FileManager.create_json_file(output_path, output_matrix_data, self.COMMUNICATION_MATRIX)
+        if Constant.Text in ProfilerConfig().export_type:
+            FileManager.create_json_file(output_path, output_matrix_data, self.COMMUNICATION_MATRIX)
+        if Constant.Columnar in ProfilerConfig().export_type:
+            self.generate_matrix_table(output_path, output_matrix_data)
+
+    def generate_communication_table(self, output_path: str, output_communication: dict):
+        time_rows, bandwidth_rows = [], []
+        for step, comm_op_dict in output_communication.items():
+            for comm_type, comm_ops in comm_op_dict.items():
+                for op_name, op_info in comm_ops.items():
+                    time_rows.append(([step, comm_type, op_name], op_info.get(self.COMMUNICATION_TIME_INFO, {})))
+                    for transport_type, bandwidth_info in op_info.get(self.COMMUNICATION_BANDWIDTH_INFO, {}).items():
+                        bandwidth_rows.append(([step, comm_type, op_name, transport_type], bandwidth_info))
+        self._create_columnar_table(output_path, time_rows, ["Step", "Type", self.OP_NAME], self.COMMUNICATION_TABLE)
+        self._create_columnar_table(output_path, bandwidth_rows, ["Step", "Type", self.OP_NAME, self.TRANSPORT_TYPE],
+                                    self.COMMUNICATION_BANDWIDTH_TABLE)
+
+    def generate_matrix_table(self, output_path: str, output_matrix_data: dict):
+        link_rows = []
+        for step, comm_op_dict in output_matrix_data.items():
+            for comm_type, comm_ops in comm_op_dict.items():
+                for op_name, link_dict in comm_ops.items():
+                    for link, link_info in link_dict.items():
+                        # the op a top/middle/bottom link was taken from
+                        link_info = {"Source Op Name" if key == self.OP_NAME else key: value
+                                     for key, value in link_info.items()}
+                        link_rows.append(([step, comm_type, op_name, link], link_info))
+        self._create_columnar_table(output_path, link_rows, ["Step", "Type", self.OP_NAME, "Link"],
+                                    self.COMMUNICATION_MATRIX_TABLE)
+
+    @classmethod
+    def _create_columnar_table(cls, output_path: str, rows: list, key_headers: list, table_name: str):
+        """rows: (key values, info dict) pairs, the scalar info fields become columns and nested ones are dropped"""
+        value_headers = []
+        for _, info in rows:
+            for key, value in info.items():
+                if key not in value_headers and not isinstance(value, dict):
+                    value_headers.append(key)
+        data = [keys + [info.get(header) for header in value_headers] for keys, info in rows]
+        ColumnarManager.create_columnar_file(output_path, data, table_name, key_headers + value_headers)
 
     def split_comm_op_by_step(self, communication_data: dict):
         if len(self.step_list) == 1:
             self.step_list[0]["comm_ops"] = communication_data
-        for communication_op, communication_op_info in communication_data.items():
-            start_time = communication_op_info.get(self.COMMUNICATION_TIME_INFO, {}).get(self.START_TIMESTAMP)
-            start_time = convert_us2ns(start_time)
-            for step_info in self.step_list:
-                if step_info.get("start_ts", -1) <= start_time <= step_info.get("end_ts", -1):
-                    step_info.get("comm_ops", {})[communication_op] = communication_op_info
-                    break
+            return
+        op_names = list(communication_data.keys())
+        start_times = [convert_us2ns(communication_data[communication_op].get(self.COMMUNICATION_TIME_INFO, {}).get(
+            self.START_TIMESTAMP)) for communication_op in op_names]
+        index = StepRangeIndex([(step_index, step_info.get("start_ts", -1), step_info.get("end_ts", -1))
+                                for step_index, step_info in enumerate(self.step_list)], inclusive_end=True)
+        for communication_op, position in zip(op_names, index.get_positions(start_times).tolist()):
+            if position == StepRangeIndex.NO_STEP:
+                continue
+            step_info = self.step_list[index.step_ids[position]]
+            step_info.get("comm_ops", {})[communication_op] = communication_data[communication_op]
 
     def split_communication_p2p_ops(self, op_data: dict):
         comm_op_dict = {self.P2P: {}, self.COLLECTIVE: {}}
@@ -145,12 +198,14 @@ class CommunicationParser(BaseParser):
             matrix_data_by_step["step"] = matrix_data
             return matrix_data_by_step
 
+        op_steps = {}
+        for step_info in self.step_list:
+            step = "step" + step_info.get("step_id") if step_info.get("step_id") else "step"
+            for comm_op in step_info.get("comm_ops", {}):
+                op_steps.setdefault(comm_op, step)
         for comm_op in matrix_data:
-            for step_info in self.step_list:
-                if comm_op in step_info.get("comm_ops", {}):
-                    step = "step" + step_info.get("step_id") if step_info.get("step_id") else "step"
-                    matrix_data_by_step.setdefault(step, {})[comm_op] = matrix_data.get(comm_op)
-                    break
+            if comm_op in op_steps:
+                matrix_data_by_step.setdefault(op_steps[comm_op], {})[comm_op] = matrix_data.get(comm_op)
         return matrix_data_by_step
 
     def get_communication_ops_dict(self, op_data: dict) -> dict:
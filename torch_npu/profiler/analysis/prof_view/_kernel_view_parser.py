@@ -1,8 +1,9 @@
 from ._base_parser import BaseParser
-from ..prof_common_func._constant import Constant, convert_ns2us_str
+from ..prof_common_func._constant import Constant, convert_us2ns
 from ..prof_common_func._csv_headers import CsvHeaders
 from ..prof_common_func._file_manager import FileManager
 from ..prof_common_func._log import ProfilerLogger
+from ..prof_common_func._step_range_index import StepRangeIndex
 from ..prof_bean._op_summary_bean import OpSummaryBean
 from ..prof_parse._cann_file_parser import CANNFileParser, CANNDataEnum
 from ..prof_parse._fwk_cann_relation_parser import FwkCANNRelationParser
@@ -17,6 +18,7 @@ class KernelViewParser(BaseParser):
     def __init__(self, name: str, param_dict: dict):
         super().__init__(name, param_dict)
         self.step_range = []
+        self._step_index = None
         ProfilerLogger.init(self._profiler_path, "KernelViewParser")
         self.logger = ProfilerLogger.get_instance()
 
@@ -34,6 +36,14 @@ class KernelViewParser(BaseParser):
                 output_headers.append(header)
         return output_headers
 
+    @staticmethod
+    def _get_ts_ns(ts: str) -> int:
+        try:
+            return convert_us2ns(ts)
+        except (ValueError, RuntimeError):
+            # a kernel without a valid start time is out of every step
+            return -1
+
     def run(self, deps_data: dict):
         try:
             ProfilerConfig().load_info(self._profiler_path)
@@ -57,16 +67,11 @@ class KernelViewParser(BaseParser):
             if not self.step_range:
                 summary_data.extend([data.row for data in all_data])
                 continue
-            for data in all_data:
-                step_id = None
-                for step_data in self.step_range:
-                    if step_data.get(Constant.START_TS) <= data.ts <= step_data.get(Constant.END_TS):
-                        step_id = step_data.get(Constant.STEP_ID)
-                        break
-                summary_data.append([step_id] + data.row)
+            step_ids = self._step_index.get_step_ids([self._get_ts_ns(data.ts) for data in all_data])
+            summary_data.extend([step_id] + data.row for step_id, data in zip(step_ids, all_data))
 
         headers = ["Step Id"] + output_headers if self.step_range else output_headers
-        FileManager.create_csv_file(self._output_path, summary_data, self.KERNEL_VIEW, headers)
+        self.create_table_file(summary_data, self.KERNEL_VIEW, headers)
 
     def _init_step_range(self, deps_data: dict):
         torch_op_node = deps_data.get(Constant.TREE_BUILD_PARSER, [])
@@ -78,9 +83,6 @@ class KernelViewParser(BaseParser):
             step_range = FwkCANNRelationParser(self._profiler_path).get_step_range(torch_op_node[0], kernel_dict)
             if not step_range:
                 self.logger.error("Kernel view get step range failed, the step range is empty.")
-            for step_data in step_range:
-                step_id = step_data.get(Constant.STEP_ID)
-                step_start = convert_ns2us_str(step_data.get(Constant.START_TS, 0))
-                step_end = convert_ns2us_str(step_data.get(Constant.END_TS, 0))
-                self.step_range.append(
-                    {Constant.STEP_ID: step_id, Constant.START_TS: step_start, Constant.END_TS: step_end})
+            self.step_range = [(step_data.get(Constant.STEP_ID), step_data.get(Constant.START_TS, 0),
+                                step_data.get(Constant.END_TS, 0)) for step_data in step_range]
+            self._step_index = StepRangeIndex(self.step_range, inclusive_end=True)
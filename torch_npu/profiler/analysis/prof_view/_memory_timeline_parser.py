@@ -589,6 +589,8 @@ class MemoryProfile:
         self._data_flow_graph = DataFlowGraph(self._root_nodes)
         self._storage_size_dict = StorageSizeDict(self._event_tree.sorted_events)
         self._categories = CategoryDict()
+        self._timeline = None
+        self._memory_history = None
 
         self._set_gradients_and_temporaries()
         self._set_parameters_using_python_tracer()
@@ -603,7 +605,13 @@ class MemoryProfile:
         """
         Return memory timeline. The memory timeline records [timestamp,
         action, (key, version), size] for each allocation or free event.
+        It is built on the first read and cached, the categories are final once the profile is constructed.
         """
+        if self._timeline is None:
+            self._timeline = self._build_timeline()
+        return self._timeline
+
+    def _build_timeline(self) -> Tuple[Tuple[int, Action, DeviceKeyAndVersion, int], ...]:
         output: List[Tuple[int, Action, DeviceKeyAndVersion, int]] = []
         allocation_times: Dict[Tuple[TensorKey, bool], int] = {}
         live_unknown: Dict[Tuple[int, int, int], bool] = {}
@@ -669,6 +677,8 @@ class MemoryProfile:
         """
         Get memory usage history, to output the memory usage peak.
         """
+        if self._memory_history is not None:
+            return self._memory_history
         result: List[Tuple[DeviceKey, int, int, int]] = []
         for event in traverse_dfs(self._root_nodes):
             if event.tag == _EventType.Allocation:
@@ -677,6 +687,7 @@ class MemoryProfile:
                                      event.extra_fields.total_active,
                                      event.extra_fields.total_allocated,
                                      event.extra_fields.total_reserved)))
+        self._memory_history = result
         return result
 
     def _is_gradient(self, *args, **kwargs) -> bool:
@@ -875,6 +886,7 @@ class MemoryProfileTimeline:
         self.timeline = memory_profile.timeline
         self.categories = memory_profile._categories
         self.memory_history = memory_profile.memory_history
+        self._device_events = None
     
     @staticmethod
     def _parse_device_info(device_str: str) -> Optional[DeviceKey]:
@@ -899,63 +911,79 @@ class MemoryProfileTimeline:
         except ValueError:
             return None
 
-    def _update_sizes_by_category(self, sizes_by_category, key, version, delta):
-        category = self.categories.get(key, version) if isinstance(key, TensorKey) else None
-        category_index = _CATEGORY_TO_INDEX[category] + 1
-        sizes_by_category[-1][category_index] += int(delta)
-
     def _get_category_index(self, key, version) -> int:
         category = self.categories.get(key, version) if isinstance(key, TensorKey) else None
         return _CATEGORY_TO_INDEX[category]
-    
-    def _construct_timeline(self, device_str: str) -> Tuple[List[int], List[List[int]]]:
+
+    def _get_device_events(self, device: DeviceKey) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the memory events of device as arrays of (timestamp ns, action index, category index, delta bytes),
+        in timeline order. An increment version is split into the release of the old version and the creation
+        of the new one. The events of all the devices are extracted in one pass of the timeline and cached.
+        """
+        if self._device_events is None:
+            events_by_device = defaultdict(list)
+            for ts, action, (key, version), numbytes in self.timeline:
+                events = events_by_device[(key.device_type, key.device_index)]
+                action_index = _ACTION_TO_INDEX[action]
+                if action in (Action.PREEXISTING, Action.CREATE):
+                    events.append((ts, action_index, self._get_category_index(key, version), numbytes))
+                elif action == Action.INCREMENT_VERSION:
+                    events.append((ts, action_index, self._get_category_index(key, version), -numbytes))
+                    events.append((ts, action_index, self._get_category_index(key, version + 1), numbytes))
+                elif action == Action.DESTROY:
+                    events.append((ts, action_index, self._get_category_index(key, version), -numbytes))
+            self._device_events = {}
+            for device_key, events in events_by_device.items():
+                columns = np.array(events, dtype=np.int64).reshape(-1, 4)
+                self._device_events[device_key] = tuple(np.ascontiguousarray(columns[:, i]) for i in range(4))
+        empty = np.empty(0, dtype=np.int64)
+        return self._device_events.get((device.device_type, device.device_index), (empty, empty, empty, empty))
+
+    @staticmethod
+    def _downsample(timestamps: np.ndarray, sizes: np.ndarray, bucket_us: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Keep one sample per bucket_us of time, the one with the highest total usage so peaks are kept."""
+        buckets = (timestamps - timestamps[0]) // bucket_us
+        order = np.lexsort((sizes.sum(axis=1), buckets))
+        sorted_buckets = buckets[order]
+        keep = order[np.append(sorted_buckets[1:] != sorted_buckets[:-1], True)]
+        return timestamps[keep], sizes[keep]
+
+    def _construct_timeline(self, device_str: str, bucket_us: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
         For each timestamp in the `timesstamps`, compute the storage size for each category
         and store the results in the `sizes`. The `sizes_by_category` will have the same
         length as the `timestamps`, with each entry corresponding to a timestamp in timestamps.
+        The deltas are summed by (timestamp, category) and accumulated over the timestamps, the first
+        column is always 0 so that the cumulative sum over the categories gives the stacked plot.
+        With bucket_us, at most one timestamp is kept per bucket_us microseconds.
         """
-        timestamps: List[int] = []
-        sizes_by_category: List[List[int]] = []
-
+        empty = np.empty(0, dtype=np.int64), np.empty((0, len(_CATEGORY_TO_INDEX) + 1), dtype=np.int64)
         device = self._parse_device_info(device_str)
         if device is None:
-            return timestamps, sizes_by_category
-
-        ts_min = -1
-        for ts, action, (key, version), numbytes in self.timeline:
-            if key.device_type != device.device_type or key.device_index != device.device_index:
-                continue
-
-            # Convert timestamps from ns to us.
-            if ts != -1:
-                ts = int(ts / Constant.NS_TO_US)
-            
-            # Save the smallest timestamp as the timestemp of pre-existing allocations.
-            if ts_min == -1 or (ts < ts_min and ts > 0):
-                ts_min = ts
-            
-            # Initialize the memory usage of the first timestamp.
-            if len(timestamps) == 0:
-                timestamps.append(ts)
-                sizes_by_category.append([0 for _ in _CATEGORY_TO_INDEX] + [0])
-            # Copy the memory usage of the last timestamp if the current timestamp
-            # is later than the last timestamp.
-            elif ts != timestamps[-1]:
-                timestamps.append(ts)
-                sizes_by_category.append(sizes_by_category[-1].copy())
-
-            # For this timestamp, calculate storage size of each category according to action.
-            if action in (Action.PREEXISTING, Action.CREATE):
-                self._update_sizes_by_category(sizes_by_category, key, version, numbytes)
-            elif action == Action.INCREMENT_VERSION:
-                self._update_sizes_by_category(sizes_by_category, key, version, -numbytes)
-                self._update_sizes_by_category(sizes_by_category, key, version + 1, numbytes)
-            elif action == Action.DESTROY:
-                self._update_sizes_by_category(sizes_by_category, key, version, -numbytes)
-
-        timestamps = [ts_min if t < 0 else t for t in timestamps]
+            return empty
+
+        ts_ns, _, category_indexes, deltas = self._get_device_events(device)
+        if ts_ns.size == 0:
+            return empty
+
+        # Convert timestamps from ns to us, the pre-existing allocations keep -1.
+        ts_us = np.where(ts_ns == -1, -1, ts_ns // Constant.NS_TO_US)
+        timestamps, ts_indexes = np.unique(ts_us, return_inverse=True)
+        category_num = len(_CATEGORY_TO_INDEX) + 1
+        flat_indexes = ts_indexes * category_num + category_indexes + 1
+        deltas_by_category = np.bincount(flat_indexes, weights=deltas, minlength=timestamps.size * category_num)
+        sizes_by_category = np.cumsum(
+            np.rint(deltas_by_category).astype(np.int64).reshape(timestamps.size, category_num), axis=0)
+
+        # The pre-existing allocations take the smallest timestamp.
+        valid_timestamps = timestamps[timestamps != -1]
+        ts_min = valid_timestamps[0] if valid_timestamps.size else -1
+        timestamps = np.where(timestamps == -1, ts_min, timestamps)
+        if bucket_us and bucket_us > 0:
+            timestamps, sizes_by_category = self._downsample(timestamps, sizes_by_category, bucket_us)
         return timestamps, sizes_by_category
-    
+
     @staticmethod
     def _draw_memory_timeline(timestamps: List[int], stacked: List[List[int]], 
                              max_memory_allocated: int, max_memory_reserved: int) -> Optional[str]:
@@ -994,23 +1022,24 @@ class MemoryProfileTimeline:
 </html>"""
         return html
 
-    def export_memory_timeline_json(self, output_path: str, device_str: str) -> None:
+    def export_memory_timeline_json(self, output_path: str, device_str: str, bucket_us: Optional[int] = None) -> None:
         """
         Saves `times` and `sizes` as a json file. `times` is a list of timestamp
         sorted in ascending order. For each timestamp, there is the memory usage
         of each category in `sizes` list at the time of the current timestamp.
         """
         # Get memory timeline data in specified device.
-        timestamps, sizes_by_category = self._construct_timeline(device_str)
-        if not timestamps:
+        timestamps, sizes_by_category = self._construct_timeline(device_str, bucket_us)
+        if timestamps.size == 0:
             print_error_msg("No memory timeline data.")
             return
         
         realpath = ProfilerPathManager.get_realpath(output_path)
+        timeline_data = [timestamps.tolist(), sizes_by_category.tolist()]
         if output_path.endswith(".gz"):
-            FileManager.create_json_gz_file_by_path(realpath, [timestamps, sizes_by_category])
+            FileManager.create_json_gz_file_by_path(realpath, timeline_data)
         else:
-            FileManager.create_json_file_by_path(realpath, [timestamps, sizes_by_category])
+            FileManager.create_json_file_by_path(realpath, timeline_data)
     
     def export_memory_timeline_json_raw(self, output_path: str, device_str: str) -> None:
         """
@@ -1021,18 +1050,8 @@ class MemoryProfileTimeline:
         if device is None:
             return
         
-        raw_events: List[Tuple[int, int, int, int]] = []
-        for ts, action, (key, version), numbytes in self.timeline:
-            if key.device_type != device.device_type or key.device_index != device.device_index:
-                continue
-
-            if action in (Action.PREEXISTING, Action.CREATE):
-                raw_events.append((ts, _ACTION_TO_INDEX[action], numbytes, self._get_category_index(key, version)))
-            elif action == Action.INCREMENT_VERSION:
-                raw_events.append((ts, _ACTION_TO_INDEX[action], -numbytes, self._get_category_index(key, version)))
-                raw_events.append((ts, _ACTION_TO_INDEX[action], numbytes, self._get_category_index(key, version + 1)))
-            elif action == Action.DESTROY:
-                raw_events.append((ts, _ACTION_TO_INDEX[action], -numbytes, self._get_category_index(key, version)))
+        ts_ns, action_indexes, category_indexes, deltas = self._get_device_events(device)
+        raw_events = list(zip(ts_ns.tolist(), action_indexes.tolist(), deltas.tolist(), category_indexes.tolist()))
         
         if not raw_events:
             print_error_msg("No memory timeline data.")
@@ -1041,20 +1060,17 @@ class MemoryProfileTimeline:
         realpath = ProfilerPathManager.get_realpath(output_path)
         FileManager.create_json_gz_file_by_path(realpath, raw_events)
 
-    def export_memory_timeline_html(self, output_path: str, device_str: str) -> None:
+    def export_memory_timeline_html(self, output_path: str, device_str: str, bucket_us: Optional[int] = None) -> None:
         """
         Stores the memory timeline plot as PNG format in an HTML file.
         """
         # Get memory timeline data.
-        timestamps, sizes_by_category = self._construct_timeline(device_str)
-        if not timestamps:
+        timestamps, sizes_by_category = self._construct_timeline(device_str, bucket_us)
+        if timestamps.size == 0:
             print_error_msg("No memory timeline data.")
             return
         
-        timestamps = np.array(timestamps)
-        sizes_by_category = np.array(sizes_by_category)
-        
-        ts_min = min(timestamps)
+        ts_min = timestamps.min()
         timestamps -= ts_min                                                # For this timeline, start at 0.
         stacked = np.cumsum(sizes_by_category, axis=1) / Constant.B_TO_GB   # Convert from B to GB.
         
@@ -1075,6 +1091,7 @@ class MemoryTimelineParser(BaseParser):
     def __init__(self, name: str, param_dict: dict):
         super().__init__(name, param_dict)
         self._device = self._param_dict.get("device")
+        self._bucket_us = self._param_dict.get("bucket_us")
         ProfilerLogger.init(self._profiler_path, "MemoryTimelineParser")
         self.logger = ProfilerLogger.get_instance()
 
@@ -1085,11 +1102,11 @@ class MemoryTimelineParser(BaseParser):
             # Depending on the file suffix, save the data as html, json or raw.json.gz.
             mem_timeline = MemoryProfileTimeline(mem_profile)
             if self._output_path.endswith(".html"):
-                mem_timeline.export_memory_timeline_html(self._output_path, self._device)
+                mem_timeline.export_memory_timeline_html(self._output_path, self._device, self._bucket_us)
             elif self._output_path.endswith("raw.json.gz"):
                 mem_timeline.export_memory_timeline_json_raw(self._output_path, self._device)
             else:
-                mem_timeline.export_memory_timeline_json(self._output_path, self._device)
+                mem_timeline.export_memory_timeline_json(self._output_path, self._device, self._bucket_us)
         except Exception as e:
             self.logger.error("Failed to generate %s, error: %s", self._output_path, str(e), exc_info=True)
             return Constant.FAIL, None
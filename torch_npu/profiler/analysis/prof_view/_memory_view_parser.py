@@ -81,9 +81,8 @@ class MemoryViewParser(BaseParser):
         self._init_pta_data()
         self._add_memory_from_cann()
         self._add_pta_ge_record_data()
-        FileManager.create_csv_file(self._output_path, self.memory_data, self.OPERATOR_MEMORY, self.HEADERS_OPERATOR)
-        FileManager.create_csv_file(self._output_path, self.size_record_list + self.component_list, self.MEMORY_RECORD,
-                                    self.HEADERS_RECORD)
+        self.create_table_file(self.memory_data, self.OPERATOR_MEMORY, self.HEADERS_OPERATOR)
+        self.create_table_file(self.size_record_list + self.component_list, self.MEMORY_RECORD, self.HEADERS_RECORD)
 
     def _add_pta_ge_record_data(self):
         """
@@ -1,11 +1,11 @@
 from ._base_parser import BaseParser
 from ..prof_common_func._constant import Constant
-from ..prof_common_func._file_manager import FileManager
 
 from ..prof_common_func._constant import convert_ns2us_float
 from ..prof_common_func._path_manager import ProfilerPathManager
 from ..prof_common_func._tree_builder import TreeBuilder
 from ..prof_common_func._log import ProfilerLogger
+from ..prof_common_func._op_device_duration import OpDeviceDuration
 from ..prof_parse._fwk_file_parser import FwkFileParser
 
 __all__ = []
@@ -41,32 +41,23 @@ class OperatorViewParser(BaseParser):
             return
         operator_list = [None] * len(self._torch_op_node)
         self._update_tree_for_no_task_queue()
+        device_dur = OpDeviceDuration(self._torch_op_node, self._kernel_dict)
+        device_dur_columns = zip(device_dur.self_dur.tolist(), device_dur.total_dur.tolist(),
+                                 device_dur.self_dur_with_ai_core.tolist(), device_dur.total_dur_with_ai_core.tolist())
         index = 0
-        for torch_op_node in self._torch_op_node:
+        for torch_op_node, device_dur_row in zip(self._torch_op_node, device_dur_columns):
             if torch_op_node.is_profiler_step():
                 continue
-            kernel_self, kernel_total = [], []
-            for corr_id in torch_op_node.corr_id_self:
-                kernel_self.extend(self._kernel_dict.get(corr_id, []))
-            for corr_id in torch_op_node.corr_id_total:
-                kernel_total.extend(self._kernel_dict.get(corr_id, []))
-
-            device_self_dur = sum([float(kernel.dur) for kernel in kernel_self])
-            device_total_dur = sum([float(kernel.dur) for kernel in kernel_total])
-            device_self_dur_with_ai_core = sum([float(kernel.dur) if kernel.is_ai_core else 0 for kernel in kernel_self])
-            device_total_dur_with_ai_core = sum([float(kernel.dur) if kernel.is_ai_core else 0 for kernel in kernel_total])
-            operator_list[index] = [torch_op_node.event.name, torch_op_node.input_shape, torch_op_node.call_stack,
+            operator_list[index] = [torch_op_node.name, torch_op_node.input_shape, torch_op_node.call_stack,
                                     convert_ns2us_float(torch_op_node.host_self_dur),
-                                    convert_ns2us_float(torch_op_node.host_total_dur), device_self_dur,
-                                    device_total_dur, device_self_dur_with_ai_core, device_total_dur_with_ai_core]
+                                    convert_ns2us_float(torch_op_node.host_total_dur), *device_dur_row]
             index += 1
         del operator_list[index:]
-        FileManager.create_csv_file(self._output_path, operator_list, self.OPERATOR_VIEW, self.OPERATOR_HEADERS)
+        self.create_table_file(operator_list, self.OPERATOR_VIEW, self.OPERATOR_HEADERS)
 
     def _update_tree_for_no_task_queue(self):
         if not FwkFileParser(self._profiler_path).has_task_queue_data():
-            for acl_ts in self._kernel_dict.keys():
-                TreeBuilder.update_tree_node_info(acl_ts, self._root_node)
+            TreeBuilder.update_tree_node_info_in_bulk(self._kernel_dict.keys(), self._torch_op_node)
 
     def _init_torch_op(self):
         if not ProfilerPathManager.get_cann_path(self._profiler_path):
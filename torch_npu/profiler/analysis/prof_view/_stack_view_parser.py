@@ -2,13 +2,13 @@ import os
 
 from ..prof_common_func._constant import convert_ns2us_float
 from ._base_parser import BaseParser
-from ..prof_bean._torch_op_node import TorchOpNode
 from ..prof_common_func._constant import Constant
 from ..prof_common_func._constant import print_warn_msg
 from ..prof_common_func._path_manager import ProfilerPathManager
 from ..prof_common_func._tree_builder import TreeBuilder
 from ..prof_common_func._file_manager import FileManager
 from ..prof_common_func._log import ProfilerLogger
+from ..prof_common_func._op_device_duration import OpDeviceDuration
 from ..prof_parse._fwk_cann_relation_parser import FwkCANNRelationParser
 from ..prof_parse._fwk_file_parser import FwkFileParser
 from ....utils._path_manager import PathManager
@@ -45,14 +45,17 @@ class StackViewParser(BaseParser):
         if suffix != ".log":
             print_warn_msg("Input file is not log file. Change to log file.")
             output_path = file_name + ".log"
-        for torch_op_node in self._torch_op_node:
+        npu_self_dur = None
+        if self._metric != Constant.METRIC_CPU_TIME:
+            npu_self_dur = OpDeviceDuration(self._torch_op_node, self._kernel_dict).self_dur.tolist()
+        for index, torch_op_node in enumerate(self._torch_op_node):
             call_stack = torch_op_node.call_stack
             if not call_stack:
                 continue
             if self._metric == Constant.METRIC_CPU_TIME:
                 total_dur = convert_ns2us_float(torch_op_node.host_self_dur)
             else:
-                total_dur = self._calculate_npu_dur(torch_op_node)
+                total_dur = npu_self_dur[index]
             if float(total_dur) <= 0:
                 continue
             # remove ‘\n’ for each stack frame
@@ -62,12 +65,6 @@ class StackViewParser(BaseParser):
             data.append(call_stack_str + " " + str(int(total_dur)))
         FileManager.create_text_file_by_path(output_path, "\n".join(data))
 
-    def _calculate_npu_dur(self, torch_op_node: TorchOpNode):
-        kernel_self = []
-        for corr_id in torch_op_node.corr_id_self:
-            kernel_self.extend(self._kernel_dict.get(corr_id, []))
-        return sum([float(kernel.dur) for kernel in kernel_self])
-
     def _init_data(self):
         if not ProfilerPathManager.get_cann_path(self._profiler_path):
             self._torch_op_node = FwkFileParser(self._profiler_path).get_torch_op_tree_node(only_fwk=True)
@@ -79,5 +76,4 @@ class StackViewParser(BaseParser):
         if self._metric == Constant.METRIC_NPU_TIME:
             self._kernel_dict = FwkCANNRelationParser(self._profiler_path).get_kernel_dict()
             if not FwkFileParser(self._profiler_path).has_task_queue_data():
-                for acl_ts in self._kernel_dict.keys():
-                    TreeBuilder.update_tree_node_info(acl_ts, self._root_node)
+                TreeBuilder.update_tree_node_info_in_bulk(self._kernel_dict.keys(), self._torch_op_node)
@@ -1,9 +1,13 @@
 from enum import Enum
+
+import numpy as np
+
 from ._base_parser import BaseParser
 from ..prof_common_func._constant import Constant
 from ..prof_common_func._file_manager import FileManager
 from ..prof_common_func._constant import convert_ns2us_float
 from ..prof_common_func._log import ProfilerLogger
+from ..prof_common_func._step_range_index import StepRangeIndex
 from ..prof_parse._cann_file_parser import CANNFileParser
 from ..prof_parse._fwk_cann_relation_parser import FwkCANNRelationParser
 from ..prof_parse._fwk_file_parser import FwkFileParser
@@ -43,51 +47,58 @@ class TraceStepTimeParser(BaseParser):
             return False
 
     @classmethod
-    def count_time(cls, add_type, start_time, duration, step_list, save_time):
-        cur_step = None
-        if not cls.is_float_num(start_time) or not cls.is_float_num(duration):
-            print('Ts or dur format error!')
+    def count_time(cls, events: list, step_list: list, save_time: list):
+        """
+        Add the durations of events, (type, start time, duration) tuples, to the save_time of their steps and
+        update the e2e and first task times of the steps in step_list, the rows of both being in the same order.
+        """
+        if not events:
             return
-        start_time = float(start_time)
-        duration = float(duration)
-        for step in step_list:
-            if step[_StepInfoIndex.START_TS.value] <= start_time < step[_StepInfoIndex.END_TS.value]:
-                cur_step = step[_StepInfoIndex.ID.value]
-                break
-        for step in step_list:
-            if cur_step == step[_StepInfoIndex.ID.value]:
-                if start_time < step[_StepInfoIndex.E2E_START_TS.value] or \
-                    step[_StepInfoIndex.E2E_START_TS.value] == -1:
-                    step[_StepInfoIndex.E2E_START_TS.value] = start_time
-                if start_time + duration > step[_StepInfoIndex.E2E_END_TS.value] or \
-                    step[_StepInfoIndex.E2E_END_TS.value] == -1:
-                    step[_StepInfoIndex.E2E_END_TS.value] = start_time + duration
-                if add_type in {'Communication', 'Computing'}:
-                    if start_time < step[_StepInfoIndex.FIRST_TASK_TS.value] or \
-                       step[_StepInfoIndex.FIRST_TASK_TS.value] == -1:
-                        step[_StepInfoIndex.FIRST_TASK_TS.value] = start_time
-                break
-        for cur_save in save_time:
-            if cur_save.get('step') == cur_step:
-                cur_save[cls.timeflag.get(add_type)] += duration
-                break
+        add_types = [event[0] for event in events]
+        start_time = np.array([event[1] for event in events], dtype=np.float64)
+        duration = np.array([event[2] for event in events], dtype=np.float64)
+        step_ranges = [(row_index, step[_StepInfoIndex.START_TS.value], step[_StepInfoIndex.END_TS.value])
+                       for row_index, step in enumerate(step_list)]
+        if len(step_list) == 1 and step_list[0][_StepInfoIndex.ID.value] is None:
+            # a run without step marks counts all the events in its single step
+            step_ranges = [(0, -float("inf"), float("inf"))]
+        index = StepRangeIndex(step_ranges)
+        # the index positions follow the step starts, mapped back to the rows of step_list
+        positions = index.get_positions(start_time)
+        row_indexes = np.array(index.step_ids + [StepRangeIndex.NO_STEP], dtype=np.int64)
+        rows = row_indexes[positions]
+        matched = rows != StepRangeIndex.NO_STEP
+        add_type_array = np.array(add_types)
+        for add_type, flag in cls.timeflag.items():
+            type_mask = matched & (add_type_array == add_type)
+            if not type_mask.any():
+                continue
+            sums = np.bincount(rows[type_mask], weights=duration[type_mask], minlength=len(step_list))
+            for row_index in np.flatnonzero(np.bincount(rows[type_mask], minlength=len(step_list))):
+                save_time[row_index][flag] += float(sums[row_index])
+        task_mask = matched & np.isin(add_type_array, ['Communication', 'Computing'])
+        for field, values, mask, reduce_func in (
+                (_StepInfoIndex.E2E_START_TS, start_time, matched, np.minimum),
+                (_StepInfoIndex.E2E_END_TS, start_time + duration, matched, np.maximum),
+                (_StepInfoIndex.FIRST_TASK_TS, start_time, task_mask, np.minimum)):
+            if not mask.any():
+                continue
+            initial = np.inf if reduce_func is np.minimum else -np.inf
+            reduced = np.full(len(step_list), initial)
+            reduce_func.at(reduced, rows[mask], values[mask])
+            for row_index in np.flatnonzero(reduced != initial):
+                step_list[row_index][field.value] = float(reduced[row_index])
 
     @classmethod
-    def get_e2e_time(cls, step, step_list):
-        for cur_step in step_list:
-            if cur_step[_StepInfoIndex.ID.value] == step:
-                return cur_step[_StepInfoIndex.E2E_END_TS.value] - cur_step[_StepInfoIndex.E2E_START_TS.value]
-        return 0
-
-    def get_prepare_time(self, step, step_list):
-        for cur_step in step_list:
-            if cur_step[_StepInfoIndex.ID.value] == step:
-                first_task_start_ts = cur_step[_StepInfoIndex.FIRST_TASK_TS.value]
-                if step is None:
-                    first_fwk_op = FwkFileParser(self._profiler_path).get_first_fwk_op()
-                    return (first_task_start_ts - convert_ns2us_float(first_fwk_op.ts)) if first_fwk_op else 0
-                return first_task_start_ts - cur_step[_StepInfoIndex.FWK_START_TS.value]
-        return 0
+    def get_e2e_time(cls, step_info: list):
+        return step_info[_StepInfoIndex.E2E_END_TS.value] - step_info[_StepInfoIndex.E2E_START_TS.value]
+
+    def get_prepare_time(self, step_info: list):
+        first_task_start_ts = step_info[_StepInfoIndex.FIRST_TASK_TS.value]
+        if step_info[_StepInfoIndex.ID.value] is None:
+            first_fwk_op = FwkFileParser(self._profiler_path).get_first_fwk_op()
+            return (first_task_start_ts - convert_ns2us_float(first_fwk_op.ts)) if first_fwk_op else 0
+        return first_task_start_ts - step_info[_StepInfoIndex.FWK_START_TS.value]
 
     def create_step_file(self, output_path: str, json_str: list, file_name: str) -> None:
         step_list = []
@@ -110,19 +121,28 @@ class TraceStepTimeParser(BaseParser):
             step_list.append([None, -1, -1, -1, -1, -1, -1])
 
         has_analysis_data_flag = False
+        events = []
         for data in json_str:
             if data.get('name') in {'Communication', 'Computing', 'Free', 'Communication(Not Overlapped)'}:
-                self.count_time(data.get('name'), data.get('ts', 0), data.get('dur', 0), step_list, save_time)
+                add_type = data.get('name')
                 has_analysis_data_flag = True
             elif str(data.get('name')).startswith('hcom_receive'):
-                self.count_time('hcom_receive', data.get('ts', 0), data.get('dur', 0), step_list, save_time)
+                add_type = 'hcom_receive'
+            else:
+                continue
+            start_time, duration = data.get('ts', 0), data.get('dur', 0)
+            if not self.is_float_num(start_time) or not self.is_float_num(duration):
+                print('Ts or dur format error!')
+                continue
+            events.append((add_type, float(start_time), float(duration)))
+        self.count_time(events, step_list, save_time)
         if not has_analysis_data_flag:
             return
-        for calc_time in save_time:
+        for calc_time, step_info in zip(save_time, step_list):
             calc_time['comunNotOverlpRec'] = calc_time['comunNotOverlp'] - calc_time['bubble']
             calc_time['Overlp'] = calc_time['comun'] - calc_time['comunNotOverlp']
-            calc_time['stage'] = self.get_e2e_time(calc_time['step'], step_list) - calc_time['bubble']
-            calc_time['prepare'] = self.get_prepare_time(calc_time['step'], step_list)
+            calc_time['stage'] = self.get_e2e_time(step_info) - calc_time['bubble']
+            calc_time['prepare'] = self.get_prepare_time(step_info)
         print_time = []
         for step in save_time:
             print_time.append(
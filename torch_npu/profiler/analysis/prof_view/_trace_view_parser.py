@@ -2,11 +2,12 @@ import os
 
 from ._base_parser import BaseParser
 from ..prof_common_func._constant import Constant
-from ..prof_common_func._file_manager import FileManager
 from ..prof_common_func._path_manager import ProfilerPathManager
 from ..prof_common_func._trace_event_manager import TraceEventManager
+from ..prof_common_func._trace_json_writer import TraceJsonWriter
 from ..prof_common_func._tree_builder import TreeBuilder
 from ..prof_common_func._log import ProfilerLogger
+from ..prof_common_func._output_recorder import OutputRecorder
 from ..prof_parse._fwk_cann_relation_parser import FwkCANNRelationParser
 from .._profiler_config import ProfilerConfig
 from ..prof_parse._cann_file_parser import CANNFileParser
@@ -24,27 +25,19 @@ class TraceViewParser(BaseParser):
             self._output_path) else self._output_path
         self._temp_trace_file_path = os.path.join(self._output_path, Constant.TRACE_VIEW_TEMP) if os.path.isdir(
             self._output_path) else self._output_path
-        self._trace_data = []
         self._torch_op_node = []
         self._root_node = None
         ProfilerLogger.init(self._profiler_path, "TraceViewParser")
         self.logger = ProfilerLogger.get_instance()
 
     @staticmethod
-    def _prune_trace_by_level(json_data: list) -> list:
+    def _prune_trace_by_level(json_data: list) -> any:
         prune_config = ProfilerConfig().get_prune_config()
         if not prune_config or not json_data:
             return json_data
-        result = []
-        for data in json_data:
-            prune_flag = False
-            for prune_key in prune_config:
-                if data.get("name", "").startswith(prune_key) or data.get("args", {}).get("name", "") == prune_key:
-                    prune_flag = True
-                    continue
-            if not prune_flag:
-                result.append(data)
-        return result
+        return (data for data in json_data
+                if not any(data.get("name", "").startswith(prune_key) or
+                           data.get("args", {}).get("name", "") == prune_key for prune_key in prune_config))
 
     def run(self, deps_data: dict):
         try:
@@ -60,34 +53,35 @@ class TraceViewParser(BaseParser):
         return Constant.SUCCESS, None
 
     def generate_view(self) -> None:
-        if not ProfilerPathManager.get_cann_path(self._profiler_path):
-            self._trace_data = FwkFileParser(self._profiler_path).get_fwk_trace_data()
-        else:
-            msprof_timeline_data = CANNFileParser(self._profiler_path).get_timeline_all_data()
-            self._trace_data.extend(
-                self._prune_trace_by_level(msprof_timeline_data))
-            if self._torch_op_node:
-                self._trace_data.extend(self._get_flow_event(msprof_timeline_data))
-        if os.path.exists(self._temp_trace_file_path):
-            FileManager.append_trace_json_by_path(self._temp_trace_file_path, self._trace_data, self._trace_file_path)
-        else:
-            FileManager.create_json_file_by_path(self._trace_file_path, self._trace_data)
+        is_append = os.path.exists(self._temp_trace_file_path)
+        trace_file_path = self._temp_trace_file_path if is_append else self._trace_file_path
+        with TraceJsonWriter(trace_file_path, compress=trace_file_path.endswith(".gz"), append=is_append) as writer:
+            if not ProfilerPathManager.get_cann_path(self._profiler_path):
+                writer.write(FwkFileParser(self._profiler_path).get_fwk_trace_data())
+            else:
+                msprof_timeline_data = CANNFileParser(self._profiler_path).get_timeline_all_data()
+                writer.write(self._prune_trace_by_level(msprof_timeline_data))
+                if self._torch_op_node:
+                    writer.write(self._get_flow_event(msprof_timeline_data))
+        if is_append and self._temp_trace_file_path != self._trace_file_path:
+            os.rename(self._temp_trace_file_path, self._trace_file_path)
+            OutputRecorder.record(self._trace_file_path)
 
     def _get_flow_event(self, msprof_timeline_data: list) -> list:
         flow_event_list = []
         acl_to_npu_dict = CANNFileParser.combine_acl_to_npu(msprof_timeline_data)
-        if not FwkFileParser(self._profiler_path).has_task_queue_data():
-            for acl_ts in acl_to_npu_dict.keys():
-                matched_torch_op = TreeBuilder.match_self_torch_op(acl_ts, self._root_node)
-                if not matched_torch_op:
-                    continue
+        fwk_file_parser = FwkFileParser(self._profiler_path)
+        if not fwk_file_parser.has_task_queue_data():
+            matched_torch_op_dict = TreeBuilder.match_self_torch_op_in_bulk(
+                acl_to_npu_dict.keys(), self._torch_op_node)
+            for acl_ts, matched_torch_op in matched_torch_op_dict.items():
                 kernel_list = acl_to_npu_dict.get(acl_ts, [])
                 for kernel in kernel_list:
                     flow_event_list.extend(
                         TraceEventManager.create_torch_to_npu_flow(matched_torch_op.event, kernel))
             return flow_event_list
-        dequeue_data_list = FwkFileParser(self._profiler_path).get_dequeue_data()
-        kernel_dict = FwkCANNRelationParser.combine_kernel_dict(acl_to_npu_dict, dequeue_data_list)
+        dequeue_columns = fwk_file_parser.get_dequeue_columns()
+        kernel_dict = FwkCANNRelationParser.combine_kernel_dict_by_columns(acl_to_npu_dict, dequeue_columns)
         for torch_op_node in self._torch_op_node:
             for corr_id in torch_op_node.corr_id_self:
                 kernel_list = kernel_dict.get(corr_id, [])
@@ -16,12 +16,14 @@
 import os
 import shutil
 import subprocess
+import time
 
 from torch_npu.utils._error_code import ErrCode, prof_error
 from ...prof_common_func._constant import print_warn_msg, Constant, print_error_msg
 from ...prof_common_func._path_manager import ProfilerPathManager
 from .._base_parser import BaseParser
 from ...prof_common_func._log import ProfilerLogger
+from ...prof_common_func._output_recorder import OutputRecorder
 from ..._profiler_config import ProfilerConfig
 
 __all__ = []
@@ -47,17 +49,20 @@ class CANNAnalyzeParser(BaseParser):
                 print_error_msg(err_msg)
                 raise RuntimeError(err_msg)
 
+            start_ns = time.time_ns()
             if Constant.Db in ProfilerConfig().export_type:
                 analyze_cmd_list = [self.msprof_path, "--analyze=on", "--type=db", f"--output={self._cann_path}"]
                 completed_analysis = subprocess.run(analyze_cmd_list, capture_output=True, shell=False)
                 if completed_analysis.returncode != self.COMMAND_SUCCESS:
                     print_warn_msg("Failed to analyze CANN DB Profiling data.")
 
-            if Constant.Text in ProfilerConfig().export_type:
+            if ProfilerConfig().is_text_based_export():
                 analyze_cmd_list = [self.msprof_path, "--analyze=on", f"--output={self._cann_path}"]
                 completed_analysis = subprocess.run(analyze_cmd_list, capture_output=True, shell=False)
                 if completed_analysis.returncode != self.COMMAND_SUCCESS:
                     print_warn_msg("Failed to analyze CANN TEXT Profiling data.")
+            # the files of msprof are recorded as the outputs of the parser, the raw data excluded
+            OutputRecorder.record_dir(self._cann_path, start_ns, exclude_dirs=("data",))
 
         except Exception as e:
             print_error_msg("Failed to analyze CANN Profiling data.")
@@ -26,6 +26,7 @@ from ...prof_common_func._path_manager import ProfilerPathManager
 from .._base_parser import BaseParser
 from ..._profiler_config import ProfilerConfig
 from ...prof_common_func._log import ProfilerLogger
+from ...prof_common_func._output_recorder import OutputRecorder
 
 
 __all__ = []
@@ -55,6 +56,7 @@ class CANNExportParser(BaseParser):
                 raise RuntimeError(err_msg)
             self._check_prof_data_size()
             start_time = datetime.utcnow()
+            start_ns = time.time_ns()
 
             if Constant.Db in ProfilerConfig().export_type:
                 analyze_cmd_list = [self.msprof_path, "--export=on", "--type=db", f"--output={self._cann_path}"]
@@ -62,12 +64,14 @@ class CANNExportParser(BaseParser):
                 if completed_analysis.returncode != self.COMMAND_SUCCESS:
                     raise RuntimeError("Failed to export CANN DB Profiling data." + prof_error(ErrCode.INTERNAL))
 
-            if Constant.Text in ProfilerConfig().export_type:
+            if ProfilerConfig().is_text_based_export():
                 # 避免老CANN包无type参数报错
                 analyze_cmd_list = [self.msprof_path, "--export=on", f"--output={self._cann_path}"]
                 completed_analysis = subprocess.run(analyze_cmd_list, capture_output=True, shell=False)
                 if completed_analysis.returncode != self.COMMAND_SUCCESS:
                     raise RuntimeError("Failed to export CANN TEXT Profiling data." + prof_error(ErrCode.INTERNAL))
+            # the files of msprof are recorded as the outputs of the parser, the raw data excluded
+            OutputRecorder.record_dir(self._cann_path, start_ns, exclude_dirs=("data",))
 
         except Exception as err:
             print_error_msg(f"Failed to export CANN Profiling data. Error msg: {err}")
@@ -102,7 +106,7 @@ class CANNTimelineParser(BaseParser):
         if not os.path.isdir(self._cann_path):
             return Constant.SUCCESS, None
         ProfilerConfig().load_info(self._profiler_path)
-        if Constant.Text in ProfilerConfig().export_type:
+        if ProfilerConfig().is_text_based_export():
             output_path = os.path.join(self._cann_path, "mindstudio_profiler_output")
             while True:
                 if os.path.exists(output_path):
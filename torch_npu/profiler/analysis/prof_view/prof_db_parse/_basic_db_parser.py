@@ -4,6 +4,7 @@ import shutil
 import json
 
 from ...prof_common_func._log import ProfilerLogger
+from ...prof_common_func._output_recorder import OutputRecorder
 from ...prof_common_func._utils import collect_env_vars
 from ...prof_common_func._path_manager import ProfilerPathManager
 from ...prof_common_func._file_manager import FileManager
@@ -28,6 +29,7 @@ class BasicDbParser(BaseParser):
             cann_db_path = self.get_cann_db_path()
             if cann_db_path:
                 shutil.move(cann_db_path, TorchDb().get_db_path())
+                OutputRecorder.record(TorchDb().get_db_path())
             self.create_ascend_db()
             self.save_rank_info_to_db()
             self.save_host_info_to_db()
@@ -5,6 +5,7 @@ from ._communication_db_parser import CommunicationDbParser
 from ._fwk_api_db_parser import FwkApiDbParser
 from ._gc_record_db_parser import GCRecordDbParser
 from ._memory_db_parser import MemoryDbParser
+from ._rollup_db_parser import RollupDbParser
 from ._step_info_db_parser import StepInfoDbParser
 from ._trace_step_time_db_parser import TraceStepTimeDbParser
 from ...prof_common_func._constant import Constant, DbConstant, print_error_msg
@@ -29,6 +30,7 @@ class DbParser(BaseParser):
         Constant.STEP_INFO_DB_PARSER: StepInfoDbParser,
         Constant.COMMUNICATION_DB_PARSER: CommunicationDbParser,
         Constant.TRACE_STEP_TIME_DB_PARSER: TraceStepTimeDbParser,
+        Constant.ROLLUP_DB_PARSER: RollupDbParser,
     }
 
     def __init__(self, name: str, param_dict: dict):
@@ -260,10 +260,7 @@ class FwkApiDbParser(BaseParser):
         connection_ids = ConnectionIdManager().get_all_connection_ids()
         if not connection_ids:
             return
-        save_connection_ids = []
-        for index, conn_ids in connection_ids.items():
-            for conn_id in conn_ids:
-                save_connection_ids.append([index, conn_id])
+        save_connection_ids = ([index, conn_id] for index, conn_ids in connection_ids.items() for conn_id in conn_ids)
         TorchDb().create_table_with_headers(DbConstant.TABLE_CONNECTION_IDS,
                                             TableColumnsManager.TableColumns.get(DbConstant.TABLE_CONNECTION_IDS))
         TorchDb().insert_data_into_table(DbConstant.TABLE_CONNECTION_IDS, save_connection_ids)
@@ -272,10 +269,8 @@ class FwkApiDbParser(BaseParser):
         callchain_ids = CallChainIdManager().get_all_callchain_id()
         if not callchain_ids:
             return
-        save_callchain_ids = []
-        for index, callstack_ids in callchain_ids.items():
-            for callstack_id in callstack_ids:
-                save_callchain_ids.append([index] + callstack_id)
+        save_callchain_ids = ([index] + callstack_id
+                              for index, callstack_ids in callchain_ids.items() for callstack_id in callstack_ids)
         TorchDb().create_table_with_headers(DbConstant.TABLE_PYTORCH_CALLCHAINS,
                                             TableColumnsManager.TableColumns.get(DbConstant.TABLE_PYTORCH_CALLCHAINS))
         TorchDb().insert_data_into_table(DbConstant.TABLE_PYTORCH_CALLCHAINS, save_callchain_ids)
@@ -1,5 +1,6 @@
 from enum import Enum
 from collections import namedtuple
+from itertools import chain
 from ...prof_parse._fwk_file_parser import FwkFileParser
 from .._memory_prepare_parser import MemoryPrepareParser
 from ...prof_common_func._db_manager import TorchDb
@@ -173,7 +174,8 @@ class MemoryDbParser(BaseParser):
         for memory in self._pta_op_memory_data:
             memory[OpMemoryTableRow.NAME.value] = Str2IdManager().get_id_from_str(memory[OpMemoryTableRow.NAME.value])
         TorchDb().create_table_with_headers(DbConstant.TABLE_OPERATOR_MEMORY, TableColumnsManager.TableColumns.get(DbConstant.TABLE_OPERATOR_MEMORY))
-        TorchDb().insert_data_into_table(DbConstant.TABLE_OPERATOR_MEMORY, self._pta_op_memory_data + self._ge_op_memory_data)
+        TorchDb().insert_data_into_table(DbConstant.TABLE_OPERATOR_MEMORY,
+                                         chain(self._pta_op_memory_data, self._ge_op_memory_data))
 
     def get_pta_memort_record_list(self):
         if not self._pta_memory_bean_list:
@@ -0,0 +1,135 @@
+from .._base_parser import BaseParser
+from ...prof_common_func._constant import Constant, DbConstant, TableColumnsManager, print_warn_msg
+from ...prof_common_func._db_manager import TorchDb
+from ...prof_common_func._log import ProfilerLogger
+
+__all__ = []
+
+
+class RollupDbParser(BaseParser):
+    """
+    Per step rollups of the device tasks and the indexes used by the step and time window queries.
+    STEP_SUMMARY gives the device time range and the totals of every step, STEP_OP_TYPE_SUMMARY the
+    count and durations of its compute tasks by op type. The step ranges and the tasks of the steps are
+    loaded in temporary tables, the communication ops and op types are aggregated by SQLite over the time
+    and task id indexes. The other indexes are built when the db is closed, after all the tables are loaded.
+    """
+    # (table, index name, columns), an index is only created when all its columns exist
+    TIME_RANGE_INDEXES = [
+        (DbConstant.TABLE_TASK, "TASK_START_INDEX", ["startNs"]),
+        (DbConstant.TABLE_TASK, "TASK_STREAM_START_INDEX", ["streamId", "startNs"]),
+        (DbConstant.TABLE_COMPUTE_TASK_INFO, "COMPUTE_TASK_INFO_GLOBAL_TASK_ID_INDEX", ["globalTaskId"]),
+        (DbConstant.TABLE_COMMUNICATION_OP, "COMMUNICATION_OP_START_INDEX", ["startNs"]),
+        (DbConstant.TABLE_CANN_API, "CANN_API_TYPE_START_INDEX", ["type", "startNs"]),
+        (DbConstant.TABLE_STEP_SUMMARY, "STEP_SUMMARY_STEP_INDEX", ["step"]),
+        (DbConstant.TABLE_STEP_OP_TYPE_SUMMARY, "STEP_OP_TYPE_SUMMARY_STEP_INDEX", ["step", "opType"]),
+    ]
+    # indexes used by the rollup queries, built before them
+    ROLLUP_INDEXES = {"COMPUTE_TASK_INFO_GLOBAL_TASK_ID_INDEX", "COMMUNICATION_OP_START_INDEX"}
+    TEMP_STEP_RANGE = "ROLLUP_STEP_RANGE"
+    TEMP_STEP_TASK = "ROLLUP_STEP_TASK"
+    # end of the step range of a run without step marks
+    MAX_END_NS = (1 << 63) - 1
+
+    def __init__(self, name: str, param_dict: dict):
+        super().__init__(name, param_dict)
+        self.step_range = []
+        ProfilerLogger.init(self._profiler_path, "RollupDbParser")
+        self.logger = ProfilerLogger.get_instance()
+
+    @staticmethod
+    def format_step_id(step_id):
+        return int(step_id) if str(step_id).isdigit() else None
+
+    def run(self, deps_data: dict):
+        try:
+            self.step_range = deps_data.get(Constant.STEP_INFO_DB_PARSER, [])
+            if not TorchDb().create_connect_db():
+                print_warn_msg(f"Failed to connect to db file: {TorchDb().get_db_path()}")
+                return Constant.FAIL, None
+            # the indexes of the rollup queries are built now, the others once all the tables are loaded
+            self.register_indexes(self.ROLLUP_INDEXES, deferred=False)
+            self.save_rollup_data()
+            self.register_indexes()
+        except Exception as error:
+            self.logger.error("Failed to generate step rollup tables, error: %s", str(error), exc_info=True)
+            return Constant.FAIL, None
+        return Constant.SUCCESS, None
+
+    def save_rollup_data(self):
+        if not self.step_range:
+            return
+        self._create_temp_tables()
+        try:
+            communication_stats = self._get_communication_stats()
+            step_summary = []
+            for position, cur_step in enumerate(self.step_range):
+                end_ts = cur_step.get(Constant.END_TS)
+                task_info = cur_step.get(Constant.TASK_INFO, {})
+                task_duration = sum(task_time.get("endNs") - task_time.get("startNs")
+                                    for task_time in task_info.values())
+                communication_count, communication_duration = communication_stats.get(position, (0, 0))
+                # a run without step marks ends at inf, kept as NULL in the table
+                step_summary.append([self.format_step_id(cur_step.get(Constant.STEP_ID)),
+                                     cur_step.get(Constant.START_TS), end_ts if end_ts != float("inf") else None,
+                                     len(task_info), task_duration, communication_count, communication_duration])
+            TorchDb().create_table_with_headers(DbConstant.TABLE_STEP_SUMMARY,
+                                                TableColumnsManager.TableColumns.get(DbConstant.TABLE_STEP_SUMMARY))
+            TorchDb().insert_data_into_table(DbConstant.TABLE_STEP_SUMMARY, step_summary)
+            TorchDb().create_table_with_headers(DbConstant.TABLE_STEP_OP_TYPE_SUMMARY,
+                                                TableColumnsManager.TableColumns.get(
+                                                    DbConstant.TABLE_STEP_OP_TYPE_SUMMARY))
+            self._save_op_type_summary()
+        finally:
+            TorchDb().execute_sql(f"DROP TABLE IF EXISTS {self.TEMP_STEP_RANGE}")
+            TorchDb().execute_sql(f"DROP TABLE IF EXISTS {self.TEMP_STEP_TASK}")
+
+    def register_indexes(self, index_names: set = None, deferred: bool = True):
+        table_columns = {}
+        for table_name, index_name, columns in self.TIME_RANGE_INDEXES:
+            if index_names is not None and index_name not in index_names:
+                continue
+            if table_name not in table_columns:
+                table_columns[table_name] = self._get_table_columns(table_name)
+            if all(column in table_columns[table_name] for column in columns):
+                TorchDb().create_index(table_name, index_name, columns, deferred)
+
+    def _get_table_columns(self, table_name: str) -> set:
+        if not TorchDb().judge_table_exist(table_name):
+            return set()
+        return {row[1] for row in TorchDb().fetch_all_data(f"PRAGMA table_info({table_name})")}
+
+    def _create_temp_tables(self):
+        TorchDb().execute_sql(f"CREATE TEMP TABLE IF NOT EXISTS {self.TEMP_STEP_RANGE} "
+                              f"(position INTEGER, step INTEGER, startNs INTEGER, endNs INTEGER)")
+        TorchDb().execute_sql(f"CREATE TEMP TABLE IF NOT EXISTS {self.TEMP_STEP_TASK} "
+                              f"(position INTEGER, globalTaskId INTEGER, durationNs INTEGER)")
+        TorchDb().insert_data_into_table(self.TEMP_STEP_RANGE, (
+            [position, self.format_step_id(cur_step.get(Constant.STEP_ID)), cur_step.get(Constant.START_TS),
+             self.MAX_END_NS if cur_step.get(Constant.END_TS) == float("inf") else cur_step.get(Constant.END_TS)]
+            for position, cur_step in enumerate(self.step_range)))
+        TorchDb().insert_data_into_table(self.TEMP_STEP_TASK, (
+            [position, task_id, task_time.get("endNs") - task_time.get("startNs")]
+            for position, cur_step in enumerate(self.step_range)
+            for task_id, task_time in cur_step.get(Constant.TASK_INFO, {}).items()))
+
+    def _get_communication_stats(self) -> dict:
+        """Return {step position: (count, duration)} of the communication ops starting in the step."""
+        if not TorchDb().judge_table_exist(DbConstant.TABLE_COMMUNICATION_OP):
+            return {}
+        sql = f"SELECT r.position, count(*), sum(c.endNs - c.startNs) FROM {self.TEMP_STEP_RANGE} r " \
+              f"JOIN {DbConstant.TABLE_COMMUNICATION_OP} c ON c.startNs >= r.startNs AND c.startNs < r.endNs " \
+              f"GROUP BY r.position"
+        return {position: (count, duration) for position, count, duration in TorchDb().fetch_all_data(sql)}
+
+    def _save_op_type_summary(self):
+        if not TorchDb().judge_table_exist(DbConstant.TABLE_COMPUTE_TASK_INFO):
+            return
+        sql = f"INSERT INTO {DbConstant.TABLE_STEP_OP_TYPE_SUMMARY} " \
+              f"SELECT r.step, i.opType, count(*), sum(t.durationNs), min(t.durationNs), max(t.durationNs) " \
+              f"FROM {self.TEMP_STEP_TASK} t " \
+              f"JOIN {self.TEMP_STEP_RANGE} r ON r.position = t.position " \
+              f"JOIN {DbConstant.TABLE_COMPUTE_TASK_INFO} i ON i.globalTaskId = t.globalTaskId " \
+              f"GROUP BY t.position, i.opType ORDER BY t.position, i.opType"
+        if not TorchDb().execute_sql(sql):
+            raise RuntimeError("Failed to insert data into profiler db file")
@@ -13,6 +13,7 @@ from .analysis.prof_common_func._file_manager import FileManager
 from ._dynamic_profiler._dynamic_profiler_utils import DynamicProfilerUtils
 from ._dynamic_profiler._dynamic_profiler_monitor import DynamicProfilerMonitor
 from ._dynamic_profiler._dynamic_profiler_config_context import ConfigContext
+from ._dynamic_profiler._dynamic_profiler_straggler import StragglerDetector
 from ._dynamic_profiler._dynamic_monitor_proxy import PyDynamicMonitorProxySingleton
 
 
@@ -38,6 +39,8 @@ class _DynamicProfile:
         self._step_record_time = None
         self._step_time = 0
         self._min_poll_interval = 1
+        self._straggler_detector = None
+        self._straggler_cfg_ctx = None
 
     def init(self):
         if self.repeat_init:
@@ -56,6 +59,9 @@ class _DynamicProfile:
             DynamicProfilerUtils.stdout_log(
                 "Profiler stop when process exit, check cfg json active whether over all step!",
                 DynamicProfilerUtils.LoggerLevelEnum.WARNING)
+        if self._straggler_detector is not None:
+            self._straggler_detector.clean_resource()
+            self._straggler_detector = None
         self._dynamic_monitor.clean_resource()
 
     def _finalize_dynolog(self):
@@ -67,11 +73,15 @@ class _DynamicProfile:
         prof_cfg_ctx = self._dynamic_monitor.shm_to_prof_conf_context()
         return prof_cfg_ctx
 
-    def step(self):
+    def step(self, computing_time: float = 0, communication_time: float = 0):
         self.cur_step += 1
         cfg_ctx = self._dynamic_profiler_valid()
         if cfg_ctx is not None:
-            self.cfg_ctx = cfg_ctx
+            self._update_straggler_detect(cfg_ctx)
+            # with straggler detect, the capture is triggered by the detector instead of start_step
+            self.cfg_ctx = None if cfg_ctx.is_straggler_detect() else cfg_ctx
+        if self._straggler_detector is not None:
+            self._straggler_detector.record_step(self.cur_step, computing_time, communication_time)
         if self.cur_step == self.RECORD_TIME_STEP:
             self._step_record_time = time.time()
         elif self.cur_step - self.RECORD_TIME_STEP == 1:
@@ -89,6 +99,32 @@ class _DynamicProfile:
             self.step_num = self.cfg_ctx.active() + self.cfg_ctx.warmup()
             self.enable_prof()
             self.cfg_ctx = None
+        elif self.prof is None and self._straggler_detector is not None and self._straggler_detector.is_straggler():
+            DynamicProfilerUtils.out_log("Rank {} is detected as a straggler at {} step, start capture.".format(
+                DynamicProfilerUtils.get_rank_id(), self.cur_step), DynamicProfilerUtils.LoggerLevelEnum.WARNING)
+            self.cfg_ctx = self._straggler_cfg_ctx
+            self.step_num = self.cfg_ctx.active() + self.cfg_ctx.warmup()
+            self.enable_prof()
+            self.cfg_ctx = None
+
+    def _update_straggler_detect(self, cfg_ctx: ConfigContext):
+        if not cfg_ctx.is_straggler_detect():
+            if self._straggler_detector is not None:
+                self._straggler_detector.clean_resource()
+                self._straggler_detector = None
+                self._straggler_cfg_ctx = None
+                DynamicProfilerUtils.out_log("Straggler detect is disabled at {} step.".format(self.cur_step),
+                                             DynamicProfilerUtils.LoggerLevelEnum.INFO)
+            return
+        self._straggler_cfg_ctx = cfg_ctx
+        if self._straggler_detector is not None:
+            self._straggler_detector.update_config(cfg_ctx.straggler_config())
+            return
+        detector = StragglerDetector(self._dynamic_monitor.shm_name + "StepTime", cfg_ctx.straggler_config())
+        if detector.enabled:
+            self._straggler_detector = detector
+            DynamicProfilerUtils.out_log("Straggler detect is enabled at {} step.".format(self.cur_step),
+                                         DynamicProfilerUtils.LoggerLevelEnum.INFO)
 
     def start(self, config_path: str):
         if self.prof:
@@ -162,8 +198,12 @@ def init(path: str):
 
 
 @no_exception_func()
-def step():
-    _DynamicProfile().step()
+def step(computing_time: float = 0, communication_time: float = 0):
+    """
+    Mark the end of a training step. computing_time and communication_time (us) of the step are optional,
+    they are kept with the step time by the straggler detect and only needed when it uses these metrics.
+    """
+    _DynamicProfile().step(computing_time, communication_time)
 
 
 @no_exception_func()
@@ -27,7 +27,7 @@ def supported_ai_core_metrics():
 
 
 def supported_export_type():
-    return set((ExportType.Db, ExportType.Text))
+    return set((ExportType.Db, ExportType.Text, ExportType.Columnar))
 
 
 class ProfilerLevel:
@@ -52,6 +52,7 @@ class AiCMetrics:
 class ExportType:
     Db = Constant.Db
     Text = Constant.Text
+    Columnar = Constant.Columnar
 
 
 class _ExperimentalConfig:
@@ -148,7 +149,7 @@ class _ExperimentalConfig:
         if not isinstance(self._op_attr, bool):
             print_warn_msg("Invalid parameter op_attr, which must be of boolean type, reset it to False.")
             self._op_attr = False
-        if not all(export_type in [ExportType.Text, ExportType.Db] for export_type in self._export_type):
+        if not all(export_type in supported_export_type() for export_type in self._export_type):
             print_warn_msg("Invalid parameter export_type, reset it to text.")
             self._export_type = [ExportType.Text]
         if self._op_attr and ExportType.Db not in self._export_type:
@@ -133,7 +133,8 @@ class _KinetoProfile:
         self.prof_if.analyse(Constant.EXPORT_STACK, output_path, metric=metric)
 
     @no_exception_func()
-    def export_memory_timeline(self, output_path: str, device: Optional[str] = None) -> None:
+    def export_memory_timeline(self, output_path: str, device: Optional[str] = None,
+                               bucket_us: Optional[int] = None) -> None:
         if device is None:
             device = "npu:0" if torch_npu.npu.is_available() else "cpu"
         
@@ -151,7 +152,10 @@ class _KinetoProfile:
         if not self.prof_if.prof_path:
             print_warn_msg("Invalid profiling path.")
             return
-        self.prof_if.analyse(Constant.EXPORT_MEMORY_TIMELINE, output_path, device=device)
+        if bucket_us is not None and (not isinstance(bucket_us, int) or bucket_us <= 0):
+            print_warn_msg("bucket_us should be a positive integer, the memory timeline is not downsampled.")
+            bucket_us = None
+        self.prof_if.analyse(Constant.EXPORT_MEMORY_TIMELINE, output_path, device=device, bucket_us=bucket_us)
 
     def _check_str_valid(self, input_str: str):
         if len(input_str) > self.max_str_len:
@@ -284,11 +288,19 @@ class profile(_KinetoProfile):
 
 
 @no_exception_func()
-def analyse(profiler_path: str, max_process_number: int = Constant.DEFAULT_PROCESS_NUMBER):
+def analyse(profiler_path: str, max_process_number: int = Constant.DEFAULT_PROCESS_NUMBER, cluster_mode: bool = False,
+            use_checkpoint: bool = True):
     if not isinstance(max_process_number, int) or max_process_number <= 0:
         max_process_number = Constant.DEFAULT_PROCESS_NUMBER
         print_warn_msg("Invalid max_process_number, reset it to default!")
     if max_process_number > os.cpu_count():
         max_process_number = os.cpu_count()
         print_warn_msg("max_process_number exceeds the number of cpu cores, reset it to the number of cpu cores!")
-    NpuProfiler.analyse(profiler_path, max_process_number=max_process_number)
+    if not isinstance(cluster_mode, bool):
+        cluster_mode = False
+        print_warn_msg("Invalid cluster_mode, reset it to False!")
+    if not isinstance(use_checkpoint, bool):
+        use_checkpoint = True
+        print_warn_msg("Invalid use_checkpoint, reset it to True!")
+    NpuProfiler.analyse(profiler_path, max_process_number=max_process_number, cluster_mode=cluster_mode,
+                        use_checkpoint=use_checkpoint)